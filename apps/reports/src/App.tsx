@@ -1,10 +1,17 @@
+import { Profiler } from 'react';
 import { Hovedbok } from './components/Hovedbok';
+import { instrumentation } from '@shared/instrumentation';
 
 function App() {
+  // Rendringstider for hovedboken når ytelsesmåling er slått på
+  const hovedbok = instrumentation.enabled
+    ? <Profiler id="Hovedbok" onRender={instrumentation.recordRender}><Hovedbok /></Profiler>
+    : <Hovedbok />;
+
   return (
     <div className="min-h-screen bg-gray-100">
       <div className="py-8 px-4 sm:px-6 lg:px-8">
-        <Hovedbok />
+        {hovedbok}
       </div>
     </div>
   );
@@ -1,11 +1,21 @@
-import { useState } from 'react';
+import { useMemo, useState } from 'react';
 import { Bilag, Bilagstype } from '../types/ledger';
+import { useVirtuelleRader } from '../hooks/useVirtuelleRader';
+import { formattersFor } from '@shared/formatting';
+import type { EntryStore } from '@shared/entryStore';
+import { useLagretBilag } from '../hooks/useBilagslager';
+import { Dokumentminiatyr } from './Dokumentminiatyr';
 
 interface BilagstabellProps {
   bilag: Bilag[];
+  // Rader abonnerer på sitt eget bilag i lageret, så endringer (f.eks.
+  // kryssing) bare rendrer raden som ble endret
+  lager?: EntryStore<Bilag>;
   onKryssingEndring?: (bilagsnummer: string, erKrysset: boolean) => void;
   visKontoKolonne?: boolean;
   visKryssingCheckbox?: boolean;
+  // Vindusbasert rendering; standard er på for store bilagslister
+  virtualisert?: boolean;
 }
 
 const bilagstypeEtiketter: Record<Bilagstype, string> = {
@@ -28,13 +38,324 @@ const bilagstypeFarger: Record<Bilagstype, string> = {
   justering: 'bg-yellow-100 text-yellow-700',
 };
 
+// Over denne grensen rendres bare synlige rader (pluss overscan)
+const VIRTUALISERINGSGRENSE = 200;
+const ESTIMERT_RADHOYDE = 45;
+
+const formatering = formattersFor('nb-NO');
+
+// Tomme celler for null og 0, som i bilagskolonnene
+const formaterBelop = (belop: number | null) =>
+  belop === null || belop === 0 ? '' : formatering.amount(belop);
+
+const totalDebetFor = (b: Bilag) => b.linjer.reduce((sum, linje) => sum + (linje.debet || 0), 0);
+const totalKreditFor = (b: Bilag) => b.linjer.reduce((sum, linje) => sum + (linje.kredit || 0), 0);
+
+// Ferdigformaterte verdier for én rad, laget samlet for alle synlige rader
+interface Radetiketter {
+  dato: string;
+  debet: string;
+  kredit: string;
+}
+
+interface BilagsradgruppeProps {
+  b: Bilag;
+  lager?: EntryStore<Bilag>;
+  etiketter: Radetiketter;
+  erUtvidet: boolean;
+  onToggle: (bilagsnummer: string) => void;
+  onKryssingEndring?: (bilagsnummer: string, erKrysset: boolean) => void;
+  visKontoKolonne: boolean;
+  visKryssingCheckbox: boolean;
+  antallKolonner: number;
+  maalRef: (element: HTMLElement | null) => void | (() => void);
+}
+
+// Ett bilag med eventuell detaljvisning, samlet i egen <tbody> slik at
+// høyden kan måles i virtualisert modus
+function Bilagsradgruppe({
+  b: listetBilag,
+  lager,
+  etiketter,
+  erUtvidet,
+  onToggle,
+  onKryssingEndring,
+  visKontoKolonne,
+  visKryssingCheckbox,
+  antallKolonner,
+  maalRef,
+}: BilagsradgruppeProps) {
+  const b = useLagretBilag(lager, listetBilag.bilagsnummer, listetBilag);
+  const totalDebet = totalDebetFor(b);
+  const totalKredit = totalKreditFor(b);
+  const forsteLinje = b.linjer[0];
+
+  return (
+    <tbody ref={maalRef} data-rad-nokkel={b.bilagsnummer} className="bg-white divide-y divide-gray-200">
+      {/* Hoved-bilagsrad */}
+      <tr
+        className={`hover:bg-gray-50 cursor-pointer transition-colors ${
+          erUtvidet ? 'bg-purple-50' : ''
+        } ${b.erKrysset ? 'bg-green-50/50' : ''}`}
+        onClick={() => onToggle(b.bilagsnummer)}
+      >
+        {visKryssingCheckbox && (
+          <td className="px-3 py-3" onClick={(e) => e.stopPropagation()}>
+            <div className="flex items-center">
+              <input
+                type="checkbox"
+                checked={b.erKrysset}
+                onChange={(e) => {
+                  onKryssingEndring?.(b.bilagsnummer, e.target.checked);
+                }}
+                className="h-4 w-4 rounded border-gray-300 text-purple-600 focus:ring-purple-500"
+              />
+              {b.erKrysset && (
+                <svg className="w-4 h-4 ml-1 text-green-500" fill="currentColor" viewBox="0 0 20 20">
+                  <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
+                </svg>
+              )}
+            </div>
+          </td>
+        )}
+        <td className="px-2 py-3">
+          <button className="text-gray-400 hover:text-gray-600">
+            <svg
+              className={`w-4 h-4 transition-transform ${erUtvidet ? 'rotate-90' : ''}`}
+              fill="none"
+              stroke="currentColor"
+              viewBox="0 0 24 24"
+            >
+              <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 5l7 7-7 7" />
+            </svg>
+          </button>
+        </td>
+        <td className="px-3 py-3 text-sm font-medium text-gray-900">
+          {b.bilagsnummer}
+        </td>
+        <td className="px-3 py-3 text-sm text-gray-600">
+          {etiketter.dato}
+        </td>
+        <td className="px-3 py-3">
+          <span className={`inline-flex px-2 py-0.5 text-xs font-medium rounded ${bilagstypeFarger[b.bilagstype]}`}>
+            {bilagstypeEtiketter[b.bilagstype]}
+          </span>
+        </td>
+        {visKontoKolonne && (
+          <td className="px-3 py-3 text-sm text-gray-600">
+            {forsteLinje && (
+              <span>
+                <span className="font-mono text-gray-900">{forsteLinje.kontoId}</span>
+                {' '}
+                <span className="text-gray-500">{forsteLinje.kontonavn}</span>
+              </span>
+            )}
+            {b.linjer.length > 1 && (
+              <span className="ml-1 text-xs text-gray-400">
+                (+{b.linjer.length - 1})
+              </span>
+            )}
+          </td>
+        )}
+        <td className="px-3 py-3 text-sm text-gray-600 max-w-xs truncate">
+          {forsteLinje?.beskrivelse || b.referanse || '—'}
+        </td>
+        <td className="px-3 py-3 text-sm text-right font-mono text-gray-900">
+          {etiketter.debet}
+        </td>
+        <td className="px-3 py-3 text-sm text-right font-mono text-gray-900">
+          {etiketter.kredit}
+        </td>
+        <td className="px-3 py-3 text-center">
+          {b.erApen ? (
+            <span className="inline-flex items-center gap-1 px-2 py-0.5 text-xs font-medium rounded-full bg-yellow-100 text-yellow-700">
+              <span className="w-1.5 h-1.5 rounded-full bg-yellow-500" />
+              Åpen
+            </span>
+          ) : (
+            <span className="inline-flex items-center gap-1 px-2 py-0.5 text-xs font-medium rounded-full bg-gray-100 text-gray-600">
+              Lukket
+            </span>
+          )}
+        </td>
+        <td className="px-3 py-3 text-center">
+          {b.dokumentUrl ? (
+            <a
+              href={b.dokumentUrl}
+              target="_blank"
+              rel="noopener noreferrer"
+              onClick={(e) => e.stopPropagation()}
+              className="inline-flex items-center text-purple-600 hover:text-purple-800"
+              title="Vis dokument"
+            >
+              <Dokumentminiatyr url={b.dokumentUrl} />
+            </a>
+          ) : (
+            <span className="text-gray-300">—</span>
+          )}
+        </td>
+      </tr>
+
+      {/* Utvidet detalj-visning */}
+      {erUtvidet && (
+        <tr>
+          <td colSpan={antallKolonner} className="px-0 py-0">
+            <div className="bg-gray-50 border-l-4 border-purple-400 mx-4 my-2 rounded-r shadow-sm">
+              <div className="px-4 py-3">
+                {/* Bilagsmetadata */}
+                <div className="flex flex-wrap gap-x-6 gap-y-2 text-sm text-gray-600 mb-4 pb-3 border-b border-gray-200">
+                  <div>
+                    <span className="text-gray-500">Opprettet:</span>{' '}
+                    <span className="text-gray-900">{formatering.date(b.opprettetDato)}</span>
+                  </div>
+                  <div>
+                    <span className="text-gray-500">Av:</span>{' '}
+                    <span className="text-gray-900">{b.opprettetAv}</span>
+                  </div>
+                  {b.referanse && (
+                    <div>
+                      <span className="text-gray-500">Referanse:</span>{' '}
+                      <span className="text-gray-900">{b.referanse}</span>
+                    </div>
+                  )}
+                  {(b.kundeId || b.leverandorId) && (
+                    <div>
+                      <span className="text-gray-500">{b.kundeId ? 'Kunde:' : 'Leverandør:'}</span>{' '}
+                      <span className="text-gray-900">{b.kundeId || b.leverandorId}</span>
+                    </div>
+                  )}
+                  {b.prosjektId && (
+                    <div>
+                      <span className="text-gray-500">Prosjekt:</span>{' '}
+                      <span className="text-gray-900">{b.prosjektId}</span>
+                    </div>
+                  )}
+                  {b.valuta && b.valuta !== 'NOK' && (
+                    <div>
+                      <span className="text-gray-500">Valuta:</span>{' '}
+                      <span className="text-gray-900">{b.valuta}</span>
+                    </div>
+                  )}
+                  {b.erKrysset && (
+                    <div className="flex items-center gap-1 text-green-600">
+                      <svg className="w-4 h-4" fill="currentColor" viewBox="0 0 20 20">
+                        <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
+                      </svg>
+                      Krysset
+                    </div>
+                  )}
+                </div>
+
+                {/* Posteringslinjer */}
+                <table className="min-w-full divide-y divide-gray-200 border border-gray-200 rounded-lg overflow-hidden">
+                  <thead className="bg-gray-100">
+                    <tr>
+                      <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase w-16">
+                        Linje
+                      </th>
+                      <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase">
+                        Konto
+                      </th>
+                      <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase">
+                        Beskrivelse
+                      </th>
+                      <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase w-20">
+                        MVA
+                      </th>
+                      <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-24">
+                        MVA-beløp
+                      </th>
+                      <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-28">
+                        Debet
+                      </th>
+                      <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-28">
+                        Kredit
+                      </th>
+                    </tr>
+                  </thead>
+                  <tbody className="bg-white divide-y divide-gray-200">
+                    {b.linjer.map((linje) => (
+                      <tr key={linje.linjeId} className="hover:bg-gray-50">
+                        <td className="px-3 py-2 text-sm text-gray-500 font-mono">
+                          {linje.linjeId}
+                        </td>
+                        <td className="px-3 py-2 text-sm">
+                          <span className="font-mono text-gray-900">{linje.kontoId}</span>
+                          {' '}
+                          <span className="text-gray-500">{linje.kontonavn}</span>
+                        </td>
+                        <td className="px-3 py-2 text-sm text-gray-600">
+                          {linje.beskrivelse || '—'}
+                        </td>
+                        <td className="px-3 py-2 text-sm text-gray-600 font-mono">
+                          {linje.mvaKode !== '0' ? linje.mvaKode : '—'}
+                        </td>
+                        <td className="px-3 py-2 text-sm text-right font-mono text-gray-600">
+                          {linje.mvaBelop > 0 ? formaterBelop(linje.mvaBelop) : '—'}
+                        </td>
+                        <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
+                          {formaterBelop(linje.debet)}
+                        </td>
+                        <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
+                          {formaterBelop(linje.kredit)}
+                        </td>
+                      </tr>
+                    ))}
+                    {/* Sum-rad */}
+                    <tr className="bg-gray-50 font-medium">
+                      <td colSpan={5} className="px-3 py-2 text-sm text-right text-gray-700">
+                        Sum:
+                      </td>
+                      <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
+                        {formaterBelop(totalDebet)}
+                      </td>
+                      <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
+                        {formaterBelop(totalKredit)}
+                      </td>
+                    </tr>
+                  </tbody>
+                </table>
+              </div>
+            </div>
+          </td>
+        </tr>
+      )}
+    </tbody>
+  );
+}
+
 export function Bilagstabell({
   bilag,
+  lager,
   onKryssingEndring,
   visKontoKolonne = true,
   visKryssingCheckbox = false,
+  virtualisert,
 }: BilagstabellProps) {
   const [utvidedeBilag, setUtvidedeBilag] = useState<Set<string>>(new Set());
+  const erVirtualisert = virtualisert ?? bilag.length > VIRTUALISERINGSGRENSE;
+
+  const bilagsnumre = useMemo(() => bilag.map((b) => b.bilagsnummer), [bilag]);
+  const { beholderRef, vedScroll, maalRef, omrade } = useVirtuelleRader({
+    nokler: bilagsnumre,
+    aktiv: erVirtualisert,
+    estimertRadhoyde: ESTIMERT_RADHOYDE,
+  });
+
+  // Formater alle synlige rader i ett kall; verdiene caches i formatteren
+  const radetiketter = useMemo(() => {
+    const side = bilag.slice(omrade.start, omrade.end);
+    const debet = side.map(totalDebetFor);
+    const kredit = side.map(totalKreditFor);
+    const datoer = formatering.dates(side.map((b) => b.dato));
+    const debetEtiketter = formatering.amounts(debet);
+    const kreditEtiketter = formatering.amounts(kredit);
+    return side.map((_, i): Radetiketter => ({
+      dato: datoer[i],
+      debet: debet[i] === 0 ? '' : debetEtiketter[i],
+      kredit: kredit[i] === 0 ? '' : kreditEtiketter[i],
+    }));
+  }, [bilag, omrade.start, omrade.end]);
 
   const toggleUtvid = (bilagsnummer: string) => {
     setUtvidedeBilag((prev) => {
@@ -48,23 +369,7 @@ export function Bilagstabell({
     });
   };
 
-  const formaterDato = (datoStreng: string) => {
-    const dato = new Date(datoStreng);
-    return dato.toLocaleDateString('nb-NO', {
-      day: '2-digit',
-      month: '2-digit',
-      year: 'numeric',
-    });
-  };
-
-  const formaterBelop = (belop: number | null) => {
-    if (belop === null || belop === 0) return '';
-    return new Intl.NumberFormat('nb-NO', {
-      style: 'decimal',
-      minimumFractionDigits: 2,
-      maximumFractionDigits: 2,
-    }).format(belop);
-  };
+  const antallKolonner = 9 + (visKryssingCheckbox ? 1 : 0) + (visKontoKolonne ? 1 : 0);
 
   if (bilag.length === 0) {
     return (
@@ -75,9 +380,14 @@ export function Bilagstabell({
   }
 
   return (
-    <div className="overflow-x-auto">
+    <div
+      ref={beholderRef}
+      onScroll={erVirtualisert ? vedScroll : undefined}
+      tabIndex={erVirtualisert ? 0 : undefined}
+      className={erVirtualisert ? 'overflow-auto max-h-[600px] focus:outline-none focus:ring-2 focus:ring-purple-300 rounded' : 'overflow-x-auto'}
+    >
       <table className="min-w-full divide-y divide-gray-200">
-        <thead className="bg-gray-50">
+        <thead className={`bg-gray-50 ${erVirtualisert ? 'sticky top-0 z-10 shadow-sm' : ''}`}>
           <tr>
             {visKryssingCheckbox && (
               <th scope="col" className="w-10 px-3 py-3">
@@ -118,250 +428,35 @@ export function Bilagstabell({
             </th>
           </tr>
         </thead>
-        <tbody className="bg-white divide-y divide-gray-200">
-          {bilag.map((b) => {
-            const erUtvidet = utvidedeBilag.has(b.bilagsnummer);
-            const totalDebet = b.linjer.reduce((sum, linje) => sum + (linje.debet || 0), 0);
-            const totalKredit = b.linjer.reduce((sum, linje) => sum + (linje.kredit || 0), 0);
-            const forsteLinje = b.linjer[0];
-
-            return (
-              <>
-                {/* Hoved-bilagsrad */}
-                <tr
-                  key={b.bilagsnummer}
-                  className={`hover:bg-gray-50 cursor-pointer transition-colors ${
-                    erUtvidet ? 'bg-purple-50' : ''
-                  } ${b.erKrysset ? 'bg-green-50/50' : ''}`}
-                  onClick={() => toggleUtvid(b.bilagsnummer)}
-                >
-                  {visKryssingCheckbox && (
-                    <td className="px-3 py-3" onClick={(e) => e.stopPropagation()}>
-                      <div className="flex items-center">
-                        <input
-                          type="checkbox"
-                          checked={b.erKrysset}
-                          onChange={(e) => {
-                            onKryssingEndring?.(b.bilagsnummer, e.target.checked);
-                          }}
-                          className="h-4 w-4 rounded border-gray-300 text-purple-600 focus:ring-purple-500"
-                        />
-                        {b.erKrysset && (
-                          <svg className="w-4 h-4 ml-1 text-green-500" fill="currentColor" viewBox="0 0 20 20">
-                            <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
-                          </svg>
-                        )}
-                      </div>
-                    </td>
-                  )}
-                  <td className="px-2 py-3">
-                    <button className="text-gray-400 hover:text-gray-600">
-                      <svg
-                        className={`w-4 h-4 transition-transform ${erUtvidet ? 'rotate-90' : ''}`}
-                        fill="none"
-                        stroke="currentColor"
-                        viewBox="0 0 24 24"
-                      >
-                        <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 5l7 7-7 7" />
-                      </svg>
-                    </button>
-                  </td>
-                  <td className="px-3 py-3 text-sm font-medium text-gray-900">
-                    {b.bilagsnummer}
-                  </td>
-                  <td className="px-3 py-3 text-sm text-gray-600">
-                    {formaterDato(b.dato)}
-                  </td>
-                  <td className="px-3 py-3">
-                    <span className={`inline-flex px-2 py-0.5 text-xs font-medium rounded ${bilagstypeFarger[b.bilagstype]}`}>
-                      {bilagstypeEtiketter[b.bilagstype]}
-                    </span>
-                  </td>
-                  {visKontoKolonne && (
-                    <td className="px-3 py-3 text-sm text-gray-600">
-                      {forsteLinje && (
-                        <span>
-                          <span className="font-mono text-gray-900">{forsteLinje.kontoId}</span>
-                          {' '}
-                          <span className="text-gray-500">{forsteLinje.kontonavn}</span>
-                        </span>
-                      )}
-                      {b.linjer.length > 1 && (
-                        <span className="ml-1 text-xs text-gray-400">
-                          (+{b.linjer.length - 1})
-                        </span>
-                      )}
-                    </td>
-                  )}
-                  <td className="px-3 py-3 text-sm text-gray-600 max-w-xs truncate">
-                    {forsteLinje?.beskrivelse || b.referanse || '—'}
-                  </td>
-                  <td className="px-3 py-3 text-sm text-right font-mono text-gray-900">
-                    {formaterBelop(totalDebet)}
-                  </td>
-                  <td className="px-3 py-3 text-sm text-right font-mono text-gray-900">
-                    {formaterBelop(totalKredit)}
-                  </td>
-                  <td className="px-3 py-3 text-center">
-                    {b.erApen ? (
-                      <span className="inline-flex items-center gap-1 px-2 py-0.5 text-xs font-medium rounded-full bg-yellow-100 text-yellow-700">
-                        <span className="w-1.5 h-1.5 rounded-full bg-yellow-500" />
-                        Åpen
-                      </span>
-                    ) : (
-                      <span className="inline-flex items-center gap-1 px-2 py-0.5 text-xs font-medium rounded-full bg-gray-100 text-gray-600">
-                        Lukket
-                      </span>
-                    )}
-                  </td>
-                  <td className="px-3 py-3 text-center">
-                    {b.dokumentUrl ? (
-                      <a
-                        href={b.dokumentUrl}
-                        target="_blank"
-                        rel="noopener noreferrer"
-                        onClick={(e) => e.stopPropagation()}
-                        className="inline-flex items-center text-purple-600 hover:text-purple-800"
-                        title="Vis dokument"
-                      >
-                        <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                          <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
-                        </svg>
-                      </a>
-                    ) : (
-                      <span className="text-gray-300">—</span>
-                    )}
-                  </td>
-                </tr>
-
-                {/* Utvidet detalj-visning */}
-                {erUtvidet && (
-                  <tr key={`${b.bilagsnummer}-detaljer`}>
-                    <td colSpan={visKryssingCheckbox ? (visKontoKolonne ? 12 : 11) : (visKontoKolonne ? 11 : 10)} className="px-0 py-0">
-                      <div className="bg-gray-50 border-l-4 border-purple-400 mx-4 my-2 rounded-r shadow-sm">
-                        <div className="px-4 py-3">
-                          {/* Bilagsmetadata */}
-                          <div className="flex flex-wrap gap-x-6 gap-y-2 text-sm text-gray-600 mb-4 pb-3 border-b border-gray-200">
-                            <div>
-                              <span className="text-gray-500">Opprettet:</span>{' '}
-                              <span className="text-gray-900">{formaterDato(b.opprettetDato)}</span>
-                            </div>
-                            <div>
-                              <span className="text-gray-500">Av:</span>{' '}
-                              <span className="text-gray-900">{b.opprettetAv}</span>
-                            </div>
-                            {b.referanse && (
-                              <div>
-                                <span className="text-gray-500">Referanse:</span>{' '}
-                                <span className="text-gray-900">{b.referanse}</span>
-                              </div>
-                            )}
-                            {(b.kundeId || b.leverandorId) && (
-                              <div>
-                                <span className="text-gray-500">{b.kundeId ? 'Kunde:' : 'Leverandør:'}</span>{' '}
-                                <span className="text-gray-900">{b.kundeId || b.leverandorId}</span>
-                              </div>
-                            )}
-                            {b.prosjektId && (
-                              <div>
-                                <span className="text-gray-500">Prosjekt:</span>{' '}
-                                <span className="text-gray-900">{b.prosjektId}</span>
-                              </div>
-                            )}
-                            {b.valuta && b.valuta !== 'NOK' && (
-                              <div>
-                                <span className="text-gray-500">Valuta:</span>{' '}
-                                <span className="text-gray-900">{b.valuta}</span>
-                              </div>
-                            )}
-                            {b.erKrysset && (
-                              <div className="flex items-center gap-1 text-green-600">
-                                <svg className="w-4 h-4" fill="currentColor" viewBox="0 0 20 20">
-                                  <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
-                                </svg>
-                                Krysset
-                              </div>
-                            )}
-                          </div>
-
-                          {/* Posteringslinjer */}
-                          <table className="min-w-full divide-y divide-gray-200 border border-gray-200 rounded-lg overflow-hidden">
-                            <thead className="bg-gray-100">
-                              <tr>
-                                <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase w-16">
-                                  Linje
-                                </th>
-                                <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase">
-                                  Konto
-                                </th>
-                                <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase">
-                                  Beskrivelse
-                                </th>
-                                <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase w-20">
-                                  MVA
-                                </th>
-                                <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-24">
-                                  MVA-beløp
-                                </th>
-                                <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-28">
-                                  Debet
-                                </th>
-                                <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-28">
-                                  Kredit
-                                </th>
-                              </tr>
-                            </thead>
-                            <tbody className="bg-white divide-y divide-gray-200">
-                              {b.linjer.map((linje) => (
-                                <tr key={linje.linjeId} className="hover:bg-gray-50">
-                                  <td className="px-3 py-2 text-sm text-gray-500 font-mono">
-                                    {linje.linjeId}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm">
-                                    <span className="font-mono text-gray-900">{linje.kontoId}</span>
-                                    {' '}
-                                    <span className="text-gray-500">{linje.kontonavn}</span>
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-gray-600">
-                                    {linje.beskrivelse || '—'}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-gray-600 font-mono">
-                                    {linje.mvaKode !== '0' ? linje.mvaKode : '—'}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-right font-mono text-gray-600">
-                                    {linje.mvaBelop > 0 ? formaterBelop(linje.mvaBelop) : '—'}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
-                                    {formaterBelop(linje.debet)}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
-                                    {formaterBelop(linje.kredit)}
-                                  </td>
-                                </tr>
-                              ))}
-                              {/* Sum-rad */}
-                              <tr className="bg-gray-50 font-medium">
-                                <td colSpan={5} className="px-3 py-2 text-sm text-right text-gray-700">
-                                  Sum:
-                                </td>
-                                <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
-                                  {formaterBelop(totalDebet)}
-                                </td>
-                                <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
-                                  {formaterBelop(totalKredit)}
-                                </td>
-                              </tr>
-                            </tbody>
-                          </table>
-                        </div>
-                      </div>
-                    </td>
-                  </tr>
-                )}
-              </>
-            );
-          })}
-        </tbody>
+        {omrade.paddingTop > 0 && (
+          <tbody aria-hidden="true">
+            <tr style={{ height: omrade.paddingTop }}>
+              <td colSpan={antallKolonner} className="p-0" />
+            </tr>
+          </tbody>
+        )}
+        {bilag.slice(omrade.start, omrade.end).map((b, i) => (
+          <Bilagsradgruppe
+            key={b.bilagsnummer}
+            b={b}
+            lager={lager}
+            etiketter={radetiketter[i]}
+            erUtvidet={utvidedeBilag.has(b.bilagsnummer)}
+            onToggle={toggleUtvid}
+            onKryssingEndring={onKryssingEndring}
+            visKontoKolonne={visKontoKolonne}
+            visKryssingCheckbox={visKryssingCheckbox}
+            antallKolonner={antallKolonner}
+            maalRef={maalRef}
+          />
+        ))}
+        {omrade.paddingBottom > 0 && (
+          <tbody aria-hidden="true">
+            <tr style={{ height: omrade.paddingBottom }}>
+              <td colSpan={antallKolonner} className="p-0" />
+            </tr>
+          </tbody>
+        )}
       </table>
     </div>
   );
@@ -0,0 +1,66 @@
+import { useEffect, useRef, useState } from 'react';
+import { observeVisibility, ThumbnailClient, ThumbnailSource } from '@shared/thumbnails';
+
+// Én klient for alle tabeller, så miniatyrene overlever rulling
+let klient: ThumbnailClient | null = null;
+const miniatyrKlient = () =>
+  (klient ??= new ThumbnailClient(
+    () => new Worker(new URL('../workers/miniatyrWorker.ts', import.meta.url), { type: 'module' }),
+    () => new ThumbnailSource('/backend/api')
+  ));
+
+/**
+ * Miniatyr av dokumentet på `url`, lastet når raden er nær synlig område.
+ * Viser dokumentikonet til miniatyren er kommet, og når dokumentet ikke har
+ * noen. Rulles raden bort før miniatyren er lastet, avbrytes forespørselen.
+ */
+export function Dokumentminiatyr({ url }: { url: string }) {
+  const beholderRef = useRef<HTMLSpanElement>(null);
+  const lerretRef = useRef<HTMLCanvasElement>(null);
+  const [vises, setVises] = useState(false);
+
+  useEffect(() => {
+    setVises(false);
+    let stoppForesporsel: (() => void) | null = null;
+    // Uten IntersectionObserver, og for miniatyrer som alt er i minnet,
+    // kalles tilbakekallene før observeVisibility() har returnert
+    let stoppObservering: (() => void) | null = null;
+    let kommet = false;
+    stoppObservering = observeVisibility(beholderRef.current!, synlig => {
+      if (!synlig) {
+        stoppForesporsel?.();
+        stoppForesporsel = null;
+        return;
+      }
+      stoppForesporsel ??= miniatyrKlient().request(url, bilde => {
+        kommet = true;
+        stoppObservering?.();
+        const lerret = lerretRef.current;
+        if (!bilde || !lerret) return;
+        lerret.width = bilde.width;
+        lerret.height = bilde.height;
+        lerret.getContext('2d')?.drawImage(bilde, 0, 0);
+        setVises(true);
+      });
+    });
+    if (kommet) stoppObservering();
+    return () => {
+      stoppObservering?.();
+      stoppForesporsel?.();
+    };
+  }, [url]);
+
+  return (
+    <span ref={beholderRef} className="inline-flex items-center justify-center h-5">
+      <canvas
+        ref={lerretRef}
+        className={vises ? 'h-9 w-auto -my-2 rounded-sm border border-gray-200 bg-white shadow-sm' : 'hidden'}
+      />
+      {!vises && (
+        <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+          <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
+        </svg>
+      )}
+    </span>
+  );
+}
@@ -1,7 +1,16 @@
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useCallback, useDeferredValue, useEffect, useSyncExternalStore } from 'react';
 import { kontoplan } from '../data/kontoplan';
 import { Bilagstabell } from './Bilagstabell';
 import { Kategori, Bilag, Bilagstype, Periode } from '../types/ledger';
+import { monthKey, type PeriodTotals } from '@shared/periodAggregates';
+import { overviewOfView, type AccountPages, type LedgerOverview } from '@shared/ledgerSummary';
+import { kontoregister } from '../ledger/kontoer';
+import { useHovedbokMotor } from '../hooks/useHovedbokMotor';
+import { erStortAr, useHovedboksammendrag, useKontobilag } from '../hooks/useHovedboksammendrag';
+import type { EntryStore } from '@shared/entryStore';
+import { formattersFor } from '@shared/formatting';
+
+const formatering = formattersFor('nb-NO');
 
 // Fargekart for kategorier
 const kategorifarger: Record<string, { bg: string; tekst: string; border: string; accent: string }> = {
@@ -102,30 +111,6 @@ const lagDemoBilag = (): Bilag[] => {
   ];
 };
 
-// Hent alle kontoer som har bilag
-const hentKontoerMedBilag = (bilag: Bilag[]): Set<string> => {
-  const kontoer = new Set<string>();
-  bilag.forEach(b => {
-    b.linjer.forEach(linje => {
-      kontoer.add(linje.kontoId);
-    });
-  });
-  return kontoer;
-};
-
-// Hent alle unike kontoer fra kontoplanen (for filter dropdown)
-const hentAlleKontoer = (): { kontoId: string; navn: string }[] => {
-  const kontoer: { kontoId: string; navn: string }[] = [];
-  kontoplan.forEach(kategori => {
-    kategori.underkategorier.forEach(under => {
-      under.kontoer.forEach(konto => {
-        kontoer.push({ kontoId: konto.kontoId, navn: konto.navn });
-      });
-    });
-  });
-  return kontoer.sort((a, b) => a.kontoId.localeCompare(b.kontoId));
-};
-
 interface FilterlinjeProps {
   periode: Periode;
   onPeriodeEndring: (periode: Periode) => void;
@@ -133,6 +118,8 @@ interface FilterlinjeProps {
   onBilagstypeEndring: (type: Bilagstype | '') => void;
   kontoId: string;
   onKontoEndring: (kontoId: string) => void;
+  sokeord: string;
+  onSokeordEndring: (sokeord: string) => void;
   kryssmodus: 'alle' | 'apne';
   onKryssmodusEndring: (modus: 'alle' | 'apne') => void;
   visKryssing: boolean;
@@ -147,6 +134,8 @@ function Filterlinje({
   onBilagstypeEndring,
   kontoId,
   onKontoEndring,
+  sokeord,
+  onSokeordEndring,
   kryssmodus,
   onKryssmodusEndring,
   visKryssing,
@@ -172,8 +161,7 @@ function Filterlinje({
   ];
 
   // Vis kun kontoer som har bilag i dropdown
-  const alleKontoer = hentAlleKontoer();
-  const tilgjengeligeKontoer = alleKontoer.filter(k => kontoerMedBilag.has(k.kontoId));
+  const tilgjengeligeKontoer = kontoregister.accounts.filter(k => kontoerMedBilag.has(k.kontoId));
 
   return (
     <div className="bg-white rounded-lg shadow-sm border border-gray-200 p-4 mb-6">
@@ -232,6 +220,18 @@ function Filterlinje({
           </select>
         </div>
 
+        {/* Søk */}
+        <div className="flex items-center gap-2">
+          <input
+            type="search"
+            value={sokeord}
+            onChange={(e) => onSokeordEndring(e.target.value)}
+            placeholder="Søk i bilag..."
+            aria-label="Søk i bilag"
+            className="rounded-md border-gray-300 text-sm focus:border-purple-500 focus:ring-purple-500 w-56"
+          />
+        </div>
+
         {/* Separator */}
         <div className="h-8 w-px bg-gray-200 mx-2" />
 
@@ -284,40 +284,25 @@ function Filterlinje({
 interface KontoRadProps {
   kontoId: string;
   kontonavn: string;
-  bilag: Bilag[];
+  // Null når bilagene hentes side for side fra `sider`
+  bilag: Bilag[] | null;
+  sider: AccountPages<Bilag> | null;
+  summer: PeriodTotals;
   visKryssing: boolean;
   onKryssingEndring: (bilagsnummer: string, erKrysset: boolean) => void;
   kategorifarge: string;
+  lager: EntryStore<Bilag>;
 }
 
-function KontoRad({ kontoId, kontonavn, bilag, visKryssing, onKryssingEndring, kategorifarge }: KontoRadProps) {
+function KontoRad({ kontoId, kontonavn, bilag, sider, summer, visKryssing, onKryssingEndring, kategorifarge, lager }: KontoRadProps) {
   const [erUtvidet, setErUtvidet] = useState(false);
   const farger = kategorifarger[kategorifarge] || kategorifarger.slate;
 
-  // Beregn sum debet og kredit for denne kontoen
-  const summer = useMemo(() => {
-    let debet = 0;
-    let kredit = 0;
-    bilag.forEach(b => {
-      b.linjer.forEach(linje => {
-        if (linje.kontoId === kontoId) {
-          debet += linje.debet || 0;
-          kredit += linje.kredit || 0;
-        }
-      });
-    });
-    return { debet, kredit, saldo: debet - kredit };
-  }, [bilag, kontoId]);
-
-  const formaterBelop = (belop: number) => {
-    return new Intl.NumberFormat('nb-NO', {
-      style: 'decimal',
-      minimumFractionDigits: 2,
-      maximumFractionDigits: 2,
-    }).format(belop);
-  };
+  // I sammendragsmodus hentes bilagene først når kontoen åpnes
+  const hentet = useKontobilag(sider, kontoId, erUtvidet);
+  const visteBilag = hentet ? hentet.entries : bilag ?? [];
 
-  if (bilag.length === 0) return null;
+  if (summer.count === 0) return null;
 
   return (
     <div>
@@ -344,73 +329,98 @@ function KontoRad({ kontoId, kontonavn, bilag, visKryssing, onKryssingEndring, k
         <div className="flex items-center gap-6 text-sm">
           <div className="text-right">
             <span className="text-gray-500 mr-2">Debet:</span>
-            <span className="font-mono text-gray-900">{formaterBelop(summer.debet)}</span>
+            <span className="font-mono text-gray-900">{formatering.amount(summer.debit)}</span>
           </div>
           <div className="text-right">
             <span className="text-gray-500 mr-2">Kredit:</span>
-            <span className="font-mono text-gray-900">{formaterBelop(summer.kredit)}</span>
+            <span className="font-mono text-gray-900">{formatering.amount(summer.credit)}</span>
           </div>
           <div className="text-right min-w-[100px]">
             <span className="text-gray-500 mr-2">Saldo:</span>
-            <span className={`font-mono font-medium ${summer.saldo >= 0 ? 'text-green-600' : 'text-red-600'}`}>
-              {formaterBelop(Math.abs(summer.saldo))}
+            <span className={`font-mono font-medium ${summer.balance >= 0 ? 'text-green-600' : 'text-red-600'}`}>
+              {formatering.amount(Math.abs(summer.balance))}
             </span>
           </div>
           <span className="text-xs text-gray-400 bg-gray-100 px-2 py-1 rounded">
-            {bilag.length} bilag
+            {summer.count} bilag
           </span>
         </div>
       </button>
 
       {erUtvidet && (
         <div className="px-6 py-4 bg-gray-50 border-t border-gray-100">
-          <Bilagstabell
-            bilag={bilag}
-            onKryssingEndring={onKryssingEndring}
-            visKontoKolonne={false}
-            visKryssingCheckbox={visKryssing}
-          />
+          {visteBilag.length > 0 && (
+            <Bilagstabell
+              bilag={visteBilag}
+              lager={lager}
+              onKryssingEndring={onKryssingEndring}
+              visKontoKolonne={false}
+              visKryssingCheckbox={visKryssing}
+            />
+          )}
+          {hentet && (hentet.hasMore || hentet.failed) && (
+            <div className="flex items-center justify-between mt-3 text-sm text-gray-600">
+              <span>
+                Viser {visteBilag.length} av {summer.count} bilag
+              </span>
+              {hentet.isLoading ? (
+                <span className="text-gray-500">Henter bilag...</span>
+              ) : (
+                <button
+                  onClick={() => sider?.loadMore(kontoId)}
+                  className="px-3 py-1.5 text-sm font-medium text-purple-700 hover:bg-purple-50 rounded-md transition-colors"
+                >
+                  {hentet.failed ? 'Kunne ikke hente bilag. Prøv igjen' : 'Vis flere'}
+                </button>
+              )}
+            </div>
+          )}
         </div>
       )}
     </div>
   );
 }
 
+// Antall kryssede bilag, oppdatert uten å rendre resten av hovedboken
+function KryssetAntall({ lager, antall }: { lager: EntryStore<Bilag>; antall: () => number }) {
+  const kryssetAntall = useSyncExternalStore(lager.subscribeCount, antall);
+  return <>{kryssetAntall}</>;
+}
+
 interface KategoriAccordionProps {
   kategori: Kategori;
   erUtvidet: boolean;
   onToggle: () => void;
-  bilag: Bilag[];
+  oversikt: LedgerOverview;
+  // Bilagene til en konto når alle bilag er lastet; ellers hentes de side for side fra `sider`
+  bilagFor: ((kontoId: string) => Bilag[]) | null;
+  sider: AccountPages<Bilag> | null;
   visKryssing: boolean;
   onKryssingEndring: (bilagsnummer: string, erKrysset: boolean) => void;
   valgtKontoId: string;
-  kontoerMedBilag: Set<string>;
+  lager: EntryStore<Bilag>;
 }
 
 function KategoriAccordion({
   kategori,
   erUtvidet,
   onToggle,
-  bilag,
+  oversikt,
+  bilagFor,
+  sider,
   visKryssing,
   onKryssingEndring,
   valgtKontoId,
-  kontoerMedBilag,
+  lager,
 }: KategoriAccordionProps) {
   const farger = kategorifarger[kategori.farge] || kategorifarger.slate;
 
-  // Hent alle kontoIDer i denne kategorien som har bilag
+  // Kontoer i denne kategorien som har bilag i valgt periode og filter
   const kategoriKontoer = useMemo(() => {
-    const kontoer: { kontoId: string; navn: string }[] = [];
-    kategori.underkategorier.forEach(under => {
-      under.kontoer.forEach(konto => {
-        if (kontoerMedBilag.has(konto.kontoId)) {
-          kontoer.push({ kontoId: konto.kontoId, navn: konto.navn });
-        }
-      });
-    });
-    return kontoer;
-  }, [kategori, kontoerMedBilag]);
+    return oversikt.accountIds
+      .filter(id => kontoregister.categoryIdOf(id) === kategori.id)
+      .map(id => ({ kontoId: id, navn: kontoregister.placementOf(id)?.account.navn ?? '' }));
+  }, [kategori, oversikt]);
 
   // Hvis en spesifikk konto er valgt, vis bare den
   const synligeKontoer = useMemo(() => {
@@ -426,19 +436,9 @@ function KategoriAccordion({
   }
 
   // Tell bilag i denne kategorien
-  const kategoriBilagAntall = useMemo(() => {
-    const kontoIder = new Set(synligeKontoer.map(k => k.kontoId));
-    return bilag.filter(b =>
-      b.linjer.some(linje => kontoIder.has(linje.kontoId))
-    ).length;
-  }, [bilag, synligeKontoer]);
-
-  // Hent bilag for en spesifikk konto
-  const hentKontoBilag = (kontoId: string) => {
-    return bilag.filter(b =>
-      b.linjer.some(linje => linje.kontoId === kontoId)
-    );
-  };
+  const kategoriBilagAntall = valgtKontoId
+    ? oversikt.totalsOf(valgtKontoId).count
+    : oversikt.categoryCount(kategori.id);
 
   return (
     <div className={`border ${farger.border} rounded-lg overflow-hidden mb-4`}>
@@ -484,10 +484,13 @@ function KategoriAccordion({
               key={konto.kontoId}
               kontoId={konto.kontoId}
               kontonavn={konto.navn}
-              bilag={hentKontoBilag(konto.kontoId)}
+              bilag={bilagFor ? bilagFor(konto.kontoId) : null}
+              sider={sider}
+              summer={oversikt.totalsOf(konto.kontoId)}
               visKryssing={visKryssing}
               onKryssingEndring={onKryssingEndring}
               kategorifarge={kategori.farge}
+              lager={lager}
             />
           ))}
         </div>
@@ -503,50 +506,65 @@ export function Hovedbok() {
   const [periode, setPeriode] = useState<Periode>({ maned: dagsDato.getMonth() + 1, ar: dagsDato.getFullYear() });
   const [bilagstype, setBilagstype] = useState<Bilagstype | ''>('');
   const [kontoId, setKontoId] = useState('');
+  const [sokeord, setSokeord] = useState('');
+  // Søket kjøres mot indeksen i workeren; feltet oppdateres uten å vente på svaret
+  const utsattSok = useDeferredValue(sokeord);
   const [kryssmodus, setKryssmodus] = useState<'alle' | 'apne'>('alle');
   const [visKryssing, setVisKryssing] = useState(false);
+  // År med for mange bilag til å lastes vises fra sammendrag i backend, og
+  // bilagene til en konto hentes først når kontoen åpnes
+  const [erSammendragsmodus, setErSammendragsmodus] = useState(false);
 
   // Accordion state
   const [utvideteKategorier, setUtvideteKategorier] = useState<Set<string>>(new Set());
 
-  // Data
-  const [bilag, setBilag] = useState<Bilag[]>(lagDemoBilag());
-
-  // Kontoer med bilag
-  const kontoerMedBilag = useMemo(() => hentKontoerMedBilag(bilag), [bilag]);
-
-  // Filtrer bilag
-  const filtrerteBilag = useMemo(() => {
-    let resultat = [...bilag];
-
-    // Filtrer på bilagstype
-    if (bilagstype) {
-      resultat = resultat.filter(b => b.bilagstype === bilagstype);
-    }
-
-    // Filtrer på konto
-    if (kontoId) {
-      resultat = resultat.filter(b =>
-        b.linjer.some(linje => linje.kontoId === kontoId)
-      );
-    }
-
+  // Data: filtrering og summering skjer i hovedbokmotoren (Web Worker)
+  const { lager, oppdaterBilag, visning, venter } = useHovedbokMotor(lagDemoBilag, {
+    // Filtrer på år (for demo)
+    fromMonth: monthKey(periode.ar, 1),
+    toMonth: monthKey(periode.ar, 12),
+    entryType: bilagstype || undefined,
+    accountId: kontoId || undefined,
     // Filtrer på åpne poster når kryssing er aktivert
-    if (visKryssing && kryssmodus === 'apne') {
-      resultat = resultat.filter(b => b.erApen);
-    }
+    openOnly: visKryssing && kryssmodus === 'apne',
+    search: utsattSok.trim() || undefined,
+  });
 
-    // Filtrer på år (for demo)
-    resultat = resultat.filter(b => {
-      const dato = new Date(b.dato);
-      return dato.getFullYear() === periode.ar;
+  // Samme filter som spørring mot backend i sammendragsmodus
+  const sammendrag = useHovedboksammendrag(erSammendragsmodus ? {
+    ar: periode.ar,
+    bilagstype: bilagstype || undefined,
+    kontoId: kontoId || undefined,
+    kunApne: visKryssing && kryssmodus === 'apne',
+    sok: utsattSok.trim() || undefined,
+  } : null);
+
+  // Uten sammendrag i backend (demodata) svarer kallet aldri ja
+  useEffect(() => {
+    let aktiv = true;
+    erStortAr(periode.ar).then(stort => {
+      if (aktiv) setErSammendragsmodus(stort);
     });
-
-    return resultat;
-  }, [bilag, bilagstype, kontoId, visKryssing, kryssmodus, periode]);
-
-  // Oppdater kontoer med bilag basert på filtrerte bilag
-  const filtrertKontoerMedBilag = useMemo(() => hentKontoerMedBilag(filtrerteBilag), [filtrerteBilag]);
+    return () => {
+      aktiv = false;
+    };
+  }, [periode.ar]);
+
+  const fullOversikt = useMemo(() => (visning ? overviewOfView(visning) : null), [visning]);
+  const oversikt = erSammendragsmodus ? sammendrag.oversikt : fullOversikt;
+  const vistLager = erSammendragsmodus ? sammendrag.lager : lager;
+  const vistOppdaterBilag = erSammendragsmodus ? sammendrag.oppdaterBilag : oppdaterBilag;
+  const vistVenter = erSammendragsmodus ? sammendrag.venter : venter;
+
+  // Kontoer med bilag (kontofilter og nedtrekksliste); sammendraget har bare
+  // kontoene i filteret, så da vises hele kontoplanen
+  const kontoerMedBilag = useMemo(
+    () => new Set(erSammendragsmodus
+      ? kontoregister.accounts.map(konto => konto.kontoId)
+      : visning?.result.ledgerAccountIds ?? []),
+    [erSammendragsmodus, visning?.result.ledgerAccountIds]
+  );
+  const antallFiltrerte = oversikt?.entryCount ?? 0;
 
   // Toggle kategori
   const toggleKategori = (kategoriId: string) => {
@@ -561,12 +579,12 @@ export function Hovedbok() {
     });
   };
 
-  // Håndter kryssing
-  const haandterKryssingEndring = (bilagsnummer: string, erKrysset: boolean) => {
-    setBilag(prev =>
-      prev.map(b => (b.bilagsnummer === bilagsnummer ? { ...b, erKrysset } : b))
-    );
-  };
+  // Håndter kryssing: bare raden til bilaget rendres på nytt
+  const haandterKryssingEndring = useCallback((bilagsnummer: string, erKrysset: boolean) => {
+    const gjeldende = vistLager.get(bilagsnummer);
+    if (!gjeldende || gjeldende.erKrysset === erKrysset) return;
+    vistOppdaterBilag(bilagsnummer, { ...gjeldende, erKrysset });
+  }, [vistLager, vistOppdaterBilag]);
 
   // Utvid/lukk alle
   const utvidAlle = () => {
@@ -578,8 +596,7 @@ export function Hovedbok() {
   };
 
   // Tell statistikk
-  const kryssetAntall = bilag.filter(b => b.erKrysset).length;
-  const apneAntall = bilag.filter(b => b.erApen).length;
+  const apneAntall = oversikt?.openCount ?? 0;
 
   return (
     <div className="max-w-7xl mx-auto">
@@ -599,6 +616,8 @@ export function Hovedbok() {
         onBilagstypeEndring={setBilagstype}
         kontoId={kontoId}
         onKontoEndring={setKontoId}
+        sokeord={sokeord}
+        onSokeordEndring={setSokeord}
         kryssmodus={kryssmodus}
         onKryssmodusEndring={setKryssmodus}
         visKryssing={visKryssing}
@@ -609,7 +628,7 @@ export function Hovedbok() {
       {/* Statuslinje */}
       <div className="flex justify-between items-center mb-4">
         <div className="flex items-center gap-4 text-sm text-gray-600">
-          <span>{filtrerteBilag.length} bilag</span>
+          <span>{antallFiltrerte} bilag</span>
           {visKryssing && (
             <>
               <span className="text-gray-300">|</span>
@@ -617,7 +636,10 @@ export function Hovedbok() {
                 <svg className="w-4 h-4 text-green-500" fill="currentColor" viewBox="0 0 20 20">
                   <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
                 </svg>
-                {kryssetAntall} krysset
+                <KryssetAntall
+                  lager={vistLager}
+                  antall={erSammendragsmodus ? sammendrag.kryssetAntall : lager.matchingCount}
+                /> krysset
               </span>
               <span className="flex items-center gap-1">
                 <span className="w-2 h-2 rounded-full bg-yellow-400" />
@@ -643,24 +665,26 @@ export function Hovedbok() {
       </div>
 
       {/* Kategori-accordion */}
-      <div>
-        {kontoplan.map(kategori => (
+      <div aria-busy={vistVenter} className={`transition-opacity ${vistVenter && oversikt ? 'opacity-60' : ''}`}>
+        {oversikt && kontoplan.map(kategori => (
           <KategoriAccordion
             key={kategori.id}
             kategori={kategori}
             erUtvidet={utvideteKategorier.has(kategori.id)}
             onToggle={() => toggleKategori(kategori.id)}
-            bilag={filtrerteBilag}
+            oversikt={oversikt}
+            bilagFor={erSammendragsmodus ? null : visning?.entriesOf ?? null}
+            sider={erSammendragsmodus ? sammendrag.sider : null}
             visKryssing={visKryssing}
             onKryssingEndring={haandterKryssingEndring}
             valgtKontoId={kontoId}
-            kontoerMedBilag={filtrertKontoerMedBilag}
+            lager={vistLager}
           />
         ))}
       </div>
 
       {/* Tom tilstand */}
-      {filtrerteBilag.length === 0 && (
+      {oversikt && antallFiltrerte === 0 && (
         <div className="text-center py-12 bg-white rounded-lg border border-gray-200">
           <svg className="w-12 h-12 mx-auto text-gray-300 mb-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
             <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={1.5} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
@@ -0,0 +1,19 @@
+import { useCallback, useSyncExternalStore } from 'react';
+import type { EntryStore } from '@shared/entryStore';
+
+/**
+ * Gjeldende versjon av `bilag` fra `lager`; rendrer bare på nytt når dette
+ * bilaget endres. Uten lager returneres bilaget som det er.
+ */
+export function useLagretBilag<E>(lager: EntryStore<E> | undefined, id: string, bilag: E): E {
+  const abonner = useCallback(
+    (lytter: () => void) => (lager ? lager.subscribe(id, lytter) : () => {}),
+    [lager, id]
+  );
+  return useSyncExternalStore(abonner, () => lager?.get(id) ?? bilag);
+}
+
+// Løpende antall i lageret (se EntryStore `countIf`)
+export function useAntallTreff<E>(lager: EntryStore<E>): number {
+  return useSyncExternalStore(lager.subscribeCount, lager.matchingCount);
+}
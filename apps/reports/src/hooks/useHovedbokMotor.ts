@@ -0,0 +1,81 @@
+import { useCallback, useEffect, useState, useSyncExternalStore } from 'react';
+import { LedgerEngine, readLedgerResult, type LedgerQuery, type LedgerResultView } from '@shared/ledgerEngine';
+import { LedgerEngineClient } from '@shared/ledgerEngineClient';
+import { EntryStore } from '@shared/entryStore';
+import { bilagAccessors } from '../ledger/accessors';
+import { kategoriForKonto } from '../ledger/kontoer';
+import type { Bilag, Posteringslinje } from '../types/ledger';
+
+// Workeren holder store år i kolonner; motoren i hovedtråden deler
+// bilagsobjektene med lageret og beholder dem som objekter
+const lagKlient = () =>
+  new LedgerEngineClient<Bilag, Posteringslinje>(
+    () => new Worker(new URL('../workers/hovedbokWorker.ts', import.meta.url), { type: 'module' }),
+    () => new LedgerEngine(bilagAccessors, kategoriForKonto)
+  );
+
+interface Svar {
+  visning: LedgerResultView<Bilag>;
+  sporringsnokkel: string;
+}
+
+/**
+ * Bilag filtrert og summert av hovedbok-workeren. `visning` beholder forrige
+ * svar til svaret for gjeldende bilag og filter er kommet; `venter` er sann
+ * i mellomtiden.
+ *
+ * Bilagene ligger i et `EntryStore` (`lager`). `oppdaterBilag` endrer ett
+ * bilag i lageret og i workeren uten ny spørring, så bare komponentene som
+ * abonnerer på bilaget rendres på nytt. Den er ment for endringer som ikke
+ * flytter bilaget inn i eller ut av et filter, som kryssing.
+ */
+export function useHovedbokMotor(startBilag: () => Bilag[], sporring: LedgerQuery) {
+  const [klient] = useState(lagKlient);
+  const [lager] = useState(() => {
+    const bilag = startBilag();
+    const nyttLager = new EntryStore<Bilag>(bilagAccessors.entryId, { countIf: bilagAccessors.isCrossed });
+    nyttLager.load(bilag);
+    klient.load(bilag);
+    return nyttLager;
+  });
+  const [svar, setSvar] = useState<Svar | null>(null);
+  const bilag = useSyncExternalStore(lager.subscribeList, lager.list);
+
+  useEffect(() => () => klient.dispose(), [klient]);
+
+  const lastBilag = useCallback((nye: Bilag[]) => {
+    klient.load(nye);
+    lager.load(nye);
+  }, [klient, lager]);
+
+  const oppdaterBilag = useCallback((bilagsnummer: string, nyttBilag: Bilag) => {
+    const posisjon = lager.positionOf(bilagsnummer);
+    if (posisjon === undefined) return;
+    klient.replace(posisjon, nyttBilag);
+    lager.update(bilagsnummer, nyttBilag);
+  }, [klient, lager]);
+
+  const { fromMonth, toMonth, entryType, accountId, openOnly, search } = sporring;
+  const sporringsnokkel = [fromMonth, toMonth, entryType, accountId, openOnly, search].join('|');
+
+  useEffect(() => {
+    let aktiv = true;
+    klient.query({ fromMonth, toMonth, entryType, accountId, openOnly, search }).then(resultat => {
+      if (aktiv && resultat) {
+        setSvar({ visning: readLedgerResult(resultat, bilag), sporringsnokkel });
+      }
+    });
+    return () => {
+      aktiv = false;
+    };
+  }, [klient, bilag, sporringsnokkel, fromMonth, toMonth, entryType, accountId, openOnly, search]);
+
+  return {
+    lager,
+    bilag,
+    lastBilag,
+    oppdaterBilag,
+    visning: svar?.visning ?? null,
+    venter: !svar || svar.visning.entries !== bilag || svar.sporringsnokkel !== sporringsnokkel,
+  };
+}
@@ -0,0 +1,145 @@
+import { useCallback, useEffect, useRef, useState, useSyncExternalStore } from 'react';
+import { AccountPages, readLedgerSummary, type LedgerOverview } from '@shared/ledgerSummary';
+import { EntryStore } from '@shared/entryStore';
+import { bilagAccessors } from '../ledger/accessors';
+import { kontoplan } from '../data/kontoplan';
+import { hentKontobilag, hentSammendrag, type Hovedboksfilter } from '../services/hovedbokApi';
+import type { Bilag } from '../types/ledger';
+
+// År med flere bilag enn dette lastes ikke inn i nettleseren; hovedboken
+// tegnes fra sammendrag fra backend i stedet
+export const FULL_LASTING_GRENSE = 50_000;
+
+// Bilag per side når en konto utvides
+const KONTOSIDE_ANTALL = 100;
+
+// Spørringer som beholder kontosidene sine, så et filter som slås av og på
+// ikke henter de samme sidene igjen
+const BEHOLDTE_SPORRINGER = 4;
+
+// Kategoriene i kontoplanen som kontoområder for sammendraget
+const SAMMENDRAGSKATEGORIER = kontoplan.map(kategori => ({ id: kategori.id, range: kategori.kontoRange }));
+const KONTOOMRADER = SAMMENDRAGSKATEGORIER.map(kategori => kategori.range);
+
+const hent = (filter: Hovedboksfilter) => hentSammendrag(filter, KONTOOMRADER);
+
+// Om `ar` har for mange bilag til å lastes helt. Usann når backend mangler
+// sammendrag eller ikke svarer (demodata).
+export const erStortAr = (ar: number) =>
+  hent({ ar }).then(
+    sammendrag => sammendrag.entryCount > FULL_LASTING_GRENSE,
+    () => false
+  );
+
+interface Svar {
+  oversikt: LedgerOverview;
+  kryssetAntall: number;
+  sporringsnokkel: string;
+}
+
+/**
+ * Hovedboken fra sammendrag fra backend, for år som er for store til å
+ * lastes. `oversikt` tegner det lukkede treet og beholder forrige svar til
+ * svaret for gjeldende filter er kommet. `sider` henter bilagene til en konto
+ * når den utvides (se useKontobilag); hentede bilag legges også i `lager`, så
+ * kryssing virker som for innlastede bilag. Med `filter` null hentes ingenting.
+ */
+export function useHovedboksammendrag(filter: Hovedboksfilter | null) {
+  const [lager] = useState(
+    () => new EntryStore<Bilag>(bilagAccessors.entryId, { countIf: bilagAccessors.isCrossed })
+  );
+  const [svar, setSvar] = useState<Svar | null>(null);
+  const [beholdteSider] = useState(() => new Map<string, AccountPages<Bilag>>());
+  // Kryssede bilag i lageret som sammendragets kryssetAntall allerede teller
+  const talteKryssede = useRef(0);
+
+  const sporringsnokkel = filter ? JSON.stringify(filter) : '';
+  const sisteFilter = useRef(filter);
+  sisteFilter.current = filter;
+
+  const leggTilBilag = useCallback((bilag: Bilag[]) => {
+    const nye = bilag.filter(b => lager.get(b.bilagsnummer) === undefined);
+    talteKryssede.current += nye.filter(bilagAccessors.isCrossed).length;
+    lager.append(nye);
+  }, [lager]);
+
+  const oppdaterBilag = useCallback((bilagsnummer: string, bilag: Bilag) => lager.update(bilagsnummer, bilag), [lager]);
+
+  useEffect(() => {
+    const gjeldende = sisteFilter.current;
+    if (!gjeldende) return;
+    let aktiv = true;
+    hent(gjeldende).then(
+      sammendrag => {
+        if (!aktiv) return;
+        talteKryssede.current = lager.matchingCount();
+        setSvar({
+          oversikt: readLedgerSummary(sammendrag, SAMMENDRAGSKATEGORIER),
+          kryssetAntall: sammendrag.crossedCount,
+          sporringsnokkel,
+        });
+      },
+      () => {
+        // Behold forrige svar
+      }
+    );
+    return () => {
+      aktiv = false;
+    };
+  }, [sporringsnokkel, lager]);
+
+  // Kontosidene for gjeldende spørring, beholdt for de siste spørringene
+  let sider: AccountPages<Bilag> | null = null;
+  if (filter) {
+    sider = beholdteSider.get(sporringsnokkel) ?? null;
+    if (!sider) {
+      const sporring = filter;
+      sider = new AccountPages<Bilag>(
+        (kontoId, cursor, signal) => hentKontobilag(sporring, kontoId, cursor, KONTOSIDE_ANTALL, signal),
+        leggTilBilag
+      );
+      beholdteSider.set(sporringsnokkel, sider);
+      for (const [nokkel, beholdt] of beholdteSider) {
+        if (beholdteSider.size <= BEHOLDTE_SPORRINGER) break;
+        beholdt.dispose();
+        beholdteSider.delete(nokkel);
+      }
+    }
+  }
+
+  useEffect(() => () => beholdteSider.forEach(beholdt => beholdt.dispose()), [beholdteSider]);
+
+  const sammendragKrysset = svar?.kryssetAntall ?? 0;
+  // Sammendragets antall pluss kryssingene gjort her siden
+  const kryssetAntall = useCallback(
+    () => sammendragKrysset + lager.matchingCount() - talteKryssede.current,
+    [sammendragKrysset, lager]
+  );
+
+  return {
+    oversikt: svar?.oversikt ?? null,
+    venter: filter !== null && svar?.sporringsnokkel !== sporringsnokkel,
+    sider,
+    lager,
+    oppdaterBilag,
+    kryssetAntall,
+  };
+}
+
+/**
+ * Bilagene på `kontoId` hentet så langt fra `sider`; første side hentes når
+ * kontoen utvides. Null uten `sider` (alle bilag er lastet).
+ */
+export function useKontobilag(sider: AccountPages<Bilag> | null, kontoId: string, erUtvidet: boolean) {
+  const abonner = useCallback(
+    (lytter: () => void) => (sider ? sider.subscribe(kontoId, lytter) : () => {}),
+    [sider, kontoId]
+  );
+  const bilag = useSyncExternalStore(abonner, () => sider?.entriesOf(kontoId) ?? null);
+
+  useEffect(() => {
+    if (sider && erUtvidet && sider.entriesOf(kontoId).entries.length === 0) sider.loadMore(kontoId);
+  }, [sider, kontoId, erUtvidet]);
+
+  return bilag;
+}
@@ -0,0 +1,90 @@
+import { useCallback, useEffect, useLayoutEffect, useMemo, useRef, useState } from 'react';
+import { buildOffsets, findVisibleRange, type VisibleRange } from '@shared/virtualWindow';
+
+interface VirtuelleRaderValg {
+  nokler: readonly string[];
+  aktiv: boolean;
+  estimertRadhoyde: number;
+  overscan?: number;
+}
+
+// Brukes før scroll-beholderen er lagt ut
+const STANDARD_VINDUSHOYDE = 600;
+
+/**
+ * Vindusbasert rendering av tabeller med varierende radhøyde. Rendrede rader
+ * måles med ResizeObserver (radene må ha `data-rad-nokkel` og `maalRef`),
+ * resten bruker estimert høyde.
+ */
+export function useVirtuelleRader({ nokler, aktiv, estimertRadhoyde, overscan = 8 }: VirtuelleRaderValg) {
+  const beholderRef = useRef<HTMLDivElement>(null);
+  const hoyder = useRef(new Map<string, number>());
+  const observator = useRef<ResizeObserver | null>(null);
+  const scrollRamme = useRef(0);
+  const [hoydeVersjon, setHoydeVersjon] = useState(0);
+  const [vindu, setVindu] = useState({ scrollTop: 0, hoyde: STANDARD_VINDUSHOYDE });
+
+  const hentObservator = () => {
+    if (!observator.current && typeof ResizeObserver !== 'undefined') {
+      observator.current = new ResizeObserver((maalinger) => {
+        let endret = false;
+        maalinger.forEach((maaling) => {
+          const element = maaling.target as HTMLElement;
+          const nokkel = element.dataset.radNokkel;
+          const hoyde = element.getBoundingClientRect().height;
+          if (nokkel && hoyde > 0 && hoyder.current.get(nokkel) !== hoyde) {
+            hoyder.current.set(nokkel, hoyde);
+            endret = true;
+          }
+        });
+        if (endret) setHoydeVersjon((v) => v + 1);
+      });
+    }
+    return observator.current;
+  };
+
+  useEffect(() => () => {
+    observator.current?.disconnect();
+    observator.current = null;
+    cancelAnimationFrame(scrollRamme.current);
+  }, []);
+
+  const maalRef = useCallback((element: HTMLElement | null) => {
+    if (!element || !aktiv) return;
+    const obs = hentObservator();
+    obs?.observe(element);
+    return () => obs?.unobserve(element);
+  }, [aktiv]);
+
+  const lesVindu = () => {
+    const beholder = beholderRef.current;
+    if (!beholder) return;
+    setVindu((forrige) =>
+      forrige.scrollTop === beholder.scrollTop && forrige.hoyde === beholder.clientHeight
+        ? forrige
+        : { scrollTop: beholder.scrollTop, hoyde: beholder.clientHeight || STANDARD_VINDUSHOYDE }
+    );
+  };
+
+  useLayoutEffect(() => {
+    if (aktiv) lesVindu();
+  }, [aktiv]);
+
+  const vedScroll = () => {
+    cancelAnimationFrame(scrollRamme.current);
+    scrollRamme.current = requestAnimationFrame(lesVindu);
+  };
+
+  const forskyvninger = useMemo(
+    () => buildOffsets(nokler.length, (i) => hoyder.current.get(nokler[i]) ?? estimertRadhoyde),
+    // hoydeVersjon ugyldiggjør tabellen når en rendret rad endrer høyde
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    [nokler, estimertRadhoyde, hoydeVersjon]
+  );
+
+  const omrade: VisibleRange = aktiv
+    ? findVisibleRange(forskyvninger, vindu.scrollTop, vindu.hoyde, overscan)
+    : { start: 0, end: nokler.length, paddingTop: 0, paddingBottom: 0 };
+
+  return { beholderRef, vedScroll, maalRef, omrade };
+}
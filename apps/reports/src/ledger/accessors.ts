@@ -0,0 +1,24 @@
+import type { LedgerAccessors } from '@shared/ledgerAccessors';
+import type { Bilag, Posteringslinje } from '../types/ledger';
+
+export const bilagAccessors: LedgerAccessors<Bilag, Posteringslinje> = {
+  entryId: (b) => b.bilagsnummer,
+  entryType: (b) => b.bilagstype,
+  date: (b) => b.dato,
+  isCrossed: (b) => b.erKrysset,
+  isOpen: (b) => b.erApen,
+  lines: (b) => b.linjer,
+  accountId: (linje) => linje.kontoId,
+  debit: (linje) => linje.debet,
+  credit: (linje) => linje.kredit,
+  vatCode: (linje) => linje.mvaKode,
+  vatAmount: (linje) => linje.mvaBelop,
+  searchText: (b) =>
+    [
+      b.bilagsnummer,
+      b.referanse,
+      b.kundeId,
+      b.leverandorId,
+      ...b.linjer.flatMap(linje => [linje.beskrivelse, linje.kontonavn]),
+    ].join(' '),
+};
@@ -0,0 +1,52 @@
+import { ColumnarLedger, type ColumnarCodec } from '@shared/columnarLedger';
+import { bilagAccessors } from './accessors';
+import type { Bilag, Bilagstype, MVAKode, Posteringslinje } from '../types/ledger';
+
+// Bilagsfelt som ikke ligger i kolonnene
+type Bilagsrest = Pick<
+  Bilag,
+  'kundeId' | 'leverandorId' | 'dokumentUrl' | 'opprettetDato' | 'opprettetAv' | 'prosjektId' | 'valuta' | 'referanse'
+>;
+
+export const bilagKolonner: ColumnarCodec<Bilag, Posteringslinje, Bilagsrest> = {
+  ...bilagAccessors,
+  lineId: (linje) => linje.linjeId,
+  accountName: (linje) => linje.kontonavn,
+  amount: (linje) => linje.belop,
+  vatCode: (linje) => linje.mvaKode,
+  vatAmount: (linje) => linje.mvaBelop,
+  description: (linje) => linje.beskrivelse,
+  restOf: (b) => ({
+    kundeId: b.kundeId,
+    leverandorId: b.leverandorId,
+    dokumentUrl: b.dokumentUrl,
+    opprettetDato: b.opprettetDato,
+    opprettetAv: b.opprettetAv,
+    prosjektId: b.prosjektId,
+    valuta: b.valuta,
+    referanse: b.referanse,
+  }),
+  toLine: (felt) => ({
+    linjeId: felt.lineId,
+    kontoId: felt.accountId,
+    kontonavn: felt.accountName,
+    debet: felt.debit,
+    kredit: felt.credit,
+    belop: felt.amount,
+    mvaKode: felt.vatCode as MVAKode,
+    mvaBelop: felt.vatAmount,
+    beskrivelse: felt.description,
+  }),
+  toEntry: (felt, rest, linjer) => ({
+    ...rest,
+    bilagsnummer: felt.entryId,
+    bilagstype: felt.entryType as Bilagstype,
+    dato: felt.date,
+    erKrysset: felt.isCrossed,
+    erApen: felt.isOpen,
+    linjer,
+  }),
+};
+
+// Bilag lagret kolonnevis, for hovedbøker som er for store til å holde som objekter
+export const lagKolonnelager = (bilag: readonly Bilag[] = []) => ColumnarLedger.from(bilag, bilagKolonner);
@@ -0,0 +1,15 @@
+import { compileChart } from '@shared/compiledChart';
+import { kontoplan } from '../data/kontoplan';
+import type { Kategori, Konto, Underkategori } from '../types/ledger';
+
+// Kontoplanen kompilert én gang: sortert kontoliste, konto → plassering og
+// kontonummer → kategori (også for underkontoer som 1920.01)
+export const kontoregister = compileChart<Kategori, Underkategori, Konto>(kontoplan, {
+  categoryId: (kategori) => kategori.id,
+  accountRange: (kategori) => kategori.kontoRange,
+  subcategories: (kategori) => kategori.underkategorier,
+  accounts: (under) => under.kontoer,
+  accountId: (konto) => konto.kontoId,
+});
+
+export const kategoriForKonto = kontoregister.categoryIdOf;
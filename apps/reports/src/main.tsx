@@ -1,8 +1,12 @@
 import React from 'react'
 import ReactDOM from 'react-dom/client'
 import App from './App'
+import { instrumentation, loadInstrumentationSettings } from '@shared/instrumentation'
 import './index.css'
 
+// Ytelsesmåling er av med mindre den slås på med ?perf=on
+instrumentation.configure({ enabled: loadInstrumentationSettings().enabled })
+
 ReactDOM.createRoot(document.getElementById('root')!).render(
   <React.StrictMode>
     <App />
@@ -0,0 +1,133 @@
+import type { LedgerSummary } from '@shared/ledgerSummary';
+import type { Bilag, Bilagstype, MVAKode } from '../types/ledger';
+
+// Samme backend som hovedappen (se docs/architecture.md, Journal Entries API)
+const API_BASE_URL = '/backend/api';
+
+// Bilag slik backend sender dem (JournalEntry i hovedappen)
+interface BilagDto {
+  entryId: string;
+  entryType: 'sale' | 'purchase' | 'salary' | 'bank' | 'journal' | 'depreciation' | 'adjustment';
+  date: string;
+  lines: {
+    lineId: string;
+    accountId: string;
+    accountName: string;
+    debit: number | null;
+    credit: number | null;
+    amount: number;
+    vatCode: string;
+    vatAmount: number;
+    description: string;
+  }[];
+  customerSupplierId?: string;
+  documentUrl?: string;
+  createdAt: string;
+  createdBy: string;
+  currency?: string;
+  reference?: string;
+  projectId?: string;
+  isCrossed: boolean;
+  isOpen: boolean;
+}
+
+const bilagstyper: Record<BilagDto['entryType'], Bilagstype> = {
+  sale: 'salg',
+  purchase: 'kjop',
+  salary: 'lonn',
+  bank: 'bank',
+  journal: 'journal',
+  depreciation: 'avskrivning',
+  adjustment: 'justering',
+};
+
+const tilBilag = (dto: BilagDto): Bilag => ({
+  bilagsnummer: dto.entryId,
+  bilagstype: bilagstyper[dto.entryType],
+  dato: dto.date,
+  linjer: dto.lines.map(linje => ({
+    linjeId: linje.lineId,
+    kontoId: linje.accountId,
+    kontonavn: linje.accountName,
+    debet: linje.debit,
+    kredit: linje.credit,
+    belop: linje.amount,
+    mvaKode: linje.vatCode as MVAKode,
+    mvaBelop: linje.vatAmount,
+    beskrivelse: linje.description,
+  })),
+  kundeId: dto.entryType === 'sale' ? dto.customerSupplierId : undefined,
+  leverandorId: dto.entryType === 'purchase' ? dto.customerSupplierId : undefined,
+  dokumentUrl: dto.documentUrl,
+  opprettetDato: dto.createdAt,
+  opprettetAv: dto.createdBy,
+  prosjektId: dto.projectId,
+  valuta: dto.currency,
+  referanse: dto.reference,
+  erKrysset: dto.isCrossed,
+  erApen: dto.isOpen,
+});
+
+const bilagstypeKoder = Object.fromEntries(
+  Object.entries(bilagstyper).map(([kode, bilagstype]) => [bilagstype, kode])
+) as Record<Bilagstype, BilagDto['entryType']>;
+
+// Filteret backend bruker; hovedboken filtrerer på hele år
+export interface Hovedboksfilter {
+  ar: number;
+  bilagstype?: Bilagstype;
+  kontoId?: string;
+  kunApne?: boolean;
+  sok?: string;
+}
+
+const parametre = (filter: Hovedboksfilter) => {
+  const params = new URLSearchParams({ from: `${filter.ar}-01-01`, to: `${filter.ar}-12-31` });
+  if (filter.bilagstype) params.set('entryType', bilagstypeKoder[filter.bilagstype]);
+  if (filter.kontoId) params.set('accountId', filter.kontoId);
+  if (filter.kunApne) params.set('openOnly', 'true');
+  if (filter.sok) params.set('search', filter.sok);
+  return params;
+};
+
+const hentJson = async <T>(sti: string, signal?: AbortSignal): Promise<T> => {
+  const svar = await fetch(`${API_BASE_URL}${sti}`, { headers: { Accept: 'application/json' }, signal });
+  if (!svar.ok) throw new Error(`HTTP ${svar.status}`);
+  return svar.json() as Promise<T>;
+};
+
+// Like forespørsler som er underveis deler svar, så valget av modus og
+// første sammendrag for samme år bare gir ett kall
+const underveis = new Map<string, Promise<LedgerSummary>>();
+
+/**
+ * Summer per konto for bilagene som treffer `filter`, og antall treff per
+ * kontoområde i `kontoomrader` (f.eks. '1000-1999'). Nok til å tegne den
+ * lukkede hovedboken uten å hente bilag.
+ */
+export function hentSammendrag(filter: Hovedboksfilter, kontoomrader: string[] = []): Promise<LedgerSummary> {
+  const params = parametre(filter);
+  if (kontoomrader.length > 0) params.set('ranges', kontoomrader.join(','));
+  const sti = `/journal-entries/summary?${params}`;
+  let sammendrag = underveis.get(sti);
+  if (!sammendrag) {
+    sammendrag = hentJson<LedgerSummary>(sti).finally(() => underveis.delete(sti));
+    underveis.set(sti, sammendrag);
+  }
+  return sammendrag;
+}
+
+// Én side med bilag på `kontoId`, etter `cursor`
+export async function hentKontobilag(
+  filter: Hovedboksfilter,
+  kontoId: string,
+  cursor: string | null,
+  antall: number,
+  signal: AbortSignal
+): Promise<{ items: Bilag[]; nextCursor: string | null }> {
+  const params = parametre({ ...filter, kontoId });
+  if (cursor) params.set('cursor', cursor);
+  params.set('limit', String(antall));
+  const side = await hentJson<{ items: BilagDto[]; nextCursor: string | null }>(`/journal-entries?${params}`, signal);
+  return { items: side.items.map(tilBilag), nextCursor: side.nextCursor };
+}
@@ -0,0 +1,10 @@
+import { LedgerEngine, serveLedgerEngine, type LedgerWorkerScope } from '@shared/ledgerEngine';
+import { bilagAccessors } from '../ledger/accessors';
+import { lagKolonnelager } from '../ledger/kolonner';
+import { kategoriForKonto } from '../ledger/kontoer';
+import type { Bilag } from '../types/ledger';
+
+serveLedgerEngine(
+  self as unknown as LedgerWorkerScope<Bilag>,
+  new LedgerEngine(bilagAccessors, kategoriForKonto, lagKolonnelager)
+);
@@ -1,9 +1,21 @@
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
+import { fileURLToPath } from 'node:url'
+
+// Rammeverksuavhengige moduler delt med hovedappen (src/lib)
+const delt = fileURLToPath(new URL('../../src/lib', import.meta.url))
 
 export default defineConfig({
   plugins: [react()],
+  resolve: {
+    alias: {
+      '@shared': delt,
+    },
+  },
   server: {
     port: 4204,
+    fs: {
+      allow: ['.', delt],
+    },
   },
 })
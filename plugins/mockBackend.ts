@@ -0,0 +1,791 @@
+import { createHash } from 'node:crypto';
+import { deflateSync } from 'node:zlib';
+import type { IncomingMessage, ServerResponse } from 'node:http';
+import type { Connect, Plugin } from 'vite';
+import { generateJournalEntries } from '../tests/fixtures/syntheticLedger';
+import { journalEntryAccessors } from '../src/ledger/accessors';
+import { searchTokens } from '../src/lib/searchIndex';
+import type { AccountSummary, LedgerSummary } from '../src/lib/ledgerSummary';
+import type {
+  ApiError,
+  BatchItemResult,
+  BatchOperation,
+  ChangeEvent,
+  Changes,
+  Department,
+  JournalEntry,
+  JournalEntryCrossing,
+  Project,
+  StoredDocument,
+  UploadRequest,
+  UploadStart,
+} from '../src/types';
+
+export interface MockBackendOptions {
+  // Delay before every response, plus a random 0..jitterMs on top
+  latencyMs?: number;
+  jitterMs?: number;
+  // Size of the generated ledger, in journal lines
+  lines?: number;
+  seed?: number;
+  year?: number;
+  // Extra bytes added to every journal entry, to simulate heavier payloads
+  entryPaddingBytes?: number;
+  // Number of seeded projects
+  projects?: number;
+  // Every this many ms a simulated colleague crosses or posts a few journal
+  // entries, pushed to GET /events; 0 turns it off
+  liveEventsMs?: number;
+}
+
+// Reads the options from MOCK_* environment variables
+export const mockBackendOptionsFromEnv = (env: NodeJS.ProcessEnv): MockBackendOptions => {
+  const number = (name: string) => (env[name] ? Number(env[name]) : undefined);
+  return {
+    latencyMs: number('MOCK_LATENCY_MS'),
+    jitterMs: number('MOCK_JITTER_MS'),
+    lines: number('MOCK_LINES'),
+    seed: number('MOCK_SEED'),
+    year: number('MOCK_YEAR'),
+    entryPaddingBytes: number('MOCK_ENTRY_PADDING_BYTES'),
+    projects: number('MOCK_PROJECTS'),
+    liveEventsMs: number('MOCK_LIVE_EVENTS_MS'),
+  };
+};
+
+// Chunk size handed out for document uploads
+const UPLOAD_CHUNK_SIZE = 1024 * 1024;
+
+const DEFAULT_PAGE_SIZE = 500;
+const MAX_PAGE_SIZE = 5000;
+// Entries per NDJSON write in the stream endpoint
+const STREAM_CHUNK = 1000;
+// Change events kept for clients resuming the event stream
+const EVENT_BACKLOG = 1000;
+// Comment line sent on idle event streams so proxies keep them open
+const KEEPALIVE_MS = 15_000;
+
+class HttpError extends Error {
+  readonly status: number;
+  readonly body: ApiError;
+
+  constructor(status: number, body: ApiError) {
+    super(body.message);
+    this.status = status;
+    this.body = body;
+  }
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+const readBody = async (req: IncomingMessage): Promise<Buffer> => {
+  const chunks: Buffer[] = [];
+  for await (const chunk of req) chunks.push(chunk as Buffer);
+  return Buffer.concat(chunks);
+};
+
+const readJson = async <T>(req: IncomingMessage): Promise<T> => {
+  const body = await readBody(req);
+  try {
+    return JSON.parse(body.toString('utf8')) as T;
+  } catch {
+    throw new HttpError(400, { message: 'Invalid JSON body' });
+  }
+};
+
+// Keyset cursor: the date and id of the last entry on the previous page
+const encodeCursor = (entry: JournalEntry) => Buffer.from(`${entry.date}|${entry.entryId}`).toString('base64url');
+const decodeCursor = (cursor: string) => {
+  const [date, entryId] = Buffer.from(cursor, 'base64url').toString('utf8').split('|');
+  if (!date || !entryId) throw new HttpError(400, { message: 'Invalid cursor' });
+  return { date, entryId };
+};
+
+const compareKey = (entry: JournalEntry, key: { date: string; entryId: string }) =>
+  entry.date < key.date ? -1 : entry.date > key.date ? 1 : entry.entryId < key.entryId ? -1 : entry.entryId > key.entryId ? 1 : 0;
+
+const now = () => new Date().toISOString();
+
+// Sync watermark of a changes request
+const requiredSince = (params: URLSearchParams) => {
+  const since = params.get('since');
+  if (!since) throw new HttpError(400, { message: 'Validation failed', errors: { since: ['since is required'] } });
+  return since;
+};
+
+const CRC_TABLE = Array.from({ length: 256 }, (_, n) => {
+  let c = n;
+  for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+  return c >>> 0;
+});
+
+const pngChunk = (type: string, data: Buffer) => {
+  const body = Buffer.concat([Buffer.from(type, 'ascii'), data]);
+  let crc = 0xffffffff;
+  for (const byte of body) crc = CRC_TABLE[(crc ^ byte) & 0xff] ^ (crc >>> 8);
+  const framed = Buffer.alloc(body.length + 8);
+  framed.writeUInt32BE(data.length, 0);
+  body.copy(framed, 4);
+  framed.writeUInt32BE((crc ^ 0xffffffff) >>> 0, body.length + 4);
+  return framed;
+};
+
+// A page with a coloured header and grey text lines as a PNG, standing in for
+// the rendered first page of a document. The colour is derived from the URL,
+// so different documents look different.
+const documentThumbnail = (documentUrl: string, width: number) => {
+  const height = Math.round(width * 1.414);
+  const hue = createHash('sha1').update(documentUrl).digest();
+  const header = [hue[0] >> 1, hue[1] >> 1, 128 + (hue[2] >> 1)];
+  const margin = Math.round(width / 8);
+  const lineHeight = Math.max(2, Math.round(width / 16));
+  const rows = Buffer.alloc((width * 3 + 1) * height);
+  for (let y = 0; y < height; y++) {
+    const rowStart = y * (width * 3 + 1);
+    const inHeader = y >= margin && y < margin + 2 * lineHeight;
+    const textLine = y > margin + 3 * lineHeight && y < height - margin && Math.floor(y / lineHeight) % 2 === 0;
+    // Text lines of varying length
+    const lineEnd = width - margin - ((Math.floor(y / lineHeight) * 7 + hue[3]) % Math.max(1, width / 3));
+    for (let x = 0; x < width; x++) {
+      let pixel = [255, 255, 255];
+      if (x >= margin && x < width - margin && inHeader) pixel = header;
+      else if (x >= margin && x < lineEnd && textLine) pixel = [200, 200, 200];
+      rows.set(pixel, rowStart + 1 + x * 3);
+    }
+  }
+  const ihdr = Buffer.alloc(13);
+  ihdr.writeUInt32BE(width, 0);
+  ihdr.writeUInt32BE(height, 4);
+  ihdr.set([8, 2, 0, 0, 0], 8);
+  return Buffer.concat([
+    Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]),
+    pngChunk('IHDR', ihdr),
+    pngChunk('IDAT', deflateSync(rows)),
+    pngChunk('IEND', Buffer.alloc(0)),
+  ]);
+};
+
+// Search tokens per entry; entries are replaced, not changed, on crossing
+const entryTokens = new WeakMap<JournalEntry, string[]>();
+
+// Every search term starts a token of the entry, as in the ledger's search index
+const matchesSearch = (entry: JournalEntry, search: string[]) => {
+  const tokens = entryTokens.get(entry) ?? searchTokens(journalEntryAccessors.searchText(entry));
+  entryTokens.set(entry, tokens);
+  return search.every(term => tokens.some(token => token.startsWith(term)));
+};
+
+const seedDepartments = (): Department[] =>
+  [
+    ['ADM', 'Administrasjon'],
+    ['SALG', 'Salg'],
+    ['DRIFT', 'Drift'],
+    ['IT', 'IT'],
+    ['OKO', 'Økonomi'],
+    ['HR', 'Personal'],
+    ['MARK', 'Markedsføring'],
+    ['PROD', 'Produksjon'],
+  ].map(([code, name], i) => ({
+    id: i + 1,
+    code,
+    name,
+    description: `Avdeling for ${name.toLowerCase()}`,
+    active: i < 7,
+    createdAt: '2024-01-02T08:00:00Z',
+    updatedAt: '2024-01-02T08:00:00Z',
+  }));
+
+// The first 20 codes match the projectIds of the synthetic journal entries
+const seedProjects = (year: number, count: number): Project[] =>
+  Array.from({ length: count }, (_, i): Project => ({
+    id: i + 1,
+    code: `P-${String(i + 1).padStart(3, '0')}`,
+    name: `Prosjekt ${i + 1}`,
+    description: '',
+    startDate: `${year}-01-01`,
+    endDate: `${year}-12-31`,
+    status: i % 5 === 4 ? 'COMPLETED' : 'ACTIVE',
+    active: i % 5 !== 4,
+    createdAt: `${year}-01-01T08:00:00Z`,
+    updatedAt: `${year}-01-01T08:00:00Z`,
+  }));
+
+const required = (fields: Record<string, unknown>) => {
+  const errors: Record<string, string[]> = {};
+  Object.entries(fields).forEach(([name, value]) => {
+    if (value === undefined || value === null || value === '') errors[name] = [`${name} is required`];
+  });
+  if (Object.keys(errors).length > 0) throw new HttpError(400, { message: 'Validation failed', errors });
+};
+
+interface Entity {
+  id?: number;
+  code: string;
+  createdAt?: string;
+  updatedAt?: string;
+}
+
+// CRUD over an in-memory list with numeric ids and unique codes
+class Collection<T extends Entity> {
+  private readonly items: T[];
+  // Deleted ids, so changes() can report deletions
+  private readonly tombstones: { id: number; deletedAt: string }[] = [];
+  private nextId: number;
+  private readonly validate: (data: Omit<T, 'id' | 'createdAt' | 'updatedAt'>) => void;
+  private readonly onChange: (change: { op: 'upsert'; item: T } | { op: 'delete'; id: number }) => void;
+
+  constructor(
+    items: T[],
+    validate: (data: Omit<T, 'id' | 'createdAt' | 'updatedAt'>) => void,
+    onChange: (change: { op: 'upsert'; item: T } | { op: 'delete'; id: number }) => void = () => {}
+  ) {
+    this.items = items;
+    this.nextId = items.length + 1;
+    this.validate = validate;
+    this.onChange = onChange;
+  }
+
+  list = () => this.items;
+
+  get = (id: number) => {
+    const item = this.items.find(candidate => candidate.id === id);
+    if (!item) throw new HttpError(404, { message: `Not found: ${id}` });
+    return item;
+  };
+
+  create = (data: Omit<T, 'id' | 'createdAt' | 'updatedAt'>) => {
+    this.validate(data);
+    this.checkCode(data.code);
+    const item = { ...data, id: this.nextId++, createdAt: now(), updatedAt: now() } as T;
+    this.items.push(item);
+    this.onChange({ op: 'upsert', item });
+    return item;
+  };
+
+  update = (id: number, data: Omit<T, 'id' | 'createdAt' | 'updatedAt'>) => {
+    const existing = this.get(id);
+    this.validate(data);
+    this.checkCode(data.code, id);
+    const item = { ...existing, ...data, id, updatedAt: now() } as T;
+    this.items[this.items.indexOf(existing)] = item;
+    this.onChange({ op: 'upsert', item });
+    return item;
+  };
+
+  remove = (id: number) => {
+    this.items.splice(this.items.indexOf(this.get(id)), 1);
+    this.tombstones.push({ id, deletedAt: now() });
+    this.onChange({ op: 'delete', id });
+  };
+
+  // Items created or updated, and ids deleted, after `since`
+  changes = (since: string): Changes<T> => ({
+    items: this.items.filter(item => (item.updatedAt ?? item.createdAt ?? '') > since),
+    deleted: this.tombstones.filter(tombstone => tombstone.deletedAt > since),
+  });
+
+  batch = (operations: BatchOperation<T>[]): BatchItemResult<T>[] =>
+    operations.map(operation => {
+      try {
+        switch (operation.op) {
+          case 'create':
+            return { ok: true, item: this.create(operation.data) };
+          case 'update':
+            return { ok: true, item: this.update(operation.id, operation.data) };
+          case 'delete':
+            this.remove(operation.id);
+            return { ok: true };
+        }
+      } catch (error) {
+        if (error instanceof HttpError) return { ok: false, error: error.body };
+        throw error;
+      }
+    });
+
+  private checkCode(code: string, exceptId?: number) {
+    if (this.items.some(item => item.code === code && item.id !== exceptId)) {
+      throw new HttpError(409, { message: 'Code already exists', errors: { code: ['Code already exists'] } });
+    }
+  }
+}
+
+/**
+ * Stand-in for the backend at /backend/api, for working and load-testing
+ * without the Quarkus server. Serves departments, projects and a generated
+ * ledger with the same endpoints, keyset pagination, NDJSON streaming,
+ * batch endpoints and ETag revalidation as the real API, behind a
+ * configurable latency. State lives in memory and resets on restart.
+ */
+export function mockBackend(options: MockBackendOptions = {}): Plugin {
+  const {
+    latencyMs = 0,
+    jitterMs = 0,
+    lines = 100_000,
+    seed = 4102,
+    year = new Date().getFullYear(),
+    entryPaddingBytes = 0,
+    projects: projectCount = 20,
+    liveEventsMs = 0,
+  } = options;
+
+  // Every change, numbered, for GET /events; the latest EVENT_BACKLOG are kept
+  // so a client that reconnects gets what it missed
+  const events: { id: number; data: string }[] = [];
+  let lastEventId = 0;
+  const eventClients = new Set<ServerResponse>();
+  const writeEvent = (res: ServerResponse, event: { id: number; data: string }) =>
+    res.write(`id: ${event.id}\ndata: ${event.data}\n\n`);
+  const publish = (change: ChangeEvent) => {
+    const event = { id: ++lastEventId, data: JSON.stringify(change) };
+    events.push(event);
+    if (events.length > EVENT_BACKLOG) events.shift();
+    eventClients.forEach(client => writeEvent(client, event));
+  };
+
+  const departments = new Collection<Department>(
+    seedDepartments(),
+    data => required({ code: data.code, name: data.name }),
+    change => publish({ entity: 'departments', ...change })
+  );
+  const projects = new Collection<Project>(
+    seedProjects(year, projectCount),
+    data => required({ code: data.code, name: data.name, startDate: data.startDate, endDate: data.endDate }),
+    change => publish({ entity: 'projects', ...change })
+  );
+
+  // Generated on the first ledger request; a million lines take a few seconds
+  let ledger: { entries: JournalEntry[]; positions: Map<string, number> } | null = null;
+  const journal = () => {
+    if (!ledger) {
+      const padding = entryPaddingBytes > 0 ? 'x'.repeat(entryPaddingBytes) : undefined;
+      // createdAt follows the entry dates, so the generation time is the sync watermark
+      const updatedAt = now();
+      const entries = generateJournalEntries({ lines, seed, year }).map(entry =>
+        padding ? { ...entry, updatedAt, padding } : { ...entry, updatedAt }
+      );
+      ledger = { entries, positions: new Map(entries.map((entry, i) => [entry.entryId, i])) };
+    }
+    return ledger;
+  };
+
+  // The filters other than the period and cursor
+  const entryFilter = (params: URLSearchParams) => {
+    const projectId = params.get('projectId');
+    const entryType = params.get('entryType');
+    const accountId = params.get('accountId');
+    const openOnly = params.get('openOnly') === 'true';
+    const search = searchTokens(params.get('search') ?? '');
+    return (entry: JournalEntry) =>
+      (!projectId || entry.projectId === projectId) &&
+      (!entryType || entry.entryType === entryType) &&
+      (!accountId || entry.lines.some(line => line.accountId === accountId)) &&
+      (!openOnly || entry.isOpen) &&
+      (search.length === 0 || matchesSearch(entry, search));
+  };
+
+  // Entries matching the query, after the cursor, in date/id order
+  const selectEntries = (params: URLSearchParams) => {
+    const from = params.get('from');
+    const to = params.get('to');
+    const matches = entryFilter(params);
+    const cursor = params.get('cursor');
+    const { entries } = journal();
+
+    let start = 0;
+    if (cursor) {
+      const key = decodeCursor(cursor);
+      let low = 0;
+      let high = entries.length;
+      while (low < high) {
+        const middle = (low + high) >>> 1;
+        if (compareKey(entries[middle], key) <= 0) low = middle + 1;
+        else high = middle;
+      }
+      start = low;
+    }
+
+    return function* () {
+      for (let i = start; i < entries.length; i++) {
+        const entry = entries[i];
+        if (from && entry.date < from) continue;
+        if (to && entry.date > to) break;
+        if (matches(entry)) yield entry;
+      }
+    };
+  };
+
+  const setCrossed = (entryId: string, crossing: JournalEntryCrossing) => {
+    const { entries, positions } = journal();
+    const position = positions.get(entryId);
+    if (position === undefined) throw new HttpError(404, { message: `Journal entry not found: ${entryId}` });
+    if (typeof crossing?.isCrossed !== 'boolean') {
+      throw new HttpError(400, { message: 'Validation failed', errors: { isCrossed: ['isCrossed must be a boolean'] } });
+    }
+    entries[position] = { ...entries[position], isCrossed: crossing.isCrossed, updatedAt: now() };
+    publish({ entity: 'journal-entries', op: 'upsert', item: entries[position] });
+  };
+
+  // The simulated colleague: crosses or uncrosses a few entries, and now and
+  // then posts a copy of one, dated like the last entry so the order holds
+  let postedCount = 0;
+  const colleagueAtWork = () => {
+    if (!ledger) return;
+    const { entries, positions } = ledger;
+    const changes = 1 + Math.floor(Math.random() * 4);
+    for (let i = 0; i < changes; i++) {
+      const source = entries[Math.floor(Math.random() * entries.length)];
+      if (Math.random() < 0.8) {
+        setCrossed(source.entryId, { isCrossed: !source.isCrossed });
+        continue;
+      }
+      const entry: JournalEntry = {
+        ...source,
+        entryId: `B-${year}-L${String(++postedCount).padStart(6, '0')}`,
+        date: entries[entries.length - 1].date,
+        isCrossed: false,
+        createdAt: now(),
+        updatedAt: now(),
+        createdBy: 'Kollega',
+      };
+      positions.set(entry.entryId, entries.length);
+      entries.push(entry);
+      publish({ entity: 'journal-entries', op: 'upsert', item: entry });
+    }
+  };
+
+  // GET /events: the changes as server-sent events. A client resuming after
+  // an event id (Last-Event-ID header, or ?lastEventId= after a closed
+  // stream) first gets the events it missed, or `reset` when they are no
+  // longer kept.
+  const eventsRoute = (req: IncomingMessage, res: ServerResponse, rest: string[], params: URLSearchParams) => {
+    if (rest.length > 0) throw new HttpError(404, { message: 'Not found' });
+    if (req.method !== 'GET') throw new HttpError(405, { message: `Method not allowed: ${req.method}` });
+    const header = req.headers['last-event-id'];
+    const resumeFrom = (Array.isArray(header) ? header[0] : header) ?? params.get('lastEventId');
+    res.writeHead(200, { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', Connection: 'keep-alive' });
+    res.write('retry: 2000\n\n');
+    if (resumeFrom !== null && resumeFrom !== undefined) {
+      const after = Number(resumeFrom);
+      const oldest = events.length > 0 ? events[0].id : lastEventId + 1;
+      if (!Number.isInteger(after) || after < oldest - 1 || after > lastEventId) {
+        res.write(`event: reset\nid: ${lastEventId}\ndata: {}\n\n`);
+      } else {
+        events.filter(event => event.id > after).forEach(event => writeEvent(res, event));
+      }
+    }
+    eventClients.add(res);
+    const keepAlive = setInterval(() => res.write(': keep-alive\n\n'), KEEPALIVE_MS);
+    req.on('close', () => {
+      clearInterval(keepAlive);
+      eventClients.delete(res);
+    });
+  };
+
+  const sendJson = (req: IncomingMessage, res: ServerResponse, status: number, body: unknown) => {
+    const json = JSON.stringify(body);
+    if (req.method === 'GET' && status === 200) {
+      const etag = `"${createHash('sha1').update(json).digest('base64url')}"`;
+      res.setHeader('ETag', etag);
+      res.setHeader('Cache-Control', 'no-cache');
+      if (req.headers['if-none-match'] === etag) {
+        res.statusCode = 304;
+        res.end();
+        return;
+      }
+    }
+    res.statusCode = status;
+    res.setHeader('Content-Type', 'application/json');
+    res.end(json);
+  };
+
+  const streamEntries = async (res: ServerResponse, entries: Iterable<JournalEntry>) => {
+    res.statusCode = 200;
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    let chunk: string[] = [];
+    for (const entry of entries) {
+      chunk.push(JSON.stringify(entry));
+      if (chunk.length === STREAM_CHUNK) {
+        res.write(chunk.join('\n') + '\n');
+        chunk = [];
+        // Let the client see the stream arrive in parts
+        await sleep(0);
+        if (res.destroyed) return;
+      }
+    }
+    if (chunk.length > 0) res.write(chunk.join('\n') + '\n');
+    res.end();
+  };
+
+  const collectionRoute = async <T extends Entity>(
+    req: IncomingMessage,
+    res: ServerResponse,
+    collection: Collection<T>,
+    rest: string[],
+    params: URLSearchParams
+  ) => {
+    const [first] = rest;
+    if (first === 'changes' && rest.length === 1) {
+      if (req.method === 'GET') return sendJson(req, res, 200, collection.changes(requiredSince(params)));
+    } else if (first === undefined) {
+      if (req.method === 'GET') return sendJson(req, res, 200, collection.list());
+      if (req.method === 'POST') return sendJson(req, res, 201, collection.create(await readJson(req)));
+    } else if (first === 'batch' && rest.length === 1) {
+      if (req.method === 'POST') {
+        const { operations } = await readJson<{ operations: BatchOperation<T>[] }>(req);
+        return sendJson(req, res, 200, { results: collection.batch(operations ?? []) });
+      }
+    } else if (rest.length === 1 && /^\d+$/.test(first)) {
+      const id = Number(first);
+      if (req.method === 'GET') return sendJson(req, res, 200, collection.get(id));
+      if (req.method === 'PUT') return sendJson(req, res, 200, collection.update(id, await readJson(req)));
+      if (req.method === 'DELETE') {
+        collection.remove(id);
+        res.statusCode = 204;
+        return res.end();
+      }
+    } else {
+      throw new HttpError(404, { message: 'Not found' });
+    }
+    throw new HttpError(405, { message: `Method not allowed: ${req.method}` });
+  };
+
+  // Per-account totals and per-range entry counts over the selected entries,
+  // in one pass. As in the ledger engine, account totals and range counts
+  // ignore accountId, and the open and crossed counts cover the whole period.
+  const summarize = (params: URLSearchParams): LedgerSummary => {
+    const ranges = (params.get('ranges') ?? '').split(',').filter(Boolean).map(range => {
+      const [low, high = low] = range.split('-');
+      return { low, high };
+    });
+    const accountId = params.get('accountId');
+    const period = new URLSearchParams();
+    ['from', 'to'].forEach(name => params.has(name) && period.set(name, params.get(name)!));
+    const withoutAccount = new URLSearchParams(params);
+    withoutAccount.delete('accountId');
+    const matches = entryFilter(withoutAccount);
+
+    const totals = new Map<string, AccountSummary>();
+    // Last entry counted per account, so an entry counts once per account
+    const counted = new Map<string, string>();
+    const touched = new Set<string>();
+    const rangeCounts = ranges.map(() => 0);
+    let entryCount = 0;
+    let openCount = 0;
+    let crossedCount = 0;
+    for (const entry of selectEntries(period)()) {
+      if (entry.isOpen) openCount++;
+      if (entry.isCrossed) crossedCount++;
+      if (!matches(entry)) continue;
+      ranges.forEach(({ low, high }, i) => {
+        if (entry.lines.some(line => line.accountId >= low && line.accountId <= high)) rangeCounts[i]++;
+      });
+      entry.lines.forEach(line => {
+        let account = totals.get(line.accountId);
+        if (!account) {
+          account = { accountId: line.accountId, debit: 0, credit: 0, count: 0 };
+          totals.set(line.accountId, account);
+        }
+        account.debit += line.debit ?? 0;
+        account.credit += line.credit ?? 0;
+        if (counted.get(line.accountId) !== entry.entryId) {
+          account.count++;
+          counted.set(line.accountId, entry.entryId);
+        }
+      });
+      if (accountId && !entry.lines.some(line => line.accountId === accountId)) continue;
+      entryCount++;
+      entry.lines.forEach(line => touched.add(line.accountId));
+    }
+    return {
+      accounts: Array.from(touched).sort((a, b) => a.localeCompare(b)).map(id => totals.get(id)!),
+      rangeCounts,
+      entryCount,
+      openCount,
+      crossedCount,
+    };
+  };
+
+  const journalRoute = async (req: IncomingMessage, res: ServerResponse, rest: string[], params: URLSearchParams) => {
+    const [first, second] = rest;
+    if (first === undefined && req.method === 'GET') {
+      const limit = Math.min(MAX_PAGE_SIZE, Math.max(1, Number(params.get('limit')) || DEFAULT_PAGE_SIZE));
+      const items: JournalEntry[] = [];
+      let hasMore = false;
+      for (const entry of selectEntries(params)()) {
+        if (items.length === limit) {
+          hasMore = true;
+          break;
+        }
+        items.push(entry);
+      }
+      const nextCursor = hasMore ? encodeCursor(items[items.length - 1]) : null;
+      return sendJson(req, res, 200, { items, nextCursor });
+    }
+    if (first === 'changes' && rest.length === 1 && req.method === 'GET') {
+      const since = requiredSince(params);
+      const items = Array.from(selectEntries(params)()).filter(entry => (entry.updatedAt ?? entry.createdAt) > since);
+      // Journal entries are never deleted here
+      const changes: Changes<JournalEntry, string> = { items, deleted: [] };
+      return sendJson(req, res, 200, changes);
+    }
+    if (first === 'summary' && rest.length === 1 && req.method === 'GET') {
+      return sendJson(req, res, 200, summarize(params));
+    }
+    if (first === 'stream' && rest.length === 1 && req.method === 'GET') {
+      return streamEntries(res, selectEntries(params)());
+    }
+    if (first === 'crossings' && second === 'batch' && rest.length === 2 && req.method === 'POST') {
+      const { operations } = await readJson<{ operations: BatchOperation<JournalEntryCrossing, string>[] }>(req);
+      const results = (operations ?? []).map((operation): BatchItemResult<JournalEntryCrossing> => {
+        try {
+          if (operation.op !== 'update') {
+            throw new HttpError(400, { message: `Unsupported crossing operation: ${operation.op}` });
+          }
+          setCrossed(operation.id, operation.data);
+          return { ok: true };
+        } catch (error) {
+          if (error instanceof HttpError) return { ok: false, error: error.body };
+          throw error;
+        }
+      });
+      return sendJson(req, res, 200, { results });
+    }
+    if (first !== undefined && second === 'crossing' && rest.length === 2 && req.method === 'PUT') {
+      setCrossed(decodeURIComponent(first), await readJson(req));
+      res.statusCode = 204;
+      return res.end();
+    }
+    throw new HttpError(404, { message: 'Not found' });
+  };
+
+  // Uploaded documents by content hash (and by the hash of the original file
+  // for compressed images), and the uploads in progress by content hash
+  const documents = new Map<string, StoredDocument>();
+  const uploads = new Map<string, UploadRequest & { uploadId: string; chunks: Map<number, Buffer> }>();
+  let nextDocumentId = 1;
+
+  const uploadRoute = async (req: IncomingMessage, res: ServerResponse, rest: string[]) => {
+    const [uploadId, action, index] = rest;
+    if (uploadId === undefined && req.method === 'POST') {
+      const request = await readJson<UploadRequest>(req);
+      required({ sha256: request.sha256, sourceSha256: request.sourceSha256, size: request.size });
+      const stored = documents.get(request.sha256) ?? documents.get(request.sourceSha256);
+      if (stored) return sendJson(req, res, 200, { document: stored } satisfies UploadStart);
+
+      // The same content again resumes the upload in progress
+      let upload = uploads.get(request.sha256);
+      if (!upload) {
+        upload = { ...request, uploadId: `u-${request.sha256.slice(0, 16)}`, chunks: new Map() };
+        uploads.set(request.sha256, upload);
+      }
+      const session = { uploadId: upload.uploadId, chunkSize: UPLOAD_CHUNK_SIZE, received: Array.from(upload.chunks.keys()) };
+      return sendJson(req, res, 201, { session } satisfies UploadStart);
+    }
+
+    const upload = Array.from(uploads.values()).find(candidate => candidate.uploadId === uploadId);
+    if (!upload) throw new HttpError(404, { message: `Upload not found: ${uploadId}` });
+    if (action === 'chunks' && index !== undefined && rest.length === 3 && req.method === 'PUT') {
+      const chunkIndex = Number(index);
+      if (!Number.isInteger(chunkIndex) || chunkIndex < 0 || chunkIndex * UPLOAD_CHUNK_SIZE >= upload.size) {
+        throw new HttpError(400, { message: `Invalid chunk: ${index}` });
+      }
+      upload.chunks.set(chunkIndex, await readBody(req));
+      res.statusCode = 204;
+      return res.end();
+    }
+    if (action === 'complete' && rest.length === 2 && req.method === 'POST') {
+      const count = Math.ceil(upload.size / UPLOAD_CHUNK_SIZE);
+      const missing = Array.from({ length: count }, (_, i) => i).filter(i => !upload.chunks.has(i));
+      if (missing.length > 0) {
+        throw new HttpError(409, { message: 'Chunks missing', errors: { chunks: missing.map(String) } });
+      }
+      const content = Buffer.concat(Array.from({ length: count }, (_, i) => upload.chunks.get(i)!));
+      uploads.delete(upload.sha256);
+      if (createHash('sha256').update(content).digest('hex') !== upload.sha256 || content.length !== upload.size) {
+        throw new HttpError(422, { message: 'Content does not match the announced hash' });
+      }
+      const document: StoredDocument = { documentId: `D-${nextDocumentId++}`, sha256: upload.sha256, size: content.length };
+      documents.set(upload.sha256, document);
+      documents.set(upload.sourceSha256, document);
+      return sendJson(req, res, 200, document);
+    }
+    throw new HttpError(404, { message: 'Not found' });
+  };
+
+  const documentRoute = (req: IncomingMessage, res: ServerResponse, rest: string[], params: URLSearchParams) => {
+    const [first, sha256] = rest;
+    if (first === 'thumbnail' && rest.length === 1 && req.method === 'GET') {
+      const documentUrl = params.get('url');
+      required({ url: documentUrl });
+      const width = Math.min(256, Math.max(16, Number(params.get('width')) || 64));
+      res.statusCode = 200;
+      res.setHeader('Content-Type', 'image/png');
+      res.setHeader('Cache-Control', 'private, max-age=86400');
+      return res.end(documentThumbnail(documentUrl!, width));
+    }
+    if (first !== 'by-hash' || rest.length !== 2 || req.method !== 'GET') throw new HttpError(404, { message: 'Not found' });
+    const stored = documents.get(sha256);
+    if (!stored) throw new HttpError(404, { message: `No document with hash ${sha256}` });
+    return sendJson(req, res, 200, stored);
+  };
+
+  // Batches from the instrumentation beacon; the latest are kept for inspection
+  const performanceBatches: unknown[] = [];
+  const telemetryRoute = async (req: IncomingMessage, res: ServerResponse, rest: string[]) => {
+    if (rest.join('/') !== 'performance') throw new HttpError(404, { message: 'Not found' });
+    if (req.method === 'GET') return sendJson(req, res, 200, performanceBatches);
+    if (req.method !== 'POST') throw new HttpError(405, { message: `Method not allowed: ${req.method}` });
+    performanceBatches.push(await readJson(req));
+    performanceBatches.splice(0, performanceBatches.length - 100);
+    res.statusCode = 204;
+    return res.end();
+  };
+
+  const handle: Connect.NextHandleFunction = (req: IncomingMessage, res, next) => {
+    const url = new URL(req.url ?? '/', 'http://mock');
+    const [resource, ...rest] = url.pathname.split('/').filter(Boolean);
+    const route = async () => {
+      switch (resource) {
+        case 'departments':
+          return collectionRoute(req, res, departments, rest, url.searchParams);
+        case 'projects':
+          return collectionRoute(req, res, projects, rest, url.searchParams);
+        case 'journal-entries':
+          return journalRoute(req, res, rest, url.searchParams);
+        case 'telemetry':
+          return telemetryRoute(req, res, rest);
+        case 'uploads':
+          return uploadRoute(req, res, rest);
+        case 'documents':
+          return documentRoute(req, res, rest, url.searchParams);
+        case 'events':
+          return eventsRoute(req, res, rest, url.searchParams);
+        default:
+          throw new HttpError(404, { message: `No mock for ${url.pathname}` });
+      }
+    };
+
+    sleep(latencyMs + Math.random() * jitterMs)
+      .then(route)
+      .catch(error => {
+        if (error instanceof HttpError) {
+          sendJson(req, res, error.status, error.body);
+        } else {
+          next(error);
+        }
+      });
+  };
+
+  if (liveEventsMs > 0) setInterval(colleagueAtWork, liveEventsMs).unref();
+
+  return {
+    name: 'mock-backend',
+    configureServer(server) {
+      server.config.logger.info(`  ➜  Mock backend: /backend/api (${lines.toLocaleString('en')} journal lines, ${latencyMs} ms + up to ${jitterMs} ms jitter)`);
+      server.middlewares.use('/backend/api', handle);
+    },
+    configurePreviewServer(server) {
+      server.middlewares.use('/backend/api', handle);
+    },
+  };
+}
@@ -0,0 +1,99 @@
+import path from 'node:path';
+import { gzipSync } from 'node:zlib';
+import type { Logger, Plugin, Rollup } from 'vite';
+
+type OutputBundle = Rollup.OutputBundle;
+type OutputChunk = Rollup.OutputChunk;
+
+interface RouteChunkReportOptions {
+  // Directory whose lazily imported modules are routes (absolute path)
+  pagesDir: string;
+  // Report file written to the build output
+  fileName?: string;
+}
+
+interface PayloadSize {
+  files: string[];
+  bytes: number;
+  gzipBytes: number;
+}
+
+/**
+ * Writes a per-route payload report at build time. For every page chunk it
+ * lists what navigating to the page downloads on top of the entry
+ * (`payload`) and what a cold start on that page downloads (`coldStart`),
+ * both raw and gzipped, including CSS.
+ */
+export function routeChunkReport({ pagesDir, fileName = 'route-chunks.json' }: RouteChunkReportOptions): Plugin {
+  let logger: Logger | undefined;
+
+  return {
+    name: 'route-chunk-report',
+    apply: 'build',
+
+    configResolved(config) {
+      logger = config.logger;
+    },
+
+    generateBundle(_options, bundle) {
+      const chunks = Object.values(bundle).filter((item): item is OutputChunk => item.type === 'chunk');
+      const entry = chunks.find((chunk) => chunk.isEntry);
+      if (!entry) return;
+
+      const entryFiles = staticClosure(entry, bundle);
+      const routes = chunks
+        .filter((chunk) => chunk.isDynamicEntry && chunk.facadeModuleId?.startsWith(pagesDir))
+        .map((chunk) => {
+          const files = staticClosure(chunk, bundle);
+          return {
+            route: path.basename(chunk.facadeModuleId!).replace(/\.[jt]sx?$/, ''),
+            chunk: chunk.fileName,
+            payload: measure([...files].filter((file) => !entryFiles.has(file)), bundle),
+            coldStart: measure([...new Set([...entryFiles, ...files])], bundle),
+          };
+        })
+        .sort((a, b) => a.route.localeCompare(b.route));
+
+      const report = { entry: measure([...entryFiles], bundle), routes };
+      this.emitFile({ type: 'asset', fileName, source: `${JSON.stringify(report, null, 2)}\n` });
+
+      const kb = (bytes: number) => `${(bytes / 1024).toFixed(1)} kB`;
+      logger?.info(`\nRoute payloads (gzip), written to ${fileName}:`);
+      logger?.info(`  entry        ${kb(report.entry.gzipBytes).padStart(10)}`);
+      routes.forEach(({ route, payload, coldStart }) => {
+        logger?.info(
+          `  ${route.padEnd(12)} ${kb(payload.gzipBytes).padStart(10)} on navigation, ${kb(coldStart.gzipBytes)} cold start`
+        );
+      });
+    },
+  };
+}
+
+// The chunk, everything it imports statically, and the CSS those chunks pull in
+function staticClosure(chunk: OutputChunk, bundle: OutputBundle): Set<string> {
+  const files = new Set<string>();
+  const stack = [chunk.fileName];
+  while (stack.length > 0) {
+    const fileName = stack.pop()!;
+    if (files.has(fileName)) continue;
+    files.add(fileName);
+    const item = bundle[fileName];
+    if (item?.type !== 'chunk') continue;
+    stack.push(...item.imports);
+    item.viteMetadata?.importedCss.forEach((css) => files.add(css));
+  }
+  return files;
+}
+
+function measure(files: string[], bundle: OutputBundle): PayloadSize {
+  let bytes = 0;
+  let gzipBytes = 0;
+  files.forEach((fileName) => {
+    const item = bundle[fileName];
+    if (!item) return;
+    const source = item.type === 'chunk' ? item.code : item.source;
+    bytes += typeof source === 'string' ? Buffer.byteLength(source) : source.byteLength;
+    gzipBytes += gzipSync(source).byteLength;
+  });
+  return { files: files.sort(), bytes, gzipBytes };
+}
@@ -1,44 +1,59 @@
+import { Suspense, lazy, useEffect, useState } from 'react';
 import { BrowserRouter, Routes, Route, Link } from 'react-router-dom';
 import { useTranslation } from 'react-i18next';
 import { AuthProvider } from './contexts/AuthContext';
 import { LanguageSwitcher } from './components/LanguageSwitcher';
+import { routes, prefetchRoute, prefetchRoutesWhenIdle } from './routes';
 import './i18n/config';
 
-// Import pages directly (simple, no module federation)
-import Dashboard from './pages/Dashboard';
-import Invoicing from './pages/Invoicing';
-import Expenses from './pages/Expenses';
-import Reports from './pages/Reports';
-import Clients from './pages/Clients';
-import Settings from './pages/Settings';
+// Only downloaded when someone opens it
+const PerformancePanel = lazy(() => import('./components/PerformancePanel'));
+
+function PageFallback() {
+  const { t } = useTranslation();
+
+  return (
+    <div className="flex justify-center items-center py-8">
+      <div className="text-gray-600">{t('common.loading')}</div>
+    </div>
+  );
+}
 
 function Layout({ children }: { children: React.ReactNode }) {
   const { t } = useTranslation();
 
+  // Load the other pages in the background once the current one is idle
+  useEffect(() => prefetchRoutesWhenIdle(), []);
+
+  // Ctrl+Alt+P toggles the hidden performance panel
+  const [showPerformance, setShowPerformance] = useState(false);
+  useEffect(() => {
+    const onKeyDown = (event: KeyboardEvent) => {
+      if (event.ctrlKey && event.altKey && event.code === 'KeyP') {
+        setShowPerformance((shown) => !shown);
+      }
+    };
+    window.addEventListener('keydown', onKeyDown);
+    return () => window.removeEventListener('keydown', onKeyDown);
+  }, []);
+
   return (
     <div className="min-h-screen bg-gray-100">
       <nav className="bg-white shadow-lg">
         <div className="max-w-7xl mx-auto px-4">
           <div className="flex justify-between h-16">
             <div className="flex space-x-8">
-              <Link to="/" className="flex items-center px-2 text-gray-700 hover:text-blue-600">
-                {t('nav.dashboard')}
-              </Link>
-              <Link to="/invoices" className="flex items-center px-2 text-gray-700 hover:text-blue-600">
-                {t('nav.invoices')}
-              </Link>
-              <Link to="/expenses" className="flex items-center px-2 text-gray-700 hover:text-blue-600">
-                {t('nav.expenses')}
-              </Link>
-              <Link to="/reports" className="flex items-center px-2 text-gray-700 hover:text-blue-600">
-                {t('nav.reports')}
-              </Link>
-              <Link to="/clients" className="flex items-center px-2 text-gray-700 hover:text-blue-600">
-                {t('nav.clients')}
-              </Link>
-              <Link to="/settings" className="flex items-center px-2 text-gray-700 hover:text-blue-600">
-                {t('nav.settings')}
-              </Link>
+              {routes.map((route) => (
+                <Link
+                  key={route.path}
+                  to={route.path}
+                  onMouseEnter={() => prefetchRoute(route.path)}
+                  onFocus={() => prefetchRoute(route.path)}
+                  className="flex items-center px-2 text-gray-700 hover:text-blue-600"
+                >
+                  {t(route.navKey)}
+                </Link>
+              ))}
             </div>
             <div className="flex items-center space-x-4">
               <LanguageSwitcher />
@@ -48,8 +63,15 @@ function Layout({ children }: { children: React.ReactNode }) {
         </div>
       </nav>
       <main className="max-w-7xl mx-auto py-6 px-4">
-        {children}
+        <Suspense fallback={<PageFallback />}>
+          {children}
+        </Suspense>
       </main>
+      {showPerformance && (
+        <Suspense fallback={null}>
+          <PerformancePanel onClose={() => setShowPerformance(false)} />
+        </Suspense>
+      )}
     </div>
   );
 }
@@ -60,12 +82,13 @@ function App() {
       <BrowserRouter basename="/frontend">
         <Layout>
           <Routes>
-            <Route path="/" element={<Dashboard />} />
-            <Route path="/invoices/*" element={<Invoicing />} />
-            <Route path="/expenses/*" element={<Expenses />} />
-            <Route path="/reports/*" element={<Reports />} />
-            <Route path="/clients/*" element={<Clients />} />
-            <Route path="/settings/*" element={<Settings />} />
+            {routes.map(({ path, Component }) => (
+              <Route
+                key={path}
+                path={path === '/' ? path : `${path}/*`}
+                element={<Component />}
+              />
+            ))}
           </Routes>
         </Layout>
       </BrowserRouter>
@@ -10,7 +10,7 @@ interface DepartmentFormProps {
 }
 
 const DepartmentForm: React.FC<DepartmentFormProps> = ({ department, onSuccess, onCancel }) => {
-  const { t } = useTranslation();
+  const { t } = useTranslation('settings');
   const [formData, setFormData] = useState<Omit<Department, 'id' | 'createdAt' | 'updatedAt'>>({
     code: '',
     name: '',
@@ -55,10 +55,11 @@ const DepartmentForm: React.FC<DepartmentFormProps> = ({ department, onSuccess,
 
     setSubmitting(true);
     try {
-      if (department?.id) {
-        await apiService.updateDepartment(department.id, formData);
-      } else {
-        await apiService.createDepartment(formData);
+      const result = await apiService.departmentMutations.enqueue(
+        department?.id ? { op: 'update', id: department.id, data: formData } : { op: 'create', data: formData }
+      );
+      if (!result.ok) {
+        throw result.error ?? {};
       }
       onSuccess();
     } catch (err: any) {
@@ -2,20 +2,34 @@ import { useEffect, useState } from 'react';
 import { useTranslation } from 'react-i18next';
 import type { Department } from '../types';
 import { apiService } from '../services/api';
+import { applyBatchResults } from '../services/mutationQueue';
+import { applyChanges } from '../services/changeEvents';
+import { usePageReady } from '../hooks/usePageReady';
+import { useLiveChanges } from '../hooks/useLiveChanges';
 import DepartmentForm from './DepartmentForm';
 
 const DepartmentList: React.FC = () => {
-  const { t } = useTranslation();
-  const [departments, setDepartments] = useState<Department[]>([]);
-  const [loading, setLoading] = useState(true);
+  const { t } = useTranslation('settings');
+  // Start from cached data so switching tabs doesn't flash the loading state
+  const [departments, setDepartments] = useState<Department[]>(() => apiService.getCachedDepartments() ?? []);
+  const [loading, setLoading] = useState(() => !apiService.getCachedDepartments());
   const [error, setError] = useState<string | null>(null);
   const [editingDepartment, setEditingDepartment] = useState<Department | null>(null);
   const [showForm, setShowForm] = useState(false);
+  usePageReady('departments', !loading);
 
   const loadDepartments = async () => {
     try {
-      setLoading(true);
+      setLoading(!apiService.getCachedDepartments());
       setError(null);
+      // On a fresh page load, show the offline copy while the changes since the last visit load
+      if (!apiService.getCachedDepartments()) {
+        const offline = await apiService.getOfflineDepartments();
+        if (offline) {
+          setDepartments(offline);
+          setLoading(false);
+        }
+      }
       const data = await apiService.getDepartments();
       setDepartments(data);
     } catch (err: any) {
@@ -29,6 +43,20 @@ const DepartmentList: React.FC = () => {
     loadDepartments();
   }, []);
 
+  useEffect(() => apiService.onDepartmentsChange(setDepartments), []);
+
+  // Apply batched create/update/delete results locally instead of refetching
+  useEffect(
+    () => apiService.departmentMutations.subscribe(batch => setDepartments(prev => applyBatchResults(prev, batch))),
+    []
+  );
+
+  // Changes made by others (and echoes of our own) are patched in as they are pushed
+  useLiveChanges('departments', ({ changes, reset }) => {
+    if (reset) loadDepartments();
+    else setDepartments(prev => applyChanges(prev, changes));
+  });
+
   const handleEdit = (department: Department) => {
     setEditingDepartment(department);
     setShowForm(true);
@@ -40,18 +68,19 @@ const DepartmentList: React.FC = () => {
     }
 
     try {
-      await apiService.deleteDepartment(id);
-      await loadDepartments();
+      const result = await apiService.departmentMutations.enqueue({ op: 'delete', id });
+      if (!result.ok) {
+        throw result.error ?? {};
+      }
     } catch (err: any) {
       // Only show error for delete operation (user initiated)
       setError(t('departments.error.delete'));
     }
   };
 
-  const handleFormSuccess = async () => {
+  const handleFormSuccess = () => {
     setShowForm(false);
     setEditingDepartment(null);
-    await loadDepartments();
   };
 
   const handleFormCancel = () => {
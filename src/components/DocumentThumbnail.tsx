@@ -0,0 +1,67 @@
+import { useEffect, useRef, useState } from 'react';
+import { observeVisibility, ThumbnailClient, ThumbnailSource } from '../lib/thumbnails';
+
+// One client for every table, so thumbnails survive scrolling and tab changes
+let client: ThumbnailClient | null = null;
+const thumbnailClient = () =>
+  (client ??= new ThumbnailClient(
+    () => new Worker(new URL('../workers/thumbnailWorker.ts', import.meta.url), { type: 'module' }),
+    () => new ThumbnailSource('/backend/api')
+  ));
+
+/**
+ * Thumbnail of the document at `url`, loaded once the row is near the
+ * viewport. Shows the document icon until it has arrived, and when the
+ * document has no thumbnail. Scrolling the row away before it has loaded
+ * cancels the request.
+ */
+export function DocumentThumbnail({ url }: { url: string }) {
+  const containerRef = useRef<HTMLSpanElement>(null);
+  const canvasRef = useRef<HTMLCanvasElement>(null);
+  const [shown, setShown] = useState(false);
+
+  useEffect(() => {
+    setShown(false);
+    let stopRequest: (() => void) | null = null;
+    // Without IntersectionObserver, and for thumbnails already in memory,
+    // the callbacks run before observeVisibility() has returned
+    let stopObserving: (() => void) | null = null;
+    let arrived = false;
+    stopObserving = observeVisibility(containerRef.current!, visible => {
+      if (!visible) {
+        stopRequest?.();
+        stopRequest = null;
+        return;
+      }
+      stopRequest ??= thumbnailClient().request(url, bitmap => {
+        arrived = true;
+        stopObserving?.();
+        const canvas = canvasRef.current;
+        if (!bitmap || !canvas) return;
+        canvas.width = bitmap.width;
+        canvas.height = bitmap.height;
+        canvas.getContext('2d')?.drawImage(bitmap, 0, 0);
+        setShown(true);
+      });
+    });
+    if (arrived) stopObserving();
+    return () => {
+      stopObserving?.();
+      stopRequest?.();
+    };
+  }, [url]);
+
+  return (
+    <span ref={containerRef} className="inline-flex items-center justify-center h-5">
+      <canvas
+        ref={canvasRef}
+        className={shown ? 'h-9 w-auto -my-2 rounded-sm border border-gray-200 bg-white shadow-sm' : 'hidden'}
+      />
+      {!shown && (
+        <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+          <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
+        </svg>
+      )}
+    </span>
+  );
+}
@@ -0,0 +1,224 @@
+import { useState } from 'react';
+import { useTranslation } from 'react-i18next';
+import { useReports } from '../hooks/useReports';
+import { useFormatters } from '../hooks/useFormatters';
+import { usePageReady } from '../hooks/usePageReady';
+import { dateFormat } from '../lib/formatting';
+import { monthKey } from '../lib/periodAggregates';
+import type { TrialBalance, VatSummary } from '../lib/reportEngine';
+import { chart } from '../ledger/chart';
+import type { EntryType } from '../types';
+
+const ENTRY_TYPES: EntryType[] = ['sale', 'purchase', 'salary', 'bank', 'journal', 'depreciation', 'adjustment'];
+
+const selectClassName = 'rounded-md border-gray-300 text-sm focus:border-purple-500 focus:ring-purple-500';
+
+interface ReportFilters {
+  year: number;
+  fromMonth: number;
+  toMonth: number;
+  entryType: EntryType | '';
+}
+
+function TrialBalanceTable({ trialBalance }: { trialBalance: TrialBalance }) {
+  const { t } = useTranslation('reports');
+  const format = useFormatters();
+
+  const amounts = (totals: { opening: number; debit: number; credit: number; closing: number }) => (
+    <>
+      <td className="px-3 py-1 text-right font-mono">{format.amount(totals.opening)}</td>
+      <td className="px-3 py-1 text-right font-mono">{format.amount(totals.debit)}</td>
+      <td className="px-3 py-1 text-right font-mono">{format.amount(totals.credit)}</td>
+      <td className="px-3 py-1 text-right font-mono">{format.amount(totals.closing)}</td>
+    </>
+  );
+
+  return (
+    <table className="w-full text-sm">
+      <thead className="bg-gray-50 text-xs text-gray-600">
+        <tr>
+          <th className="px-3 py-2 text-left">{t('reports.trialBalance.account')}</th>
+          <th className="px-3 py-2 text-right">{t('reports.trialBalance.opening')}</th>
+          <th className="px-3 py-2 text-right">{t('reports.trialBalance.debit')}</th>
+          <th className="px-3 py-2 text-right">{t('reports.trialBalance.credit')}</th>
+          <th className="px-3 py-2 text-right">{t('reports.trialBalance.closing')}</th>
+        </tr>
+      </thead>
+      {trialBalance.classes.map((group) => (
+        <tbody key={group.classId} className="border-t border-gray-200">
+          {group.rows.map((row) => (
+            <tr key={row.accountId} className="text-gray-700">
+              <td className="px-3 py-1">
+                <span className="font-mono">{row.accountId}</span>{' '}
+                {chart.placementOf(row.accountId)?.account.name}
+              </td>
+              {amounts(row)}
+            </tr>
+          ))}
+          <tr className="bg-gray-50 font-medium text-gray-900">
+            <td className="px-3 py-1">
+              {group.classId} {t(`reports.trialBalance.classes.${group.classId}`)}
+            </td>
+            {amounts(group)}
+          </tr>
+        </tbody>
+      ))}
+      <tfoot className="border-t-2 border-gray-300 font-semibold text-gray-900">
+        <tr>
+          <td className="px-3 py-2">{t('reports.trialBalance.total')}</td>
+          {amounts(trialBalance)}
+        </tr>
+      </tfoot>
+    </table>
+  );
+}
+
+function VatSummaryTable({ vat }: { vat: VatSummary }) {
+  const { t } = useTranslation('reports');
+  const format = useFormatters();
+
+  return (
+    <table className="w-full text-sm">
+      <thead className="bg-gray-50 text-xs text-gray-600">
+        <tr>
+          <th className="px-3 py-2 text-left">{t('reports.vat.code')}</th>
+          <th className="px-3 py-2 text-left">{t('reports.vat.kind')}</th>
+          <th className="px-3 py-2 text-right">{t('reports.vat.lines')}</th>
+          <th className="px-3 py-2 text-right">{t('reports.vat.base')}</th>
+          <th className="px-3 py-2 text-right">{t('reports.vat.vat')}</th>
+        </tr>
+      </thead>
+      <tbody>
+        {vat.rows.map((row) => (
+          <tr key={row.vatCode} className="border-t border-gray-100 text-gray-700">
+            <td className="px-3 py-1 font-mono">{row.vatCode}</td>
+            <td className="px-3 py-1">{t(`reports.vat.kinds.${row.kind}`)}</td>
+            <td className="px-3 py-1 text-right font-mono">{row.lines}</td>
+            <td className="px-3 py-1 text-right font-mono">{format.amount(row.base)}</td>
+            <td className="px-3 py-1 text-right font-mono">{format.amount(row.vat)}</td>
+          </tr>
+        ))}
+      </tbody>
+      <tfoot className="border-t-2 border-gray-300 text-gray-900">
+        <tr>
+          <td colSpan={4} className="px-3 py-1">{t('reports.vat.outputVat')}</td>
+          <td className="px-3 py-1 text-right font-mono">{format.amount(vat.outputVat)}</td>
+        </tr>
+        <tr>
+          <td colSpan={4} className="px-3 py-1">{t('reports.vat.inputVat')}</td>
+          <td className="px-3 py-1 text-right font-mono">{format.amount(vat.inputVat)}</td>
+        </tr>
+        <tr className="font-semibold">
+          <td colSpan={4} className="px-3 py-2">{t('reports.vat.payable')}</td>
+          <td className="px-3 py-2 text-right font-mono">{format.amount(vat.payable)}</td>
+        </tr>
+      </tfoot>
+    </table>
+  );
+}
+
+/**
+ * Trial balance per NS 4102 class and VAT summary per VAT code for a range
+ * of months. Both come from one pass over the journal lines in the ledger
+ * worker, memoized per period and filter (see src/lib/reportEngine.ts).
+ */
+export function FinancialReports() {
+  const { t } = useTranslation('reports');
+  const format = useFormatters();
+  const currentYear = new Date().getFullYear();
+  const years = Array.from({ length: 5 }, (_, i) => currentYear - i);
+  const monthName = dateFormat(format.locale, { month: 'long' });
+  const months = Array.from({ length: 12 }, (_, i) => monthName.format(new Date(2000, i, 1)));
+
+  const [filters, setFilters] = useState<ReportFilters>({ year: currentYear, fromMonth: 1, toMonth: 12, entryType: '' });
+  const { reports, isPending } = useReports(filters.year, {
+    fromMonth: monthKey(filters.year, filters.fromMonth),
+    toMonth: monthKey(filters.year, filters.toMonth),
+    entryType: filters.entryType || undefined,
+  });
+
+  usePageReady('reports', reports !== null);
+
+  const change = (next: Partial<ReportFilters>) => {
+    const merged = { ...filters, ...next };
+    // Keep the range the right way round
+    if (merged.fromMonth > merged.toMonth) {
+      if (next.fromMonth !== undefined) merged.toMonth = merged.fromMonth;
+      else merged.fromMonth = merged.toMonth;
+    }
+    setFilters(merged);
+  };
+
+  return (
+    <div>
+      <h1 className="text-3xl font-bold text-gray-900 mb-2">{t('reports.title')}</h1>
+      <p className="text-gray-600 mb-6">{t('reports.description')}</p>
+
+      <div className="bg-white rounded-lg shadow-sm border border-gray-200 p-4 mb-6 flex flex-wrap items-center gap-4">
+        <label className="flex items-center gap-2 text-sm font-medium text-gray-700">
+          {t('reports.filters.year')}
+          <select value={filters.year} onChange={(e) => change({ year: Number(e.target.value) })} className={selectClassName}>
+            {years.map((year) => (
+              <option key={year} value={year}>{year}</option>
+            ))}
+          </select>
+        </label>
+        <label className="flex items-center gap-2 text-sm font-medium text-gray-700">
+          {t('reports.filters.from')}
+          <select value={filters.fromMonth} onChange={(e) => change({ fromMonth: Number(e.target.value) })} className={selectClassName}>
+            {months.map((month, i) => (
+              <option key={i} value={i + 1}>{month}</option>
+            ))}
+          </select>
+        </label>
+        <label className="flex items-center gap-2 text-sm font-medium text-gray-700">
+          {t('reports.filters.to')}
+          <select value={filters.toMonth} onChange={(e) => change({ toMonth: Number(e.target.value) })} className={selectClassName}>
+            {months.map((month, i) => (
+              <option key={i} value={i + 1}>{month}</option>
+            ))}
+          </select>
+        </label>
+        <label className="flex items-center gap-2 text-sm font-medium text-gray-700">
+          {t('reports.filters.entryType')}
+          <select
+            value={filters.entryType}
+            onChange={(e) => change({ entryType: e.target.value as EntryType | '' })}
+            className={selectClassName}
+          >
+            <option value="">{t('reports.filters.allTypes')}</option>
+            {ENTRY_TYPES.map((type) => (
+              <option key={type} value={type}>{t(`ledger.entryTypes.${type}`)}</option>
+            ))}
+          </select>
+        </label>
+        {isPending && <span className="text-sm text-gray-500">{t('reports.computing')}</span>}
+      </div>
+
+      {reports && (
+        <div className={`grid gap-6 xl:grid-cols-2 ${isPending ? 'opacity-60' : ''}`}>
+          <section className="bg-white rounded-lg shadow overflow-hidden">
+            <h2 className="px-4 py-3 text-lg font-semibold text-gray-900 border-b border-gray-200">
+              {t('reports.trialBalance.title')}
+            </h2>
+            {reports.trialBalance.classes.length === 0 ? (
+              <p className="px-4 py-3 text-gray-500">{t('reports.noData')}</p>
+            ) : (
+              <TrialBalanceTable trialBalance={reports.trialBalance} />
+            )}
+          </section>
+          <section className="bg-white rounded-lg shadow overflow-hidden self-start">
+            <h2 className="px-4 py-3 text-lg font-semibold text-gray-900 border-b border-gray-200">
+              {t('reports.vat.title')}
+            </h2>
+            {reports.vat.rows.length === 0 ? (
+              <p className="px-4 py-3 text-gray-500">{t('reports.noData')}</p>
+            ) : (
+              <VatSummaryTable vat={reports.vat} />
+            )}
+          </section>
+        </div>
+      )}
+    </div>
+  );
+}
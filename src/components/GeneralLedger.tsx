@@ -1,6 +1,20 @@
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useEffect, useRef, useDeferredValue, useSyncExternalStore } from 'react';
 import { chartOfAccounts } from '../data/chartOfAccounts';
 import { JournalEntryTable } from './JournalEntryTable';
+import { Profiled } from './Profiled';
+import { monthKey, type PeriodTotals } from '../lib/periodAggregates';
+import { overviewOfView, type AccountPages, type LedgerOverview } from '../lib/ledgerSummary';
+import { chart } from '../ledger/chart';
+import { useLedgerEngine } from '../hooks/useLedgerEngine';
+import { isLargeYear, useAccountEntries, useLedgerSummary } from '../hooks/useLedgerSummary';
+import { useCrossing } from '../hooks/useCrossing';
+import { usePageReady } from '../hooks/usePageReady';
+import { useLiveChanges } from '../hooks/useLiveChanges';
+import type { EntryStore } from '../lib/entryStore';
+import { useFormatters } from '../hooks/useFormatters';
+import { loadJournalYear } from '../services/journalYear';
+import { apiService } from '../services/api';
+import { generateMockEntries } from '../data/demoJournalEntries';
 import {
   LedgerCategory,
   LedgerAccount,
@@ -20,106 +34,6 @@ const categoryColors: Record<string, { bg: string; text: string; border: string;
   slate: { bg: 'bg-slate-50', text: 'text-slate-700', border: 'border-slate-200', accent: 'bg-slate-500' },
 };
 
-// Demo-data for visning
-const generateMockEntries = (): JournalEntry[] => {
-  return [
-    {
-      entryId: 'B-2024-001',
-      entryType: 'sale',
-      date: '2024-01-15',
-      customerSupplierId: 'K-001',
-      reference: 'Faktura 1001',
-      createdAt: '2024-01-15T10:30:00',
-      createdBy: 'Ole Hansen',
-      isCrossed: false,
-      isOpen: false,
-      projectId: 'P-001',
-      lines: [
-        { lineId: '1', accountId: '1500', accountName: 'Kundefordringer', debit: 12500, credit: null, amount: 12500, vatCode: '0', vatAmount: 0, description: 'Faktura til kunde' },
-        { lineId: '2', accountId: '3000', accountName: 'Salgsinntekt', debit: null, credit: 10000, amount: 10000, vatCode: '1', vatAmount: 2500, description: 'Salg av konsulenttjenester' },
-        { lineId: '3', accountId: '2700', accountName: 'Utgående MVA', debit: null, credit: 2500, amount: 2500, vatCode: '1', vatAmount: 2500, description: 'MVA 25%' },
-      ],
-    },
-    {
-      entryId: 'B-2024-002',
-      entryType: 'purchase',
-      date: '2024-01-18',
-      customerSupplierId: 'L-005',
-      reference: 'Leverandørfaktura 5521',
-      documentUrl: '/documents/receipts/5521.pdf',
-      createdAt: '2024-01-18T14:15:00',
-      createdBy: 'Kari Olsen',
-      isCrossed: true,
-      isOpen: false,
-      lines: [
-        { lineId: '1', accountId: '6800', accountName: 'Kontorrekvisita', debit: 2400, credit: null, amount: 2400, vatCode: '3', vatAmount: 600, description: 'Kontormateriell' },
-        { lineId: '2', accountId: '2710', accountName: 'Inngående MVA', debit: 600, credit: null, amount: 600, vatCode: '3', vatAmount: 600, description: 'MVA 25%' },
-        { lineId: '3', accountId: '2400', accountName: 'Leverandørgjeld', debit: null, credit: 3000, amount: 3000, vatCode: '0', vatAmount: 0, description: 'Skyldig leverandør' },
-      ],
-    },
-    {
-      entryId: 'B-2024-003',
-      entryType: 'bank',
-      date: '2024-01-20',
-      reference: 'Bankoverføring',
-      createdAt: '2024-01-20T09:00:00',
-      createdBy: 'System',
-      isCrossed: false,
-      isOpen: true,
-      lines: [
-        { lineId: '1', accountId: '1920', accountName: 'Bankinnskudd', debit: 12500, credit: null, amount: 12500, vatCode: '0', vatAmount: 0, description: 'Innbetaling fra kunde' },
-        { lineId: '2', accountId: '1500', accountName: 'Kundefordringer', debit: null, credit: 12500, amount: 12500, vatCode: '0', vatAmount: 0, description: 'Motregning kundefordring' },
-      ],
-    },
-    {
-      entryId: 'B-2024-004',
-      entryType: 'salary',
-      date: '2024-01-31',
-      reference: 'Lønnskjøring januar',
-      createdAt: '2024-01-31T12:00:00',
-      createdBy: 'Kari Olsen',
-      isCrossed: false,
-      isOpen: false,
-      lines: [
-        { lineId: '1', accountId: '5000', accountName: 'Lønn', debit: 45000, credit: null, amount: 45000, vatCode: '0', vatAmount: 0, description: 'Bruttolønn' },
-        { lineId: '2', accountId: '5400', accountName: 'Arbeidsgiveravgift', debit: 6345, credit: null, amount: 6345, vatCode: '0', vatAmount: 0, description: 'AGA 14.1%' },
-        { lineId: '3', accountId: '2600', accountName: 'Skattetrekk', debit: null, credit: 13500, amount: 13500, vatCode: '0', vatAmount: 0, description: 'Forskuddstrekk' },
-        { lineId: '4', accountId: '2770', accountName: 'Skyldig AGA', debit: null, credit: 6345, amount: 6345, vatCode: '0', vatAmount: 0, description: 'Skyldig arbeidsgiveravgift' },
-        { lineId: '5', accountId: '2920', accountName: 'Skyldig lønn', debit: null, credit: 31500, amount: 31500, vatCode: '0', vatAmount: 0, description: 'Nettolønn til utbetaling' },
-      ],
-    },
-    {
-      entryId: 'B-2024-005',
-      entryType: 'purchase',
-      date: '2024-02-05',
-      customerSupplierId: 'L-012',
-      reference: 'Faktura 8842',
-      createdAt: '2024-02-05T11:00:00',
-      createdBy: 'Ole Hansen',
-      isCrossed: false,
-      isOpen: true,
-      lines: [
-        { lineId: '1', accountId: '6940', accountName: 'Lisenser og programvare', debit: 4800, credit: null, amount: 4800, vatCode: '3', vatAmount: 1200, description: 'Årsabonnement regnskapssystem' },
-        { lineId: '2', accountId: '2710', accountName: 'Inngående MVA', debit: 1200, credit: null, amount: 1200, vatCode: '3', vatAmount: 1200, description: 'MVA 25%' },
-        { lineId: '3', accountId: '2400', accountName: 'Leverandørgjeld', debit: null, credit: 6000, amount: 6000, vatCode: '0', vatAmount: 0, description: 'Skyldig leverandør' },
-      ],
-    },
-  ];
-};
-
-// Hent alle unike kontoer fra kontoplanen
-const getAllAccounts = (): { accountId: string; name: string }[] => {
-  const accounts: { accountId: string; name: string }[] = [];
-  chartOfAccounts.forEach(category => {
-    category.subcategories.forEach(sub => {
-      sub.accounts.forEach(acc => {
-        accounts.push({ accountId: acc.accountId, name: acc.name });
-      });
-    });
-  });
-  return accounts.sort((a, b) => a.accountId.localeCompare(b.accountId));
-};
-
 interface FilterBarProps {
   period: { month: number; year: number };
   onPeriodChange: (period: { month: number; year: number }) => void;
@@ -127,6 +41,8 @@ interface FilterBarProps {
   onEntryTypeChange: (type: EntryType | '') => void;
   accountId: string;
   onAccountChange: (accountId: string) => void;
+  searchQuery: string;
+  onSearchChange: (searchQuery: string) => void;
   crossingMode: 'all' | 'open';
   onCrossingModeChange: (mode: 'all' | 'open') => void;
   isCrossingEnabled: boolean;
@@ -140,6 +56,8 @@ function FilterBar({
   onEntryTypeChange,
   accountId,
   onAccountChange,
+  searchQuery,
+  onSearchChange,
   crossingMode,
   onCrossingModeChange,
   isCrossingEnabled,
@@ -163,8 +81,6 @@ function FilterBar({
     { value: 'adjustment', label: 'Justering' },
   ];
 
-  const allAccounts = getAllAccounts();
-
   return (
     <div className="bg-white rounded-lg shadow-sm border border-gray-200 p-4 mb-6">
       <div className="flex flex-wrap items-center gap-4">
@@ -214,7 +130,7 @@ function FilterBar({
             className="rounded-md border-gray-300 text-sm focus:border-purple-500 focus:ring-purple-500 max-w-[200px]"
           >
             <option value="">Alle kontoer</option>
-            {allAccounts.map((acc) => (
+            {chart.accounts.map((acc) => (
               <option key={acc.accountId} value={acc.accountId}>
                 {acc.accountId} - {acc.name}
               </option>
@@ -222,6 +138,18 @@ function FilterBar({
           </select>
         </div>
 
+        {/* Søk */}
+        <div className="flex items-center gap-2">
+          <input
+            type="search"
+            value={searchQuery}
+            onChange={(e) => onSearchChange(e.target.value)}
+            placeholder="Søk i bilag..."
+            aria-label="Søk i bilag"
+            className="rounded-md border-gray-300 text-sm focus:border-purple-500 focus:ring-purple-500 w-56"
+          />
+        </div>
+
         {/* Separator */}
         <div className="h-8 w-px bg-gray-200 mx-2" />
 
@@ -271,72 +199,73 @@ function FilterBar({
   );
 }
 
+// Antall kryssede bilag, oppdatert uten å rendre resten av hovedboken
+function CrossedCount({ store, count }: { store: EntryStore<JournalEntry>; count: () => number }) {
+  const crossedCount = useSyncExternalStore(store.subscribeCount, count);
+  return <>{crossedCount}</>;
+}
+
 interface CategoryAccordionProps {
   category: LedgerCategory;
   isExpanded: boolean;
   onToggle: () => void;
-  entries: JournalEntry[];
+  overview: LedgerOverview | null;
+  // Bilagene til en konto når alle bilag er lastet; ellers hentes de side for side fra `pages`
+  entriesOf: ((accountId: string) => JournalEntry[]) | null;
+  pages: AccountPages<JournalEntry> | null;
   isCrossingEnabled: boolean;
   onCrossedChange: (entryId: string, isCrossed: boolean) => void;
   selectedAccountId: string;
+  store: EntryStore<JournalEntry>;
 }
 
 function CategoryAccordion({
   category,
   isExpanded,
   onToggle,
-  entries,
+  overview,
+  entriesOf,
+  pages,
   isCrossingEnabled,
   onCrossedChange,
   selectedAccountId,
+  store,
 }: CategoryAccordionProps) {
   const colors = categoryColors[category.color] || categoryColors.slate;
 
-  // Hent alle kontoIDer i denne kategorien
-  const categoryAccountIds = useMemo(() => {
-    const ids = new Set<string>();
-    category.subcategories.forEach(sub => {
-      sub.accounts.forEach(acc => ids.add(acc.accountId));
-    });
-    return ids;
-  }, [category]);
-
-  // Filtrer bilag som tilhører denne kategorien
-  const categoryEntries = useMemo(() => {
-    return entries.filter(entry =>
-      entry.lines.some(line => categoryAccountIds.has(line.accountId))
-    );
-  }, [entries, categoryAccountIds]);
+  // Antall bilag i kategorien kommer ferdig aggregert, fra hovedbokmotoren eller backend
+  const categoryEntryCount = !overview
+    ? 0
+    : selectedAccountId
+      ? overview.totalsOf(selectedAccountId).count
+      : overview.categoryCount(category.id);
 
-  // Hent alle kontoer med bilag
+  // Hent kontoer med bilag (kun når kategorien er åpen)
   const accountsWithEntries = useMemo(() => {
-    const accountMap = new Map<string, { account: LedgerAccount; entries: JournalEntry[] }>();
-
-    category.subcategories.forEach(sub => {
-      sub.accounts.forEach(account => {
-        const accountEntries = entries.filter(entry =>
-          entry.lines.some(line => line.accountId === account.accountId)
-        );
-        if (accountEntries.length > 0 || !selectedAccountId) {
-          accountMap.set(account.accountId, { account, entries: accountEntries });
-        }
+    const accountMap = new Map<string, { account: LedgerAccount; entries: JournalEntry[] | null; totals: PeriodTotals }>();
+    if (!isExpanded || !overview) return accountMap;
+
+    // Kontoene med bilag i kategorien, også underkontoer som 1920.01;
+    // kontoplanen gir bare navnet. Hvis en spesifikk konto er valgt, vis bare den.
+    overview.accountIds
+      .filter(id => chart.categoryIdOf(id) === category.id && (!selectedAccountId || id === selectedAccountId))
+      .forEach(id => {
+        const main = chart.placementOf(id)?.account;
+        const account: LedgerAccount = main?.accountId === id
+          ? main
+          : { accountId: id, name: main?.name ?? '', nameEn: main?.nameEn, entries: [] };
+        accountMap.set(id, {
+          account,
+          entries: entriesOf ? entriesOf(id) : null,
+          totals: overview.totalsOf(id),
+        });
       });
-    });
-
-    // Hvis en spesifikk konto er valgt, vis bare den
-    if (selectedAccountId && categoryAccountIds.has(selectedAccountId)) {
-      const filtered = new Map<string, { account: LedgerAccount; entries: JournalEntry[] }>();
-      if (accountMap.has(selectedAccountId)) {
-        filtered.set(selectedAccountId, accountMap.get(selectedAccountId)!);
-      }
-      return filtered;
-    }
 
     return accountMap;
-  }, [category, entries, selectedAccountId, categoryAccountIds]);
+  }, [category, overview, entriesOf, selectedAccountId, isExpanded]);
 
   // Ikke vis kategorien hvis en annen konto er valgt
-  if (selectedAccountId && !categoryAccountIds.has(selectedAccountId)) {
+  if (selectedAccountId && chart.categoryIdOf(selectedAccountId) !== category.id) {
     return null;
   }
 
@@ -362,9 +291,9 @@ function CategoryAccordion({
           <span className="text-xs text-gray-500 font-mono bg-white/50 px-2 py-1 rounded">
             {category.accountRange}
           </span>
-          {categoryEntries.length > 0 && (
+          {categoryEntryCount > 0 && (
             <span className={`px-2.5 py-1 text-xs font-semibold rounded-full bg-white/80 ${colors.text}`}>
-              {categoryEntries.length} bilag
+              {categoryEntryCount} bilag
             </span>
           )}
           <svg
@@ -381,13 +310,16 @@ function CategoryAccordion({
       {/* Innhold - liste over kontoer */}
       {isExpanded && (
         <div className="bg-white divide-y divide-gray-100">
-          {Array.from(accountsWithEntries.entries()).map(([accountId, { account, entries: accountEntries }]) => (
+          {Array.from(accountsWithEntries.entries()).map(([accountId, { account, entries: accountEntries, totals }]) => (
             <AccountRow
               key={accountId}
               account={account}
               entries={accountEntries}
+              pages={pages}
+              totals={totals}
               isCrossingEnabled={isCrossingEnabled}
               onCrossedChange={onCrossedChange}
+              store={store}
               categoryColor={category.color}
             />
           ))}
@@ -404,38 +336,25 @@ function CategoryAccordion({
 
 interface AccountRowProps {
   account: LedgerAccount;
-  entries: JournalEntry[];
+  // Null når bilagene hentes side for side fra `pages`
+  entries: JournalEntry[] | null;
+  pages: AccountPages<JournalEntry> | null;
+  totals: PeriodTotals;
   isCrossingEnabled: boolean;
   onCrossedChange: (entryId: string, isCrossed: boolean) => void;
   categoryColor: string;
+  store: EntryStore<JournalEntry>;
 }
 
-function AccountRow({ account, entries, isCrossingEnabled, onCrossedChange, categoryColor }: AccountRowProps) {
+function AccountRow({ account, entries, pages, totals, isCrossingEnabled, onCrossedChange, categoryColor, store }: AccountRowProps) {
   const [isExpanded, setIsExpanded] = useState(false);
   const colors = categoryColors[categoryColor] || categoryColors.slate;
 
-  // Beregn sum debet og kredit for denne kontoen
-  const totals = useMemo(() => {
-    let debit = 0;
-    let credit = 0;
-    entries.forEach(entry => {
-      entry.lines.forEach(line => {
-        if (line.accountId === account.accountId) {
-          debit += line.debit || 0;
-          credit += line.credit || 0;
-        }
-      });
-    });
-    return { debit, credit, balance: debit - credit };
-  }, [entries, account.accountId]);
-
-  const formatCurrency = (amount: number) => {
-    return new Intl.NumberFormat('nb-NO', {
-      style: 'decimal',
-      minimumFractionDigits: 2,
-      maximumFractionDigits: 2,
-    }).format(amount);
-  };
+  const format = useFormatters();
+
+  // I sammendragsmodus hentes bilagene først når kontoen åpnes
+  const paged = useAccountEntries(pages, account.accountId, isExpanded);
+  const shownEntries = paged ? paged.entries : entries ?? [];
 
   return (
     <div>
@@ -444,7 +363,7 @@ function AccountRow({ account, entries, isCrossingEnabled, onCrossedChange, cate
         className="w-full flex items-center justify-between px-6 py-3 hover:bg-gray-50 transition-colors"
       >
         <div className="flex items-center gap-4">
-          {entries.length > 0 ? (
+          {totals.count > 0 ? (
             <svg
               className={`w-4 h-4 text-gray-400 transition-transform ${isExpanded ? 'rotate-90' : ''}`}
               fill="none"
@@ -464,24 +383,24 @@ function AccountRow({ account, entries, isCrossingEnabled, onCrossedChange, cate
           </span>
         </div>
         <div className="flex items-center gap-6 text-sm">
-          {entries.length > 0 && (
+          {totals.count > 0 && (
             <>
               <div className="text-right">
                 <span className="text-gray-500 mr-2">Debet:</span>
-                <span className="font-mono text-gray-900">{formatCurrency(totals.debit)}</span>
+                <span className="font-mono text-gray-900">{format.amount(totals.debit)}</span>
               </div>
               <div className="text-right">
                 <span className="text-gray-500 mr-2">Kredit:</span>
-                <span className="font-mono text-gray-900">{formatCurrency(totals.credit)}</span>
+                <span className="font-mono text-gray-900">{format.amount(totals.credit)}</span>
               </div>
               <div className="text-right min-w-[100px]">
                 <span className="text-gray-500 mr-2">Saldo:</span>
                 <span className={`font-mono font-medium ${totals.balance >= 0 ? 'text-green-600' : 'text-red-600'}`}>
-                  {formatCurrency(Math.abs(totals.balance))}
+                  {format.amount(Math.abs(totals.balance))}
                 </span>
               </div>
               <span className="text-xs text-gray-400 bg-gray-100 px-2 py-1 rounded">
-                {entries.length} bilag
+                {totals.count} bilag
               </span>
             </>
           )}
@@ -489,14 +408,36 @@ function AccountRow({ account, entries, isCrossingEnabled, onCrossedChange, cate
       </button>
 
       {/* Bilagstabell */}
-      {isExpanded && entries.length > 0 && (
+      {isExpanded && totals.count > 0 && (
         <div className="px-6 py-4 bg-gray-50 border-t border-gray-100">
-          <JournalEntryTable
-            entries={entries}
-            onCrossedChange={onCrossedChange}
-            showAccountColumn={false}
-            showCrossingCheckbox={isCrossingEnabled}
-          />
+          {shownEntries.length > 0 && (
+            <Profiled id="JournalEntryTable">
+              <JournalEntryTable
+                entries={shownEntries}
+                store={store}
+                onCrossedChange={onCrossedChange}
+                showAccountColumn={false}
+                showCrossingCheckbox={isCrossingEnabled}
+              />
+            </Profiled>
+          )}
+          {paged && (paged.hasMore || paged.failed) && (
+            <div className="flex items-center justify-between mt-3 text-sm text-gray-600">
+              <span>
+                Viser {shownEntries.length} av {totals.count} bilag
+              </span>
+              {paged.isLoading ? (
+                <span className="text-gray-500">Henter bilag...</span>
+              ) : (
+                <button
+                  onClick={() => pages?.loadMore(account.accountId)}
+                  className="px-3 py-1.5 text-sm font-medium text-purple-700 hover:bg-purple-50 rounded-md transition-colors"
+                >
+                  {paged.failed ? 'Kunne ikke hente bilag. Prøv igjen' : 'Vis flere'}
+                </button>
+              )}
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -510,44 +451,110 @@ export function GeneralLedger() {
   const [period, setPeriod] = useState({ month: currentDate.getMonth() + 1, year: currentDate.getFullYear() });
   const [entryType, setEntryType] = useState<EntryType | ''>('');
   const [accountId, setAccountId] = useState('');
+  const [searchQuery, setSearchQuery] = useState('');
+  // Søket kjøres mot indeksen i workeren; feltet oppdateres uten å vente på svaret
+  const deferredSearch = useDeferredValue(searchQuery);
   const [crossingMode, setCrossingMode] = useState<'all' | 'open'>('all');
   const [isCrossingEnabled, setIsCrossingEnabled] = useState(false);
 
+  // Bilag fra backend lagrer kryssing; demodata krysses bare lokalt
+  const [isBackendData, setIsBackendData] = useState(false);
+  // År med for mange bilag til å lastes vises fra sammendrag i backend, og
+  // bilagene til en konto hentes først når kontoen åpnes
+  const [isSummaryMode, setIsSummaryMode] = useState(false);
+  // Økes når endringer fra backend har gått tapt, så året lastes på nytt
+  const [reloadCount, setReloadCount] = useState(0);
+  // Endringer som kommer mens året lastes, legges inn når det er lastet
+  // (ellers kunne et bilag bli lagt til før strømmen leverer det); null ellers
+  const pendingChanges = useRef<JournalEntry[] | null>(null);
+
   // Accordion state
   const [expandedCategories, setExpandedCategories] = useState<Set<string>>(new Set());
 
-  // Data
-  const [entries, setEntries] = useState<JournalEntry[]>(generateMockEntries());
-
-  // Filtrer bilag
-  const filteredEntries = useMemo(() => {
-    let result = [...entries];
-
-    // Filtrer på bilagstype
-    if (entryType) {
-      result = result.filter(e => e.entryType === entryType);
-    }
-
-    // Filtrer på konto
-    if (accountId) {
-      result = result.filter(e =>
-        e.lines.some(line => line.accountId === accountId)
-      );
-    }
-
+  // Data: filtrering og summering skjer i hovedbokmotoren (Web Worker)
+  const { store, loadEntries, appendEntries, updateEntry, applyEntries, view, isPending } = useLedgerEngine(generateMockEntries, {
+    // Filtrer på periode (for demo viser vi alle bilag i valgt år)
+    fromMonth: monthKey(period.year, 1),
+    toMonth: monthKey(period.year, 12),
+    entryType: entryType || undefined,
+    accountId: accountId || undefined,
     // Filtrer på åpne poster når kryssing er aktivert
-    if (isCrossingEnabled && crossingMode === 'open') {
-      result = result.filter(e => e.isOpen);
-    }
-
-    // Filtrer på periode (for demo viser vi alle 2024-bilag)
-    result = result.filter(e => {
-      const date = new Date(e.date);
-      return date.getFullYear() === period.year;
-    });
+    openOnly: isCrossingEnabled && crossingMode === 'open',
+    search: deferredSearch.trim() || undefined,
+  });
 
-    return result;
-  }, [entries, entryType, accountId, isCrossingEnabled, crossingMode, period]);
+  // Samme filtre som spørring mot backend i sammendragsmodus
+  const summary = useLedgerSummary(isSummaryMode ? {
+    period: { type: 'year', year: period.year },
+    entryType: entryType || undefined,
+    accountId: accountId || undefined,
+    openOnly: isCrossingEnabled && crossingMode === 'open',
+    search: deferredSearch.trim() || undefined,
+  } : null);
+
+  // Bilag for valgt år, fra offline-lageret og backend (se services/journalYear.ts).
+  // Store år lastes ikke, de vises fra sammendrag. Uten bilags-API i backend
+  // beholdes demodataene.
+  useEffect(() => {
+    const controller = new AbortController();
+    const target = {
+      load: (entries: JournalEntry[]) => {
+        loadEntries(entries);
+        setIsBackendData(true);
+      },
+      append: appendEntries,
+    };
+    pendingChanges.current = [];
+    let isLarge = false;
+    isLargeYear(period.year)
+      .then(large => {
+        if (controller.signal.aborted) return;
+        isLarge = large;
+        setIsSummaryMode(large);
+        if (!large) return loadJournalYear(period.year, target, controller.signal);
+      })
+      .catch(() => {
+        // Avbrutt eller ingen backend: vis det vi har
+      })
+      .then(() => {
+        if (controller.signal.aborted) return;
+        const pending = pendingChanges.current;
+        pendingChanges.current = null;
+        if (pending && pending.length > 0 && !isLarge) applyEntries(pending);
+      });
+    return () => controller.abort();
+  }, [period.year, reloadCount, loadEntries, appendEntries, applyEntries]);
+
+  const fullOverview = useMemo(() => (view ? overviewOfView(view) : null), [view]);
+  const overview = isSummaryMode ? summary.overview : fullOverview;
+  const shownStore = isSummaryMode ? summary.store : store;
+
+  // Bilag postert eller krysset av andre (og ekko av egne endringer) kommer
+  // fra backend og legges inn uten ny henting: bare berørte rader og
+  // kontosummer oppdateres, og en bølge av endringer gir én rendring
+  useLiveChanges('journal-entries', ({ changes, reset }) => {
+    if (reset) {
+      setReloadCount(count => count + 1);
+      // Sammendraget hentes på nytt
+      if (isSummaryMode) summary.applyEntries([]);
+      return;
+    }
+    if (!isBackendData && !isSummaryMode) return;
+    const changed = changes
+      .map(change => change.item)
+      .filter(entry => entry.date.startsWith(`${period.year}-`))
+      .map(entry => {
+        // Kryssing som ikke er bekreftet ennå vinner over det backend sender
+        const current = shownStore.get(entry.entryId);
+        return current && apiService.crossingMutations.isPending(entry.entryId)
+          ? { ...entry, isCrossed: current.isCrossed }
+          : entry;
+      });
+    if (changed.length === 0) return;
+    if (isSummaryMode) summary.applyEntries(changed);
+    else if (pendingChanges.current) pendingChanges.current.push(...changed);
+    else applyEntries(changed);
+  });
 
   // Toggle kategori
   const toggleCategory = (categoryId: string) => {
@@ -563,11 +570,12 @@ export function GeneralLedger() {
   };
 
   // Håndter kryssing
-  const handleCrossedChange = (entryId: string, isCrossed: boolean) => {
-    setEntries(prev =>
-      prev.map(e => (e.entryId === entryId ? { ...e, isCrossed } : e))
-    );
-  };
+  // Kryssing vises med en gang og lagres i bolker; bare raden til bilaget rendres på nytt
+  const handleCrossedChange = useCrossing(
+    shownStore,
+    isSummaryMode ? summary.updateEntry : updateEntry,
+    isBackendData || isSummaryMode
+  );
 
   // Utvid/lukk alle
   const expandAll = () => {
@@ -578,9 +586,11 @@ export function GeneralLedger() {
     setExpandedCategories(new Set());
   };
 
-  // Tell antall bilag med kryssing
-  const crossedCount = entries.filter(e => e.isCrossed).length;
-  const openCount = entries.filter(e => e.isOpen).length;
+  const openCount = overview?.openCount ?? 0;
+  const pending = isSummaryMode ? summary.isPending : isPending;
+
+  // Klar når første svar fra hovedbokmotoren (eller sammendraget) er vist
+  usePageReady('ledger', overview !== null);
 
   return (
     <div className="max-w-7xl mx-auto">
@@ -600,6 +610,8 @@ export function GeneralLedger() {
         onEntryTypeChange={setEntryType}
         accountId={accountId}
         onAccountChange={setAccountId}
+        searchQuery={searchQuery}
+        onSearchChange={setSearchQuery}
         crossingMode={crossingMode}
         onCrossingModeChange={setCrossingMode}
         isCrossingEnabled={isCrossingEnabled}
@@ -609,7 +621,7 @@ export function GeneralLedger() {
       {/* Statuslinje */}
       <div className="flex justify-between items-center mb-4">
         <div className="flex items-center gap-4 text-sm text-gray-600">
-          <span>{filteredEntries.length} bilag</span>
+          <span>{overview?.entryCount ?? 0} bilag</span>
           {isCrossingEnabled && (
             <>
               <span className="text-gray-300">|</span>
@@ -617,7 +629,10 @@ export function GeneralLedger() {
                 <svg className="w-4 h-4 text-green-500" fill="currentColor" viewBox="0 0 20 20">
                   <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
                 </svg>
-                {crossedCount} krysset
+                <CrossedCount
+                  store={shownStore}
+                  count={isSummaryMode ? summary.crossedCount : store.matchingCount}
+                /> krysset
               </span>
               <span className="flex items-center gap-1">
                 <span className="w-2 h-2 rounded-full bg-yellow-400" />
@@ -643,17 +658,20 @@ export function GeneralLedger() {
       </div>
 
       {/* Kategori-accordion */}
-      <div>
+      <div aria-busy={pending} className={`transition-opacity ${pending && overview ? 'opacity-60' : ''}`}>
         {chartOfAccounts.map(category => (
           <CategoryAccordion
             key={category.id}
             category={category}
             isExpanded={expandedCategories.has(category.id)}
             onToggle={() => toggleCategory(category.id)}
-            entries={filteredEntries}
+            overview={overview}
+            entriesOf={isSummaryMode ? null : view?.entriesOf ?? null}
+            pages={isSummaryMode ? summary.pages : null}
             isCrossingEnabled={isCrossingEnabled}
             onCrossedChange={handleCrossedChange}
             selectedAccountId={accountId}
+            store={shownStore}
           />
         ))}
       </div>
@@ -1,11 +1,22 @@
-import { useState } from 'react';
+import { useMemo, useState } from 'react';
 import { JournalEntry, EntryType } from '../types';
+import { useVirtualRows } from '../hooks/useVirtualRows';
+import { useFormatters } from '../hooks/useFormatters';
+import { useStoredEntry } from '../hooks/useEntryStore';
+import type { EntryStore } from '../lib/entryStore';
+import type { Formatters } from '../lib/formatting';
+import { DocumentThumbnail } from './DocumentThumbnail';
 
 interface JournalEntryTableProps {
   entries: JournalEntry[];
+  // Rader abonnerer på sitt eget bilag i storen, så endringer (f.eks.
+  // kryssing) bare rendrer raden som ble endret
+  store?: EntryStore<JournalEntry>;
   onCrossedChange?: (entryId: string, isCrossed: boolean) => void;
   showAccountColumn?: boolean;
   showCrossingCheckbox?: boolean;
+  // Vindusbasert rendering; standard er på for store bilagslister
+  virtualized?: boolean;
 }
 
 const entryTypeLabels: Record<EntryType, string> = {
@@ -28,13 +39,306 @@ const entryTypeColors: Record<EntryType, string> = {
   adjustment: 'bg-yellow-100 text-yellow-700',
 };
 
+// Over denne grensen rendres bare synlige rader (pluss overscan)
+const VIRTUALIZE_THRESHOLD = 200;
+const ESTIMATED_ROW_HEIGHT = 45;
+
+// Tomme celler for null og 0, som i bilagskolonnene
+const formatCurrency = (format: Formatters, amount: number | null) =>
+  amount === null || amount === 0 ? '' : format.amount(amount);
+
+const totalDebitOf = (entry: JournalEntry) => entry.lines.reduce((sum, line) => sum + (line.debit || 0), 0);
+const totalCreditOf = (entry: JournalEntry) => entry.lines.reduce((sum, line) => sum + (line.credit || 0), 0);
+
+// Ferdigformaterte verdier for én rad, laget samlet for alle synlige rader
+interface EntryRowLabels {
+  date: string;
+  debit: string;
+  credit: string;
+}
+
+interface EntryRowGroupProps {
+  entry: JournalEntry;
+  store?: EntryStore<JournalEntry>;
+  labels: EntryRowLabels;
+  format: Formatters;
+  isExpanded: boolean;
+  onToggle: (entryId: string) => void;
+  onCrossedChange?: (entryId: string, isCrossed: boolean) => void;
+  showAccountColumn: boolean;
+  showCrossingCheckbox: boolean;
+  columnCount: number;
+  measureRef: (element: HTMLElement | null) => void | (() => void);
+}
+
+// Ett bilag med eventuell detaljvisning, samlet i egen <tbody> slik at
+// høyden kan måles i virtualisert modus
+function EntryRowGroup({
+  entry: listedEntry,
+  store,
+  labels,
+  format,
+  isExpanded,
+  onToggle,
+  onCrossedChange,
+  showAccountColumn,
+  showCrossingCheckbox,
+  columnCount,
+  measureRef,
+}: EntryRowGroupProps) {
+  const entry = useStoredEntry(store, listedEntry.entryId, listedEntry);
+  const totalDebit = totalDebitOf(entry);
+  const totalCredit = totalCreditOf(entry);
+  const primaryLine = entry.lines[0];
+
+  return (
+    <tbody ref={measureRef} data-row-key={entry.entryId} className="bg-white divide-y divide-gray-200">
+      <tr
+        className={`hover:bg-gray-50 cursor-pointer transition-colors ${
+          isExpanded ? 'bg-purple-50' : ''
+        } ${entry.isCrossed ? 'bg-green-50/50' : ''}`}
+        onClick={() => onToggle(entry.entryId)}
+      >
+        {showCrossingCheckbox && (
+          <td className="px-3 py-3" onClick={(e) => e.stopPropagation()}>
+            <div className="flex items-center">
+              <input
+                type="checkbox"
+                checked={entry.isCrossed}
+                onChange={(e) => {
+                  onCrossedChange?.(entry.entryId, e.target.checked);
+                }}
+                className="h-4 w-4 rounded border-gray-300 text-purple-600 focus:ring-purple-500"
+              />
+              {entry.isCrossed && (
+                <svg className="w-4 h-4 ml-1 text-green-500" fill="currentColor" viewBox="0 0 20 20">
+                  <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
+                </svg>
+              )}
+            </div>
+          </td>
+        )}
+        <td className="px-2 py-3">
+          <button className="text-gray-400 hover:text-gray-600">
+            <svg
+              className={`w-4 h-4 transition-transform ${isExpanded ? 'rotate-90' : ''}`}
+              fill="none"
+              stroke="currentColor"
+              viewBox="0 0 24 24"
+            >
+              <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 5l7 7-7 7" />
+            </svg>
+          </button>
+        </td>
+        <td className="px-3 py-3 text-sm font-medium text-gray-900">
+          {entry.entryId}
+        </td>
+        <td className="px-3 py-3 text-sm text-gray-600">
+          {labels.date}
+        </td>
+        <td className="px-3 py-3">
+          <span className={`inline-flex px-2 py-0.5 text-xs font-medium rounded ${entryTypeColors[entry.entryType]}`}>
+            {entryTypeLabels[entry.entryType]}
+          </span>
+        </td>
+        {showAccountColumn && (
+          <td className="px-3 py-3 text-sm text-gray-600">
+            {primaryLine && (
+              <span>
+                <span className="font-mono text-gray-900">{primaryLine.accountId}</span>
+                {' '}
+                <span className="text-gray-500">{primaryLine.accountName}</span>
+              </span>
+            )}
+            {entry.lines.length > 1 && (
+              <span className="ml-1 text-xs text-gray-400">
+                (+{entry.lines.length - 1})
+              </span>
+            )}
+          </td>
+        )}
+        <td className="px-3 py-3 text-sm text-gray-600 max-w-xs truncate">
+          {primaryLine?.description || entry.reference || '—'}
+        </td>
+        <td className="px-3 py-3 text-sm text-right font-mono text-gray-900">
+          {labels.debit}
+        </td>
+        <td className="px-3 py-3 text-sm text-right font-mono text-gray-900">
+          {labels.credit}
+        </td>
+        <td className="px-3 py-3 text-center">
+          {entry.isOpen ? (
+            <span className="inline-flex items-center gap-1 px-2 py-0.5 text-xs font-medium rounded-full bg-yellow-100 text-yellow-700">
+              <span className="w-1.5 h-1.5 rounded-full bg-yellow-500" />
+              Åpen
+            </span>
+          ) : (
+            <span className="inline-flex items-center gap-1 px-2 py-0.5 text-xs font-medium rounded-full bg-gray-100 text-gray-600">
+              Lukket
+            </span>
+          )}
+        </td>
+        <td className="px-3 py-3 text-center">
+          {entry.documentUrl ? (
+            <a
+              href={entry.documentUrl}
+              target="_blank"
+              rel="noopener noreferrer"
+              onClick={(e) => e.stopPropagation()}
+              className="inline-flex items-center text-purple-600 hover:text-purple-800"
+              title="Vis dokument"
+            >
+              <DocumentThumbnail url={entry.documentUrl} />
+            </a>
+          ) : (
+            <span className="text-gray-300">—</span>
+          )}
+        </td>
+      </tr>
+
+      {isExpanded && (
+        <tr>
+          <td colSpan={columnCount} className="px-0 py-0">
+            <div className="bg-gray-50 border-l-4 border-purple-400 mx-4 my-2 rounded-r shadow-sm">
+              <div className="px-4 py-3">
+                <div className="flex flex-wrap gap-x-6 gap-y-2 text-sm text-gray-600 mb-4 pb-3 border-b border-gray-200">
+                  <div>
+                    <span className="text-gray-500">Opprettet:</span>{' '}
+                    <span className="text-gray-900">{format.date(entry.createdAt)}</span>
+                  </div>
+                  <div>
+                    <span className="text-gray-500">Av:</span>{' '}
+                    <span className="text-gray-900">{entry.createdBy}</span>
+                  </div>
+                  {entry.reference && (
+                    <div>
+                      <span className="text-gray-500">Referanse:</span>{' '}
+                      <span className="text-gray-900">{entry.reference}</span>
+                    </div>
+                  )}
+                  {entry.customerSupplierId && (
+                    <div>
+                      <span className="text-gray-500">Kunde/Lev.:</span>{' '}
+                      <span className="text-gray-900">{entry.customerSupplierId}</span>
+                    </div>
+                  )}
+                  {entry.projectId && (
+                    <div>
+                      <span className="text-gray-500">Prosjekt:</span>{' '}
+                      <span className="text-gray-900">{entry.projectId}</span>
+                    </div>
+                  )}
+                </div>
+
+                <table className="min-w-full divide-y divide-gray-200 border border-gray-200 rounded-lg overflow-hidden">
+                  <thead className="bg-gray-100">
+                    <tr>
+                      <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase w-16">
+                        Linje
+                      </th>
+                      <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase">
+                        Konto
+                      </th>
+                      <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase">
+                        Beskrivelse
+                      </th>
+                      <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase w-20">
+                        MVA
+                      </th>
+                      <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-24">
+                        MVA-beløp
+                      </th>
+                      <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-28">
+                        Debet
+                      </th>
+                      <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-28">
+                        Kredit
+                      </th>
+                    </tr>
+                  </thead>
+                  <tbody className="bg-white divide-y divide-gray-200">
+                    {entry.lines.map((line) => (
+                      <tr key={line.lineId} className="hover:bg-gray-50">
+                        <td className="px-3 py-2 text-sm text-gray-500 font-mono">
+                          {line.lineId}
+                        </td>
+                        <td className="px-3 py-2 text-sm">
+                          <span className="font-mono text-gray-900">{line.accountId}</span>
+                          {' '}
+                          <span className="text-gray-500">{line.accountName}</span>
+                        </td>
+                        <td className="px-3 py-2 text-sm text-gray-600">
+                          {line.description || '—'}
+                        </td>
+                        <td className="px-3 py-2 text-sm text-gray-600 font-mono">
+                          {line.vatCode !== '0' ? line.vatCode : '—'}
+                        </td>
+                        <td className="px-3 py-2 text-sm text-right font-mono text-gray-600">
+                          {line.vatAmount > 0 ? formatCurrency(format, line.vatAmount) : '—'}
+                        </td>
+                        <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
+                          {formatCurrency(format, line.debit)}
+                        </td>
+                        <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
+                          {formatCurrency(format, line.credit)}
+                        </td>
+                      </tr>
+                    ))}
+                    <tr className="bg-gray-50 font-medium">
+                      <td colSpan={5} className="px-3 py-2 text-sm text-right text-gray-700">
+                        Sum:
+                      </td>
+                      <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
+                        {formatCurrency(format, totalDebit)}
+                      </td>
+                      <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
+                        {formatCurrency(format, totalCredit)}
+                      </td>
+                    </tr>
+                  </tbody>
+                </table>
+              </div>
+            </div>
+          </td>
+        </tr>
+      )}
+    </tbody>
+  );
+}
+
 export function JournalEntryTable({
   entries,
+  store,
   onCrossedChange,
   showAccountColumn = true,
   showCrossingCheckbox = false,
+  virtualized,
 }: JournalEntryTableProps) {
   const [expandedEntries, setExpandedEntries] = useState<Set<string>>(new Set());
+  const isVirtualized = virtualized ?? entries.length > VIRTUALIZE_THRESHOLD;
+
+  const entryIds = useMemo(() => entries.map((entry) => entry.entryId), [entries]);
+  const { containerRef, onScroll, measureRef, range } = useVirtualRows({
+    keys: entryIds,
+    enabled: isVirtualized,
+    estimatedRowHeight: ESTIMATED_ROW_HEIGHT,
+  });
+
+  // Formater alle synlige rader i ett kall; verdiene caches i formatteren
+  const format = useFormatters();
+  const rowLabels = useMemo(() => {
+    const page = entries.slice(range.start, range.end);
+    const debits = page.map(totalDebitOf);
+    const credits = page.map(totalCreditOf);
+    const dates = format.dates(page.map((entry) => entry.date));
+    const debitLabels = format.amounts(debits);
+    const creditLabels = format.amounts(credits);
+    return page.map((_, i): EntryRowLabels => ({
+      date: dates[i],
+      debit: debits[i] === 0 ? '' : debitLabels[i],
+      credit: credits[i] === 0 ? '' : creditLabels[i],
+    }));
+  }, [entries, range.start, range.end, format]);
 
   const toggleExpand = (entryId: string) => {
     setExpandedEntries((prev) => {
@@ -48,23 +352,7 @@ export function JournalEntryTable({
     });
   };
 
-  const formatDate = (dateString: string) => {
-    const date = new Date(dateString);
-    return date.toLocaleDateString('nb-NO', {
-      day: '2-digit',
-      month: '2-digit',
-      year: 'numeric',
-    });
-  };
-
-  const formatCurrency = (amount: number | null) => {
-    if (amount === null || amount === 0) return '';
-    return new Intl.NumberFormat('nb-NO', {
-      style: 'decimal',
-      minimumFractionDigits: 2,
-      maximumFractionDigits: 2,
-    }).format(amount);
-  };
+  const columnCount = 9 + (showCrossingCheckbox ? 1 : 0) + (showAccountColumn ? 1 : 0);
 
   if (entries.length === 0) {
     return (
@@ -75,9 +363,14 @@ export function JournalEntryTable({
   }
 
   return (
-    <div className="overflow-x-auto">
+    <div
+      ref={containerRef}
+      onScroll={isVirtualized ? onScroll : undefined}
+      tabIndex={isVirtualized ? 0 : undefined}
+      className={isVirtualized ? 'overflow-auto max-h-[600px] focus:outline-none focus:ring-2 focus:ring-purple-300 rounded' : 'overflow-x-auto'}
+    >
       <table className="min-w-full divide-y divide-gray-200">
-        <thead className="bg-gray-50">
+        <thead className={`bg-gray-50 ${isVirtualized ? 'sticky top-0 z-10 shadow-sm' : ''}`}>
           <tr>
             {showCrossingCheckbox && (
               <th scope="col" className="w-10 px-3 py-3">
@@ -118,231 +411,36 @@ export function JournalEntryTable({
             </th>
           </tr>
         </thead>
-        <tbody className="bg-white divide-y divide-gray-200">
-          {entries.map((entry) => {
-            const isExpanded = expandedEntries.has(entry.entryId);
-            const totalDebit = entry.lines.reduce((sum, line) => sum + (line.debit || 0), 0);
-            const totalCredit = entry.lines.reduce((sum, line) => sum + (line.credit || 0), 0);
-            const primaryLine = entry.lines[0];
-
-            return (
-              <>
-                <tr
-                  key={entry.entryId}
-                  className={`hover:bg-gray-50 cursor-pointer transition-colors ${
-                    isExpanded ? 'bg-purple-50' : ''
-                  } ${entry.isCrossed ? 'bg-green-50/50' : ''}`}
-                  onClick={() => toggleExpand(entry.entryId)}
-                >
-                  {showCrossingCheckbox && (
-                    <td className="px-3 py-3" onClick={(e) => e.stopPropagation()}>
-                      <div className="flex items-center">
-                        <input
-                          type="checkbox"
-                          checked={entry.isCrossed}
-                          onChange={(e) => {
-                            onCrossedChange?.(entry.entryId, e.target.checked);
-                          }}
-                          className="h-4 w-4 rounded border-gray-300 text-purple-600 focus:ring-purple-500"
-                        />
-                        {entry.isCrossed && (
-                          <svg className="w-4 h-4 ml-1 text-green-500" fill="currentColor" viewBox="0 0 20 20">
-                            <path fillRule="evenodd" d="M16.707 5.293a1 1 0 010 1.414l-8 8a1 1 0 01-1.414 0l-4-4a1 1 0 011.414-1.414L8 12.586l7.293-7.293a1 1 0 011.414 0z" clipRule="evenodd" />
-                          </svg>
-                        )}
-                      </div>
-                    </td>
-                  )}
-                  <td className="px-2 py-3">
-                    <button className="text-gray-400 hover:text-gray-600">
-                      <svg
-                        className={`w-4 h-4 transition-transform ${isExpanded ? 'rotate-90' : ''}`}
-                        fill="none"
-                        stroke="currentColor"
-                        viewBox="0 0 24 24"
-                      >
-                        <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 5l7 7-7 7" />
-                      </svg>
-                    </button>
-                  </td>
-                  <td className="px-3 py-3 text-sm font-medium text-gray-900">
-                    {entry.entryId}
-                  </td>
-                  <td className="px-3 py-3 text-sm text-gray-600">
-                    {formatDate(entry.date)}
-                  </td>
-                  <td className="px-3 py-3">
-                    <span className={`inline-flex px-2 py-0.5 text-xs font-medium rounded ${entryTypeColors[entry.entryType]}`}>
-                      {entryTypeLabels[entry.entryType]}
-                    </span>
-                  </td>
-                  {showAccountColumn && (
-                    <td className="px-3 py-3 text-sm text-gray-600">
-                      {primaryLine && (
-                        <span>
-                          <span className="font-mono text-gray-900">{primaryLine.accountId}</span>
-                          {' '}
-                          <span className="text-gray-500">{primaryLine.accountName}</span>
-                        </span>
-                      )}
-                      {entry.lines.length > 1 && (
-                        <span className="ml-1 text-xs text-gray-400">
-                          (+{entry.lines.length - 1})
-                        </span>
-                      )}
-                    </td>
-                  )}
-                  <td className="px-3 py-3 text-sm text-gray-600 max-w-xs truncate">
-                    {primaryLine?.description || entry.reference || '—'}
-                  </td>
-                  <td className="px-3 py-3 text-sm text-right font-mono text-gray-900">
-                    {formatCurrency(totalDebit)}
-                  </td>
-                  <td className="px-3 py-3 text-sm text-right font-mono text-gray-900">
-                    {formatCurrency(totalCredit)}
-                  </td>
-                  <td className="px-3 py-3 text-center">
-                    {entry.isOpen ? (
-                      <span className="inline-flex items-center gap-1 px-2 py-0.5 text-xs font-medium rounded-full bg-yellow-100 text-yellow-700">
-                        <span className="w-1.5 h-1.5 rounded-full bg-yellow-500" />
-                        Åpen
-                      </span>
-                    ) : (
-                      <span className="inline-flex items-center gap-1 px-2 py-0.5 text-xs font-medium rounded-full bg-gray-100 text-gray-600">
-                        Lukket
-                      </span>
-                    )}
-                  </td>
-                  <td className="px-3 py-3 text-center">
-                    {entry.documentUrl ? (
-                      <a
-                        href={entry.documentUrl}
-                        target="_blank"
-                        rel="noopener noreferrer"
-                        onClick={(e) => e.stopPropagation()}
-                        className="inline-flex items-center text-purple-600 hover:text-purple-800"
-                        title="Vis dokument"
-                      >
-                        <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                          <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
-                        </svg>
-                      </a>
-                    ) : (
-                      <span className="text-gray-300">—</span>
-                    )}
-                  </td>
-                </tr>
-
-                {isExpanded && (
-                  <tr key={`${entry.entryId}-details`}>
-                    <td colSpan={showCrossingCheckbox ? (showAccountColumn ? 12 : 11) : (showAccountColumn ? 11 : 10)} className="px-0 py-0">
-                      <div className="bg-gray-50 border-l-4 border-purple-400 mx-4 my-2 rounded-r shadow-sm">
-                        <div className="px-4 py-3">
-                          <div className="flex flex-wrap gap-x-6 gap-y-2 text-sm text-gray-600 mb-4 pb-3 border-b border-gray-200">
-                            <div>
-                              <span className="text-gray-500">Opprettet:</span>{' '}
-                              <span className="text-gray-900">{formatDate(entry.createdAt)}</span>
-                            </div>
-                            <div>
-                              <span className="text-gray-500">Av:</span>{' '}
-                              <span className="text-gray-900">{entry.createdBy}</span>
-                            </div>
-                            {entry.reference && (
-                              <div>
-                                <span className="text-gray-500">Referanse:</span>{' '}
-                                <span className="text-gray-900">{entry.reference}</span>
-                              </div>
-                            )}
-                            {entry.customerSupplierId && (
-                              <div>
-                                <span className="text-gray-500">Kunde/Lev.:</span>{' '}
-                                <span className="text-gray-900">{entry.customerSupplierId}</span>
-                              </div>
-                            )}
-                            {entry.projectId && (
-                              <div>
-                                <span className="text-gray-500">Prosjekt:</span>{' '}
-                                <span className="text-gray-900">{entry.projectId}</span>
-                              </div>
-                            )}
-                          </div>
-
-                          <table className="min-w-full divide-y divide-gray-200 border border-gray-200 rounded-lg overflow-hidden">
-                            <thead className="bg-gray-100">
-                              <tr>
-                                <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase w-16">
-                                  Linje
-                                </th>
-                                <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase">
-                                  Konto
-                                </th>
-                                <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase">
-                                  Beskrivelse
-                                </th>
-                                <th className="px-3 py-2 text-left text-xs font-medium text-gray-500 uppercase w-20">
-                                  MVA
-                                </th>
-                                <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-24">
-                                  MVA-beløp
-                                </th>
-                                <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-28">
-                                  Debet
-                                </th>
-                                <th className="px-3 py-2 text-right text-xs font-medium text-gray-500 uppercase w-28">
-                                  Kredit
-                                </th>
-                              </tr>
-                            </thead>
-                            <tbody className="bg-white divide-y divide-gray-200">
-                              {entry.lines.map((line) => (
-                                <tr key={line.lineId} className="hover:bg-gray-50">
-                                  <td className="px-3 py-2 text-sm text-gray-500 font-mono">
-                                    {line.lineId}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm">
-                                    <span className="font-mono text-gray-900">{line.accountId}</span>
-                                    {' '}
-                                    <span className="text-gray-500">{line.accountName}</span>
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-gray-600">
-                                    {line.description || '—'}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-gray-600 font-mono">
-                                    {line.vatCode !== '0' ? line.vatCode : '—'}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-right font-mono text-gray-600">
-                                    {line.vatAmount > 0 ? formatCurrency(line.vatAmount) : '—'}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
-                                    {formatCurrency(line.debit)}
-                                  </td>
-                                  <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
-                                    {formatCurrency(line.credit)}
-                                  </td>
-                                </tr>
-                              ))}
-                              <tr className="bg-gray-50 font-medium">
-                                <td colSpan={5} className="px-3 py-2 text-sm text-right text-gray-700">
-                                  Sum:
-                                </td>
-                                <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
-                                  {formatCurrency(totalDebit)}
-                                </td>
-                                <td className="px-3 py-2 text-sm text-right font-mono text-gray-900">
-                                  {formatCurrency(totalCredit)}
-                                </td>
-                              </tr>
-                            </tbody>
-                          </table>
-                        </div>
-                      </div>
-                    </td>
-                  </tr>
-                )}
-              </>
-            );
-          })}
-        </tbody>
+        {range.paddingTop > 0 && (
+          <tbody aria-hidden="true">
+            <tr style={{ height: range.paddingTop }}>
+              <td colSpan={columnCount} className="p-0" />
+            </tr>
+          </tbody>
+        )}
+        {entries.slice(range.start, range.end).map((entry, i) => (
+          <EntryRowGroup
+            key={entry.entryId}
+            entry={entry}
+            store={store}
+            labels={rowLabels[i]}
+            format={format}
+            isExpanded={expandedEntries.has(entry.entryId)}
+            onToggle={toggleExpand}
+            onCrossedChange={onCrossedChange}
+            showAccountColumn={showAccountColumn}
+            showCrossingCheckbox={showCrossingCheckbox}
+            columnCount={columnCount}
+            measureRef={measureRef}
+          />
+        ))}
+        {range.paddingBottom > 0 && (
+          <tbody aria-hidden="true">
+            <tr style={{ height: range.paddingBottom }}>
+              <td colSpan={columnCount} className="p-0" />
+            </tr>
+          </tbody>
+        )}
       </table>
     </div>
   );
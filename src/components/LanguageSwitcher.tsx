@@ -1,24 +1,32 @@
+import { useState } from 'react';
 import { useTranslation } from 'react-i18next';
+import { supportedLanguages } from '../i18n/config';
 
 export function LanguageSwitcher() {
   const { i18n, t } = useTranslation();
+  // Language being loaded; the UI keeps the current language until it is ready
+  const [pendingLanguage, setPendingLanguage] = useState<string | null>(null);
 
   const changeLanguage = (lng: string) => {
-    i18n.changeLanguage(lng);
+    setPendingLanguage(lng);
+    // changeLanguage() loads every namespace in use for the new language before switching
+    i18n.changeLanguage(lng).finally(() => {
+      setPendingLanguage((current) => (current === lng ? null : current));
+    });
   };
 
   return (
     <div className="flex items-center space-x-2">
       <span className="text-sm text-gray-600">{t('common.language')}:</span>
       <select
-        value={i18n.language}
+        value={pendingLanguage ?? i18n.resolvedLanguage}
         onChange={(e) => changeLanguage(e.target.value)}
+        aria-busy={pendingLanguage !== null}
         className="text-sm border border-gray-300 rounded px-2 py-1 bg-white text-gray-700 focus:outline-none focus:ring-2 focus:ring-blue-500"
       >
-        <option value="no">{t('languages.no')}</option>
-        <option value="en">{t('languages.en')}</option>
-        <option value="pl">{t('languages.pl')}</option>
-        <option value="uk">{t('languages.uk')}</option>
+        {supportedLanguages.map((lng) => (
+          <option key={lng} value={lng}>{t(`languages.${lng}`)}</option>
+        ))}
       </select>
     </div>
   );
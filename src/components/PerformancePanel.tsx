@@ -0,0 +1,114 @@
+import { useEffect, useState } from 'react';
+import { useTranslation } from 'react-i18next';
+import { instrumentation, loadInstrumentationSettings, summarize, type Measurement } from '../lib/instrumentation';
+import { changeInstrumentationSettings } from '../services/performance';
+
+// How often the panel re-reads the measurement buffer
+const REFRESH_MS = 1000;
+
+const formatMs = (value: number) => value.toFixed(1);
+
+/**
+ * Hidden debug panel for the performance instrumentation, opened with
+ * Ctrl+Alt+P (see App.tsx). Shows the buffered measurements per name and
+ * turns recording and the beacon on or off.
+ */
+export default function PerformancePanel({ onClose }: { onClose: () => void }) {
+  const { t } = useTranslation();
+  const [settings, setSettings] = useState(loadInstrumentationSettings);
+  const [measurements, setMeasurements] = useState<Measurement[]>(() => instrumentation.entries());
+
+  useEffect(() => {
+    const timer = setInterval(() => setMeasurements(instrumentation.entries()), REFRESH_MS);
+    return () => clearInterval(timer);
+  }, []);
+
+  const changeSettings = (next: typeof settings) => {
+    changeInstrumentationSettings(next);
+    setSettings(next);
+  };
+
+  const clear = () => {
+    instrumentation.clear();
+    setMeasurements([]);
+  };
+
+  const copy = () => {
+    navigator.clipboard?.writeText(JSON.stringify(measurements, null, 2)).catch(() => undefined);
+  };
+
+  const summaries = summarize(measurements);
+
+  return (
+    <div className="fixed bottom-4 right-4 z-50 w-[36rem] max-h-[70vh] overflow-auto bg-white border border-gray-300 rounded-lg shadow-xl text-sm">
+      <div className="flex items-center justify-between px-4 py-2 border-b border-gray-200 bg-gray-50">
+        <h2 className="font-semibold text-gray-900">{t('performance.title')}</h2>
+        <button onClick={onClose} className="text-gray-500 hover:text-gray-900">
+          {t('performance.close')}
+        </button>
+      </div>
+
+      <div className="px-4 py-3 space-y-2 border-b border-gray-200">
+        <label className="flex items-center gap-2">
+          <input
+            type="checkbox"
+            checked={settings.enabled}
+            onChange={(e) => changeSettings({ ...settings, enabled: e.target.checked })}
+          />
+          {t('performance.record')}
+        </label>
+        <label className="flex items-center gap-2">
+          <input
+            type="checkbox"
+            checked={settings.beacon}
+            disabled={!settings.enabled}
+            onChange={(e) => changeSettings({ ...settings, beacon: e.target.checked })}
+          />
+          {t('performance.beacon')}
+        </label>
+        <p className="text-xs text-gray-500">{t('performance.reloadHint')}</p>
+      </div>
+
+      {summaries.length === 0 ? (
+        <p className="px-4 py-3 text-gray-500">{t('performance.empty')}</p>
+      ) : (
+        <table className="w-full">
+          <thead className="bg-gray-50 text-xs text-gray-600">
+            <tr>
+              <th className="px-4 py-1 text-left">{t('performance.measurement')}</th>
+              <th className="px-2 py-1 text-right">{t('performance.count')}</th>
+              <th className="px-2 py-1 text-right">{t('performance.median')}</th>
+              <th className="px-2 py-1 text-right">{t('performance.p95')}</th>
+              <th className="px-4 py-1 text-right">{t('performance.max')}</th>
+            </tr>
+          </thead>
+          <tbody className="font-mono text-xs">
+            {summaries.map((summary) => (
+              <tr key={summary.name} className="border-t border-gray-100">
+                <td className="px-4 py-1">{summary.name}</td>
+                <td className="px-2 py-1 text-right">{summary.count}</td>
+                <td className="px-2 py-1 text-right">{formatMs(summary.p50)}</td>
+                <td className="px-2 py-1 text-right">{formatMs(summary.p95)}</td>
+                <td className="px-4 py-1 text-right">{formatMs(summary.max)}</td>
+              </tr>
+            ))}
+          </tbody>
+        </table>
+      )}
+
+      <div className="flex gap-2 px-4 py-2 border-t border-gray-200">
+        <button onClick={clear} className="px-3 py-1 rounded border border-gray-300 hover:bg-gray-50">
+          {t('performance.clear')}
+        </button>
+        <button onClick={copy} className="px-3 py-1 rounded border border-gray-300 hover:bg-gray-50">
+          {t('performance.copy')}
+        </button>
+        {settings.enabled && settings.beacon && (
+          <button onClick={() => instrumentation.flush()} className="px-3 py-1 rounded border border-gray-300 hover:bg-gray-50">
+            {t('performance.send')}
+          </button>
+        )}
+      </div>
+    </div>
+  );
+}
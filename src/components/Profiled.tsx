@@ -0,0 +1,19 @@
+import { Profiler, useState, type ReactNode } from 'react';
+import { instrumentation } from '../lib/instrumentation';
+
+/**
+ * Records render timings of `children` as `render.<id>` when instrumentation
+ * is on. Whether to profile is decided once, at mount, so turning
+ * instrumentation on later does not remount the subtree; without it the
+ * children render with no Profiler at all.
+ */
+export function Profiled({ id, children }: { id: string; children: ReactNode }) {
+  const [enabled] = useState(() => instrumentation.enabled);
+
+  if (!enabled) return children;
+  return (
+    <Profiler id={id} onRender={instrumentation.recordRender}>
+      {children}
+    </Profiler>
+  );
+}
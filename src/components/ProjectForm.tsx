@@ -11,7 +11,7 @@ interface ProjectFormProps {
 }
 
 const ProjectForm: React.FC<ProjectFormProps> = ({ project, onSuccess, onCancel }) => {
-  const { t } = useTranslation();
+  const { t } = useTranslation('settings');
   const [formData, setFormData] = useState<Omit<Project, 'id' | 'createdAt' | 'updatedAt'>>({
     code: '',
     name: '',
@@ -74,10 +74,11 @@ const ProjectForm: React.FC<ProjectFormProps> = ({ project, onSuccess, onCancel
 
     setSubmitting(true);
     try {
-      if (project?.id) {
-        await apiService.updateProject(project.id, formData);
-      } else {
-        await apiService.createProject(formData);
+      const result = await apiService.projectMutations.enqueue(
+        project?.id ? { op: 'update', id: project.id, data: formData } : { op: 'create', data: formData }
+      );
+      if (!result.ok) {
+        throw result.error ?? {};
       }
       onSuccess();
     } catch (err: any) {
@@ -2,20 +2,36 @@ import { useEffect, useState } from 'react';
 import { useTranslation } from 'react-i18next';
 import type { Project } from '../types';
 import { apiService } from '../services/api';
+import { applyBatchResults } from '../services/mutationQueue';
+import { applyChanges } from '../services/changeEvents';
+import { useFormatters } from '../hooks/useFormatters';
+import { usePageReady } from '../hooks/usePageReady';
+import { useLiveChanges } from '../hooks/useLiveChanges';
 import ProjectForm from './ProjectForm';
 
 const ProjectList: React.FC = () => {
-  const { t } = useTranslation();
-  const [projects, setProjects] = useState<Project[]>([]);
-  const [loading, setLoading] = useState(true);
+  const { t } = useTranslation('settings');
+  const format = useFormatters();
+  // Start from cached data so switching tabs doesn't flash the loading state
+  const [projects, setProjects] = useState<Project[]>(() => apiService.getCachedProjects() ?? []);
+  const [loading, setLoading] = useState(() => !apiService.getCachedProjects());
   const [error, setError] = useState<string | null>(null);
   const [editingProject, setEditingProject] = useState<Project | null>(null);
   const [showForm, setShowForm] = useState(false);
+  usePageReady('projects', !loading);
 
   const loadProjects = async () => {
     try {
-      setLoading(true);
+      setLoading(!apiService.getCachedProjects());
       setError(null);
+      // On a fresh page load, show the offline copy while the changes since the last visit load
+      if (!apiService.getCachedProjects()) {
+        const offline = await apiService.getOfflineProjects();
+        if (offline) {
+          setProjects(offline);
+          setLoading(false);
+        }
+      }
       const data = await apiService.getProjects();
       setProjects(data);
     } catch (err: any) {
@@ -29,6 +45,20 @@ const ProjectList: React.FC = () => {
     loadProjects();
   }, []);
 
+  useEffect(() => apiService.onProjectsChange(setProjects), []);
+
+  // Apply batched create/update/delete results locally instead of refetching
+  useEffect(
+    () => apiService.projectMutations.subscribe(batch => setProjects(prev => applyBatchResults(prev, batch))),
+    []
+  );
+
+  // Changes made by others (and echoes of our own) are patched in as they are pushed
+  useLiveChanges('projects', ({ changes, reset }) => {
+    if (reset) loadProjects();
+    else setProjects(prev => applyChanges(prev, changes));
+  });
+
   const handleEdit = (project: Project) => {
     setEditingProject(project);
     setShowForm(true);
@@ -40,17 +70,18 @@ const ProjectList: React.FC = () => {
     }
 
     try {
-      await apiService.deleteProject(id);
-      await loadProjects();
+      const result = await apiService.projectMutations.enqueue({ op: 'delete', id });
+      if (!result.ok) {
+        throw result.error ?? {};
+      }
     } catch (err: any) {
       setError(err.message || t('projects.error.delete'));
     }
   };
 
-  const handleFormSuccess = async () => {
+  const handleFormSuccess = () => {
     setShowForm(false);
     setEditingProject(null);
-    await loadProjects();
   };
 
   const handleFormCancel = () => {
@@ -63,10 +94,6 @@ const ProjectList: React.FC = () => {
     setShowForm(true);
   };
 
-  const formatDate = (dateString: string) => {
-    return new Date(dateString).toLocaleDateString();
-  };
-
   const getStatusColor = (status: string) => {
     const colors: Record<string, string> = {
       ACTIVE: 'bg-green-100 text-green-800',
@@ -160,8 +187,8 @@ const ProjectList: React.FC = () => {
                     {project.description}
                   </td>
                   <td className="px-6 py-6 whitespace-nowrap text-sm text-gray-500">
-                    <div>{formatDate(project.startDate)}</div>
-                    <div>{formatDate(project.endDate)}</div>
+                    <div>{format.date(project.startDate)}</div>
+                    <div>{format.date(project.endDate)}</div>
                   </td>
                   <td className="px-6 py-6 whitespace-nowrap text-sm">
                     <span
@@ -0,0 +1,88 @@
+import type { JournalEntry } from '../types';
+
+// Demo-data for visning i hovedboken og rapportene når backend ikke har bilag
+export const generateMockEntries = (): JournalEntry[] => {
+  return [
+    {
+      entryId: 'B-2024-001',
+      entryType: 'sale',
+      date: '2024-01-15',
+      customerSupplierId: 'K-001',
+      reference: 'Faktura 1001',
+      createdAt: '2024-01-15T10:30:00',
+      createdBy: 'Ole Hansen',
+      isCrossed: false,
+      isOpen: false,
+      projectId: 'P-001',
+      lines: [
+        { lineId: '1', accountId: '1500', accountName: 'Kundefordringer', debit: 12500, credit: null, amount: 12500, vatCode: '0', vatAmount: 0, description: 'Faktura til kunde' },
+        { lineId: '2', accountId: '3000', accountName: 'Salgsinntekt', debit: null, credit: 10000, amount: 10000, vatCode: '1', vatAmount: 2500, description: 'Salg av konsulenttjenester' },
+        { lineId: '3', accountId: '2700', accountName: 'Utgående MVA', debit: null, credit: 2500, amount: 2500, vatCode: '1', vatAmount: 2500, description: 'MVA 25%' },
+      ],
+    },
+    {
+      entryId: 'B-2024-002',
+      entryType: 'purchase',
+      date: '2024-01-18',
+      customerSupplierId: 'L-005',
+      reference: 'Leverandørfaktura 5521',
+      documentUrl: '/documents/receipts/5521.pdf',
+      createdAt: '2024-01-18T14:15:00',
+      createdBy: 'Kari Olsen',
+      isCrossed: true,
+      isOpen: false,
+      lines: [
+        { lineId: '1', accountId: '6800', accountName: 'Kontorrekvisita', debit: 2400, credit: null, amount: 2400, vatCode: '3', vatAmount: 600, description: 'Kontormateriell' },
+        { lineId: '2', accountId: '2710', accountName: 'Inngående MVA', debit: 600, credit: null, amount: 600, vatCode: '3', vatAmount: 600, description: 'MVA 25%' },
+        { lineId: '3', accountId: '2400', accountName: 'Leverandørgjeld', debit: null, credit: 3000, amount: 3000, vatCode: '0', vatAmount: 0, description: 'Skyldig leverandør' },
+      ],
+    },
+    {
+      entryId: 'B-2024-003',
+      entryType: 'bank',
+      date: '2024-01-20',
+      reference: 'Bankoverføring',
+      createdAt: '2024-01-20T09:00:00',
+      createdBy: 'System',
+      isCrossed: false,
+      isOpen: true,
+      lines: [
+        { lineId: '1', accountId: '1920', accountName: 'Bankinnskudd', debit: 12500, credit: null, amount: 12500, vatCode: '0', vatAmount: 0, description: 'Innbetaling fra kunde' },
+        { lineId: '2', accountId: '1500', accountName: 'Kundefordringer', debit: null, credit: 12500, amount: 12500, vatCode: '0', vatAmount: 0, description: 'Motregning kundefordring' },
+      ],
+    },
+    {
+      entryId: 'B-2024-004',
+      entryType: 'salary',
+      date: '2024-01-31',
+      reference: 'Lønnskjøring januar',
+      createdAt: '2024-01-31T12:00:00',
+      createdBy: 'Kari Olsen',
+      isCrossed: false,
+      isOpen: false,
+      lines: [
+        { lineId: '1', accountId: '5000', accountName: 'Lønn', debit: 45000, credit: null, amount: 45000, vatCode: '0', vatAmount: 0, description: 'Bruttolønn' },
+        { lineId: '2', accountId: '5400', accountName: 'Arbeidsgiveravgift', debit: 6345, credit: null, amount: 6345, vatCode: '0', vatAmount: 0, description: 'AGA 14.1%' },
+        { lineId: '3', accountId: '2600', accountName: 'Skattetrekk', debit: null, credit: 13500, amount: 13500, vatCode: '0', vatAmount: 0, description: 'Forskuddstrekk' },
+        { lineId: '4', accountId: '2770', accountName: 'Skyldig AGA', debit: null, credit: 6345, amount: 6345, vatCode: '0', vatAmount: 0, description: 'Skyldig arbeidsgiveravgift' },
+        { lineId: '5', accountId: '2920', accountName: 'Skyldig lønn', debit: null, credit: 31500, amount: 31500, vatCode: '0', vatAmount: 0, description: 'Nettolønn til utbetaling' },
+      ],
+    },
+    {
+      entryId: 'B-2024-005',
+      entryType: 'purchase',
+      date: '2024-02-05',
+      customerSupplierId: 'L-012',
+      reference: 'Faktura 8842',
+      createdAt: '2024-02-05T11:00:00',
+      createdBy: 'Ole Hansen',
+      isCrossed: false,
+      isOpen: true,
+      lines: [
+        { lineId: '1', accountId: '6940', accountName: 'Lisenser og programvare', debit: 4800, credit: null, amount: 4800, vatCode: '3', vatAmount: 1200, description: 'Årsabonnement regnskapssystem' },
+        { lineId: '2', accountId: '2710', accountName: 'Inngående MVA', debit: 1200, credit: null, amount: 1200, vatCode: '3', vatAmount: 1200, description: 'MVA 25%' },
+        { lineId: '3', accountId: '2400', accountName: 'Leverandørgjeld', debit: null, credit: 6000, amount: 6000, vatCode: '0', vatAmount: 0, description: 'Skyldig leverandør' },
+      ],
+    },
+  ];
+};
@@ -0,0 +1,53 @@
+import { useCallback, useRef } from 'react';
+import type { EntryStore } from '../lib/entryStore';
+import { apiService } from '../services/api';
+import type { JournalEntry } from '../types';
+
+/**
+ * Crossing with optimistic updates. The new state shows at once and is sent
+ * through `apiService.crossingMutations`, which batches crossings and merges
+ * repeated toggles of one entry. When the backend rejects a crossing the
+ * entry goes back to the last state the backend confirmed.
+ *
+ * With `persist` false (demo data) crossings stay local.
+ */
+export function useCrossing(
+  store: EntryStore<JournalEntry>,
+  updateEntry: (entryId: string, entry: JournalEntry) => void,
+  persist: boolean
+) {
+  // Per entry with crossings in flight: the last confirmed state and the
+  // number of the latest change
+  const confirmed = useRef(new Map<string, boolean>());
+  const latest = useRef(new Map<string, number>());
+  const sequence = useRef(0);
+
+  return useCallback((entryId: string, isCrossed: boolean) => {
+    const entry = store.get(entryId);
+    if (!entry || entry.isCrossed === isCrossed) return;
+    updateEntry(entryId, { ...entry, isCrossed });
+    if (!persist) return;
+
+    if (!confirmed.current.has(entryId)) confirmed.current.set(entryId, entry.isCrossed);
+    const change = ++sequence.current;
+    latest.current.set(entryId, change);
+
+    apiService.crossingMutations.enqueue({ op: 'update', id: entryId, data: { isCrossed } }).then(result => {
+      const isLatest = latest.current.get(entryId) === change;
+      if (result.ok && !isLatest) {
+        // A newer change is still on its way; remember what the backend has
+        confirmed.current.set(entryId, isCrossed);
+        return;
+      }
+      if (!isLatest) return;
+
+      const rollbackTo = confirmed.current.get(entryId);
+      confirmed.current.delete(entryId);
+      latest.current.delete(entryId);
+      const current = store.get(entryId);
+      if (!result.ok && current && rollbackTo !== undefined && current.isCrossed !== rollbackTo) {
+        updateEntry(entryId, { ...current, isCrossed: rollbackTo });
+      }
+    });
+  }, [store, updateEntry, persist]);
+}
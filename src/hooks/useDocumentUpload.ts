@@ -0,0 +1,46 @@
+import { useCallback, useEffect, useState } from 'react';
+import { uploadDocument, type UploadProgress, type UploadResult } from '../services/documentUpload';
+
+interface UploadState {
+  progress: UploadProgress | null;
+  result: UploadResult | null;
+  failed: boolean;
+}
+
+const IDLE: UploadState = { progress: null, result: null, failed: false };
+
+/**
+ * Uploads `file` in the background as soon as it is picked, so the upload
+ * runs while the rest of the wizard is filled in. Picking another file (or
+ * none) aborts the running upload. `retry` resumes a failed upload where it
+ * stopped.
+ */
+export function useDocumentUpload(file: File | null) {
+  const [state, setState] = useState<UploadState>(IDLE);
+  const [attempt, setAttempt] = useState(0);
+
+  useEffect(() => {
+    setState(IDLE);
+    if (!file) return;
+
+    const controller = new AbortController();
+    uploadDocument(file, {
+      signal: controller.signal,
+      onProgress: progress => setState(current => ({ ...current, progress })),
+    }).then(
+      result => setState(current => ({ ...current, result })),
+      () => {
+        if (!controller.signal.aborted) setState(current => ({ ...current, failed: true }));
+      }
+    );
+    return () => controller.abort();
+  }, [file, attempt]);
+
+  const retry = useCallback(() => setAttempt(a => a + 1), []);
+
+  return {
+    ...state,
+    isUploading: file !== null && !state.result && !state.failed,
+    retry,
+  };
+}
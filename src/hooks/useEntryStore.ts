@@ -0,0 +1,19 @@
+import { useCallback, useSyncExternalStore } from 'react';
+import type { EntryStore } from '../lib/entryStore';
+
+/**
+ * The current version of `entry` from `store`, re-rendering only when that
+ * entry changes. Without a store the entry is returned as given.
+ */
+export function useStoredEntry<E>(store: EntryStore<E> | undefined, id: string, entry: E): E {
+  const subscribe = useCallback(
+    (listener: () => void) => (store ? store.subscribe(id, listener) : () => {}),
+    [store, id]
+  );
+  return useSyncExternalStore(subscribe, () => store?.get(id) ?? entry);
+}
+
+// The store's running count (see EntryStore `countIf`)
+export function useMatchingCount<E>(store: EntryStore<E>): number {
+  return useSyncExternalStore(store.subscribeCount, store.matchingCount);
+}
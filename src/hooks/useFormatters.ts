@@ -0,0 +1,9 @@
+import { useTranslation } from 'react-i18next';
+import { formattersFor } from '../lib/formatting';
+import { localeFor } from '../i18n/config';
+
+// Cached number and date formatters for the active language
+export function useFormatters() {
+  const { i18n } = useTranslation();
+  return formattersFor(localeFor(i18n.resolvedLanguage));
+}
@@ -0,0 +1,121 @@
+import { useCallback, useEffect, useState, useSyncExternalStore } from 'react';
+import { LedgerEngine, readLedgerResult, type EntryReplacement, type LedgerQuery, type LedgerResultView } from '../lib/ledgerEngine';
+import { LedgerEngineClient } from '../lib/ledgerEngineClient';
+import { EntryStore } from '../lib/entryStore';
+import { journalEntryAccessors } from '../ledger/accessors';
+import { categoryIdOf } from '../ledger/chart';
+import type { JournalEntry, JournalEntryLine } from '../types';
+
+// Client for the ledger worker, also used for the reports (useReports). The
+// worker keeps large years in columns; the in-thread fallback shares the
+// store's entry objects, so it keeps them as objects.
+export const createLedgerEngineClient = () =>
+  new LedgerEngineClient<JournalEntry, JournalEntryLine>(
+    () => new Worker(new URL('../workers/ledgerWorker.ts', import.meta.url), { type: 'module' }),
+    () => new LedgerEngine(journalEntryAccessors, categoryIdOf)
+  );
+
+interface Answer {
+  view: LedgerResultView<JournalEntry>;
+  queryKey: string;
+}
+
+/**
+ * Journal entries filtered and aggregated by the ledger worker. `view` keeps
+ * the previous answer until the one for the current entries and filter has
+ * arrived; `isPending` is true in between.
+ *
+ * The entries live in an `EntryStore`. `updateEntry` changes one entry in the
+ * store and the worker without a new query, so only components subscribed to
+ * that entry re-render. It is meant for changes that keep the entry's date,
+ * type, open status and lines, like crossing. `applyEntries` takes any
+ * changed or new entries (pushed by the backend, say) and queries again.
+ */
+export function useLedgerEngine(initialEntries: () => JournalEntry[], query: LedgerQuery) {
+  const [client] = useState(createLedgerEngineClient);
+  const [store] = useState(() => {
+    const entries = initialEntries();
+    const created = new EntryStore<JournalEntry>(journalEntryAccessors.entryId, {
+      countIf: journalEntryAccessors.isCrossed,
+    });
+    created.load(entries);
+    client.load(entries);
+    return created;
+  });
+  const [answer, setAnswer] = useState<Answer | null>(null);
+  // Bumped when entries changed in place in a way the current answer does not show
+  const [revision, setRevision] = useState(0);
+  const entries = useSyncExternalStore(store.subscribeList, store.list);
+
+  useEffect(() => () => client.dispose(), [client]);
+
+  const loadEntries = useCallback((next: JournalEntry[]) => {
+    client.load(next);
+    store.load(next);
+  }, [client, store]);
+
+  // Add entries at the end, e.g. while the rest of a period streams in
+  const appendEntries = useCallback((batch: JournalEntry[]) => {
+    client.append(batch);
+    store.append(batch);
+  }, [client, store]);
+
+  const updateEntry = useCallback((entryId: string, entry: JournalEntry) => {
+    const position = store.positionOf(entryId);
+    if (position === undefined) return;
+    client.replace(position, entry);
+    store.update(entryId, entry);
+  }, [client, store]);
+
+  // Replace the changed entries in place, so only their rows re-render, and
+  // append the new ones; then query again so the account totals follow.
+  // A whole batch renders once.
+  const applyEntries = useCallback((changed: JournalEntry[]) => {
+    const added = new Map<string, JournalEntry>();
+    const replacements: EntryReplacement<JournalEntry>[] = [];
+    changed.forEach(entry => {
+      const position = store.positionOf(entry.entryId);
+      if (position === undefined) {
+        added.set(entry.entryId, entry);
+        return;
+      }
+      store.update(entry.entryId, entry);
+      replacements.push({ position, entry });
+    });
+    // One message and no copy of the year, however many entries changed
+    client.replaceMany(replacements);
+    if (added.size > 0) {
+      const batch = Array.from(added.values());
+      client.append(batch);
+      store.append(batch);
+    } else if (replacements.length > 0) {
+      setRevision(current => current + 1);
+    }
+  }, [client, store]);
+
+  const { fromMonth, toMonth, entryType, accountId, openOnly, search } = query;
+  const queryKey = [fromMonth, toMonth, entryType, accountId, openOnly, search].join('|');
+
+  useEffect(() => {
+    let active = true;
+    client.query({ fromMonth, toMonth, entryType, accountId, openOnly, search }).then(result => {
+      if (active && result) {
+        setAnswer({ view: readLedgerResult(result, entries), queryKey });
+      }
+    });
+    return () => {
+      active = false;
+    };
+  }, [client, entries, revision, queryKey, fromMonth, toMonth, entryType, accountId, openOnly, search]);
+
+  return {
+    store,
+    entries,
+    loadEntries,
+    appendEntries,
+    updateEntry,
+    applyEntries,
+    view: answer?.view ?? null,
+    isPending: !answer || answer.view.entries !== entries || answer.queryKey !== queryKey,
+  };
+}
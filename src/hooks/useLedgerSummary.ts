@@ -0,0 +1,159 @@
+import { useCallback, useEffect, useRef, useState, useSyncExternalStore } from 'react';
+import { AccountPages, readLedgerSummary, type LedgerOverview } from '../lib/ledgerSummary';
+import { EntryStore } from '../lib/entryStore';
+import { journalEntryAccessors } from '../ledger/accessors';
+import { chartOfAccounts } from '../data/chartOfAccounts';
+import { apiService } from '../services/api';
+import type { JournalEntry, JournalEntryFilters } from '../types';
+
+// Years with more journal entries than this are not loaded into the browser;
+// the ledger is drawn from backend summaries instead
+export const FULL_LOAD_LIMIT = 50_000;
+
+// Entries fetched per page of an expanded account
+const ACCOUNT_PAGE_SIZE = 100;
+
+// Queries whose account pages are kept, so switching a filter back and forth
+// does not fetch the same pages again
+const KEPT_QUERIES = 4;
+
+// The chart's categories as account ranges for the summary
+const SUMMARY_CATEGORIES = chartOfAccounts.map(category => ({ id: category.id, range: category.accountRange }));
+const SUMMARY_RANGES = SUMMARY_CATEGORIES.map(category => category.range);
+
+const fetchSummary = (filters: JournalEntryFilters) => apiService.getLedgerSummary(filters, SUMMARY_RANGES);
+
+// Whether `year` has too many entries to load in full. False when the backend
+// has no summary endpoint or cannot be reached.
+export const isLargeYear = (year: number) =>
+  fetchSummary({ period: { type: 'year', year } }).then(
+    summary => summary.entryCount > FULL_LOAD_LIMIT,
+    () => false
+  );
+
+interface Answer {
+  overview: LedgerOverview;
+  crossedCount: number;
+  queryKey: string;
+}
+
+/**
+ * The ledger from backend summaries, for years too large to load. `overview`
+ * draws the collapsed tree and keeps the previous answer until the one for
+ * the current filters has arrived. `pages` fetches the entries of an account
+ * when it is expanded (see useAccountEntries); fetched entries also go into
+ * `store`, so crossing works on them as on loaded entries. `applyEntries`
+ * takes changed entries (pushed by the backend) and fetches the summary
+ * again. With `filters` null nothing is fetched.
+ */
+export function useLedgerSummary(filters: JournalEntryFilters | null) {
+  const [store] = useState(
+    () => new EntryStore<JournalEntry>(journalEntryAccessors.entryId, { countIf: journalEntryAccessors.isCrossed })
+  );
+  const [answer, setAnswer] = useState<Answer | null>(null);
+  // Bumped when the backend reports changed entries, to fetch the summary again
+  const [revision, setRevision] = useState(0);
+  const [keptPages] = useState(() => new Map<string, AccountPages<JournalEntry>>());
+  // Crossed entries in the store that the summary's crossedCount includes
+  const countedCrossed = useRef(0);
+
+  const queryKey = filters ? JSON.stringify(filters) : '';
+  const latestFilters = useRef(filters);
+  latestFilters.current = filters;
+
+  const addEntries = useCallback((entries: JournalEntry[]) => {
+    const added = entries.filter(entry => store.get(entry.entryId) === undefined);
+    countedCrossed.current += added.filter(journalEntryAccessors.isCrossed).length;
+    store.append(added);
+  }, [store]);
+
+  const updateEntry = useCallback((entryId: string, entry: JournalEntry) => store.update(entryId, entry), [store]);
+
+  // Fetched entries are updated in place; new entries show in the totals and
+  // in account pages fetched from then on
+  const applyEntries = useCallback((changed: JournalEntry[]) => {
+    changed.forEach(entry => store.update(entry.entryId, entry));
+    setRevision(current => current + 1);
+  }, [store]);
+
+  useEffect(() => {
+    const current = latestFilters.current;
+    if (!current) return;
+    let active = true;
+    fetchSummary(current).then(
+      summary => {
+        if (!active) return;
+        countedCrossed.current = store.matchingCount();
+        setAnswer({
+          overview: readLedgerSummary(summary, SUMMARY_CATEGORIES),
+          crossedCount: summary.crossedCount,
+          queryKey,
+        });
+      },
+      () => {
+        // Keep the previous answer
+      }
+    );
+    return () => {
+      active = false;
+    };
+  }, [queryKey, store, revision]);
+
+  // Account pages of the current query, kept for the last few queries
+  let pages: AccountPages<JournalEntry> | null = null;
+  if (filters) {
+    pages = keptPages.get(queryKey) ?? null;
+    if (!pages) {
+      const query = filters;
+      pages = new AccountPages<JournalEntry>(
+        (accountId, cursor, signal) =>
+          apiService.getJournalEntriesPage({ ...query, accountId }, { cursor, limit: ACCOUNT_PAGE_SIZE, signal }),
+        addEntries
+      );
+      keptPages.set(queryKey, pages);
+      for (const [key, kept] of keptPages) {
+        if (keptPages.size <= KEPT_QUERIES) break;
+        kept.dispose();
+        keptPages.delete(key);
+      }
+    }
+  }
+
+  useEffect(() => () => keptPages.forEach(kept => kept.dispose()), [keptPages]);
+
+  const summaryCrossed = answer?.crossedCount ?? 0;
+  // The summary's count plus the crossings made here since
+  const crossedCount = useCallback(
+    () => summaryCrossed + store.matchingCount() - countedCrossed.current,
+    [summaryCrossed, store]
+  );
+
+  return {
+    overview: answer?.overview ?? null,
+    isPending: filters !== null && answer?.queryKey !== queryKey,
+    pages,
+    store,
+    updateEntry,
+    applyEntries,
+    crossedCount,
+  };
+}
+
+/**
+ * The entries of `accountId` fetched so far from `pages`, fetching the first
+ * page once the account is expanded. Null without `pages` (every entry is
+ * loaded).
+ */
+export function useAccountEntries(pages: AccountPages<JournalEntry> | null, accountId: string, isExpanded: boolean) {
+  const subscribe = useCallback(
+    (listener: () => void) => (pages ? pages.subscribe(accountId, listener) : () => {}),
+    [pages, accountId]
+  );
+  const entries = useSyncExternalStore(subscribe, () => pages?.entriesOf(accountId) ?? null);
+
+  useEffect(() => {
+    if (pages && isExpanded && pages.entriesOf(accountId).entries.length === 0) pages.loadMore(accountId);
+  }, [pages, accountId, isExpanded]);
+
+  return entries;
+}
@@ -0,0 +1,19 @@
+import { useEffect, useRef } from 'react';
+import { liveUpdates, type LiveChanges } from '../services/liveUpdates';
+import type { ChangeEvent } from '../types';
+
+/**
+ * Calls `onChanges` with each batch of pushed changes to `entity` (see
+ * services/liveUpdates.ts). A batch holds every change that arrived within a
+ * few milliseconds, so state set from it renders once. The latest callback is
+ * used; it does not need to be stable.
+ */
+export function useLiveChanges<E extends ChangeEvent['entity']>(
+  entity: E,
+  onChanges: (changes: LiveChanges<E>) => void
+) {
+  const latest = useRef(onChanges);
+  latest.current = onChanges;
+
+  useEffect(() => liveUpdates.subscribe(entity, changes => latest.current(changes)), [entity]);
+}
@@ -0,0 +1,26 @@
+import { useEffect } from 'react';
+import { useLocation } from 'react-router-dom';
+
+/**
+ * Signals that the current page is usable, for the browser tests in tests/.
+ * Once `ready` is true and the frame is painted, `data-page-ready` on <html>
+ * is set to `name` and a `page-ready` User Timing mark is recorded with the
+ * name and route, so tests wait for the page instead of sleeping.
+ */
+export function usePageReady(name: string, ready = true) {
+  const { pathname } = useLocation();
+
+  useEffect(() => {
+    if (!ready) return;
+    const frame = requestAnimationFrame(() => {
+      document.documentElement.dataset.pageReady = name;
+      performance.mark('page-ready', { detail: { name, route: pathname } });
+    });
+    return () => {
+      cancelAnimationFrame(frame);
+      if (document.documentElement.dataset.pageReady === name) {
+        delete document.documentElement.dataset.pageReady;
+      }
+    };
+  }, [name, ready, pathname]);
+}
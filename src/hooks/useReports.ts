@@ -0,0 +1,68 @@
+import { useCallback, useEffect, useState } from 'react';
+import type { FinancialReports, ReportQuery } from '../lib/reportEngine';
+import { createLedgerEngineClient } from './useLedgerEngine';
+import { generateMockEntries } from '../data/demoJournalEntries';
+import { loadJournalYear } from '../services/journalYear';
+import type { JournalEntry } from '../types';
+
+interface Answer {
+  reports: FinancialReports;
+  queryKey: string;
+  version: number;
+}
+
+/**
+ * Trial balance and VAT summary for the journal entries of `year`, computed
+ * by the ledger worker. The entries load like in the general ledger (offline
+ * copy first, then the changes); until they arrive, and without a backend,
+ * the demo entries are used. `reports` keeps the previous answer until the
+ * one for the current entries and query has arrived.
+ */
+export function useReports(year: number, query: ReportQuery) {
+  const [client] = useState(() => {
+    const created = createLedgerEngineClient();
+    created.load(generateMockEntries());
+    return created;
+  });
+  // Bumped whenever entries are loaded or appended, so the reports are asked for again
+  const [version, setVersion] = useState(0);
+  const [answer, setAnswer] = useState<Answer | null>(null);
+
+  useEffect(() => () => client.dispose(), [client]);
+
+  const load = useCallback((entries: JournalEntry[]) => {
+    client.load(entries);
+    setVersion(v => v + 1);
+  }, [client]);
+
+  const append = useCallback((entries: JournalEntry[]) => {
+    client.append(entries);
+    setVersion(v => v + 1);
+  }, [client]);
+
+  useEffect(() => {
+    const controller = new AbortController();
+    loadJournalYear(year, { load, append }, controller.signal).catch(() => {
+      // Aborted or no backend: keep the entries we have
+    });
+    return () => controller.abort();
+  }, [year, load, append]);
+
+  const { fromMonth, toMonth, entryType } = query;
+  const queryKey = [fromMonth, toMonth, entryType].join('|');
+
+  useEffect(() => {
+    let active = true;
+    client.report({ fromMonth, toMonth, entryType }).then(reports => {
+      if (active && reports) setAnswer({ reports, queryKey, version });
+    });
+    return () => {
+      active = false;
+    };
+  }, [client, version, queryKey, fromMonth, toMonth, entryType]);
+
+  return {
+    reports: answer?.reports ?? null,
+    isPending: !answer || answer.queryKey !== queryKey || answer.version !== version,
+  };
+}
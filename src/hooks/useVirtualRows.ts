@@ -0,0 +1,90 @@
+import { useCallback, useEffect, useLayoutEffect, useMemo, useRef, useState } from 'react';
+import { buildOffsets, findVisibleRange, type VisibleRange } from '../lib/virtualWindow';
+
+interface UseVirtualRowsOptions {
+  keys: readonly string[];
+  enabled: boolean;
+  estimatedRowHeight: number;
+  overscan?: number;
+}
+
+// Fallback before the scroll container has been laid out
+const DEFAULT_VIEWPORT_HEIGHT = 600;
+
+/**
+ * Windowed rendering for tables with variable row heights. Rendered rows are
+ * measured with a ResizeObserver (rows must carry `data-row-key` and the
+ * returned `measureRef`), everything else uses the estimated height.
+ */
+export function useVirtualRows({ keys, enabled, estimatedRowHeight, overscan = 8 }: UseVirtualRowsOptions) {
+  const containerRef = useRef<HTMLDivElement>(null);
+  const heights = useRef(new Map<string, number>());
+  const observer = useRef<ResizeObserver | null>(null);
+  const scrollFrame = useRef(0);
+  const [heightsVersion, setHeightsVersion] = useState(0);
+  const [viewport, setViewport] = useState({ scrollTop: 0, height: DEFAULT_VIEWPORT_HEIGHT });
+
+  const getObserver = () => {
+    if (!observer.current && typeof ResizeObserver !== 'undefined') {
+      observer.current = new ResizeObserver((records) => {
+        let changed = false;
+        records.forEach((record) => {
+          const element = record.target as HTMLElement;
+          const key = element.dataset.rowKey;
+          const height = element.getBoundingClientRect().height;
+          if (key && height > 0 && heights.current.get(key) !== height) {
+            heights.current.set(key, height);
+            changed = true;
+          }
+        });
+        if (changed) setHeightsVersion((v) => v + 1);
+      });
+    }
+    return observer.current;
+  };
+
+  useEffect(() => () => {
+    observer.current?.disconnect();
+    observer.current = null;
+    cancelAnimationFrame(scrollFrame.current);
+  }, []);
+
+  const measureRef = useCallback((element: HTMLElement | null) => {
+    if (!element || !enabled) return;
+    const resizeObserver = getObserver();
+    resizeObserver?.observe(element);
+    return () => resizeObserver?.unobserve(element);
+  }, [enabled]);
+
+  const readViewport = () => {
+    const container = containerRef.current;
+    if (!container) return;
+    setViewport((prev) =>
+      prev.scrollTop === container.scrollTop && prev.height === container.clientHeight
+        ? prev
+        : { scrollTop: container.scrollTop, height: container.clientHeight || DEFAULT_VIEWPORT_HEIGHT }
+    );
+  };
+
+  useLayoutEffect(() => {
+    if (enabled) readViewport();
+  }, [enabled]);
+
+  const onScroll = () => {
+    cancelAnimationFrame(scrollFrame.current);
+    scrollFrame.current = requestAnimationFrame(readViewport);
+  };
+
+  const offsets = useMemo(
+    () => buildOffsets(keys.length, (i) => heights.current.get(keys[i]) ?? estimatedRowHeight),
+    // heightsVersion invalidates the table when a rendered row changes size
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    [keys, estimatedRowHeight, heightsVersion]
+  );
+
+  const range: VisibleRange = enabled
+    ? findVisibleRange(offsets, viewport.scrollTop, viewport.height, overscan)
+    : { start: 0, end: keys.length, paddingTop: 0, paddingBottom: 0 };
+
+  return { containerRef, onScroll, measureRef, range };
+}
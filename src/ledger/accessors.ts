@@ -0,0 +1,23 @@
+import type { LedgerAccessors } from '../lib/ledgerAccessors';
+import type { JournalEntry, JournalEntryLine } from '../types';
+
+export const journalEntryAccessors: LedgerAccessors<JournalEntry, JournalEntryLine> = {
+  entryId: (entry) => entry.entryId,
+  entryType: (entry) => entry.entryType,
+  date: (entry) => entry.date,
+  isCrossed: (entry) => entry.isCrossed,
+  isOpen: (entry) => entry.isOpen,
+  lines: (entry) => entry.lines,
+  accountId: (line) => line.accountId,
+  debit: (line) => line.debit,
+  credit: (line) => line.credit,
+  vatCode: (line) => line.vatCode,
+  vatAmount: (line) => line.vatAmount,
+  searchText: (entry) =>
+    [
+      entry.entryId,
+      entry.reference,
+      entry.customerSupplierId,
+      ...entry.lines.flatMap(line => [line.description, line.accountName]),
+    ].join(' '),
+};
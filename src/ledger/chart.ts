@@ -0,0 +1,15 @@
+import { compileChart } from '../lib/compiledChart';
+import { chartOfAccounts } from '../data/chartOfAccounts';
+import type { LedgerAccount, LedgerCategory, LedgerSubcategory } from '../types';
+
+// Kontoplanen kompilert én gang: sortert kontoliste, konto → plassering og
+// kontonummer → kategori (også for underkontoer som 1920.01)
+export const chart = compileChart<LedgerCategory, LedgerSubcategory, LedgerAccount>(chartOfAccounts, {
+  categoryId: (category) => category.id,
+  accountRange: (category) => category.accountRange,
+  subcategories: (category) => category.subcategories,
+  accounts: (subcategory) => subcategory.accounts,
+  accountId: (account) => account.accountId,
+});
+
+export const categoryIdOf = chart.categoryIdOf;
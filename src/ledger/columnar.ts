@@ -0,0 +1,33 @@
+import { ColumnarLedger, type ColumnarCodec } from '../lib/columnarLedger';
+import { journalEntryAccessors } from './accessors';
+import type { EntryType, JournalEntry, JournalEntryLine } from '../types';
+
+// Entry fields that are not stored in columns
+type EntryRest = Pick<
+  JournalEntry,
+  'customerSupplierId' | 'documentUrl' | 'createdAt' | 'updatedAt' | 'createdBy' | 'currency' | 'reference' | 'projectId'
+>;
+
+export const journalEntryColumns: ColumnarCodec<JournalEntry, JournalEntryLine, EntryRest> = {
+  ...journalEntryAccessors,
+  lineId: (line) => line.lineId,
+  accountName: (line) => line.accountName,
+  amount: (line) => line.amount,
+  description: (line) => line.description,
+  restOf: (entry) => ({
+    customerSupplierId: entry.customerSupplierId,
+    documentUrl: entry.documentUrl,
+    createdAt: entry.createdAt,
+    updatedAt: entry.updatedAt,
+    createdBy: entry.createdBy,
+    currency: entry.currency,
+    reference: entry.reference,
+    projectId: entry.projectId,
+  }),
+  toLine: (fields) => fields,
+  toEntry: (fields, rest, lines) => ({ ...rest, ...fields, entryType: fields.entryType as EntryType, lines }),
+};
+
+// Journal entries in columns, for ledgers too large to keep as objects
+export const createColumnarLedger = (entries: readonly JournalEntry[] = []) =>
+  ColumnarLedger.from(entries, journalEntryColumns);
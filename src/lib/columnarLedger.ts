@@ -0,0 +1,334 @@
+import type { LedgerAccessors } from './ledgerAccessors';
+import { parseMonthKey } from './periodAggregates';
+
+// Journal lines stored column by column instead of one object per line.
+// Amounts are Float64Arrays (NaN for an empty debit or credit side), and
+// line ids, account ids, account names, descriptions, VAT codes, entry types
+// and dates are dictionary-encoded into typed arrays of codes. Each entry
+// points at its lines with a start and a count, so a line costs about 50
+// bytes instead of an object with five strings.
+//
+// The ledger engine keeps large ledgers in one (see LedgerEngine): its
+// filter reads the month, type, open flag and accounts of an entry straight
+// from the columns, and at()/slice() rebuild entry objects for the rest.
+
+// Loaded entries read by position: what the ledger engine needs from its
+// entries, whether they are objects or columns
+export interface EntryRows<E> extends Iterable<E> {
+  readonly length: number;
+  append: (entries: readonly E[]) => void;
+  replace: (position: number, entry: E) => void;
+  at: (position: number) => E | undefined;
+  slice: (start?: number, end?: number) => E[];
+  monthAt: (position: number) => number;
+  entryTypeAt: (position: number) => string;
+  isOpenAt: (position: number) => boolean;
+  lineCountAt: (position: number) => number;
+  // Account of the entry's line number `line` (from 0)
+  accountIdAt: (position: number, line: number) => string;
+}
+
+// The line and entry fields the columns hold, on top of the ledger accessors
+export interface ColumnarCodec<E, L, R> extends LedgerAccessors<E, L> {
+  lineId: (line: L) => string;
+  accountName: (line: L) => string;
+  amount: (line: L) => number;
+  description: (line: L) => string;
+  // The remaining entry fields, stored as they are
+  restOf: (entry: E) => R;
+  toLine: (fields: ColumnarLine) => L;
+  toEntry: (fields: ColumnarEntry, rest: R, lines: L[]) => E;
+}
+
+export interface ColumnarLine {
+  lineId: string;
+  accountId: string;
+  accountName: string;
+  debit: number | null;
+  credit: number | null;
+  amount: number;
+  vatCode: string;
+  vatAmount: number;
+  description: string;
+}
+
+export interface ColumnarEntry {
+  entryId: string;
+  entryType: string;
+  date: string;
+  isCrossed: boolean;
+  isOpen: boolean;
+}
+
+type Column = Float64Array | Uint32Array | Uint16Array | Uint8Array;
+
+const INITIAL_CAPACITY = 1024;
+
+// Copy into a larger column when `needed` does not fit: at least twice the
+// size for appends in batches, exactly `needed` for one large load
+const ensureCapacity = <C extends Column>(column: C, needed: number): C => {
+  if (needed <= column.length) return column;
+  const capacity = Math.max(needed, column.length * 2, INITIAL_CAPACITY);
+  const grown = new (column.constructor as new (length: number) => C)(capacity);
+  grown.set(column);
+  return grown;
+};
+
+class Dictionary {
+  readonly values: string[] = [];
+  private readonly codes = new Map<string, number>();
+
+  code(value: string): number {
+    let code = this.codes.get(value);
+    if (code === undefined) {
+      code = this.values.length;
+      this.values.push(value);
+      this.codes.set(value, code);
+    }
+    return code;
+  }
+
+}
+
+const ENTRY_CROSSED = 1;
+const ENTRY_OPEN = 2;
+
+export class ColumnarLedger<E, L, R> implements EntryRows<E> {
+  private readonly codec: ColumnarCodec<E, L, R>;
+
+  // Entry columns
+  private entryCount = 0;
+  private readonly entryIds: string[] = [];
+  private readonly rests: R[] = [];
+  private entryTypes = new Uint8Array(0);
+  private dates = new Uint32Array(0);
+  private months = new Uint32Array(0);
+  private flags = new Uint8Array(0);
+  private lineStarts = new Uint32Array(0);
+  private lineCounts = new Uint16Array(0);
+
+  // Line columns
+  private usedLines = 0;
+  // Line slots no entry uses any more, after replacements
+  private freeLines = 0;
+  private lineIds = new Uint32Array(0);
+  private accounts = new Uint32Array(0);
+  private accountNames = new Uint32Array(0);
+  private debits = new Float64Array(0);
+  private credits = new Float64Array(0);
+  private amounts = new Float64Array(0);
+  private vatCodes = new Uint16Array(0);
+  private vatAmounts = new Float64Array(0);
+  private descriptions = new Uint32Array(0);
+
+  private readonly entryTypeDictionary = new Dictionary();
+  private readonly dateDictionary = new Dictionary();
+  // Line ids are mostly line numbers ("1", "2"), so this stays small
+  private readonly lineIdDictionary = new Dictionary();
+  private readonly accountDictionary = new Dictionary();
+  private readonly accountNameDictionary = new Dictionary();
+  private readonly vatCodeDictionary = new Dictionary();
+  private readonly descriptionDictionary = new Dictionary();
+
+  constructor(codec: ColumnarCodec<E, L, R>) {
+    this.codec = codec;
+  }
+
+  static from<E, L, R>(entries: readonly E[], codec: ColumnarCodec<E, L, R>): ColumnarLedger<E, L, R> {
+    const ledger = new ColumnarLedger(codec);
+    ledger.append(entries);
+    return ledger;
+  }
+
+  get length() {
+    return this.entryCount;
+  }
+
+  // Bytes held by the typed-array columns (dictionaries and the per-entry
+  // ids and remaining fields not included)
+  get byteLength() {
+    return [
+      this.entryTypes, this.dates, this.months, this.flags, this.lineStarts, this.lineCounts,
+      this.lineIds, this.accounts, this.accountNames, this.debits, this.credits,
+      this.amounts, this.vatCodes, this.vatAmounts, this.descriptions,
+    ].reduce((sum, column) => sum + column.byteLength, 0);
+  }
+
+  append(entries: readonly E[]) {
+    const { codec } = this;
+    let lines = 0;
+    for (let i = 0; i < entries.length; i++) lines += codec.lines(entries[i]).length;
+    this.reserveEntries(this.entryCount + entries.length);
+    this.reserveLines(this.usedLines + lines);
+
+    for (let i = 0; i < entries.length; i++) {
+      const entry = entries[i];
+      this.entryIds.push(codec.entryId(entry));
+      this.rests.push(codec.restOf(entry));
+      this.lineStarts[this.entryCount] = this.usedLines;
+      this.writeEntry(this.entryCount++, entry);
+    }
+  }
+
+  // Replace the entry at `position`. Lines are rewritten in place when they
+  // fit in the entry's slots and moved to the end of the columns otherwise.
+  // Slots left unused are reclaimed once they are a quarter of the lines.
+  replace(position: number, entry: E) {
+    if (position >= this.entryCount) return;
+    this.entryIds[position] = this.codec.entryId(entry);
+    this.rests[position] = this.codec.restOf(entry);
+    const count = this.codec.lines(entry).length;
+    const previousCount = this.lineCounts[position];
+    if (count > previousCount) {
+      this.reserveLines(this.usedLines + count);
+      this.lineStarts[position] = this.usedLines;
+      this.freeLines += previousCount;
+    } else {
+      this.freeLines += previousCount - count;
+    }
+    this.writeEntry(position, entry);
+    if (this.freeLines * 4 > this.usedLines) this.compact();
+  }
+
+  // Row view: the entry at `position`, rebuilt from the columns
+  at(position: number): E | undefined {
+    if (position < 0 || position >= this.entryCount) return undefined;
+    const fields: ColumnarEntry = {
+      entryId: this.entryIds[position],
+      entryType: this.entryTypeDictionary.values[this.entryTypes[position]],
+      date: this.dateDictionary.values[this.dates[position]],
+      isCrossed: (this.flags[position] & ENTRY_CROSSED) !== 0,
+      isOpen: (this.flags[position] & ENTRY_OPEN) !== 0,
+    };
+    const lines: L[] = [];
+    const start = this.lineStarts[position];
+    for (let i = start; i < start + this.lineCounts[position]; i++) lines.push(this.lineAt(i));
+    return this.codec.toEntry(fields, this.rests[position], lines);
+  }
+
+  slice(start = 0, end = this.entryCount): E[] {
+    const entries: E[] = [];
+    for (let i = Math.max(0, start); i < Math.min(end, this.entryCount); i++) entries.push(this.at(i)!);
+    return entries;
+  }
+
+  *[Symbol.iterator](): IterableIterator<E> {
+    for (let i = 0; i < this.entryCount; i++) yield this.at(i)!;
+  }
+
+  // Column reads for the engine's filter, without building the entry
+
+  monthAt(position: number): number {
+    return this.months[position];
+  }
+
+  entryTypeAt(position: number): string {
+    return this.entryTypeDictionary.values[this.entryTypes[position]];
+  }
+
+  isOpenAt(position: number): boolean {
+    return (this.flags[position] & ENTRY_OPEN) !== 0;
+  }
+
+  lineCountAt(position: number): number {
+    return this.lineCounts[position];
+  }
+
+  accountIdAt(position: number, line: number): string {
+    return this.accountDictionary.values[this.accounts[this.lineStarts[position] + line]];
+  }
+
+  private lineAt(i: number): L {
+    return this.codec.toLine({
+      lineId: this.lineIdDictionary.values[this.lineIds[i]],
+      accountId: this.accountDictionary.values[this.accounts[i]],
+      accountName: this.accountNameDictionary.values[this.accountNames[i]],
+      debit: Number.isNaN(this.debits[i]) ? null : this.debits[i],
+      credit: Number.isNaN(this.credits[i]) ? null : this.credits[i],
+      amount: this.amounts[i],
+      vatCode: this.vatCodeDictionary.values[this.vatCodes[i]],
+      vatAmount: this.vatAmounts[i],
+      description: this.descriptionDictionary.values[this.descriptions[i]],
+    });
+  }
+
+  // Write the entry columns and its lines from lineStarts[position] on
+  private writeEntry(position: number, entry: E) {
+    const { codec } = this;
+    const date = codec.date(entry);
+    this.entryTypes[position] = this.entryTypeDictionary.code(codec.entryType(entry));
+    this.dates[position] = this.dateDictionary.code(date);
+    this.months[position] = parseMonthKey(date);
+    this.flags[position] = (codec.isCrossed(entry) ? ENTRY_CROSSED : 0) | (codec.isOpen(entry) ? ENTRY_OPEN : 0);
+
+    const lines = codec.lines(entry);
+    const start = this.lineStarts[position];
+    this.lineCounts[position] = lines.length;
+    for (let j = 0; j < lines.length; j++) {
+      const line = lines[j];
+      const i = start + j;
+      this.lineIds[i] = this.lineIdDictionary.code(codec.lineId(line));
+      this.accounts[i] = this.accountDictionary.code(codec.accountId(line));
+      this.accountNames[i] = this.accountNameDictionary.code(codec.accountName(line));
+      this.debits[i] = codec.debit(line) ?? NaN;
+      this.credits[i] = codec.credit(line) ?? NaN;
+      this.amounts[i] = codec.amount(line);
+      this.vatCodes[i] = this.vatCodeDictionary.code(codec.vatCode(line));
+      this.vatAmounts[i] = codec.vatAmount(line);
+      this.descriptions[i] = this.descriptionDictionary.code(codec.description(line));
+    }
+    this.usedLines = Math.max(this.usedLines, start + lines.length);
+  }
+
+  // Move every entry's lines next to each other, in entry order, dropping
+  // the unused slots
+  private compact() {
+    const starts = new Uint32Array(this.entryCount);
+    let used = 0;
+    for (let e = 0; e < this.entryCount; e++) {
+      starts[e] = used;
+      used += this.lineCounts[e];
+    }
+    const move = (column: Column): Column => {
+      const moved = new (column.constructor as new (length: number) => Column)(column.length);
+      for (let e = 0; e < this.entryCount; e++) {
+        const from = this.lineStarts[e];
+        for (let j = 0; j < this.lineCounts[e]; j++) moved[starts[e] + j] = column[from + j];
+      }
+      return moved;
+    };
+    this.lineIds = move(this.lineIds) as Uint32Array;
+    this.accounts = move(this.accounts) as Uint32Array;
+    this.accountNames = move(this.accountNames) as Uint32Array;
+    this.debits = move(this.debits) as Float64Array;
+    this.credits = move(this.credits) as Float64Array;
+    this.amounts = move(this.amounts) as Float64Array;
+    this.vatCodes = move(this.vatCodes) as Uint16Array;
+    this.vatAmounts = move(this.vatAmounts) as Float64Array;
+    this.descriptions = move(this.descriptions) as Uint32Array;
+    this.lineStarts.set(starts);
+    this.usedLines = used;
+    this.freeLines = 0;
+  }
+
+  private reserveEntries(needed: number) {
+    this.entryTypes = ensureCapacity(this.entryTypes, needed);
+    this.dates = ensureCapacity(this.dates, needed);
+    this.months = ensureCapacity(this.months, needed);
+    this.flags = ensureCapacity(this.flags, needed);
+    this.lineStarts = ensureCapacity(this.lineStarts, needed);
+    this.lineCounts = ensureCapacity(this.lineCounts, needed);
+  }
+
+  private reserveLines(needed: number) {
+    this.lineIds = ensureCapacity(this.lineIds, needed);
+    this.accounts = ensureCapacity(this.accounts, needed);
+    this.accountNames = ensureCapacity(this.accountNames, needed);
+    this.debits = ensureCapacity(this.debits, needed);
+    this.credits = ensureCapacity(this.credits, needed);
+    this.amounts = ensureCapacity(this.amounts, needed);
+    this.vatCodes = ensureCapacity(this.vatCodes, needed);
+    this.vatAmounts = ensureCapacity(this.vatAmounts, needed);
+    this.descriptions = ensureCapacity(this.descriptions, needed);
+  }
+}
@@ -0,0 +1,113 @@
+// Lookup structures for a chart of accounts (NS 4102), built once per chart.
+// Like the ledger modules it works on both apps' models through accessors:
+// the English `LedgerCategory` tree in src/ and the Norwegian `Kategori` tree
+// in apps/reports.
+
+export interface ChartAccessors<C, S, A> {
+  categoryId: (category: C) => string;
+  // Account number range of the category, e.g. '1000-1999'
+  accountRange: (category: C) => string;
+  subcategories: (category: C) => readonly S[];
+  accounts: (subcategory: S) => readonly A[];
+  accountId: (account: A) => string;
+}
+
+export interface ChartPlacement<C, S, A> {
+  account: A;
+  subcategory: S;
+  category: C;
+}
+
+// Sorts account numbers numerically, so 1920 < 1920.01 < 1921 < 10000
+const accountOrder = new Intl.Collator('nb', { numeric: true }).compare;
+
+// The four-digit main account of an id: '1920.01', '1920-01' and '19201' are
+// all sub-accounts of 1920
+const mainAccountNumber = (accountId: string) => {
+  const match = /^\d{4}/.exec(accountId);
+  return match ? Number(match[0]) : NaN;
+};
+
+export interface CompiledChart<C, S, A> {
+  // Every account in the chart, sorted by account number
+  accounts: readonly A[];
+  // The account itself, or the main account of a sub-account such as 1920.01
+  placementOf: (accountId: string) => ChartPlacement<C, S, A> | undefined;
+  // Category of any account number, also ones missing from the chart
+  categoryOf: (accountId: string) => C | undefined;
+  categoryIdOf: (accountId: string) => string | undefined;
+  // Accounts of a category in chart order
+  accountsIn: (categoryId: string) => readonly A[];
+}
+
+export function compileChart<C, S, A>(
+  categories: readonly C[],
+  accessors: ChartAccessors<C, S, A>
+): CompiledChart<C, S, A> {
+  const placements = new Map<string, ChartPlacement<C, S, A>>();
+  const accountsByCategory = new Map<string, A[]>();
+  categories.forEach(category => {
+    const inCategory: A[] = [];
+    accessors.subcategories(category).forEach(subcategory => {
+      accessors.accounts(subcategory).forEach(account => {
+        placements.set(accessors.accountId(account), { account, subcategory, category });
+        inCategory.push(account);
+      });
+    });
+    accountsByCategory.set(accessors.categoryId(category), inCategory);
+  });
+
+  const accounts = Array.from(placements.values(), placement => placement.account)
+    .sort((a, b) => accountOrder(accessors.accountId(a), accessors.accountId(b)));
+
+  // Category ranges sorted by their first account number, searched by bisection
+  const ranges = categories
+    .map(category => {
+      const [from, to] = accessors.accountRange(category).split('-').map(Number);
+      return { from, to: to ?? from, category };
+    })
+    .filter(range => !Number.isNaN(range.from) && !Number.isNaN(range.to))
+    .sort((a, b) => a.from - b.from);
+  const rangeStarts = Float64Array.from(ranges, range => range.from);
+
+  const categoryInRange = (accountNumber: number) => {
+    let low = 0;
+    let high = rangeStarts.length - 1;
+    let found = -1;
+    while (low <= high) {
+      const mid = (low + high) >> 1;
+      if (rangeStarts[mid] <= accountNumber) {
+        found = mid;
+        low = mid + 1;
+      } else {
+        high = mid - 1;
+      }
+    }
+    return found >= 0 && accountNumber <= ranges[found].to ? ranges[found].category : undefined;
+  };
+
+  const placementOf = (accountId: string) => {
+    const placement = placements.get(accountId);
+    if (placement) return placement;
+    const main = mainAccountNumber(accountId);
+    return Number.isNaN(main) ? undefined : placements.get(String(main));
+  };
+
+  const categoryOf = (accountId: string) => {
+    const placement = placementOf(accountId);
+    if (placement) return placement.category;
+    const main = mainAccountNumber(accountId);
+    return Number.isNaN(main) ? undefined : categoryInRange(main);
+  };
+
+  return {
+    accounts,
+    placementOf,
+    categoryOf,
+    categoryIdOf: (accountId) => {
+      const category = categoryOf(accountId);
+      return category === undefined ? undefined : accessors.categoryId(category);
+    },
+    accountsIn: (categoryId) => accountsByCategory.get(categoryId) ?? [],
+  };
+}
@@ -0,0 +1,104 @@
+// Entries normalized by id, with subscriptions per entry. Changing one entry
+// (crossing it, say) only notifies the subscribers of that entry; the list
+// subscribers are notified when entries are loaded or appended.
+//
+// list() returns the same array until the list itself changes. update()
+// swaps the entry into that array in place, so positions and the array handed
+// to the ledger engine stay valid.
+
+export class EntryStore<E> {
+  private readonly idOf: (entry: E) => string;
+  private readonly countIf: ((entry: E) => boolean) | undefined;
+  private entries: E[] = [];
+  private readonly positions = new Map<string, number>();
+  private readonly entryListeners = new Map<string, Set<() => void>>();
+  private readonly listListeners = new Set<() => void>();
+  private readonly countListeners = new Set<() => void>();
+  private matching = 0;
+
+  // `countIf` keeps a running count of matching entries, e.g. crossed ones
+  constructor(idOf: (entry: E) => string, { countIf }: { countIf?: (entry: E) => boolean } = {}) {
+    this.idOf = idOf;
+    this.countIf = countIf;
+  }
+
+  list = (): readonly E[] => this.entries;
+
+  get = (id: string): E | undefined => {
+    const position = this.positions.get(id);
+    return position === undefined ? undefined : this.entries[position];
+  };
+
+  positionOf = (id: string): number | undefined => this.positions.get(id);
+
+  matchingCount = (): number => this.matching;
+
+  load(entries: E[]) {
+    this.entries = entries.slice();
+    this.positions.clear();
+    this.matching = 0;
+    this.index(0);
+    this.notifyList();
+    this.entryListeners.forEach(listeners => listeners.forEach(listener => listener()));
+  }
+
+  append(entries: E[]) {
+    const first = this.entries.length;
+    this.entries = this.entries.concat(entries);
+    this.index(first);
+    this.notifyList();
+  }
+
+  // Replace one entry and notify only its subscribers (and the count)
+  update(id: string, entry: E) {
+    const position = this.positions.get(id);
+    if (position === undefined) return;
+    const previous = this.entries[position];
+    if (previous === entry) return;
+    this.entries[position] = entry;
+    const countChanged = this.countIf && this.countIf(previous) !== this.countIf(entry);
+    if (countChanged) this.matching += this.countIf!(entry) ? 1 : -1;
+    this.entryListeners.get(id)?.forEach(listener => listener());
+    if (countChanged) this.countListeners.forEach(listener => listener());
+  }
+
+  subscribe = (id: string, listener: () => void): (() => void) => {
+    let listeners = this.entryListeners.get(id);
+    if (!listeners) {
+      listeners = new Set();
+      this.entryListeners.set(id, listeners);
+    }
+    listeners.add(listener);
+    return () => {
+      listeners.delete(listener);
+      if (listeners.size === 0) this.entryListeners.delete(id);
+    };
+  };
+
+  subscribeList = (listener: () => void): (() => void) => {
+    this.listListeners.add(listener);
+    return () => {
+      this.listListeners.delete(listener);
+    };
+  };
+
+  subscribeCount = (listener: () => void): (() => void) => {
+    this.countListeners.add(listener);
+    return () => {
+      this.countListeners.delete(listener);
+    };
+  };
+
+  private index(from: number) {
+    for (let i = from; i < this.entries.length; i++) {
+      const entry = this.entries[i];
+      this.positions.set(this.idOf(entry), i);
+      if (this.countIf?.(entry)) this.matching++;
+    }
+  }
+
+  private notifyList() {
+    this.listListeners.forEach(listener => listener());
+    this.countListeners.forEach(listener => listener());
+  }
+}
@@ -0,0 +1,131 @@
+// Server-sent event stream with resume and batching. Events carry an id; a
+// dropped connection is picked up after the last event seen, so nothing is
+// missed. The browser reconnects by itself after network errors (sending the
+// Last-Event-ID header); when the stream is closed instead (an HTTP error),
+// this reconnects with backoff and passes the id as `?lastEventId=`.
+//
+// Events are handed to listeners in batches, at most one per `batchMs`, so a
+// burst of changes is applied in one render.
+
+export interface EventBatch<T> {
+  events: T[];
+  // The server could not resume from the last event seen (it no longer has
+  // it): changes were missed, and listeners should load their data again
+  reset: boolean;
+}
+
+export interface EventStreamOptions {
+  // Wait this long after the first subscriber before connecting, so the
+  // stream does not hold a connection while the page loads
+  connectDelayMs?: number;
+  batchMs?: number;
+  minRetryMs?: number;
+  maxRetryMs?: number;
+  createSource?: (url: string) => EventSource;
+}
+
+export class EventStream<T> {
+  private readonly url: string;
+  private readonly connectDelayMs: number;
+  private readonly batchMs: number;
+  private readonly minRetryMs: number;
+  private readonly maxRetryMs: number;
+  private readonly createSource: (url: string) => EventSource;
+  private readonly listeners = new Set<(batch: EventBatch<T>) => void>();
+  private source: EventSource | null = null;
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private retryMs: number;
+  private lastEventId: string | null = null;
+  private pending: T[] = [];
+  private pendingReset = false;
+  private flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+  constructor(
+    url: string,
+    {
+      connectDelayMs = 2000,
+      batchMs = 50,
+      minRetryMs = 1000,
+      maxRetryMs = 60_000,
+      createSource = sourceUrl => new EventSource(sourceUrl),
+    }: EventStreamOptions = {}
+  ) {
+    this.url = url;
+    this.connectDelayMs = connectDelayMs;
+    this.batchMs = batchMs;
+    this.minRetryMs = minRetryMs;
+    this.maxRetryMs = maxRetryMs;
+    this.createSource = createSource;
+    this.retryMs = minRetryMs;
+  }
+
+  // Listen for event batches. The first subscriber opens the stream, which
+  // then stays open until close().
+  subscribe(listener: (batch: EventBatch<T>) => void): () => void {
+    this.listeners.add(listener);
+    if (!this.source && !this.timer) this.schedule(this.connectDelayMs);
+    return () => {
+      this.listeners.delete(listener);
+    };
+  }
+
+  close() {
+    if (this.timer) clearTimeout(this.timer);
+    this.timer = null;
+    this.source?.close();
+    this.source = null;
+  }
+
+  private schedule(delayMs: number) {
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.connect();
+    }, delayMs);
+  }
+
+  private connect() {
+    const url = this.lastEventId === null
+      ? this.url
+      : `${this.url}${this.url.includes('?') ? '&' : '?'}lastEventId=${encodeURIComponent(this.lastEventId)}`;
+    let source: EventSource;
+    try {
+      source = this.createSource(url);
+    } catch {
+      // No EventSource (old browser, tests): no live updates
+      return;
+    }
+    this.source = source;
+    source.onopen = () => {
+      this.retryMs = this.minRetryMs;
+    };
+    source.onmessage = event => {
+      if (event.lastEventId) this.lastEventId = event.lastEventId;
+      this.pending.push(JSON.parse(event.data) as T);
+      this.scheduleFlush();
+    };
+    source.addEventListener('reset', event => {
+      const { lastEventId } = event as MessageEvent;
+      if (lastEventId) this.lastEventId = lastEventId;
+      this.pending = [];
+      this.pendingReset = true;
+      this.scheduleFlush();
+    });
+    source.onerror = () => {
+      // CONNECTING: the browser is retrying on its own
+      if (source.readyState !== source.CLOSED || this.source !== source) return;
+      this.source = null;
+      this.schedule(this.retryMs);
+      this.retryMs = Math.min(this.retryMs * 2, this.maxRetryMs);
+    };
+  }
+
+  private scheduleFlush() {
+    this.flushTimer ??= setTimeout(() => {
+      this.flushTimer = null;
+      const batch = { events: this.pending, reset: this.pendingReset };
+      this.pending = [];
+      this.pendingReset = false;
+      this.listeners.forEach(listener => listener(batch));
+    }, this.batchMs);
+  }
+}
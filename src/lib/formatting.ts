@@ -0,0 +1,82 @@
+// Shared number and date formatting for the ledger tables. Building an
+// Intl formatter costs far more than using one, so there is one formatter per
+// locale and option set, and the strings for recurring amounts and dates are
+// cached per locale as well.
+
+// Formatted values kept per locale and kind before the cache starts over
+const MAX_CACHED_VALUES = 10_000;
+
+const intlFormats = new Map<string, Intl.NumberFormat | Intl.DateTimeFormat>();
+
+export const numberFormat = (locale: string, options: Intl.NumberFormatOptions = {}) => {
+  const key = `number|${locale}|${JSON.stringify(options)}`;
+  let format = intlFormats.get(key) as Intl.NumberFormat | undefined;
+  if (!format) {
+    format = new Intl.NumberFormat(locale, options);
+    intlFormats.set(key, format);
+  }
+  return format;
+};
+
+export const dateFormat = (locale: string, options: Intl.DateTimeFormatOptions = {}) => {
+  const key = `date|${locale}|${JSON.stringify(options)}`;
+  let format = intlFormats.get(key) as Intl.DateTimeFormat | undefined;
+  if (!format) {
+    format = new Intl.DateTimeFormat(locale, options);
+    intlFormats.set(key, format);
+  }
+  return format;
+};
+
+const memoize = <K, V>(compute: (key: K) => V) => {
+  const cache = new Map<K, V>();
+  return (key: K) => {
+    let value = cache.get(key);
+    if (value === undefined) {
+      if (cache.size >= MAX_CACHED_VALUES) cache.clear();
+      value = compute(key);
+      cache.set(key, value);
+    }
+    return value;
+  };
+};
+
+export interface Formatters {
+  locale: string;
+  // Amount with two decimals and no currency, as in the ledger columns
+  amount: (value: number) => string;
+  currency: (value: number, currency?: string) => string;
+  // Calendar date of an ISO date or date-time string, e.g. 05.02.2024; an
+  // empty or malformed date is returned unchanged
+  date: (isoDate: string) => string;
+  // Bulk variants, for formatting a page of table rows in one call
+  amounts: (values: ArrayLike<number>) => string[];
+  dates: (isoDates: ArrayLike<string>) => string[];
+}
+
+const formattersByLocale = new Map<string, Formatters>();
+
+export function formattersFor(locale: string): Formatters {
+  let formatters = formattersByLocale.get(locale);
+  if (formatters) return formatters;
+
+  const amountFormat = numberFormat(locale, { style: 'decimal', minimumFractionDigits: 2, maximumFractionDigits: 2 });
+  const calendarDate = dateFormat(locale, { day: '2-digit', month: '2-digit', year: 'numeric' });
+  const amount = memoize((value: number) => amountFormat.format(value));
+  const date = memoize((isoDate: string) => {
+    const parsed = new Date(isoDate);
+    // format() throws on an invalid date; show it as it came instead of failing the table
+    return Number.isNaN(parsed.getTime()) ? isoDate : calendarDate.format(parsed);
+  });
+
+  formatters = {
+    locale,
+    amount,
+    currency: (value, currency = 'NOK') => numberFormat(locale, { style: 'currency', currency }).format(value),
+    date,
+    amounts: (values) => Array.from(values, amount),
+    dates: (isoDates) => Array.from(isoDates, date),
+  };
+  formattersByLocale.set(locale, formatters);
+  return formatters;
+}
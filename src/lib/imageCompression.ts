@@ -0,0 +1,77 @@
+// Downscale and re-encode photos before upload. A phone photo of a receipt
+// is 5-12 MB at 12+ megapixels; 2000 px on the long side as JPEG is still
+// easy to read and usually a few hundred kB.
+
+export interface ImageCompressionOptions {
+  // Longest side after scaling, in pixels
+  maxDimension?: number;
+  // JPEG quality, 0-1
+  quality?: number;
+  // Smaller images are sent as they are
+  minBytes?: number;
+}
+
+const COMPRESSIBLE_TYPES = new Set(['image/jpeg', 'image/png', 'image/webp', 'image/heic', 'image/heif']);
+
+export const isCompressibleImage = (file: Blob) => COMPRESSIBLE_TYPES.has(file.type);
+
+// JPEG has no alpha: transparent pixels (PNG/WebP screenshots and scans)
+// would turn black, so they are drawn onto white paper instead
+const draw = (
+  context: CanvasRenderingContext2D | OffscreenCanvasRenderingContext2D,
+  bitmap: ImageBitmap,
+  width: number,
+  height: number
+) => {
+  context.fillStyle = '#ffffff';
+  context.fillRect(0, 0, width, height);
+  context.drawImage(bitmap, 0, 0, width, height);
+};
+
+const encode = async (bitmap: ImageBitmap, width: number, height: number, quality: number): Promise<Blob | null> => {
+  if (typeof OffscreenCanvas !== 'undefined') {
+    const canvas = new OffscreenCanvas(width, height);
+    const context = canvas.getContext('2d');
+    if (!context) return null;
+    draw(context, bitmap, width, height);
+    return canvas.convertToBlob({ type: 'image/jpeg', quality });
+  }
+  if (typeof document === 'undefined') return null;
+  const canvas = document.createElement('canvas');
+  canvas.width = width;
+  canvas.height = height;
+  const context = canvas.getContext('2d');
+  if (!context) return null;
+  draw(context, bitmap, width, height);
+  return new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', quality));
+};
+
+/**
+ * The image scaled to fit `maxDimension` and re-encoded as JPEG, or the
+ * original when it is not an image the browser can decode, is already small,
+ * or would not get smaller. EXIF orientation is applied while decoding, so
+ * the result is upright.
+ */
+export async function compressImage(file: Blob, options: ImageCompressionOptions = {}): Promise<Blob> {
+  const { maxDimension = 2000, quality = 0.8, minBytes = 300 * 1024 } = options;
+  if (!isCompressibleImage(file) || file.size < minBytes || typeof createImageBitmap === 'undefined') {
+    return file;
+  }
+
+  let bitmap: ImageBitmap;
+  try {
+    bitmap = await createImageBitmap(file, { imageOrientation: 'from-image' });
+  } catch {
+    // Not decodable here, e.g. HEIC outside Safari
+    return file;
+  }
+  try {
+    const scale = Math.min(1, maxDimension / Math.max(bitmap.width, bitmap.height));
+    const width = Math.round(bitmap.width * scale);
+    const height = Math.round(bitmap.height * scale);
+    const compressed = await encode(bitmap, width, height, quality);
+    return compressed && compressed.size < file.size ? compressed : file;
+  } finally {
+    bitmap.close();
+  }
+}
@@ -0,0 +1,242 @@
+// Performance instrumentation for the hot paths: ledger filtering and
+// aggregation, component renders and API calls.
+//
+// - measurements go to the User Timing timeline (performance.measure), where
+//   the browser's performance panel shows them, and to a rolling buffer of the
+//   last `capacity` measurements for the debug panel
+// - with a beacon URL, measurements are also sent in batches with
+//   navigator.sendBeacon: when a batch is full, after `flushIntervalMs` and
+//   when the page is hidden
+// - disabled (the default), every method returns after one boolean check.
+//   Callers on hot paths check `enabled` before they collect details.
+
+export type MeasurementDetail = Record<string, string | number>;
+
+export interface Measurement {
+  // Dotted name, e.g. 'ledger.filter', 'api.parse' or 'render.GeneralLedger'
+  name: string;
+  // On the performance.now() timeline of the page
+  startTime: number;
+  duration: number;
+  detail?: MeasurementDetail;
+}
+
+export interface MeasurementSummary {
+  name: string;
+  count: number;
+  mean: number;
+  p50: number;
+  p95: number;
+  max: number;
+}
+
+interface InstrumentationOptions {
+  enabled?: boolean;
+  capacity?: number;
+  // Endpoint for measurement batches; null stops sending
+  beaconUrl?: string | null;
+  batchSize?: number;
+  flushIntervalMs?: number;
+}
+
+export class Instrumentation {
+  enabled = false;
+  private capacity = 1000;
+  private buffer: Measurement[] = [];
+  // Oldest measurement once the buffer is full
+  private head = 0;
+  private beaconUrl: string | null = null;
+  private batchSize = 50;
+  private flushIntervalMs = 10_000;
+  private pending: Measurement[] = [];
+  private flushTimer: ReturnType<typeof setTimeout> | null = null;
+  private flushOnHide = false;
+  // Names this instance put on the User Timing timeline since it was last cleared
+  private readonly measuredNames = new Set<string>();
+
+  configure({ enabled, capacity, beaconUrl, batchSize, flushIntervalMs }: InstrumentationOptions) {
+    if (enabled !== undefined) this.enabled = enabled;
+    if (capacity !== undefined && capacity !== this.capacity) {
+      this.capacity = capacity;
+      this.buffer = this.entries().slice(-capacity);
+      this.head = 0;
+    }
+    if (batchSize !== undefined) this.batchSize = batchSize;
+    if (flushIntervalMs !== undefined) this.flushIntervalMs = flushIntervalMs;
+    if (beaconUrl !== undefined) {
+      this.flush();
+      this.beaconUrl = beaconUrl;
+    }
+    if (this.beaconUrl && !this.flushOnHide && typeof document !== 'undefined') {
+      this.flushOnHide = true;
+      document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') this.flush();
+      });
+    }
+  }
+
+  // Start time for end(); 0 when disabled
+  now(): number {
+    return this.enabled ? performance.now() : 0;
+  }
+
+  // Record `name` from `startTime` (from now()) until now
+  end(name: string, startTime: number, detail?: MeasurementDetail) {
+    if (!this.enabled || !startTime) return;
+    this.record(name, startTime, performance.now() - startTime, detail);
+  }
+
+  measure<T>(name: string, run: () => T, detail?: MeasurementDetail): T {
+    if (!this.enabled) return run();
+    const startTime = performance.now();
+    try {
+      return run();
+    } finally {
+      this.end(name, startTime, detail);
+    }
+  }
+
+  record(name: string, startTime: number, duration: number, detail?: MeasurementDetail) {
+    if (!this.enabled) return;
+    const measurement: Measurement = { name, startTime, duration, detail };
+    try {
+      performance.measure(name, { start: startTime, duration, detail });
+      this.measuredNames.add(name);
+    } catch {
+      // Older browsers without measure options; the buffer still has it
+    }
+
+    if (this.buffer.length < this.capacity) {
+      this.buffer.push(measurement);
+    } else {
+      this.buffer[this.head] = measurement;
+      this.head = (this.head + 1) % this.capacity;
+      // Keep the browser's timeline from growing for as long as the page is
+      // open; measures of other code (React, libraries) are left alone
+      if (this.head === 0) {
+        this.measuredNames.forEach(measured => performance.clearMeasures(measured));
+        this.measuredNames.clear();
+      }
+    }
+
+    if (this.beaconUrl) {
+      this.pending.push(measurement);
+      if (this.pending.length >= this.batchSize) {
+        this.flush();
+      } else if (!this.flushTimer) {
+        this.flushTimer = setTimeout(() => this.flush(), this.flushIntervalMs);
+      }
+    }
+  }
+
+  // Matches React's Profiler onRender, for <Profiler onRender={instrumentation.recordRender}>
+  readonly recordRender = (
+    id: string,
+    phase: string,
+    actualDuration: number,
+    baseDuration: number,
+    startTime: number,
+    commitTime: number,
+  ) => {
+    this.record(`render.${id}`, startTime, actualDuration, { phase, baseDuration, commitTime });
+  };
+
+  // Buffered measurements, oldest first
+  entries(): Measurement[] {
+    return this.buffer.slice(this.head).concat(this.buffer.slice(0, this.head));
+  }
+
+  clear() {
+    this.buffer = [];
+    this.head = 0;
+  }
+
+  // Send pending measurements to the beacon URL now
+  flush() {
+    if (this.flushTimer) {
+      clearTimeout(this.flushTimer);
+      this.flushTimer = null;
+    }
+    if (!this.beaconUrl || this.pending.length === 0) return;
+    const body = JSON.stringify({
+      page: typeof location !== 'undefined' ? location.pathname : undefined,
+      timeOrigin: performance.timeOrigin,
+      measurements: this.pending,
+    });
+    this.pending = [];
+
+    const sent = typeof navigator !== 'undefined' && typeof navigator.sendBeacon === 'function'
+      && navigator.sendBeacon(this.beaconUrl, new Blob([body], { type: 'application/json' }));
+    if (!sent) {
+      fetch(this.beaconUrl, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body,
+        keepalive: true,
+      }).catch(() => undefined);
+    }
+  }
+}
+
+// Count, mean, median, 95th percentile and max duration per measurement name
+export function summarize(measurements: Measurement[]): MeasurementSummary[] {
+  const byName = new Map<string, number[]>();
+  for (const { name, duration } of measurements) {
+    let durations = byName.get(name);
+    if (!durations) {
+      durations = [];
+      byName.set(name, durations);
+    }
+    durations.push(duration);
+  }
+  return Array.from(byName, ([name, durations]) => {
+    durations.sort((a, b) => a - b);
+    const at = (fraction: number) => durations[Math.min(durations.length - 1, Math.floor(durations.length * fraction))];
+    return {
+      name,
+      count: durations.length,
+      mean: durations.reduce((sum, duration) => sum + duration, 0) / durations.length,
+      p50: at(0.5),
+      p95: at(0.95),
+      max: durations[durations.length - 1],
+    };
+  }).sort((a, b) => a.name.localeCompare(b.name));
+}
+
+export interface InstrumentationSettings {
+  enabled: boolean;
+  // Also send measurements to the beacon endpoint
+  beacon: boolean;
+}
+
+const SETTINGS_KEY = 'perf.instrumentation';
+
+// Settings from `?perf=on|beacon|off` in the URL, which is remembered, or
+// from an earlier choice in localStorage. Off unless asked for.
+export function loadInstrumentationSettings(): InstrumentationSettings {
+  const off = { enabled: false, beacon: false };
+  if (typeof window === 'undefined') return off;
+  try {
+    const flag = new URLSearchParams(window.location.search).get('perf');
+    if (flag !== null) {
+      const settings = { enabled: flag !== 'off', beacon: flag === 'beacon' };
+      saveInstrumentationSettings(settings);
+      return settings;
+    }
+    const stored = window.localStorage.getItem(SETTINGS_KEY);
+    return stored ? { ...off, ...JSON.parse(stored) } : off;
+  } catch {
+    return off;
+  }
+}
+
+export function saveInstrumentationSettings(settings: InstrumentationSettings) {
+  try {
+    window.localStorage.setItem(SETTINGS_KEY, JSON.stringify(settings));
+  } catch {
+    // Private mode or storage full; the settings last for this page only
+  }
+}
+
+// Shared by the app, the API service and the ledger engine client
+export const instrumentation = new Instrumentation();
@@ -0,0 +1,20 @@
+// Field accessors that let the shared ledger modules work on both the
+// English `JournalEntry` model (src/) and the Norwegian `Bilag` model
+// (apps/reports) without copying the algorithms.
+
+export interface LedgerAccessors<E, L> {
+  entryId: (entry: E) => string;
+  entryType: (entry: E) => string;
+  date: (entry: E) => string;
+  isCrossed: (entry: E) => boolean;
+  isOpen: (entry: E) => boolean;
+  lines: (entry: E) => readonly L[];
+  accountId: (line: L) => string;
+  debit: (line: L) => number | null;
+  credit: (line: L) => number | null;
+  // VAT code and VAT amount of a line, for the VAT report
+  vatCode: (line: L) => string;
+  vatAmount: (line: L) => number;
+  // Text the ledger search looks in: ids, references and line texts
+  searchText: (entry: E) => string;
+}
@@ -0,0 +1,478 @@
+import type { EntryRows } from './columnarLedger';
+import type { LedgerAccessors } from './ledgerAccessors';
+import { appendToLedgerIndex, buildLedgerIndex, pickEntries, replaceInLedgerIndex, type LedgerIndex } from './ledgerIndex';
+import { PeriodAggregates, categoryKey, type PeriodTotals } from './periodAggregates';
+import { ReportEngine, type FinancialReports, type ReportQuery } from './reportEngine';
+import { SearchIndex } from './searchIndex';
+
+// Filter and aggregate engine for the ledger views. It owns the entries and
+// answers queries with typed arrays so results can be transferred out of a
+// worker without copying. Both apps run it in a worker through
+// serveLedgerEngine(); LedgerEngineClient falls back to running it in-thread.
+// It also answers report queries (trial balance and VAT) over the same entries.
+// Given a way to build columns, it keeps ledgers of COLUMNAR_LIMIT entries or
+// more in a ColumnarLedger instead of as objects.
+
+export interface LedgerQuery {
+  fromMonth: number;
+  toMonth: number;
+  entryType?: string;
+  accountId?: string;
+  openOnly?: boolean;
+  // Free-text search; every word must prefix a word in the entry
+  search?: string;
+}
+
+export interface LedgerQueryResult {
+  // Positions of the matching entries in the loaded list, ascending
+  positions: Uint32Array;
+  // Accounts touched by the matching entries, sorted. The entries of
+  // accountIds[i] are accountPositions[accountOffsets[i]..accountOffsets[i + 1]]
+  accountIds: string[];
+  accountOffsets: Uint32Array;
+  accountPositions: Uint32Array;
+  // debit, credit and entry count per account in accountIds
+  accountTotals: Float64Array;
+  // Entry counts per category for the period and filter, ignoring accountId
+  categoryIds: string[];
+  categoryCounts: Uint32Array;
+  // Every account with postings in the loaded ledger, regardless of filter
+  ledgerAccountIds: string[];
+  crossedCount: number;
+  openCount: number;
+  // Time spent filtering (with the search) and aggregating, for instrumentation
+  filterMs: number;
+  aggregateMs: number;
+}
+
+const TOTALS_STRIDE = 3;
+
+// Loaded ledgers with at least this many entries are kept in columns
+export const COLUMNAR_LIMIT = 20_000;
+
+// A changed entry and its position in the loaded list
+export interface EntryReplacement<E> {
+  position: number;
+  entry: E;
+}
+
+export const resultTransferables = (result: LedgerQueryResult): ArrayBuffer[] => [
+  result.positions.buffer as ArrayBuffer,
+  result.accountOffsets.buffer as ArrayBuffer,
+  result.accountPositions.buffer as ArrayBuffer,
+  result.accountTotals.buffer as ArrayBuffer,
+  result.categoryCounts.buffer as ArrayBuffer,
+];
+
+// The loaded entries as objects, read like the columns
+class EntryArray<E extends object, L> implements EntryRows<E> {
+  private readonly entries: E[];
+  private readonly accessors: LedgerAccessors<E, L>;
+  private readonly monthKeyOf: (entry: E) => number;
+
+  constructor(entries: E[], accessors: LedgerAccessors<E, L>, monthKeyOf: (entry: E) => number) {
+    this.entries = entries;
+    this.accessors = accessors;
+    this.monthKeyOf = monthKeyOf;
+  }
+
+  get length() {
+    return this.entries.length;
+  }
+
+  append(entries: readonly E[]) {
+    for (let i = 0; i < entries.length; i++) this.entries.push(entries[i]);
+  }
+
+  replace(position: number, entry: E) {
+    this.entries[position] = entry;
+  }
+
+  at(position: number): E | undefined {
+    return this.entries[position];
+  }
+
+  slice(start?: number, end?: number): E[] {
+    return this.entries.slice(start, end);
+  }
+
+  [Symbol.iterator]() {
+    return this.entries[Symbol.iterator]();
+  }
+
+  monthAt(position: number) {
+    return this.monthKeyOf(this.entries[position]);
+  }
+
+  entryTypeAt(position: number) {
+    return this.accessors.entryType(this.entries[position]);
+  }
+
+  isOpenAt(position: number) {
+    return this.accessors.isOpen(this.entries[position]);
+  }
+
+  lineCountAt(position: number) {
+    return this.accessors.lines(this.entries[position]).length;
+  }
+
+  accountIdAt(position: number, line: number) {
+    return this.accessors.accountId(this.accessors.lines(this.entries[position])[line]);
+  }
+}
+
+export class LedgerEngine<E extends object, L> {
+  private readonly accessors: LedgerAccessors<E, L>;
+  private readonly categoryOf: (accountId: string) => string | undefined;
+  private readonly createColumns: ((entries: readonly E[]) => EntryRows<E>) | null;
+  private rows: EntryRows<E>;
+  private index: LedgerIndex;
+  private aggregates: PeriodAggregates<E, L>;
+  private readonly search = new SearchIndex();
+  private readonly reports: ReportEngine<E, L>;
+
+  constructor(
+    accessors: LedgerAccessors<E, L>,
+    categoryOf: (accountId: string) => string | undefined,
+    // Builds the columns for a large ledger, e.g. createColumnarLedger; null
+    // keeps every ledger as objects
+    createColumns: ((entries: readonly E[]) => EntryRows<E>) | null = null,
+  ) {
+    this.accessors = accessors;
+    this.categoryOf = categoryOf;
+    this.createColumns = createColumns;
+    this.rows = this.entryArray([]);
+    this.index = buildLedgerIndex([], accessors, categoryOf);
+    this.aggregates = new PeriodAggregates(accessors, categoryOf);
+    this.reports = new ReportEngine(accessors);
+  }
+
+  load(entries: E[]) {
+    // An own copy, so replaceMany() can swap entries into it in place
+    this.rows = this.createColumns && entries.length >= COLUMNAR_LIMIT
+      ? this.createColumns(entries)
+      : this.entryArray(entries.slice());
+    this.index = buildLedgerIndex(entries, this.accessors, this.categoryOf);
+    this.aggregates = PeriodAggregates.build(entries, this.accessors, this.categoryOf);
+    this.search.clear();
+    entries.forEach(entry => this.search.add(this.accessors.searchText(entry)));
+    this.reports.clear();
+  }
+
+  // Add entries after the loaded ones, e.g. as they stream in from the API
+  append(entries: E[]) {
+    const firstPosition = this.rows.length;
+    if (this.createColumns && this.rows instanceof EntryArray && firstPosition + entries.length >= COLUMNAR_LIMIT) {
+      // The ledger streamed in past the limit: move it into columns
+      this.rows = this.createColumns(this.rows.slice());
+    }
+    this.rows.append(entries);
+    appendToLedgerIndex(this.index, entries, firstPosition, this.accessors, this.categoryOf);
+    entries.forEach(entry => {
+      this.aggregates.add(entry);
+      this.search.add(this.accessors.searchText(entry));
+    });
+    this.reports.add(entries);
+  }
+
+  replace(position: number, entry: E) {
+    this.replaceMany([{ position, entry }]);
+  }
+
+  // Swap changed entries (a batch of crossings or live changes) into the
+  // loaded list in place. The index changes only for entries whose lines
+  // moved to other accounts; crossing an entry never does that.
+  replaceMany(replacements: EntryReplacement<E>[]) {
+    const previous: E[] = [];
+    const next: E[] = [];
+    replacements.forEach(({ position, entry }) => {
+      const old = this.rows.at(position);
+      if (!old) return;
+      this.rows.replace(position, entry);
+      this.aggregates.replace(old, entry);
+      this.search.replace(position, this.accessors.searchText(entry));
+      previous.push(old);
+      next.push(entry);
+      if (!this.sameAccounts(old, entry)) {
+        replaceInLedgerIndex(this.index, position, old, entry, this.accessors, this.categoryOf);
+      }
+    });
+    if (next.length === 0) return;
+    this.reports.remove(previous);
+    this.reports.add(next);
+  }
+
+  query(query: LedgerQuery): LedgerQueryResult {
+    const { rows, aggregates } = this;
+    const startedAt = performance.now();
+    const hits = query.search ? this.search.match(query.search) : null;
+    if (hits) return this.querySearch(query, hits, startedAt);
+
+    const source = query.accountId ? this.index.accountEntries.get(query.accountId) ?? [] : null;
+    const count = source ? source.length : rows.length;
+
+    // Read by position, so columns are filtered without building entries
+    const positions: number[] = [];
+    const byAccount = new Map<string, number[]>();
+    for (let i = 0; i < count; i++) {
+      const position = source ? source[i] : i;
+      if (!this.matchesFilter(position, query)) continue;
+
+      positions.push(position);
+      const lineCount = rows.lineCountAt(position);
+      for (let j = 0; j < lineCount; j++) {
+        const accountId = rows.accountIdAt(position, j);
+        let accountPositions = byAccount.get(accountId);
+        if (!accountPositions) {
+          accountPositions = [];
+          byAccount.set(accountId, accountPositions);
+        }
+        if (accountPositions[accountPositions.length - 1] !== position) {
+          accountPositions.push(position);
+        }
+      }
+    }
+
+    const filter = { entryType: query.entryType, openOnly: query.openOnly };
+    return this.result(
+      positions,
+      byAccount,
+      accountId => aggregates.totals(accountId, query.fromMonth, query.toMonth, filter),
+      categoryId => aggregates.totals(categoryKey(categoryId), query.fromMonth, query.toMonth, filter).count,
+      performance.now() - startedAt,
+    );
+  }
+
+  // Trial balance and VAT summary, memoized per query and kept up to date as
+  // entries are appended or replaced
+  report(query: ReportQuery): FinancialReports {
+    return this.reports.report(this.rows, query);
+  }
+
+  // A search narrows the ledger to a handful of entries, so totals and
+  // category counts are summed from the hits instead of the aggregates
+  private querySearch(query: LedgerQuery, hits: number[], startedAt: number): LedgerQueryResult {
+    const { accessors, rows } = this;
+    const positions: number[] = [];
+    const byAccount = new Map<string, number[]>();
+    const totals = new Map<string, PeriodTotals>();
+    const categoryCounts = new Map<string, number>();
+
+    for (const position of hits) {
+      if (!this.matchesFilter(position, query)) continue;
+      const entry = rows.at(position)!;
+
+      // Totals and category counts ignore accountId, like the aggregates
+      const lines = accessors.lines(entry);
+      const entryAccounts = new Set<string>();
+      const entryCategories = new Set<string>();
+      for (let j = 0; j < lines.length; j++) {
+        const accountId = accessors.accountId(lines[j]);
+        let sums = totals.get(accountId);
+        if (!sums) {
+          sums = { debit: 0, credit: 0, balance: 0, count: 0 };
+          totals.set(accountId, sums);
+        }
+        sums.debit += accessors.debit(lines[j]) || 0;
+        sums.credit += accessors.credit(lines[j]) || 0;
+        sums.balance = sums.debit - sums.credit;
+        if (!entryAccounts.has(accountId)) {
+          entryAccounts.add(accountId);
+          sums.count++;
+        }
+        const categoryId = this.categoryOf(accountId);
+        if (categoryId !== undefined) entryCategories.add(categoryId);
+      }
+      entryCategories.forEach(categoryId => categoryCounts.set(categoryId, (categoryCounts.get(categoryId) ?? 0) + 1));
+
+      if (query.accountId && !entryAccounts.has(query.accountId)) continue;
+      positions.push(position);
+      entryAccounts.forEach(accountId => {
+        let accountPositions = byAccount.get(accountId);
+        if (!accountPositions) {
+          accountPositions = [];
+          byAccount.set(accountId, accountPositions);
+        }
+        accountPositions.push(position);
+      });
+    }
+
+    return this.result(
+      positions,
+      byAccount,
+      accountId => totals.get(accountId)!,
+      categoryId => categoryCounts.get(categoryId) ?? 0,
+      performance.now() - startedAt,
+    );
+  }
+
+  private matchesFilter(position: number, query: LedgerQuery) {
+    const { rows } = this;
+    if (query.entryType && rows.entryTypeAt(position) !== query.entryType) return false;
+    if (query.openOnly && !rows.isOpenAt(position)) return false;
+    const month = rows.monthAt(position);
+    return month >= query.fromMonth && month <= query.toMonth;
+  }
+
+  private entryArray(entries: E[]) {
+    return new EntryArray(entries, this.accessors, entry => this.aggregates.monthKeyOf(entry));
+  }
+
+  private result(
+    positions: number[],
+    byAccount: Map<string, number[]>,
+    totalsOf: (accountId: string) => PeriodTotals,
+    categoryCountOf: (categoryId: string) => number,
+    filterMs: number,
+  ): LedgerQueryResult {
+    const { aggregates } = this;
+    const startedAt = performance.now();
+    const accountIds = Array.from(byAccount.keys()).sort((a, b) => a.localeCompare(b));
+    const accountOffsets = new Uint32Array(accountIds.length + 1);
+    const accountTotals = new Float64Array(accountIds.length * TOTALS_STRIDE);
+    accountIds.forEach((accountId, i) => {
+      accountOffsets[i + 1] = accountOffsets[i] + byAccount.get(accountId)!.length;
+      const totals = totalsOf(accountId);
+      accountTotals[i * TOTALS_STRIDE] = totals.debit;
+      accountTotals[i * TOTALS_STRIDE + 1] = totals.credit;
+      accountTotals[i * TOTALS_STRIDE + 2] = totals.count;
+    });
+    const accountPositions = new Uint32Array(accountOffsets[accountIds.length]);
+    accountIds.forEach((accountId, i) => accountPositions.set(byAccount.get(accountId)!, accountOffsets[i]));
+
+    const categoryIds = Array.from(this.index.categoryAccounts.keys());
+    const categoryCounts = new Uint32Array(categoryIds.length);
+    categoryIds.forEach((categoryId, i) => {
+      categoryCounts[i] = categoryCountOf(categoryId);
+    });
+
+    return {
+      positions: Uint32Array.from(positions),
+      accountIds,
+      accountOffsets,
+      accountPositions,
+      accountTotals,
+      categoryIds,
+      categoryCounts,
+      ledgerAccountIds: Array.from(this.index.accountEntries.keys()),
+      crossedCount: aggregates.crossedCount,
+      openCount: aggregates.openCount,
+      filterMs,
+      aggregateMs: performance.now() - startedAt,
+    };
+  }
+
+  // Whether both entries post to the same accounts, line by line
+  private sameAccounts(a: E, b: E) {
+    const { accessors } = this;
+    const linesA = accessors.lines(a);
+    const linesB = accessors.lines(b);
+    if (linesA.length !== linesB.length) return false;
+    for (let i = 0; i < linesA.length; i++) {
+      if (accessors.accountId(linesA[i]) !== accessors.accountId(linesB[i])) return false;
+    }
+    return true;
+  }
+}
+
+// Main-thread view over a query result and the entries it was computed from
+export interface LedgerResultView<E> {
+  entries: readonly E[];
+  result: LedgerQueryResult;
+  matchingEntries: () => E[];
+  entriesOf: (accountId: string) => E[];
+  totalsOf: (accountId: string) => PeriodTotals;
+  categoryCount: (categoryId: string) => number;
+}
+
+const NO_TOTALS: PeriodTotals = { debit: 0, credit: 0, balance: 0, count: 0 };
+
+export function readLedgerResult<E>(result: LedgerQueryResult, entries: readonly E[]): LedgerResultView<E> {
+  const accountIndex = new Map<string, number>();
+  result.accountIds.forEach((accountId, i) => accountIndex.set(accountId, i));
+  const categoryIndex = new Map<string, number>();
+  result.categoryIds.forEach((categoryId, i) => categoryIndex.set(categoryId, i));
+
+  return {
+    entries,
+    result,
+    matchingEntries: () => pickEntries(entries, result.positions),
+    entriesOf: (accountId) => {
+      const i = accountIndex.get(accountId);
+      if (i === undefined) return [];
+      return pickEntries(entries, result.accountPositions.subarray(result.accountOffsets[i], result.accountOffsets[i + 1]));
+    },
+    totalsOf: (accountId) => {
+      const i = accountIndex.get(accountId);
+      if (i === undefined) return NO_TOTALS;
+      const debit = result.accountTotals[i * TOTALS_STRIDE];
+      const credit = result.accountTotals[i * TOTALS_STRIDE + 1];
+      return { debit, credit, balance: debit - credit, count: result.accountTotals[i * TOTALS_STRIDE + 2] };
+    },
+    categoryCount: (categoryId) => {
+      const i = categoryIndex.get(categoryId);
+      return i === undefined ? 0 : result.categoryCounts[i];
+    },
+  };
+}
+
+// Worker protocol
+
+export type LedgerEngineRequest<E> =
+  | { type: 'load'; entries: E[] }
+  | { type: 'append'; entries: E[] }
+  | { type: 'replace'; replacements: EntryReplacement<E>[] }
+  | { type: 'query'; id: number; query: LedgerQuery }
+  | { type: 'report'; id: number; query: ReportQuery };
+
+export type LedgerEngineResponse =
+  | { type: 'result'; id: number; result: LedgerQueryResult }
+  | { type: 'cancelled'; id: number }
+  | { type: 'report'; id: number; report: FinancialReports };
+
+// The parts of DedicatedWorkerGlobalScope the engine needs; the apps' tsconfig
+// only includes the DOM lib, so worker entrypoints cast `self` to this.
+export interface LedgerWorkerScope<E> {
+  onmessage: ((event: MessageEvent<LedgerEngineRequest<E>>) => void) | null;
+  postMessage: (message: LedgerEngineResponse, transfer: Transferable[]) => void;
+}
+
+// Answer engine requests posted to `scope`. Queries are run on a later task
+// so that a query superseded by a newer one in the same burst of messages is
+// cancelled instead of computed.
+export function serveLedgerEngine<E extends object, L>(scope: LedgerWorkerScope<E>, engine: LedgerEngine<E, L>) {
+  let pending: { id: number; query: LedgerQuery } | null = null;
+
+  const flush = () => {
+    if (!pending) return;
+    const { id, query } = pending;
+    pending = null;
+    const result = engine.query(query);
+    scope.postMessage({ type: 'result', id, result }, resultTransferables(result));
+  };
+
+  scope.onmessage = ({ data }) => {
+    switch (data.type) {
+      case 'load':
+        engine.load(data.entries);
+        break;
+      case 'append':
+        engine.append(data.entries);
+        break;
+      case 'replace':
+        engine.replaceMany(data.replacements);
+        break;
+      case 'query':
+        if (pending) {
+          scope.postMessage({ type: 'cancelled', id: pending.id }, []);
+        } else {
+          setTimeout(flush, 0);
+        }
+        pending = { id: data.id, query: data.query };
+        break;
+      case 'report':
+        scope.postMessage({ type: 'report', id: data.id, report: engine.report(data.query) }, []);
+        break;
+    }
+  };
+}
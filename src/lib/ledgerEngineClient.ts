@@ -0,0 +1,209 @@
+import type {
+  EntryReplacement,
+  LedgerEngine,
+  LedgerEngineRequest,
+  LedgerEngineResponse,
+  LedgerQuery,
+  LedgerQueryResult,
+} from './ledgerEngine';
+import type { FinancialReports, ReportQuery } from './reportEngine';
+import { instrumentation } from './instrumentation';
+
+// Main-thread side of the ledger worker. Only the latest query is answered:
+// starting a new query resolves every older one with null. When workers are
+// unavailable (or the worker fails to start) the engine runs in-thread behind
+// the same asynchronous interface. Report queries work the same way, apart
+// from ledger queries.
+export class LedgerEngineClient<E extends object, L> {
+  private readonly createWorker: () => Worker;
+  private readonly createEngine: () => LedgerEngine<E, L>;
+  private worker: Worker | null = null;
+  private engine: LedgerEngine<E, L> | null = null;
+  private entries: E[] = [];
+  private latestId = 0;
+  private latestQuery: LedgerQuery | null = null;
+  private latestStartedAt = 0;
+  private readonly waiting = new Map<number, (result: LedgerQueryResult | null) => void>();
+  private latestReportId = 0;
+  private latestReportQuery: ReportQuery | null = null;
+  private latestReportStartedAt = 0;
+  private readonly waitingReports = new Map<number, (report: FinancialReports | null) => void>();
+
+  constructor(createWorker: () => Worker, createEngine: () => LedgerEngine<E, L>) {
+    this.createWorker = createWorker;
+    this.createEngine = createEngine;
+  }
+
+  load(entries: E[]) {
+    // An own copy, so replaceMany() can swap entries into it in place
+    this.entries = entries.slice();
+    this.dispatch({ type: 'load', entries });
+  }
+
+  append(entries: E[]) {
+    this.entries = this.entries.concat(entries);
+    this.dispatch({ type: 'append', entries });
+  }
+
+  replace(position: number, entry: E) {
+    this.replaceMany([{ position, entry }]);
+  }
+
+  // Replace a batch of entries with one message
+  replaceMany(replacements: EntryReplacement<E>[]) {
+    if (replacements.length === 0) return;
+    replacements.forEach(({ position, entry }) => {
+      this.entries[position] = entry;
+    });
+    this.dispatch({ type: 'replace', replacements });
+  }
+
+  query(query: LedgerQuery): Promise<LedgerQueryResult | null> {
+    const id = ++this.latestId;
+    this.latestQuery = query;
+    this.latestStartedAt = instrumentation.now();
+    this.waiting.forEach(resolve => resolve(null));
+    this.waiting.clear();
+    return new Promise(resolve => {
+      this.waiting.set(id, resolve);
+      this.dispatch({ type: 'query', id, query });
+    });
+  }
+
+  report(query: ReportQuery): Promise<FinancialReports | null> {
+    const id = ++this.latestReportId;
+    this.latestReportQuery = query;
+    this.latestReportStartedAt = instrumentation.now();
+    this.waitingReports.forEach(resolve => resolve(null));
+    this.waitingReports.clear();
+    return new Promise(resolve => {
+      this.waitingReports.set(id, resolve);
+      this.dispatch({ type: 'report', id, query });
+    });
+  }
+
+  // Stop the worker. The client restarts it with the last entries on the next call.
+  dispose() {
+    this.worker?.terminate();
+    this.worker = null;
+    this.engine = null;
+    this.waiting.forEach(resolve => resolve(null));
+    this.waiting.clear();
+    this.waitingReports.forEach(resolve => resolve(null));
+    this.waitingReports.clear();
+  }
+
+  private dispatch(message: LedgerEngineRequest<E>) {
+    if (!this.worker && !this.engine) {
+      this.start();
+      // start() already sent the current entries
+      if (message.type !== 'query' && message.type !== 'report') return;
+    }
+    if (this.worker) {
+      this.worker.postMessage(message);
+    } else {
+      this.runInThread(message);
+    }
+  }
+
+  private start() {
+    if (typeof Worker !== 'undefined') {
+      try {
+        const worker = this.createWorker();
+        worker.onmessage = ({ data }: MessageEvent<LedgerEngineResponse>) => {
+          if (data.type === 'report') {
+            this.deliverReport(data.id, data.report);
+          } else {
+            this.deliver(data.id, data.type === 'result' ? data.result : null);
+          }
+        };
+        worker.onerror = () => this.fallBackToThread();
+        worker.postMessage({ type: 'load', entries: this.entries });
+        this.worker = worker;
+        return;
+      } catch {
+        // Fall through to the in-thread engine
+      }
+    }
+    this.engine = this.createEngine();
+    this.engine.load(this.entries);
+  }
+
+  private fallBackToThread() {
+    this.worker?.terminate();
+    this.worker = null;
+    this.engine = this.createEngine();
+    this.engine.load(this.entries);
+    if (this.latestQuery && this.waiting.has(this.latestId)) {
+      this.runInThread({ type: 'query', id: this.latestId, query: this.latestQuery });
+    }
+    if (this.latestReportQuery && this.waitingReports.has(this.latestReportId)) {
+      this.runInThread({ type: 'report', id: this.latestReportId, query: this.latestReportQuery });
+    }
+  }
+
+  private runInThread(message: LedgerEngineRequest<E>) {
+    const engine = this.engine!;
+    switch (message.type) {
+      case 'load':
+        engine.load(message.entries);
+        break;
+      case 'append':
+        engine.append(message.entries);
+        break;
+      case 'replace':
+        engine.replaceMany(message.replacements);
+        break;
+      case 'query':
+        // Answer asynchronously so superseded queries are skipped, as in the worker
+        Promise.resolve().then(() => {
+          if (this.engine === engine && this.waiting.has(message.id)) {
+            this.deliver(message.id, engine.query(message.query));
+          }
+        });
+        break;
+      case 'report':
+        Promise.resolve().then(() => {
+          if (this.engine === engine && this.waitingReports.has(message.id)) {
+            this.deliverReport(message.id, engine.report(message.query));
+          }
+        });
+        break;
+    }
+  }
+
+  private deliver(id: number, result: LedgerQueryResult | null) {
+    const resolve = this.waiting.get(id);
+    if (!resolve) return;
+    this.waiting.delete(id);
+    if (result && instrumentation.enabled) this.recordTimings(result);
+    resolve(result);
+  }
+
+  private deliverReport(id: number, report: FinancialReports) {
+    const resolve = this.waitingReports.get(id);
+    if (!resolve) return;
+    this.waitingReports.delete(id);
+    if (instrumentation.enabled) {
+      instrumentation.end('ledger.report', this.latestReportStartedAt, {
+        entries: this.entries.length,
+        computeMs: report.computeMs,
+      });
+    }
+    resolve(report);
+  }
+
+  // The worker's own clock is not the page's, so its filter and aggregate
+  // times are placed right before the answer arrived
+  private recordTimings(result: LedgerQueryResult) {
+    const { filterMs, aggregateMs } = result;
+    const arrivedAt = performance.now();
+    const detail = { entries: this.entries.length, matches: result.positions.length };
+    instrumentation.end('ledger.query', this.latestStartedAt, detail);
+    instrumentation.record('ledger.filter', arrivedAt - filterMs - aggregateMs, filterMs, detail);
+    instrumentation.record('ledger.aggregate', arrivedAt - aggregateMs, aggregateMs, {
+      accounts: result.accountIds.length,
+      categories: result.categoryIds.length,
+    });
+  }
+}
@@ -0,0 +1,200 @@
+import type { LedgerAccessors } from './ledgerAccessors';
+
+// Inverted index over a list of journal entries, built in one pass over the
+// lines. Positions refer to the index of the entry in the list the index was
+// built from and are stored in ascending order without duplicates.
+export interface LedgerIndex {
+  // accountId → entries with at least one line on the account
+  accountEntries: Map<string, number[]>;
+  // categoryId → accounts in the category that have postings, sorted
+  categoryAccounts: Map<string, string[]>;
+  // categoryId → entries with at least one line in the category
+  categoryEntries: Map<string, number[]>;
+}
+
+export function buildLedgerIndex<E, L>(
+  entries: readonly E[],
+  accessors: LedgerAccessors<E, L>,
+  categoryOf: (accountId: string) => string | undefined,
+): LedgerIndex {
+  const index: LedgerIndex = {
+    accountEntries: new Map(),
+    categoryAccounts: new Map(),
+    categoryEntries: new Map(),
+  };
+  appendToLedgerIndex(index, entries, 0, accessors, categoryOf);
+  return index;
+}
+
+// Add entries that were appended to the indexed list; `firstPosition` is the
+// position of entries[0] in that list.
+export function appendToLedgerIndex<E, L>(
+  index: LedgerIndex,
+  entries: readonly E[],
+  firstPosition: number,
+  accessors: LedgerAccessors<E, L>,
+  categoryOf: (accountId: string) => string | undefined,
+) {
+  const { accountEntries, categoryAccounts, categoryEntries } = index;
+
+  for (let i = 0; i < entries.length; i++) {
+    const position = firstPosition + i;
+    const lines = accessors.lines(entries[i]);
+    for (let j = 0; j < lines.length; j++) {
+      const accountId = accessors.accountId(lines[j]);
+
+      let positions = accountEntries.get(accountId);
+      if (!positions) {
+        positions = [];
+        accountEntries.set(accountId, positions);
+        const categoryId = categoryOf(accountId);
+        if (categoryId !== undefined) {
+          let accounts = categoryAccounts.get(categoryId);
+          if (!accounts) {
+            accounts = [];
+            categoryAccounts.set(categoryId, accounts);
+          }
+          insertSorted(accounts, accountId);
+        }
+      }
+      if (positions[positions.length - 1] === position) continue;
+      positions.push(position);
+
+      const categoryId = categoryOf(accountId);
+      if (categoryId === undefined) continue;
+      let categoryPositions = categoryEntries.get(categoryId);
+      if (!categoryPositions) {
+        categoryPositions = [];
+        categoryEntries.set(categoryId, categoryPositions);
+      }
+      if (categoryPositions[categoryPositions.length - 1] !== position) {
+        categoryPositions.push(position);
+      }
+    }
+  }
+}
+
+// Move the entry at `position` from the accounts and categories of
+// `previous` to those of `next`, after it was replaced in the indexed list.
+// Accounts and categories left without entries are dropped, as a rebuild
+// would.
+export function replaceInLedgerIndex<E, L>(
+  index: LedgerIndex,
+  position: number,
+  previous: E,
+  next: E,
+  accessors: LedgerAccessors<E, L>,
+  categoryOf: (accountId: string) => string | undefined,
+) {
+  const { accountEntries, categoryAccounts, categoryEntries } = index;
+  const accountsBefore = accountsOf(previous, accessors);
+  const accountsAfter = accountsOf(next, accessors);
+  const categoriesOf = (accounts: Set<string>) => {
+    const categories = new Set<string>();
+    accounts.forEach(accountId => {
+      const categoryId = categoryOf(accountId);
+      if (categoryId !== undefined) categories.add(categoryId);
+    });
+    return categories;
+  };
+  const categoriesBefore = categoriesOf(accountsBefore);
+  const categoriesAfter = categoriesOf(accountsAfter);
+
+  accountsBefore.forEach(accountId => {
+    if (accountsAfter.has(accountId)) return;
+    const positions = accountEntries.get(accountId);
+    if (!positions || !removeSorted(positions, position) || positions.length > 0) return;
+    accountEntries.delete(accountId);
+    const categoryId = categoryOf(accountId);
+    const accounts = categoryId === undefined ? undefined : categoryAccounts.get(categoryId);
+    if (!accounts) return;
+    accounts.splice(accounts.indexOf(accountId), 1);
+    if (accounts.length === 0) categoryAccounts.delete(categoryId!);
+  });
+  accountsAfter.forEach(accountId => {
+    if (accountsBefore.has(accountId)) return;
+    let positions = accountEntries.get(accountId);
+    if (!positions) {
+      positions = [];
+      accountEntries.set(accountId, positions);
+      const categoryId = categoryOf(accountId);
+      if (categoryId !== undefined) {
+        let accounts = categoryAccounts.get(categoryId);
+        if (!accounts) {
+          accounts = [];
+          categoryAccounts.set(categoryId, accounts);
+        }
+        insertSorted(accounts, accountId);
+      }
+    }
+    insertPosition(positions, position);
+  });
+
+  categoriesBefore.forEach(categoryId => {
+    if (categoriesAfter.has(categoryId)) return;
+    const positions = categoryEntries.get(categoryId);
+    if (positions && removeSorted(positions, position) && positions.length === 0) categoryEntries.delete(categoryId);
+  });
+  categoriesAfter.forEach(categoryId => {
+    if (categoriesBefore.has(categoryId)) return;
+    let positions = categoryEntries.get(categoryId);
+    if (!positions) {
+      positions = [];
+      categoryEntries.set(categoryId, positions);
+    }
+    insertPosition(positions, position);
+  });
+}
+
+const accountsOf = <E, L>(entry: E, accessors: LedgerAccessors<E, L>) => {
+  const accounts = new Set<string>();
+  const lines = accessors.lines(entry);
+  for (let j = 0; j < lines.length; j++) accounts.add(accessors.accountId(lines[j]));
+  return accounts;
+};
+
+// First index in the ascending `positions` not below `position`
+const lowerBound = (positions: number[], position: number) => {
+  let low = 0;
+  let high = positions.length;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (positions[mid] < position) low = mid + 1;
+    else high = mid;
+  }
+  return low;
+};
+
+const insertPosition = (positions: number[], position: number) => {
+  const at = lowerBound(positions, position);
+  if (positions[at] !== position) positions.splice(at, 0, position);
+};
+
+// Whether `position` was there to remove
+const removeSorted = (positions: number[], position: number) => {
+  const at = lowerBound(positions, position);
+  if (positions[at] !== position) return false;
+  positions.splice(at, 1);
+  return true;
+};
+
+const insertSorted = (accounts: string[], accountId: string) => {
+  let low = 0;
+  let high = accounts.length;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (accounts[mid].localeCompare(accountId) < 0) low = mid + 1;
+    else high = mid;
+  }
+  accounts.splice(low, 0, accountId);
+};
+
+// Resolve index positions back to entries
+export function pickEntries<E>(entries: readonly E[], positions: ArrayLike<number> | undefined): E[] {
+  if (!positions) return [];
+  const result = new Array<E>(positions.length);
+  for (let i = 0; i < positions.length; i++) {
+    result[i] = entries[positions[i]];
+  }
+  return result;
+}
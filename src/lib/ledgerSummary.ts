@@ -0,0 +1,204 @@
+// Summary-first ledger. For ledgers too large to keep in memory the collapsed
+// tree (categories and accounts with debit, credit, balance and entry count)
+// is drawn from per-account totals the backend aggregates, and the entries of
+// an account are fetched page by page only when it is expanded.
+//
+// The ledger components draw the tree from a LedgerOverview, which comes
+// either from the ledger engine (every entry loaded, see overviewOfView) or
+// from a backend summary (readLedgerSummary). AccountPages fetches and keeps
+// the entries of expanded accounts.
+
+import type { LedgerResultView } from './ledgerEngine';
+import type { PeriodTotals } from './periodAggregates';
+
+// Totals of one account over the matching entries; `count` is the number of
+// entries with a line on the account
+export interface AccountSummary {
+  accountId: string;
+  debit: number;
+  credit: number;
+  count: number;
+}
+
+// Response of GET /journal-entries/summary
+export interface LedgerSummary {
+  // Accounts touched by the matching entries, sorted by account id
+  accounts: AccountSummary[];
+  // Per requested account range (`ranges`), the matching entries with a line
+  // in it. Like the engine's category counts these ignore `accountId`.
+  rangeCounts: number[];
+  entryCount: number;
+  openCount: number;
+  crossedCount: number;
+}
+
+// What the collapsed ledger tree needs
+export interface LedgerOverview {
+  // Accounts with matching entries, sorted, sub-accounts included. The tree
+  // lists these (not the chart's accounts), so its rows match categoryCount.
+  accountIds: readonly string[];
+  totalsOf: (accountId: string) => PeriodTotals;
+  categoryCount: (categoryId: string) => number;
+  entryCount: number;
+  openCount: number;
+}
+
+const NO_TOTALS: PeriodTotals = { debit: 0, credit: 0, balance: 0, count: 0 };
+
+export function overviewOfView<E>(view: LedgerResultView<E>): LedgerOverview {
+  return {
+    accountIds: view.result.accountIds,
+    totalsOf: view.totalsOf,
+    categoryCount: view.categoryCount,
+    entryCount: view.result.positions.length,
+    openCount: view.result.openCount,
+  };
+}
+
+// `categories` are the account ranges the summary was asked for, in the same
+// order, with the id of the category each stands for
+export function readLedgerSummary(
+  summary: LedgerSummary,
+  categories: readonly { id: string; range: string }[]
+): LedgerOverview {
+  const totals = new Map<string, PeriodTotals>();
+  summary.accounts.forEach(({ accountId, debit, credit, count }) => {
+    totals.set(accountId, { debit, credit, balance: debit - credit, count });
+  });
+  const categoryCounts = new Map<string, number>();
+  categories.forEach(({ id }, i) => categoryCounts.set(id, summary.rangeCounts[i] ?? 0));
+
+  return {
+    accountIds: summary.accounts.map(account => account.accountId),
+    totalsOf: accountId => totals.get(accountId) ?? NO_TOTALS,
+    categoryCount: categoryId => categoryCounts.get(categoryId) ?? 0,
+    entryCount: summary.entryCount,
+    openCount: summary.openCount,
+  };
+}
+
+// The entries of one account fetched so far
+export interface AccountEntries<E> {
+  entries: E[];
+  hasMore: boolean;
+  isLoading: boolean;
+  // The last page failed; loadMore() tries it again
+  failed: boolean;
+}
+
+export type FetchAccountPage<E> = (
+  accountId: string,
+  cursor: string | null,
+  signal: AbortSignal
+) => Promise<{ items: E[]; nextCursor: string | null }>;
+
+interface AccountState<E> {
+  entries: AccountEntries<E>;
+  cursor: string | null;
+  controller: AbortController | null;
+}
+
+const NOT_LOADED: AccountEntries<never> = { entries: [], hasMore: true, isLoading: false, failed: false };
+
+// Accounts whose entries are kept; the least recently expanded go first
+const MAX_ACCOUNTS = 50;
+
+/**
+ * Entries of expanded accounts for one query (period and filters), fetched a
+ * page at a time and kept for the accounts used most recently. Make a new
+ * instance when the query changes. `onPage` sees every fetched page, e.g. to
+ * put the entries in an EntryStore.
+ */
+export class AccountPages<E> {
+  private readonly fetchPage: FetchAccountPage<E>;
+  private readonly onPage: (entries: E[]) => void;
+  private readonly maxAccounts: number;
+  // Least recently used first
+  private readonly accounts = new Map<string, AccountState<E>>();
+  private readonly listeners = new Map<string, Set<() => void>>();
+
+  constructor(fetchPage: FetchAccountPage<E>, onPage: (entries: E[]) => void = () => {}, maxAccounts = MAX_ACCOUNTS) {
+    this.fetchPage = fetchPage;
+    this.onPage = onPage;
+    this.maxAccounts = maxAccounts;
+  }
+
+  entriesOf = (accountId: string): AccountEntries<E> => this.accounts.get(accountId)?.entries ?? NOT_LOADED;
+
+  subscribe = (accountId: string, listener: () => void): (() => void) => {
+    let listeners = this.listeners.get(accountId);
+    if (!listeners) {
+      listeners = new Set();
+      this.listeners.set(accountId, listeners);
+    }
+    listeners.add(listener);
+    return () => {
+      listeners.delete(listener);
+      if (listeners.size === 0) this.listeners.delete(accountId);
+    };
+  };
+
+  // Fetch the next page of the account; nothing while a page is loading or
+  // when every entry is there
+  loadMore(accountId: string) {
+    let state = this.accounts.get(accountId);
+    if (state) {
+      this.accounts.delete(accountId);
+      this.accounts.set(accountId, state);
+    } else {
+      state = { entries: NOT_LOADED, cursor: null, controller: null };
+      this.accounts.set(accountId, state);
+      this.evict();
+    }
+    if (state.entries.isLoading || !state.entries.hasMore) return;
+
+    const current = state;
+    const controller = new AbortController();
+    current.controller = controller;
+    this.set(accountId, current, { ...current.entries, isLoading: true, failed: false });
+    this.fetchPage(accountId, current.cursor, controller.signal).then(
+      page => {
+        if (controller.signal.aborted) return;
+        this.onPage(page.items);
+        current.cursor = page.nextCursor;
+        current.controller = null;
+        this.set(accountId, current, {
+          entries: current.entries.entries.concat(page.items),
+          hasMore: page.nextCursor !== null,
+          isLoading: false,
+          failed: false,
+        });
+      },
+      () => {
+        if (controller.signal.aborted) return;
+        current.controller = null;
+        this.set(accountId, current, { ...current.entries, isLoading: false, failed: true });
+      }
+    );
+  }
+
+  // Cancel the pages being fetched; loadMore() starts them again
+  dispose() {
+    this.accounts.forEach((state, accountId) => {
+      if (!state.controller) return;
+      state.controller.abort();
+      state.controller = null;
+      this.set(accountId, state, { ...state.entries, isLoading: false });
+    });
+  }
+
+  private set(accountId: string, state: AccountState<E>, entries: AccountEntries<E>) {
+    state.entries = entries;
+    this.listeners.get(accountId)?.forEach(listener => listener());
+  }
+
+  // Drop the least recently used accounts nobody is showing
+  private evict() {
+    for (const [accountId, state] of this.accounts) {
+      if (this.accounts.size <= this.maxAccounts) break;
+      if (this.listeners.has(accountId)) continue;
+      state.controller?.abort();
+      this.accounts.delete(accountId);
+    }
+  }
+}
@@ -0,0 +1,31 @@
+// Incremental NDJSON reader: yields one parsed value per line as the bytes
+// arrive instead of buffering the whole body. Stopping the iteration early
+// cancels the underlying stream.
+export async function* readNdjson<T>(body: ReadableStream<Uint8Array>): AsyncGenerator<T> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let finished = false;
+  try {
+    while (!finished) {
+      const { done, value } = await reader.read();
+      finished = done;
+      buffer += done ? decoder.decode() : decoder.decode(value, { stream: true });
+
+      let start = 0;
+      let newline = buffer.indexOf('\n');
+      while (newline !== -1) {
+        const line = buffer.slice(start, newline).trim();
+        if (line) yield JSON.parse(line) as T;
+        start = newline + 1;
+        newline = buffer.indexOf('\n', start);
+      }
+      buffer = buffer.slice(start);
+    }
+    const rest = buffer.trim();
+    if (rest) yield JSON.parse(rest) as T;
+  } finally {
+    if (!finished) await reader.cancel().catch(() => undefined);
+    reader.releaseLock();
+  }
+}
@@ -0,0 +1,104 @@
+// Promise wrapper around one IndexedDB database.
+//
+// - the schema is a list of migrations: migration i upgrades version i to
+//   i + 1, and the database version is the number of migrations. Opening an
+//   older database runs only the missing ones, so migrations that have
+//   shipped must never change; append a new one instead.
+// - open() resolves to null when IndexedDB is missing, blocked or failing
+//   (private mode, old browsers). Callers then go to the network as before.
+
+export type Migration = (db: IDBDatabase, transaction: IDBTransaction) => void;
+
+const promisify = <T>(request: IDBRequest<T>) =>
+  new Promise<T>((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+export class OfflineStore {
+  private readonly db: IDBDatabase;
+
+  private constructor(db: IDBDatabase) {
+    this.db = db;
+    // Another tab upgraded the schema; this connection has to go
+    db.onversionchange = () => db.close();
+  }
+
+  static open(name: string, migrations: Migration[]): Promise<OfflineStore | null> {
+    if (typeof indexedDB === 'undefined') return Promise.resolve(null);
+    return new Promise(resolve => {
+      let request: IDBOpenDBRequest;
+      try {
+        request = indexedDB.open(name, migrations.length);
+      } catch {
+        resolve(null);
+        return;
+      }
+      request.onupgradeneeded = event => {
+        for (let version = event.oldVersion; version < migrations.length; version++) {
+          migrations[version](request.result, request.transaction!);
+        }
+      };
+      request.onsuccess = () => resolve(new OfflineStore(request.result));
+      request.onerror = () => resolve(null);
+      request.onblocked = () => {
+        resolve(null);
+        // The request goes on and succeeds once the other tab closes; nobody
+        // uses that connection, so close it rather than block the next upgrade
+        request.onsuccess = () => request.result.close();
+      };
+    });
+  }
+
+  get<T>(storeName: string, key: IDBValidKey): Promise<T | undefined> {
+    return promisify(this.db.transaction(storeName).objectStore(storeName).get(key));
+  }
+
+  // Every record of a store, or of an index range, in key order
+  getAll<T>(storeName: string, query?: IDBKeyRange, indexName?: string): Promise<T[]> {
+    const store = this.db.transaction(storeName).objectStore(storeName);
+    return promisify((indexName ? store.index(indexName) : store).getAll(query));
+  }
+
+  getAllKeys(storeName: string, query?: IDBKeyRange): Promise<IDBValidKey[]> {
+    return promisify(this.db.transaction(storeName).objectStore(storeName).getAllKeys(query));
+  }
+
+  // Run `work` in one readwrite transaction over `storeNames`; resolves when
+  // it has committed, so either all of its writes land or none do
+  write(storeNames: string[], work: (stores: Record<string, IDBObjectStore>) => void): Promise<void> {
+    return new Promise((resolve, reject) => {
+      const transaction = this.db.transaction(storeNames, 'readwrite');
+      const stores: Record<string, IDBObjectStore> = {};
+      storeNames.forEach(storeName => {
+        stores[storeName] = transaction.objectStore(storeName);
+      });
+      transaction.oncomplete = () => resolve();
+      transaction.onerror = () => reject(transaction.error);
+      transaction.onabort = () => reject(transaction.error);
+      work(stores);
+    });
+  }
+}
+
+// Delete every record in `range` of an index, inside a write() transaction
+export function deleteIndexRange(store: IDBObjectStore, indexName: string, range: IDBKeyRange) {
+  const request = store.index(indexName).openKeyCursor(range);
+  request.onsuccess = () => {
+    const cursor = request.result;
+    if (!cursor) return;
+    store.delete(cursor.primaryKey);
+    cursor.continue();
+  };
+}
+
+export const isQuotaError = (error: unknown) =>
+  error instanceof DOMException && error.name === 'QuotaExceededError';
+
+// Share of the origin's storage quota in use, or null when the browser
+// does not say
+export async function storageUsage(): Promise<number | null> {
+  if (typeof navigator === 'undefined' || !navigator.storage?.estimate) return null;
+  const { usage, quota } = await navigator.storage.estimate();
+  return usage !== undefined && quota ? usage / quota : null;
+}
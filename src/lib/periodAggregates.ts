@@ -0,0 +1,228 @@
+import type { LedgerAccessors } from './ledgerAccessors';
+
+// Per-month debit/credit aggregates for accounts, categories and the whole
+// ledger. Buckets are dense per series and carry lazily rebuilt prefix sums,
+// so totals and opening balances for any month range are O(1). Adding,
+// removing or replacing an entry only touches the buckets of that entry.
+
+// Month keys count months since year 0: year * 12 + (month - 1)
+export const monthKey = (year: number, month: number) => year * 12 + month - 1;
+
+// Parses the YYYY-MM prefix of an ISO date without going through Date
+export const parseMonthKey = (date: string) =>
+  monthKey(Number(date.slice(0, 4)), Number(date.slice(5, 7)));
+
+export const yearOfMonthKey = (key: number) => Math.floor(key / 12);
+
+// Group keys for series that span more than one account
+export const TOTAL_KEY = '*';
+export const categoryKey = (categoryId: string) => `category:${categoryId}`;
+
+export interface AggregateFilter {
+  entryType?: string;
+  openOnly?: boolean;
+}
+
+export interface PeriodTotals {
+  debit: number;
+  credit: number;
+  balance: number;
+  count: number;
+}
+
+const ALL_TYPES = '*';
+const EMPTY_TOTALS: PeriodTotals = { debit: 0, credit: 0, balance: 0, count: 0 };
+
+interface Prefix {
+  debit: Float64Array;
+  credit: Float64Array;
+  count: Float64Array;
+}
+
+interface Series {
+  first: number;
+  debit: Float64Array;
+  credit: Float64Array;
+  count: Float64Array;
+  prefix: Prefix | null;
+}
+
+const seriesKey = (groupKey: string, entryType: string, openOnly: boolean) =>
+  `${groupKey}|${entryType}|${openOnly ? 'open' : 'all'}`;
+
+// First month key of the calendar year containing `month`
+const yearStart = (month: number) => month - (month % 12);
+
+const createSeries = (month: number): Series => ({
+  first: yearStart(month),
+  debit: new Float64Array(12),
+  credit: new Float64Array(12),
+  count: new Float64Array(12),
+  prefix: null,
+});
+
+// Widen a series so it covers `month`, keeping whole calendar years
+const growSeries = (series: Series, month: number) => {
+  const last = series.first + series.debit.length - 1;
+  if (month >= series.first && month <= last) return;
+  const first = Math.min(series.first, yearStart(month));
+  const end = Math.max(last + 1, yearStart(month) + 12);
+  const shift = series.first - first;
+  const widen = (values: Float64Array) => {
+    const next = new Float64Array(end - first);
+    next.set(values, shift);
+    return next;
+  };
+  series.first = first;
+  series.debit = widen(series.debit);
+  series.credit = widen(series.credit);
+  series.count = widen(series.count);
+  series.prefix = null;
+};
+
+const prefixOf = (series: Series): Prefix => {
+  if (series.prefix) return series.prefix;
+  const length = series.debit.length;
+  const prefix: Prefix = {
+    debit: new Float64Array(length + 1),
+    credit: new Float64Array(length + 1),
+    count: new Float64Array(length + 1),
+  };
+  for (let i = 0; i < length; i++) {
+    prefix.debit[i + 1] = prefix.debit[i] + series.debit[i];
+    prefix.credit[i + 1] = prefix.credit[i] + series.credit[i];
+    prefix.count[i + 1] = prefix.count[i] + series.count[i];
+  }
+  series.prefix = prefix;
+  return prefix;
+};
+
+export class PeriodAggregates<E extends object, L> {
+  private readonly accessors: LedgerAccessors<E, L>;
+  private readonly categoryOf: (accountId: string) => string | undefined;
+  private readonly monthKeys = new WeakMap<E, number>();
+  private readonly series = new Map<string, Series>();
+
+  entryCount = 0;
+  crossedCount = 0;
+  openCount = 0;
+
+  constructor(
+    accessors: LedgerAccessors<E, L>,
+    categoryOf: (accountId: string) => string | undefined = () => undefined,
+  ) {
+    this.accessors = accessors;
+    this.categoryOf = categoryOf;
+  }
+
+  static build<E extends object, L>(
+    entries: readonly E[],
+    accessors: LedgerAccessors<E, L>,
+    categoryOf?: (accountId: string) => string | undefined,
+  ): PeriodAggregates<E, L> {
+    const aggregates = new PeriodAggregates(accessors, categoryOf);
+    entries.forEach(entry => aggregates.add(entry));
+    return aggregates;
+  }
+
+  // Month key of the entry date, parsed once per entry object
+  monthKeyOf(entry: E): number {
+    let key = this.monthKeys.get(entry);
+    if (key === undefined) {
+      key = parseMonthKey(this.accessors.date(entry));
+      this.monthKeys.set(entry, key);
+    }
+    return key;
+  }
+
+  add(entry: E) {
+    this.apply(entry, 1);
+  }
+
+  remove(entry: E) {
+    this.apply(entry, -1);
+  }
+
+  // Swap an entry for an updated copy, e.g. after crossing it
+  replace(previous: E, next: E) {
+    this.apply(previous, -1);
+    this.apply(next, 1);
+  }
+
+  // Totals for a group key (account id, categoryKey(...) or TOTAL_KEY) over
+  // the inclusive month range
+  totals(groupKey: string, fromMonth: number, toMonth: number, filter: AggregateFilter = {}): PeriodTotals {
+    const series = this.series.get(seriesKey(groupKey, filter.entryType || ALL_TYPES, !!filter.openOnly));
+    if (!series) return EMPTY_TOTALS;
+    const length = series.debit.length;
+    const start = Math.min(length, Math.max(0, fromMonth - series.first));
+    const end = Math.min(length, Math.max(0, toMonth - series.first + 1));
+    if (end <= start) return EMPTY_TOTALS;
+    const prefix = prefixOf(series);
+    const debit = prefix.debit[end] - prefix.debit[start];
+    const credit = prefix.credit[end] - prefix.credit[start];
+    return { debit, credit, balance: debit - credit, count: prefix.count[end] - prefix.count[start] };
+  }
+
+  // Balance carried into `fromMonth` (everything posted before it)
+  openingBalance(groupKey: string, fromMonth: number, filter: AggregateFilter = {}): number {
+    return this.totals(groupKey, Number.MIN_SAFE_INTEGER, fromMonth - 1, filter).balance;
+  }
+
+  private apply(entry: E, sign: 1 | -1) {
+    const { accessors } = this;
+    const month = this.monthKeyOf(entry);
+    const entryType = accessors.entryType(entry);
+    const isOpen = accessors.isOpen(entry);
+
+    // Sum the entry per group first so each group counts the entry once
+    const groups = new Map<string, [number, number]>();
+    const addTo = (groupKey: string, debit: number, credit: number) => {
+      const sums = groups.get(groupKey);
+      if (sums) {
+        sums[0] += debit;
+        sums[1] += credit;
+      } else {
+        groups.set(groupKey, [debit, credit]);
+      }
+    };
+    const lines = accessors.lines(entry);
+    for (let i = 0; i < lines.length; i++) {
+      const accountId = accessors.accountId(lines[i]);
+      const debit = accessors.debit(lines[i]) || 0;
+      const credit = accessors.credit(lines[i]) || 0;
+      addTo(accountId, debit, credit);
+      const categoryId = this.categoryOf(accountId);
+      if (categoryId !== undefined) addTo(categoryKey(categoryId), debit, credit);
+      addTo(TOTAL_KEY, debit, credit);
+    }
+
+    groups.forEach(([debit, credit], groupKey) => {
+      this.bump(seriesKey(groupKey, ALL_TYPES, false), month, debit, credit, sign);
+      this.bump(seriesKey(groupKey, entryType, false), month, debit, credit, sign);
+      if (isOpen) {
+        this.bump(seriesKey(groupKey, ALL_TYPES, true), month, debit, credit, sign);
+        this.bump(seriesKey(groupKey, entryType, true), month, debit, credit, sign);
+      }
+    });
+
+    this.entryCount += sign;
+    if (accessors.isCrossed(entry)) this.crossedCount += sign;
+    if (isOpen) this.openCount += sign;
+  }
+
+  private bump(key: string, month: number, debit: number, credit: number, sign: 1 | -1) {
+    let series = this.series.get(key);
+    if (!series) {
+      series = createSeries(month);
+      this.series.set(key, series);
+    } else {
+      growSeries(series, month);
+    }
+    const bucket = month - series.first;
+    series.debit[bucket] += sign * debit;
+    series.credit[bucket] += sign * credit;
+    series.count[bucket] += sign;
+    series.prefix = null;
+  }
+}
@@ -0,0 +1,346 @@
+import type { LedgerAccessors } from './ledgerAccessors';
+import { parseMonthKey } from './periodAggregates';
+
+// Trial balance (saldobalanse) per NS 4102 account class and VAT return
+// summary per VAT code, computed together in one pass over the journal
+// lines. Results are memoized per period and filter; appending or replacing
+// entries adds their difference to every memoized report instead of
+// recomputing it.
+
+export interface ReportQuery {
+  fromMonth: number;
+  toMonth: number;
+  entryType?: string;
+}
+
+export interface TrialBalanceRow {
+  accountId: string;
+  // Balance before fromMonth: every earlier posting for balance sheet
+  // accounts, postings earlier in the same year for result accounts
+  opening: number;
+  debit: number;
+  credit: number;
+  closing: number;
+}
+
+export interface TrialBalanceClass {
+  // First digit of the account number, 1-8
+  classId: string;
+  rows: TrialBalanceRow[];
+  opening: number;
+  debit: number;
+  credit: number;
+  closing: number;
+}
+
+export interface TrialBalance {
+  classes: TrialBalanceClass[];
+  opening: number;
+  debit: number;
+  credit: number;
+  closing: number;
+}
+
+// How a VAT code is reported: output (sales) and input (purchase) VAT,
+// reverse charge (output VAT with an equal deduction), and exempt or
+// zero-rated turnover with a base but no VAT
+export type VatKind = 'output' | 'input' | 'reverseCharge' | 'exempt';
+
+export interface VatSummaryRow {
+  vatCode: string;
+  kind: VatKind;
+  // Net amount of the lines with the code, positive for ordinary sales and purchases
+  base: number;
+  vat: number;
+  lines: number;
+}
+
+export interface VatSummary {
+  rows: VatSummaryRow[];
+  outputVat: number;
+  inputVat: number;
+  // Output minus input VAT; negative when VAT is refunded
+  payable: number;
+}
+
+export interface FinancialReports {
+  trialBalance: TrialBalance;
+  vat: VatSummary;
+  // Time spent summing and building the reports, 0 when memoized
+  computeMs: number;
+}
+
+// The standard VAT codes (see VATCode in src/types). Codes not listed, like
+// 0 and 7, are left out of the VAT summary.
+export const VAT_KINDS: Record<string, VatKind> = {
+  '1': 'output',
+  '11': 'output',
+  '13': 'output',
+  '3': 'input',
+  '31': 'input',
+  '33': 'input',
+  '5': 'exempt',
+  '6': 'exempt',
+  '14': 'reverseCharge',
+  '81': 'reverseCharge',
+  '83': 'reverseCharge',
+  '86': 'reverseCharge',
+  '87': 'reverseCharge',
+};
+
+const KIND_OUTPUT = 1;
+const KIND_INPUT = 2;
+const KIND_REVERSE_CHARGE = 3;
+const KIND_EXEMPT = 4;
+const KIND_CODES: Record<VatKind, number> = {
+  output: KIND_OUTPUT,
+  input: KIND_INPUT,
+  reverseCharge: KIND_REVERSE_CHARGE,
+  exempt: KIND_EXEMPT,
+};
+const KIND_NAMES = ['', 'output', 'input', 'reverseCharge', 'exempt'];
+
+const ACCOUNT_BALANCE = 1;
+const ACCOUNT_VAT = 2;
+
+// 2700-2749 hold the VAT itself (utgående, inngående, oppgjør). Lines there
+// repeat the VAT code of the sale or purchase and would count the VAT as base.
+const isVatAccount = (accountId: string) => {
+  const account = Number(accountId.slice(0, 4));
+  return account >= 2700 && account < 2750;
+};
+
+// Classes 1 and 2 are the balance sheet; 3-8 are closed at the end of each year
+const isBalanceAccount = (accountId: string) => accountId[0] === '1' || accountId[0] === '2';
+
+// How many memoized reports are kept, least recently used dropped first
+const MAX_MEMOIZED = 8;
+
+const round = (amount: number) => Math.round(amount * 100) / 100;
+
+const queryKey = (query: ReportQuery) => `${query.fromMonth}|${query.toMonth}|${query.entryType ?? ''}`;
+
+// Running sums of one memoized report, indexed by account and VAT code
+interface ReportSums {
+  query: ReportQuery;
+  opening: Float64Array;
+  debit: Float64Array;
+  credit: Float64Array;
+  vatBase: Float64Array;
+  vatAmount: Float64Array;
+  vatLines: Float64Array;
+  // Built from the sums on demand; dropped whenever they change
+  result: FinancialReports | null;
+}
+
+const grow = (column: Float64Array, needed: number) => {
+  if (needed <= column.length) return column;
+  const grown = new Float64Array(Math.max(needed, column.length * 2, 64));
+  grown.set(column);
+  return grown;
+};
+
+export class ReportEngine<E, L> {
+  private readonly accessors: LedgerAccessors<E, L>;
+  private readonly memoized = new Map<string, ReportSums>();
+
+  // Accounts and VAT codes seen so far, with what the pass needs to know about them
+  private readonly accountIds: string[] = [];
+  private readonly accountIndex = new Map<string, number>();
+  private accountFlags = new Uint8Array(64);
+  private readonly vatCodes: string[] = [];
+  private readonly vatIndex = new Map<string, number>();
+  private vatKinds = new Uint8Array(16);
+
+  constructor(accessors: LedgerAccessors<E, L>) {
+    this.accessors = accessors;
+  }
+
+  // Forget every memoized report, e.g. when another ledger is loaded
+  clear() {
+    this.memoized.clear();
+  }
+
+  // Bring the memoized reports up to date after entries were added or removed
+  add(entries: readonly E[]) {
+    this.memoized.forEach(sums => this.sum(sums, entries, 1));
+  }
+
+  remove(entries: readonly E[]) {
+    this.memoized.forEach(sums => this.sum(sums, entries, -1));
+  }
+
+  // `entries` is read once, in order, so it may be a ColumnarLedger
+  report(entries: Iterable<E>, query: ReportQuery): FinancialReports {
+    const key = queryKey(query);
+    let sums = this.memoized.get(key);
+    const startedAt = performance.now();
+    if (sums) {
+      // Most recently used last
+      this.memoized.delete(key);
+    } else {
+      if (this.memoized.size >= MAX_MEMOIZED) {
+        this.memoized.delete(this.memoized.keys().next().value!);
+      }
+      sums = {
+        query: { ...query },
+        opening: new Float64Array(this.accountIds.length),
+        debit: new Float64Array(this.accountIds.length),
+        credit: new Float64Array(this.accountIds.length),
+        vatBase: new Float64Array(this.vatCodes.length),
+        vatAmount: new Float64Array(this.vatCodes.length),
+        vatLines: new Float64Array(this.vatCodes.length),
+        result: null,
+      };
+      this.sum(sums, entries, 1);
+    }
+    this.memoized.set(key, sums);
+    if (sums.result) return { ...sums.result, computeMs: 0 };
+
+    sums.result = this.build(sums, performance.now() - startedAt);
+    return sums.result;
+  }
+
+  // The single pass: add `sign` times the lines of `entries` to the sums
+  private sum(sums: ReportSums, entries: Iterable<E>, sign: number) {
+    const { accessors } = this;
+    const { fromMonth, toMonth, entryType } = sums.query;
+    // Result accounts start every year from zero
+    const yearStart = fromMonth - (fromMonth % 12);
+
+    for (const entry of entries) {
+      if (entryType && accessors.entryType(entry) !== entryType) continue;
+      const month = parseMonthKey(accessors.date(entry));
+      if (month > toMonth) continue;
+      const inPeriod = month >= fromMonth;
+      const inYear = month >= yearStart;
+
+      const lines = accessors.lines(entry);
+      for (let j = 0; j < lines.length; j++) {
+        const line = lines[j];
+        const account = this.accountOf(accessors.accountId(line));
+        const flags = this.accountFlags[account];
+        if (account >= sums.debit.length) {
+          const size = this.accountIds.length;
+          sums.opening = grow(sums.opening, size);
+          sums.debit = grow(sums.debit, size);
+          sums.credit = grow(sums.credit, size);
+        }
+        const debit = accessors.debit(line) || 0;
+        const credit = accessors.credit(line) || 0;
+
+        if (!inPeriod) {
+          if (inYear || flags & ACCOUNT_BALANCE) sums.opening[account] += sign * (debit - credit);
+          continue;
+        }
+        sums.debit[account] += sign * debit;
+        sums.credit[account] += sign * credit;
+
+        if (flags & ACCOUNT_VAT) continue;
+        const vatCode = this.vatCodeOf(accessors.vatCode(line));
+        const kind = this.vatKinds[vatCode];
+        if (!kind) continue;
+        if (vatCode >= sums.vatBase.length) {
+          const size = this.vatCodes.length;
+          sums.vatBase = grow(sums.vatBase, size);
+          sums.vatAmount = grow(sums.vatAmount, size);
+          sums.vatLines = grow(sums.vatLines, size);
+        }
+        // Sales are credited and purchases debited; credit notes come out negative
+        const base = kind === KIND_OUTPUT || kind === KIND_EXEMPT ? credit - debit : debit - credit;
+        const vat = Math.abs(accessors.vatAmount(line));
+        sums.vatBase[vatCode] += sign * base;
+        sums.vatAmount[vatCode] += sign * (base < 0 ? -vat : vat);
+        sums.vatLines[vatCode] += sign;
+      }
+    }
+    sums.result = null;
+  }
+
+  private accountOf(accountId: string) {
+    let index = this.accountIndex.get(accountId);
+    if (index === undefined) {
+      index = this.accountIds.length;
+      this.accountIds.push(accountId);
+      this.accountIndex.set(accountId, index);
+      if (index >= this.accountFlags.length) {
+        const flags = new Uint8Array(this.accountFlags.length * 2);
+        flags.set(this.accountFlags);
+        this.accountFlags = flags;
+      }
+      this.accountFlags[index] =
+        (isBalanceAccount(accountId) ? ACCOUNT_BALANCE : 0) | (isVatAccount(accountId) ? ACCOUNT_VAT : 0);
+    }
+    return index;
+  }
+
+  private vatCodeOf(vatCode: string) {
+    let index = this.vatIndex.get(vatCode);
+    if (index === undefined) {
+      index = this.vatCodes.length;
+      this.vatCodes.push(vatCode);
+      this.vatIndex.set(vatCode, index);
+      if (index >= this.vatKinds.length) {
+        const kinds = new Uint8Array(this.vatKinds.length * 2);
+        kinds.set(this.vatKinds);
+        this.vatKinds = kinds;
+      }
+      const kind = VAT_KINDS[vatCode];
+      this.vatKinds[index] = kind ? KIND_CODES[kind] : 0;
+    }
+    return index;
+  }
+
+  private build(sums: ReportSums, computeMs: number): FinancialReports {
+    const classes = new Map<string, TrialBalanceClass>();
+    const trialBalance: TrialBalance = { classes: [], opening: 0, debit: 0, credit: 0, closing: 0 };
+    const order = this.accountIds
+      .map((accountId, index) => ({ accountId, index }))
+      .filter(({ index }) => index < sums.debit.length)
+      .sort((a, b) => (a.accountId < b.accountId ? -1 : a.accountId > b.accountId ? 1 : 0));
+
+    for (const { accountId, index } of order) {
+      const opening = round(sums.opening[index]);
+      const debit = round(sums.debit[index]);
+      const credit = round(sums.credit[index]);
+      if (opening === 0 && debit === 0 && credit === 0) continue;
+      const row: TrialBalanceRow = { accountId, opening, debit, credit, closing: round(opening + debit - credit) };
+
+      const classId = accountId[0];
+      let group = classes.get(classId);
+      if (!group) {
+        group = { classId, rows: [], opening: 0, debit: 0, credit: 0, closing: 0 };
+        classes.set(classId, group);
+        trialBalance.classes.push(group);
+      }
+      group.rows.push(row);
+      for (const total of [group, trialBalance]) {
+        total.opening = round(total.opening + row.opening);
+        total.debit = round(total.debit + row.debit);
+        total.credit = round(total.credit + row.credit);
+        total.closing = round(total.closing + row.closing);
+      }
+    }
+
+    const vat: VatSummary = { rows: [], outputVat: 0, inputVat: 0, payable: 0 };
+    this.vatCodes.forEach((vatCode, index) => {
+      const kind = this.vatKinds[index];
+      if (!kind || index >= sums.vatLines.length || sums.vatLines[index] === 0) return;
+      const row: VatSummaryRow = {
+        vatCode,
+        kind: KIND_NAMES[kind] as VatKind,
+        base: round(sums.vatBase[index]),
+        vat: round(sums.vatAmount[index]),
+        lines: sums.vatLines[index],
+      };
+      vat.rows.push(row);
+      // Reverse charge is both owed and deducted
+      if (kind === KIND_OUTPUT || kind === KIND_REVERSE_CHARGE) vat.outputVat = round(vat.outputVat + row.vat);
+      if (kind === KIND_INPUT || kind === KIND_REVERSE_CHARGE) vat.inputVat = round(vat.inputVat + row.vat);
+    });
+    vat.rows.sort((a, b) => Number(a.vatCode) - Number(b.vatCode));
+    vat.payable = round(vat.outputVat - vat.inputVat);
+
+    return { trialBalance, vat, computeMs };
+  }
+}
@@ -0,0 +1,177 @@
+// Response cache for GET requests, keyed by path.
+//
+// - concurrent requests for the same key share one fetch
+// - entries live in an LRU of `maxEntries` and are fresh for `ttlMs`
+// - stale entries are returned immediately and revalidated in the background
+//   with the stored ETag; subscribers hear about changed data. A cache that
+//   others load from (the shared data worker) revalidates first instead, with
+//   `serveStale: false`, so it never hands out data older than `ttlMs`
+// - invalidated entries (after a mutation) are revalidated before they are
+//   served again, which costs a 304 when nothing changed
+
+// `ageMs`: how old the data already is, when it comes from another cache;
+// it is fresh for that much less
+export type Revalidation<T> =
+  | { notModified: true; ageMs?: number }
+  | { notModified?: false; data: T; etag: string | null; ageMs?: number };
+
+export type CacheFetcher<T> = (etag: string | null) => Promise<Revalidation<T>>;
+
+interface CacheEntry {
+  data: unknown;
+  etag: string | null;
+  storedAt: number;
+  invalidated: boolean;
+}
+
+interface RequestCacheOptions {
+  maxEntries?: number;
+  ttlMs?: number;
+  serveStale?: boolean;
+  now?: () => number;
+}
+
+export class RequestCache {
+  private readonly maxEntries: number;
+  private readonly ttlMs: number;
+  private readonly serveStale: boolean;
+  private readonly now: () => number;
+  private readonly entries = new Map<string, CacheEntry>();
+  private readonly inFlight = new Map<string, Promise<unknown>>();
+  private readonly listeners = new Map<string, Set<(data: unknown) => void>>();
+  // Bumped per key on invalidation so responses to older requests are not stored as fresh
+  private readonly generations = new Map<string, number>();
+
+  constructor({ maxEntries = 100, ttlMs = 30_000, serveStale = true, now = Date.now }: RequestCacheOptions = {}) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.serveStale = serveStale;
+    this.now = now;
+  }
+
+  // Cached data for `key`, fresh or not, without touching the network
+  peek<T>(key: string): T | undefined {
+    return this.entries.get(key)?.data as T | undefined;
+  }
+
+  // ETag stored with the cached data for `key`, if any
+  etagOf(key: string): string | null {
+    return this.entries.get(key)?.etag ?? null;
+  }
+
+  // Time since the cached data for `key` was fetched or last revalidated
+  ageOf(key: string): number | null {
+    const entry = this.entries.get(key);
+    return entry ? this.now() - entry.storedAt : null;
+  }
+
+  get<T>(key: string, fetcher: CacheFetcher<T>): Promise<T> {
+    const entry = this.entries.get(key);
+    if (entry && !entry.invalidated) {
+      this.touch(key, entry);
+      if (this.now() - entry.storedAt > this.ttlMs) {
+        if (!this.serveStale) return this.revalidate(key, fetcher);
+        // Serve stale data now, refresh behind it
+        this.revalidate(key, fetcher).catch(() => undefined);
+      }
+      return Promise.resolve(entry.data as T);
+    }
+    return this.revalidate(key, fetcher);
+  }
+
+  // Called with new data whenever a revalidation changes the cached value
+  subscribe<T>(key: string, listener: (data: T) => void): () => void {
+    let keyListeners = this.listeners.get(key);
+    if (!keyListeners) {
+      keyListeners = new Set();
+      this.listeners.set(key, keyListeners);
+    }
+    const wrapped = listener as (data: unknown) => void;
+    keyListeners.add(wrapped);
+    return () => {
+      keyListeners.delete(wrapped);
+      if (keyListeners.size === 0) this.listeners.delete(key);
+    };
+  }
+
+  // Patch the cached data for `key`, e.g. with changes pushed by the backend,
+  // without a request. Subscribers are not notified: whoever patches the
+  // cache updates its own views.
+  update<T>(key: string, patch: (data: T) => T) {
+    const entry = this.entries.get(key);
+    if (entry) entry.data = patch(entry.data as T);
+  }
+
+  // Mark every key equal to `prefix` or below it (`prefix/...`) as invalid
+  invalidate(prefix: string) {
+    const matches = (key: string) => key === prefix || key.startsWith(`${prefix}/`);
+    this.entries.forEach((entry, key) => {
+      if (matches(key)) entry.invalidated = true;
+    });
+    this.inFlight.forEach((_, key) => {
+      if (matches(key)) this.inFlight.delete(key);
+    });
+    this.generations.forEach((generation, key) => {
+      if (matches(key)) this.generations.set(key, generation + 1);
+    });
+  }
+
+  private revalidate<T>(key: string, fetcher: CacheFetcher<T>): Promise<T> {
+    const pending = this.inFlight.get(key);
+    if (pending) return pending as Promise<T>;
+
+    const generation = this.generations.get(key) ?? 0;
+    this.generations.set(key, generation);
+    const request = (async () => {
+      const cached = this.entries.get(key);
+      const result = await fetcher(cached?.etag ?? null);
+      // Invalidated while in flight: hand the data to this caller but don't cache it
+      const current = (this.generations.get(key) ?? 0) === generation;
+
+      if (result.notModified) {
+        // Only reachable with an ETag, i.e. with a cached entry
+        const entry = this.entries.get(key) ?? cached!;
+        if (current) {
+          entry.storedAt = this.now() - (result.ageMs ?? 0);
+          entry.invalidated = false;
+          this.store(key, entry);
+        }
+        return entry.data as T;
+      }
+
+      if (current) {
+        const changed = !cached || cached.etag === null || cached.etag !== result.etag;
+        this.store(key, { data: result.data, etag: result.etag, storedAt: this.now() - (result.ageMs ?? 0), invalidated: false });
+        if (changed && cached) this.notify(key, result.data);
+      }
+      return result.data;
+    })();
+
+    this.inFlight.set(key, request);
+    const clear = () => {
+      if (this.inFlight.get(key) === request) this.inFlight.delete(key);
+    };
+    request.then(clear, clear);
+    return request;
+  }
+
+  private store(key: string, entry: CacheEntry) {
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+      this.generations.delete(oldest);
+    }
+  }
+
+  // Move a key to the most recently used end of the LRU
+  private touch(key: string, entry: CacheEntry) {
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+  }
+
+  private notify(key: string, data: unknown) {
+    this.listeners.get(key)?.forEach(listener => listener(data));
+  }
+}
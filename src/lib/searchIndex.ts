@@ -0,0 +1,144 @@
+// Inverted index for search-as-you-type over the ledger. Each indexed
+// position (the entry's place in the engine's list) is split into tokens;
+// a query matches the positions that have, for every query term, a token
+// starting with it. Text is folded before it is split, so "sjo" finds
+// "Sjøvegen" and "kafe" finds "Kafé".
+//
+// Postings are kept sorted per token, and the distinct tokens in a sorted
+// array for prefix lookups by binary search. Adding or replacing a position
+// only touches the tokens of that position.
+
+// Lowercase, æ → ae, ø → o and accents stripped (å → a, é → e, ...)
+export const foldSearchText = (text: string) =>
+  text
+    .toLowerCase()
+    .replace(/æ/g, 'ae')
+    .replace(/ø/g, 'o')
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '');
+
+export const searchTokens = (text: string): string[] =>
+  foldSearchText(text).split(/[^\p{L}\p{N}]+/u).filter(token => token.length > 0);
+
+// First index in the sorted `values` whose value is not below `value`
+const lowerBound = <T>(values: readonly T[], value: T) => {
+  let low = 0;
+  let high = values.length;
+  while (low < high) {
+    const middle = (low + high) >>> 1;
+    if (values[middle] < value) low = middle + 1;
+    else high = middle;
+  }
+  return low;
+};
+
+const distinctTokens = (text: string) => Array.from(new Set(searchTokens(text))).sort();
+
+export class SearchIndex {
+  // token → positions, ascending
+  private readonly postings = new Map<string, number[]>();
+  // Distinct tokens, sorted; tokens seen since the last query wait in
+  // `newTokens` and are merged in on the next query
+  private tokens: string[] = [];
+  private newTokens: string[] = [];
+  // Tokens per position, to know what to remove when a position changes
+  private tokensAt: string[][] = [];
+
+  get size() {
+    return this.tokensAt.length;
+  }
+
+  clear() {
+    this.postings.clear();
+    this.tokens = [];
+    this.newTokens = [];
+    this.tokensAt = [];
+  }
+
+  // Index the text of the next position (positions are added in order)
+  add(text: string) {
+    const position = this.tokensAt.length;
+    const tokens = distinctTokens(text);
+    this.tokensAt.push(tokens);
+    tokens.forEach(token => {
+      const positions = this.postings.get(token);
+      if (positions) positions.push(position);
+      else this.createPosting(token, [position]);
+    });
+  }
+
+  // Re-index one position. Nothing happens when its tokens are unchanged,
+  // e.g. when an entry was only crossed.
+  replace(position: number, text: string) {
+    const previous = this.tokensAt[position];
+    if (!previous) return;
+    const tokens = distinctTokens(text);
+    if (tokens.length === previous.length && tokens.every((token, i) => token === previous[i])) return;
+    this.tokensAt[position] = tokens;
+
+    const kept = new Set(tokens);
+    previous.forEach(token => {
+      if (kept.has(token)) return;
+      const positions = this.postings.get(token)!;
+      positions.splice(lowerBound(positions, position), 1);
+      if (positions.length === 0) this.postings.delete(token);
+    });
+    const removed = new Set(previous);
+    tokens.forEach(token => {
+      if (removed.has(token)) return;
+      const positions = this.postings.get(token);
+      if (positions) positions.splice(lowerBound(positions, position), 0, position);
+      else this.createPosting(token, [position]);
+    });
+  }
+
+  // Positions matching every term of `query`, ascending, or null when the
+  // query has no terms (no search)
+  match(query: string): number[] | null {
+    const terms = Array.from(new Set(searchTokens(query)));
+    if (terms.length === 0) return null;
+    this.mergeNewTokens();
+
+    // hits[p] is the number of terms matched so far; a position only counts
+    // for a term when it matched all earlier ones, and only once
+    const hits = new Uint16Array(this.size);
+    const candidates: number[] = [];
+    terms.forEach((term, t) => {
+      for (let i = lowerBound(this.tokens, term); i < this.tokens.length && this.tokens[i].startsWith(term); i++) {
+        const positions = this.postings.get(this.tokens[i]);
+        if (!positions) continue;
+        for (let j = 0; j < positions.length; j++) {
+          const position = positions[j];
+          if (hits[position] !== t) continue;
+          hits[position] = t + 1;
+          if (t === 0) candidates.push(position);
+        }
+      }
+    });
+
+    return candidates.filter(position => hits[position] === terms.length).sort((a, b) => a - b);
+  }
+
+  private createPosting(token: string, positions: number[]) {
+    this.postings.set(token, positions);
+    this.newTokens.push(token);
+  }
+
+  // Merge new tokens into the sorted token list and drop tokens that no
+  // longer have postings
+  private mergeNewTokens() {
+    if (this.newTokens.length === 0) return;
+    const added = this.newTokens.sort();
+    const merged: string[] = [];
+    let i = 0;
+    let j = 0;
+    while (i < this.tokens.length || j < added.length) {
+      const token = j >= added.length || (i < this.tokens.length && this.tokens[i] < added[j])
+        ? this.tokens[i++]
+        : added[j++];
+      if (this.postings.has(token) && merged[merged.length - 1] !== token) merged.push(token);
+    }
+    this.tokens = merged;
+    this.newTokens = [];
+  }
+}
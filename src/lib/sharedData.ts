@@ -0,0 +1,324 @@
+// Data layer shared by every tab of the origin.
+//
+// - serveSharedData runs in a SharedWorker. It holds one RequestCache and one
+//   EventStream for all tabs: a list another tab fetched a moment ago is
+//   answered from the worker, identical requests from several tabs share one
+//   fetch, and however many tabs are open there is a single connection for
+//   pushed changes. The worker's cache does not serve stale data: it
+//   revalidates first, and tells the tab how old the data is, so a tab's copy
+//   is never older than one TTL.
+//   API timings measured in the worker go to the tab that asked, when its
+//   instrumentation is on. Changes a tab reports (its own mutations) and cache
+//   invalidations are applied to the worker's cache and relayed to the other
+//   tabs.
+// - SharedDataClient is the tab side. Without SharedWorker (Chrome on
+//   Android, old Safari) or when the worker fails to start, each tab fetches
+//   and listens for itself, and invalidations and changes reach the other
+//   tabs over a BroadcastChannel instead.
+
+import type { EventBatch, EventStream } from './eventStream';
+import { instrumentation, type Measurement, type MeasurementDetail } from './instrumentation';
+import type { CacheFetcher, RequestCache, Revalidation } from './requestCache';
+
+// Tab -> worker
+export type SharedDataRequest<T> =
+  // `measure`: the tab records API timings (instrumentation is on)
+  | { type: 'get'; id: number; path: string; etag: string | null; measure: boolean }
+  | { type: 'invalidate'; prefix: string }
+  | { type: 'publish'; events: T[] }
+  | { type: 'listen' }
+  | { type: 'disconnect' };
+
+// Worker -> tab, and tab -> tab over the BroadcastChannel
+export type SharedDataResponse<T> =
+  | { type: 'got'; id: number; result: Revalidation<unknown> }
+  // `networkError`: fetch itself failed (offline), which the tab sees as a TypeError
+  | { type: 'failed'; id: number; error: unknown; networkError: boolean }
+  | { type: 'invalidate'; prefix: string }
+  | { type: 'events'; batch: EventBatch<T> }
+  // A timing taken in the worker; startTime is epoch milliseconds, as the
+  // worker's and the tab's performance.now() timelines differ
+  | { type: 'measured'; measurement: Measurement };
+
+// Records a measurement from a fetch in the worker, with instrumentation's record() arguments
+export type MeasurementRecorder = (name: string, startTime: number, duration: number, detail?: MeasurementDetail) => void;
+
+// The parts of SharedWorkerGlobalScope the data layer needs; see LedgerWorkerScope
+export interface SharedDataScope {
+  onconnect: ((event: MessageEvent) => void) | null;
+}
+
+export interface SharedDataSource<T> {
+  cache: RequestCache;
+  stream: EventStream<T>;
+  // How the worker loads `path` into the cache; `record` is null when the
+  // asking tab does not measure. Created with `serveStale: false`.
+  fetcherFor: (path: string, record: MeasurementRecorder | null) => CacheFetcher<unknown>;
+  // Apply pushed or reported changes to `cache` before the tabs hear of them
+  applyToCache: (cache: RequestCache, batch: EventBatch<T>) => void;
+}
+
+const failure = (id: number, error: unknown) => ({
+  type: 'failed' as const,
+  id,
+  // Errors other than plain objects (ApiError) may not survive postMessage
+  error: error instanceof Error ? { message: error.message } : error,
+  networkError: error instanceof TypeError,
+});
+
+export function serveSharedData<T>(scope: SharedDataScope, source: SharedDataSource<T>) {
+  const { cache, stream, fetcherFor, applyToCache } = source;
+  const ports = new Set<MessagePort>();
+  let listening = false;
+
+  const broadcast = (message: SharedDataResponse<T>, except?: MessagePort) => {
+    ports.forEach(port => {
+      if (port !== except) port.postMessage(message);
+    });
+  };
+
+  const get = (port: MessagePort, request: Extract<SharedDataRequest<T>, { type: 'get' }>) => {
+    const { id, path, etag } = request;
+    const record: MeasurementRecorder | null = request.measure
+      ? (name, startTime, duration, detail) => {
+        const measurement = { name, startTime: performance.timeOrigin + startTime, duration, detail };
+        port.postMessage({ type: 'measured', measurement } satisfies SharedDataResponse<T>);
+      }
+      : null;
+    cache.get(path, fetcherFor(path, record)).then(
+      data => {
+        // Data not stored (invalidated while loading) has no ETag or age to offer
+        const stored = cache.peek(path) === data;
+        const current = stored ? cache.etagOf(path) : null;
+        const ageMs = stored ? cache.ageOf(path) ?? 0 : 0;
+        // The tab already has this version: don't copy the data over again
+        const result: Revalidation<unknown> = current !== null && current === etag
+          ? { notModified: true, ageMs }
+          : { data, etag: current, ageMs };
+        port.postMessage({ type: 'got', id, result } satisfies SharedDataResponse<T>);
+      },
+      error => port.postMessage(failure(id, error) satisfies SharedDataResponse<T>)
+    );
+  };
+
+  scope.onconnect = event => {
+    const port = event.ports[0];
+    ports.add(port);
+    port.onmessage = ({ data }: MessageEvent<SharedDataRequest<T>>) => {
+      switch (data.type) {
+        case 'get':
+          get(port, data);
+          break;
+        case 'invalidate':
+          cache.invalidate(data.prefix);
+          broadcast(data, port);
+          break;
+        case 'publish': {
+          const batch = { events: data.events, reset: false };
+          applyToCache(cache, batch);
+          broadcast({ type: 'events', batch }, port);
+          break;
+        }
+        case 'listen':
+          if (listening) break;
+          listening = true;
+          stream.subscribe(batch => {
+            applyToCache(cache, batch);
+            broadcast({ type: 'events', batch });
+          });
+          break;
+        case 'disconnect':
+          ports.delete(port);
+          port.close();
+          break;
+      }
+    };
+  };
+}
+
+interface PendingGet {
+  path: string;
+  etag: string | null;
+  fetchHere: CacheFetcher<unknown>;
+  resolve: (result: Revalidation<unknown>) => void;
+  reject: (error: unknown) => void;
+}
+
+export class SharedDataClient<T> {
+  private readonly createWorker: () => SharedWorker;
+  private readonly createStream: () => EventStream<T>;
+  private readonly channelName: string;
+  private started = false;
+  private port: MessagePort | null = null;
+  // Set when running without the worker
+  private workingHere = false;
+  private channel: BroadcastChannel | null = null;
+  private stream: EventStream<T> | null = null;
+  private readonly pending = new Map<number, PendingGet>();
+  private nextId = 0;
+  private readonly listeners = new Set<(batch: EventBatch<T>) => void>();
+  private readonly invalidationListeners = new Set<(prefix: string) => void>();
+
+  constructor(createWorker: () => SharedWorker, createStream: () => EventStream<T>, channelName: string) {
+    this.createWorker = createWorker;
+    this.createStream = createStream;
+    this.channelName = channelName;
+  }
+
+  // Load `path` for a RequestCache: through the worker, whose cache other
+  // tabs fill too, or with `fetchHere` when there is none
+  get<D>(path: string, etag: string | null, fetchHere: CacheFetcher<D>): Promise<Revalidation<D>> {
+    this.start();
+    if (!this.port) return fetchHere(etag);
+    return new Promise((resolve, reject) => {
+      const id = ++this.nextId;
+      this.pending.set(id, {
+        path,
+        etag,
+        fetchHere: fetchHere as CacheFetcher<unknown>,
+        resolve: resolve as (result: Revalidation<unknown>) => void,
+        reject,
+      });
+      this.post({ type: 'get', id, path, etag, measure: instrumentation.enabled });
+    });
+  }
+
+  // Tell the shared cache and the other tabs that data below `prefix` changed
+  invalidate(prefix: string) {
+    this.start();
+    this.post({ type: 'invalidate', prefix });
+  }
+
+  // Hand changes made in this tab to the other tabs
+  publish(events: T[]) {
+    if (events.length === 0) return;
+    this.start();
+    this.post({ type: 'publish', events });
+  }
+
+  // Changes pushed by the backend or published by another tab. The first
+  // subscriber opens the event stream (the worker's, or this tab's own).
+  subscribe(listener: (batch: EventBatch<T>) => void): () => void {
+    this.start();
+    this.listeners.add(listener);
+    if (this.listeners.size === 1) this.listen();
+    return () => {
+      this.listeners.delete(listener);
+    };
+  }
+
+  // Called with the prefix another tab invalidated
+  onInvalidate(listener: (prefix: string) => void): () => void {
+    this.invalidationListeners.add(listener);
+    return () => {
+      this.invalidationListeners.delete(listener);
+    };
+  }
+
+  private start() {
+    if (this.started) return;
+    this.started = true;
+    if (typeof SharedWorker !== 'undefined') {
+      try {
+        this.connect();
+        // A page restored from the back/forward cache gets a new connection
+        if (typeof window !== 'undefined') {
+          window.addEventListener('pagehide', () => this.disconnect());
+          window.addEventListener('pageshow', event => {
+            if (event.persisted && !this.port && !this.workingHere) this.connect();
+          });
+        }
+        return;
+      } catch {
+        // Fall through to working in this tab
+      }
+    }
+    this.workHere();
+  }
+
+  private connect() {
+    const worker = this.createWorker();
+    worker.onerror = () => this.workHere();
+    const port = worker.port;
+    port.onmessage = ({ data }: MessageEvent<SharedDataResponse<T>>) => this.receive(data);
+    this.port = port;
+    this.pending.forEach((pending, id) => {
+      this.post({ type: 'get', id, path: pending.path, etag: pending.etag, measure: instrumentation.enabled });
+    });
+    if (this.listeners.size > 0) this.post({ type: 'listen' });
+  }
+
+  private disconnect() {
+    if (!this.port) return;
+    this.post({ type: 'disconnect' });
+    this.port.close();
+    this.port = null;
+  }
+
+  // No worker (or it failed): fetch in this tab, with its own event stream
+  private workHere() {
+    this.port?.close();
+    this.port = null;
+    if (this.workingHere) return;
+    this.workingHere = true;
+    if (typeof BroadcastChannel !== 'undefined') {
+      this.channel = new BroadcastChannel(this.channelName);
+      this.channel.onmessage = ({ data }: MessageEvent<SharedDataResponse<T>>) => this.receive(data);
+    }
+    const pending = Array.from(this.pending.values());
+    this.pending.clear();
+    pending.forEach(({ etag, fetchHere, resolve, reject }) => fetchHere(etag).then(resolve, reject));
+    if (this.listeners.size > 0) this.listen();
+  }
+
+  private listen() {
+    if (this.port) {
+      this.post({ type: 'listen' });
+    } else if (!this.stream) {
+      this.stream = this.createStream();
+      this.stream.subscribe(batch => this.listeners.forEach(listener => listener(batch)));
+    }
+  }
+
+  private post(message: SharedDataRequest<T>) {
+    if (this.port) {
+      this.port.postMessage(message);
+      return;
+    }
+    // Between tabs, the request types that matter are the ones the worker relays
+    if (message.type === 'invalidate') {
+      this.channel?.postMessage(message satisfies SharedDataResponse<T>);
+    } else if (message.type === 'publish') {
+      this.channel?.postMessage({ type: 'events', batch: { events: message.events, reset: false } } satisfies SharedDataResponse<T>);
+    }
+  }
+
+  private receive(message: SharedDataResponse<T>) {
+    switch (message.type) {
+      case 'got':
+      case 'failed': {
+        const pending = this.pending.get(message.id);
+        if (!pending) return;
+        this.pending.delete(message.id);
+        if (message.type === 'got') {
+          pending.resolve(message.result);
+        } else {
+          const { error } = message;
+          pending.reject(message.networkError ? new TypeError((error as { message?: string }).message) : error);
+        }
+        break;
+      }
+      case 'invalidate':
+        this.invalidationListeners.forEach(listener => listener(message.prefix));
+        break;
+      case 'events':
+        this.listeners.forEach(listener => listener(message.batch));
+        break;
+      case 'measured': {
+        const { name, startTime, duration, detail } = message.measurement;
+        instrumentation.record(name, startTime - performance.timeOrigin, duration, { ...detail, shared: 1 });
+        break;
+      }
+    }
+  }
+}
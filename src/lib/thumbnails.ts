@@ -0,0 +1,346 @@
+// Thumbnails for the document column of the ledger tables.
+//
+// - ThumbnailSource fetches a small image of a document from the backend's
+//   thumbnail endpoint (instead of the full PDF) and decodes it with
+//   createImageBitmap. It keeps the encoded thumbnails in IndexedDB, evicting
+//   the least recently used, and runs in a worker (see serveThumbnails).
+// - ThumbnailClient is the main-thread side: it keeps the decoded bitmaps in a
+//   bounded LRU, shares one request between the rows showing the same
+//   document, and cancels a request when no row waits for it any more. Like
+//   LedgerEngineClient it falls back to an in-thread source without workers.
+// - observeVisibility() tells a row when it comes near the viewport, so only
+//   visible rows ask for thumbnails.
+
+import { OfflineStore, type Migration } from './offlineStore';
+
+// Pixel width requested from the backend; twice the CSS size for sharp
+// thumbnails on high-density screens
+export const THUMBNAIL_WIDTH = 64;
+
+const DATABASE_NAME = 'document-thumbnails';
+const STORE = 'thumbnails';
+
+// Thumbnails kept in IndexedDB; at 2-5 KB each a few MB
+const MAX_STORED = 2000;
+// Decoded thumbnails kept in memory; 64 x 90 px is about 23 KB each
+const MAX_BITMAPS = 300;
+// Check the stored count once per this many writes
+const EVICT_EVERY = 50;
+
+// Rows this far outside the viewport start loading, so they are ready when
+// scrolled in
+const VISIBILITY_MARGIN = '200px 0px';
+
+const migrations: Migration[] = [
+  db => {
+    db.createObjectStore(STORE, { keyPath: 'url' }).createIndex('usedAt', 'usedAt');
+  },
+];
+
+interface StoredThumbnail {
+  url: string;
+  blob: Blob;
+  usedAt: number;
+}
+
+const abortError = () => new DOMException('Thumbnail request cancelled', 'AbortError');
+
+// The backend has no thumbnail for the document (404). Other failures
+// (offline, a server error, a bad image) are worth trying again.
+export class MissingThumbnailError extends Error {}
+
+export class ThumbnailSource {
+  private readonly apiBase: string;
+  private readonly maxStored: number;
+  private opened: Promise<OfflineStore | null> | null = null;
+  private writes = 0;
+
+  constructor(apiBase: string, maxStored = MAX_STORED) {
+    this.apiBase = apiBase;
+    this.maxStored = maxStored;
+  }
+
+  // Decoded thumbnail of the document at `documentUrl`, from IndexedDB or the
+  // backend. Rejects with MissingThumbnailError when the backend has none.
+  async load(documentUrl: string, signal?: AbortSignal): Promise<ImageBitmap> {
+    const blob = (await this.stored(documentUrl)) ?? (await this.fetch(documentUrl, signal));
+    if (signal?.aborted) throw abortError();
+    return createImageBitmap(blob);
+  }
+
+  private open() {
+    this.opened ??= OfflineStore.open(DATABASE_NAME, migrations);
+    return this.opened;
+  }
+
+  private async stored(documentUrl: string): Promise<Blob | null> {
+    const store = await this.open();
+    if (!store) return null;
+    try {
+      const hit = await store.get<StoredThumbnail>(STORE, documentUrl);
+      if (!hit) return null;
+      // Mark it as recently used; nothing waits for this
+      store.write([STORE], stores => stores[STORE].put({ ...hit, usedAt: Date.now() })).catch(() => undefined);
+      return hit.blob;
+    } catch {
+      return null;
+    }
+  }
+
+  private async fetch(documentUrl: string, signal?: AbortSignal): Promise<Blob> {
+    const params = new URLSearchParams({ url: documentUrl, width: String(THUMBNAIL_WIDTH) });
+    const response = await fetch(`${this.apiBase}/documents/thumbnail?${params}`, { signal });
+    if (response.status === 404) throw new MissingThumbnailError(`No thumbnail for ${documentUrl}`);
+    if (!response.ok) throw new Error(`Thumbnail for ${documentUrl} failed: HTTP ${response.status}`);
+    const blob = await response.blob();
+    void this.save(documentUrl, blob);
+    return blob;
+  }
+
+  private async save(documentUrl: string, blob: Blob) {
+    const store = await this.open();
+    if (!store) return;
+    try {
+      const record: StoredThumbnail = { url: documentUrl, blob, usedAt: Date.now() };
+      await store.write([STORE], stores => stores[STORE].put(record));
+      if (this.writes++ % EVICT_EVERY === 0) await this.evict(store);
+    } catch {
+      // Quota or a closed database: the thumbnail is just not kept
+    }
+  }
+
+  // Delete the least recently used thumbnails above maxStored
+  private async evict(store: OfflineStore) {
+    const excess = (await store.getAllKeys(STORE)).length - this.maxStored;
+    if (excess <= 0) return;
+    await store.write([STORE], stores => {
+      let left = excess;
+      const cursorRequest = stores[STORE].index('usedAt').openKeyCursor();
+      cursorRequest.onsuccess = () => {
+        const cursor = cursorRequest.result;
+        if (!cursor || left-- <= 0) return;
+        stores[STORE].delete(cursor.primaryKey);
+        cursor.continue();
+      };
+    });
+  }
+}
+
+// Worker protocol
+
+export type ThumbnailRequest =
+  | { type: 'load'; id: number; url: string }
+  | { type: 'cancel'; id: number };
+
+export type ThumbnailResponse =
+  | { type: 'done'; id: number; bitmap: ImageBitmap }
+  // `missing`: the backend has no thumbnail, so it is not asked again
+  | { type: 'error'; id: number; message: string; missing: boolean };
+
+// The parts of DedicatedWorkerGlobalScope the thumbnails need; see LedgerWorkerScope
+export interface ThumbnailWorkerScope {
+  onmessage: ((event: MessageEvent<ThumbnailRequest>) => void) | null;
+  postMessage: (message: ThumbnailResponse, transfer?: Transferable[]) => void;
+}
+
+export function serveThumbnails(scope: ThumbnailWorkerScope, source: ThumbnailSource) {
+  const running = new Map<number, AbortController>();
+
+  scope.onmessage = ({ data }) => {
+    if (data.type === 'cancel') {
+      running.get(data.id)?.abort();
+      running.delete(data.id);
+      return;
+    }
+    const { id, url } = data;
+    const controller = new AbortController();
+    running.set(id, controller);
+    source.load(url, controller.signal).then(
+      bitmap => {
+        if (running.delete(id)) scope.postMessage({ type: 'done', id, bitmap }, [bitmap]);
+        else bitmap.close();
+      },
+      error => {
+        if (running.delete(id)) {
+          scope.postMessage({ type: 'error', id, message: String(error), missing: error instanceof MissingThumbnailError });
+        }
+      }
+    );
+  };
+}
+
+type ThumbnailListener = (bitmap: ImageBitmap | null) => void;
+
+interface PendingThumbnail {
+  id: number;
+  url: string;
+  listeners: Set<ThumbnailListener>;
+  // Set when loading in-thread
+  controller?: AbortController;
+}
+
+export class ThumbnailClient {
+  private readonly createWorker: () => Worker;
+  private readonly createSource: () => ThumbnailSource;
+  private readonly maxBitmaps: number;
+  private worker: Worker | null = null;
+  private source: ThumbnailSource | null = null;
+  // Least recently used first
+  private readonly bitmaps = new Map<string, ImageBitmap>();
+  // Documents the backend has no thumbnail for; not asked for again
+  private readonly missing = new Set<string>();
+  private readonly pending = new Map<string, PendingThumbnail>();
+  private readonly pendingById = new Map<number, PendingThumbnail>();
+  private nextId = 0;
+
+  constructor(createWorker: () => Worker, createSource: () => ThumbnailSource, maxBitmaps = MAX_BITMAPS) {
+    this.createWorker = createWorker;
+    this.createSource = createSource;
+    this.maxBitmaps = maxBitmaps;
+  }
+
+  // Calls `listener` once with the thumbnail of `documentUrl`, or null when
+  // there is none or it failed to load; at once if it is in memory. The returned function stops
+  // listening, and cancels the request if no one else is waiting for it.
+  request(documentUrl: string, listener: ThumbnailListener): () => void {
+    const cached = this.bitmaps.get(documentUrl);
+    if (cached) {
+      this.bitmaps.delete(documentUrl);
+      this.bitmaps.set(documentUrl, cached);
+      listener(cached);
+      return () => undefined;
+    }
+    if (this.missing.has(documentUrl)) {
+      listener(null);
+      return () => undefined;
+    }
+
+    let pending = this.pending.get(documentUrl);
+    if (!pending) {
+      pending = { id: ++this.nextId, url: documentUrl, listeners: new Set() };
+      this.pending.set(documentUrl, pending);
+      this.pendingById.set(pending.id, pending);
+      this.send(pending);
+    }
+    // Wrapped so the same function can listen twice
+    const own: ThumbnailListener = bitmap => listener(bitmap);
+    const joined = pending;
+    joined.listeners.add(own);
+    return () => {
+      if (joined.listeners.delete(own) && joined.listeners.size === 0) this.cancel(joined);
+    };
+  }
+
+  // Stop the worker and drop the bitmaps in memory
+  dispose() {
+    this.pending.forEach(pending => this.cancel(pending));
+    this.worker?.terminate();
+    this.worker = null;
+    this.source = null;
+    this.bitmaps.forEach(bitmap => bitmap.close());
+    this.bitmaps.clear();
+  }
+
+  private send(pending: PendingThumbnail) {
+    if (!this.worker && !this.source) this.start();
+    if (this.worker) {
+      const request: ThumbnailRequest = { type: 'load', id: pending.id, url: pending.url };
+      this.worker.postMessage(request);
+      return;
+    }
+    const controller = new AbortController();
+    pending.controller = controller;
+    this.source!.load(pending.url, controller.signal).then(
+      bitmap => this.deliver(pending.id, bitmap),
+      error => this.deliver(pending.id, null, error instanceof MissingThumbnailError)
+    );
+  }
+
+  private cancel(pending: PendingThumbnail) {
+    if (this.pendingById.get(pending.id) !== pending) return;
+    this.pending.delete(pending.url);
+    this.pendingById.delete(pending.id);
+    if (pending.controller) {
+      pending.controller.abort();
+    } else {
+      const request: ThumbnailRequest = { type: 'cancel', id: pending.id };
+      this.worker?.postMessage(request);
+    }
+  }
+
+  private start() {
+    if (typeof Worker !== 'undefined') {
+      try {
+        const worker = this.createWorker();
+        worker.onmessage = ({ data }: MessageEvent<ThumbnailResponse>) => {
+          if (data.type === 'done') this.deliver(data.id, data.bitmap);
+          else this.deliver(data.id, null, data.missing);
+        };
+        worker.onerror = () => this.fallBackToThread();
+        this.worker = worker;
+        return;
+      } catch {
+        // Fall through to the in-thread source
+      }
+    }
+    this.source = this.createSource();
+  }
+
+  private fallBackToThread() {
+    this.worker?.terminate();
+    this.worker = null;
+    this.source = this.createSource();
+    this.pending.forEach(pending => this.send(pending));
+  }
+
+  // `missing`: the backend has none. Other failures are tried again on the
+  // next request.
+  private deliver(id: number, bitmap: ImageBitmap | null, missing = false) {
+    const pending = this.pendingById.get(id);
+    if (!pending) {
+      // Cancelled while it was loading
+      bitmap?.close();
+      return;
+    }
+    this.pending.delete(pending.url);
+    this.pendingById.delete(id);
+    if (bitmap) this.remember(pending.url, bitmap);
+    else if (missing) this.missing.add(pending.url);
+    pending.listeners.forEach(listener => listener(bitmap));
+  }
+
+  private remember(documentUrl: string, bitmap: ImageBitmap) {
+    this.bitmaps.set(documentUrl, bitmap);
+    for (const [url, oldest] of this.bitmaps) {
+      if (this.bitmaps.size <= this.maxBitmaps) break;
+      // Canvases that drew it keep their pixels
+      this.bitmaps.delete(url);
+      oldest.close();
+    }
+  }
+}
+
+// One IntersectionObserver for every observed element
+const visibilityListeners = new Map<Element, (visible: boolean) => void>();
+let visibilityObserver: IntersectionObserver | null = null;
+
+// Calls `onChange` whenever `element` comes within VISIBILITY_MARGIN of the
+// viewport or leaves it. Without IntersectionObserver everything counts as
+// visible. Returns a function that stops observing.
+export function observeVisibility(element: Element, onChange: (visible: boolean) => void): () => void {
+  if (typeof IntersectionObserver === 'undefined') {
+    onChange(true);
+    return () => undefined;
+  }
+  visibilityObserver ??= new IntersectionObserver(
+    entries => entries.forEach(entry => visibilityListeners.get(entry.target)?.(entry.isIntersecting)),
+    { rootMargin: VISIBILITY_MARGIN }
+  );
+  visibilityListeners.set(element, onChange);
+  visibilityObserver.observe(element);
+  return () => {
+    if (visibilityListeners.get(element) !== onChange) return;
+    visibilityListeners.delete(element);
+    visibilityObserver?.unobserve(element);
+  };
+}
@@ -0,0 +1,57 @@
+// Windowing math for variable-height row lists. Heights are looked up per row
+// (measured or estimated) and turned into a prefix-sum offset table so the
+// visible range can be found with a binary search.
+
+export interface VisibleRange {
+  start: number;
+  end: number;
+  paddingTop: number;
+  paddingBottom: number;
+}
+
+// offsets[i] is the top of row i, offsets[count] the total height
+export function buildOffsets(count: number, heightOf: (index: number) => number): Float64Array {
+  const offsets = new Float64Array(count + 1);
+  for (let i = 0; i < count; i++) {
+    offsets[i + 1] = offsets[i] + heightOf(i);
+  }
+  return offsets;
+}
+
+// Index of the row that contains the vertical position y
+export function rowAt(offsets: Float64Array, y: number): number {
+  const count = offsets.length - 1;
+  let low = 0;
+  let high = count - 1;
+  while (low < high) {
+    const mid = (low + high + 1) >>> 1;
+    if (offsets[mid] <= y) {
+      low = mid;
+    } else {
+      high = mid - 1;
+    }
+  }
+  return low;
+}
+
+export function findVisibleRange(
+  offsets: Float64Array,
+  scrollTop: number,
+  viewportHeight: number,
+  overscan: number,
+): VisibleRange {
+  const count = offsets.length - 1;
+  if (count <= 0) {
+    return { start: 0, end: 0, paddingTop: 0, paddingBottom: 0 };
+  }
+  const first = rowAt(offsets, Math.max(0, scrollTop));
+  const last = rowAt(offsets, Math.max(0, scrollTop + viewportHeight));
+  const start = Math.max(0, first - overscan);
+  const end = Math.min(count, last + 1 + overscan);
+  return {
+    start,
+    end,
+    paddingTop: offsets[start],
+    paddingBottom: offsets[count] - offsets[end],
+  };
+}
@@ -1,10 +1,19 @@
 import { StrictMode } from 'react';
 import { createRoot } from 'react-dom/client';
 import App from './App';
+import { i18nReady } from './i18n/config';
+import { applyInstrumentationSettings } from './services/performance';
 import './index.css';
 
-createRoot(document.getElementById('root')!).render(
-  <StrictMode>
-    <App />
-  </StrictMode>
-);
+// Performance instrumentation stays off unless turned on with ?perf=on or
+// from the debug panel
+applyInstrumentationSettings();
+
+// Render once the startup translations are in, so nothing flashes raw keys
+i18nReady.finally(() => {
+  createRoot(document.getElementById('root')!).render(
+    <StrictMode>
+      <App />
+    </StrictMode>
+  );
+});
@@ -1,7 +1,9 @@
 import { useTranslation } from 'react-i18next';
+import { usePageReady } from '../hooks/usePageReady';
 
 function Clients() {
-  const { t } = useTranslation();
+  const { t } = useTranslation('clients');
+  usePageReady('clients');
 
   return (
     <div>
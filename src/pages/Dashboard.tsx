@@ -1,7 +1,9 @@
 import { useTranslation } from 'react-i18next';
+import { usePageReady } from '../hooks/usePageReady';
 
 function Dashboard() {
-  const { t } = useTranslation();
+  const { t } = useTranslation('dashboard');
+  usePageReady('dashboard');
 
   return (
     <div>
@@ -1,7 +1,9 @@
 import { useTranslation } from 'react-i18next';
+import { usePageReady } from '../hooks/usePageReady';
 
 function Expenses() {
-  const { t } = useTranslation();
+  const { t } = useTranslation('expenses');
+  usePageReady('expenses');
 
   return (
     <div>
@@ -1,5 +1,9 @@
 import { useTranslation } from 'react-i18next';
 import { useState, useRef } from 'react';
+import { useFormatters } from '../hooks/useFormatters';
+import { usePageReady } from '../hooks/usePageReady';
+import { useDocumentUpload } from '../hooks/useDocumentUpload';
+import { numberFormat } from '../lib/formatting';
 
 type DocumentType = 'invoice' | 'receipt' | 'other' | null;
 type ItemType = 'goods' | 'service';
@@ -24,8 +28,53 @@ interface FormData {
   notes: string;
 }
 
+// Progress and outcome of the background upload of the picked document
+function UploadStatus({ upload }: { upload: ReturnType<typeof useDocumentUpload> }) {
+  const { t } = useTranslation('invoicing');
+  const format = useFormatters();
+  const megabytes = (bytes: number) => numberFormat(format.locale, { maximumFractionDigits: 1 }).format(bytes / 1024 / 1024);
+  const { progress, result, failed, retry } = upload;
+
+  if (failed) {
+    return (
+      <div className="mt-2 flex items-center gap-3 text-xs text-red-600">
+        {t('invoicing.step1.upload.failed')}
+        <button onClick={retry} className="text-blue-600 hover:text-blue-800">
+          {t('invoicing.step1.upload.retry')}
+        </button>
+      </div>
+    );
+  }
+  if (result) {
+    return (
+      <p className="mt-2 text-xs text-green-700">
+        {result.deduplicated
+          ? t('invoicing.step1.upload.deduplicated')
+          : result.storedBytes < result.originalBytes
+            ? t('invoicing.step1.upload.compressed', { original: megabytes(result.originalBytes), size: megabytes(result.storedBytes) })
+            : t('invoicing.step1.upload.done', { size: megabytes(result.storedBytes) })}
+      </p>
+    );
+  }
+  if (!progress) return null;
+
+  const percent = progress.total > 0 ? Math.round((progress.loaded / progress.total) * 100) : 0;
+  return (
+    <div className="mt-2">
+      <div className="flex justify-between text-xs text-gray-500 mb-1">
+        <span>{t(`invoicing.step1.upload.${progress.phase === 'done' ? 'uploading' : progress.phase}`)}</span>
+        {progress.phase !== 'compressing' && <span>{percent} %</span>}
+      </div>
+      <div className="h-1.5 bg-gray-200 rounded-full overflow-hidden">
+        <div className="h-full bg-blue-500 transition-all" style={{ width: `${percent}%` }} />
+      </div>
+    </div>
+  );
+}
+
 function Invoicing() {
-  const { t } = useTranslation();
+  const { t } = useTranslation('invoicing');
+  usePageReady('invoicing');
   const [currentStep, setCurrentStep] = useState(1);
   const [formData, setFormData] = useState<FormData>({
     documentType: null,
@@ -46,6 +95,7 @@ function Invoicing() {
   const [dragActive, setDragActive] = useState(false);
   const [isComplete, setIsComplete] = useState(false);
   const fileInputRef = useRef<HTMLInputElement>(null);
+  const upload = useDocumentUpload(formData.file);
 
   const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     if (e.target.files && e.target.files[0]) {
@@ -86,7 +136,8 @@ function Invoicing() {
   };
 
   const handleFinish = () => {
-    console.log('Lagrer dokument:', formData);
+    if (documentPending) return;
+    console.log('Lagrer dokument:', { ...formData, documentId: upload.result?.document.documentId });
     setIsComplete(true);
   };
 
@@ -133,6 +184,9 @@ function Invoicing() {
 
   const canProceedFromStep1 = formData.documentType !== null && formData.name.trim() !== '';
   const canProceedFromStep2 = formData.unitPrice !== '' && parseFloat(formData.unitPrice) > 0;
+  // A picked document must be stored before the voucher is saved; a failed
+  // upload is retried from the summary
+  const documentPending = formData.file !== null && !upload.result;
 
   const getDocumentTypeLabel = () => {
     switch (formData.documentType) {
@@ -147,12 +201,7 @@ function Invoicing() {
     }
   };
 
-  const formatCurrency = (amount: number) => {
-    return new Intl.NumberFormat('nb-NO', {
-      style: 'currency',
-      currency: 'NOK',
-    }).format(amount);
-  };
+  const format = useFormatters();
 
   if (isComplete) {
     return (
@@ -363,6 +412,7 @@ function Invoicing() {
                           {t('invoicing.step1.changeFile')}
                         </button>
                       </div>
+                      <UploadStatus upload={upload} />
                       <input ref={fileInputRef} type="file" className="hidden" onChange={handleFileChange} accept=".pdf,.jpg,.jpeg,.png" />
                     </div>
                   )}
@@ -455,15 +505,15 @@ function Invoicing() {
               <div className="bg-gray-50 rounded-lg p-4 space-y-2">
                 <div className="flex justify-between text-sm">
                   <span className="text-gray-600">{t('invoicing.step2.totalExVat')}</span>
-                  <span className="font-medium">{formatCurrency(totalExVat)}</span>
+                  <span className="font-medium">{format.currency(totalExVat)}</span>
                 </div>
                 <div className="flex justify-between text-sm">
                   <span className="text-gray-600">{t('invoicing.step2.vatAmount')} ({formData.vatRate}%)</span>
-                  <span className="font-medium">{formatCurrency(vatAmount)}</span>
+                  <span className="font-medium">{format.currency(vatAmount)}</span>
                 </div>
                 <div className="flex justify-between text-base font-semibold border-t border-gray-200 pt-2">
                   <span>{t('invoicing.step2.totalIncVat')}</span>
-                  <span className="text-blue-600">{formatCurrency(totalIncVat)}</span>
+                  <span className="text-blue-600">{format.currency(totalIncVat)}</span>
                 </div>
               </div>
             </div>
@@ -572,13 +622,22 @@ function Invoicing() {
                     <span className="text-gray-600">{t('invoicing.step3.customerName')}</span>
                     <span className="font-medium">{formData.name}</span>
                   </div>
+                  {formData.file && (
+                    <div className="flex justify-between">
+                      <span className="text-gray-600">{t('invoicing.step3.document')}</span>
+                      <span className="font-medium">
+                        {upload.isUploading ? t('invoicing.step3.waitingForUpload') : formData.file.name}
+                      </span>
+                    </div>
+                  )}
+                  {upload.failed && <UploadStatus upload={upload} />}
                   <div className="flex justify-between">
                     <span className="text-gray-600">{t('invoicing.step2.goodsOrService')}</span>
                     <span className="font-medium">{formData.itemType === 'goods' ? t('invoicing.step2.goods') : t('invoicing.step2.service')}</span>
                   </div>
                   <div className="flex justify-between border-t border-gray-200 pt-2 mt-2">
                     <span className="text-gray-900 font-medium">{t('invoicing.step2.totalIncVat')}</span>
-                    <span className="font-semibold text-blue-600">{formatCurrency(totalIncVat)}</span>
+                    <span className="font-semibold text-blue-600">{format.currency(totalIncVat)}</span>
                   </div>
                 </div>
               </div>
@@ -621,7 +680,10 @@ function Invoicing() {
           ) : (
             <button
               onClick={handleFinish}
-              className="px-6 py-2 bg-green-600 text-white rounded-lg hover:bg-green-700 transition-colors"
+              disabled={documentPending}
+              className={`px-6 py-2 rounded-lg transition-colors ${
+                documentPending ? 'bg-gray-300 text-gray-500 cursor-not-allowed' : 'bg-green-600 text-white hover:bg-green-700'
+              }`}
             >
               {t('invoicing.finish')}
             </button>
@@ -2,11 +2,12 @@ import { useState } from 'react';
 import { useTranslation } from 'react-i18next';
 import DepartmentList from '../components/DepartmentList';
 import ProjectList from '../components/ProjectList';
+import { Profiled } from '../components/Profiled';
 
 type Tab = 'departments' | 'projects';
 
 function Settings() {
-  const { t } = useTranslation();
+  const { t } = useTranslation('settings');
   const [activeTab, setActiveTab] = useState<Tab>('departments');
 
   return (
@@ -17,6 +18,7 @@ function Settings() {
           <nav className="flex px-4">
             <button
               onClick={() => setActiveTab('departments')}
+              data-tab="departments"
               className={`py-4 px-6 text-center border-b-4 font-semibold text-base transition-colors ${
                 activeTab === 'departments'
                   ? 'border-blue-600 text-blue-700 bg-white'
@@ -27,6 +29,7 @@ function Settings() {
             </button>
             <button
               onClick={() => setActiveTab('projects')}
+              data-tab="projects"
               className={`py-4 px-6 text-center border-b-4 font-semibold text-base transition-colors ${
                 activeTab === 'projects'
                   ? 'border-blue-600 text-blue-700 bg-white'
@@ -39,8 +42,16 @@ function Settings() {
         </div>
 
         <div className="p-8">
-          {activeTab === 'departments' && <DepartmentList />}
-          {activeTab === 'projects' && <ProjectList />}
+          {activeTab === 'departments' && (
+            <Profiled id="DepartmentList">
+              <DepartmentList />
+            </Profiled>
+          )}
+          {activeTab === 'projects' && (
+            <Profiled id="ProjectList">
+              <ProjectList />
+            </Profiled>
+          )}
         </div>
       </div>
     </div>
@@ -0,0 +1,75 @@
+import { lazy, type ComponentType } from 'react';
+import i18n from './i18n/config';
+
+type PageModule = { default: ComponentType };
+
+// Share one import() between React.lazy and prefetching so a prefetched page
+// is not requested twice
+const once = (load: () => Promise<PageModule>) => {
+  let pending: Promise<PageModule> | null = null;
+  return () => {
+    if (!pending) {
+      pending = load().catch((error) => {
+        // Let the next attempt retry, e.g. after a network blip
+        pending = null;
+        throw error;
+      });
+    }
+    return pending;
+  };
+};
+
+// A page resolves once both its code and its translation namespace are in,
+// so the Suspense fallback covers both and a prefetch warms both
+const page = (path: string, navKey: string, namespace: string, load: () => Promise<PageModule>) => {
+  const loadOnce = once(() =>
+    Promise.all([load(), i18n.loadNamespaces(namespace)]).then(([module]) => module)
+  );
+  return { path, navKey, namespace, load: loadOnce, Component: lazy(loadOnce) };
+};
+
+// Each page is its own chunk
+export const routes = [
+  page('/', 'nav.dashboard', 'dashboard', () => import('./pages/Dashboard')),
+  page('/invoices', 'nav.invoices', 'invoicing', () => import('./pages/Invoicing')),
+  page('/expenses', 'nav.expenses', 'expenses', () => import('./pages/Expenses')),
+  page('/reports', 'nav.reports', 'reports', () => import('./pages/Reports')),
+  page('/clients', 'nav.clients', 'clients', () => import('./pages/Clients')),
+  page('/settings', 'nav.settings', 'settings', () => import('./pages/Settings')),
+];
+
+export const prefetchRoute = (path: string) => {
+  routes.find((route) => route.path === path)?.load().catch(() => undefined);
+};
+
+// Prefetch every page one at a time while the browser is idle. Skipped when
+// the user has asked to save data.
+export const prefetchRoutesWhenIdle = () => {
+  const connection = (navigator as Navigator & { connection?: { saveData?: boolean } }).connection;
+  if (connection?.saveData) return () => {};
+
+  const whenIdle = (callback: () => void) =>
+    typeof window.requestIdleCallback === 'function'
+      ? window.requestIdleCallback(callback, { timeout: 5000 })
+      : window.setTimeout(callback, 2000);
+  const cancelIdle = (handle: number) =>
+    typeof window.cancelIdleCallback === 'function'
+      ? window.cancelIdleCallback(handle)
+      : window.clearTimeout(handle);
+
+  let handle = 0;
+  let cancelled = false;
+  const queue = routes.slice();
+  const next = () => {
+    const route = queue.shift();
+    if (!route || cancelled) return;
+    route.load().catch(() => undefined).finally(() => {
+      if (!cancelled) handle = whenIdle(next);
+    });
+  };
+  handle = whenIdle(next);
+  return () => {
+    cancelled = true;
+    cancelIdle(handle);
+  };
+};
@@ -1,8 +1,179 @@
-import type { Department, Project, ApiError } from '../types';
+import type {
+  ChangeEvent,
+  Department,
+  Project,
+  ApiError,
+  BatchItemResult,
+  BatchOperation,
+  Changes,
+  JournalEntry,
+  JournalEntryCrossing,
+  JournalEntryFilters,
+  Page,
+  StoredDocument,
+  UploadRequest,
+  UploadStart,
+} from '../types';
+import type { EventBatch } from '../lib/eventStream';
+import { readNdjson } from '../lib/ndjson';
+import type { LedgerSummary } from '../lib/ledgerSummary';
+import { RequestCache, type Revalidation } from '../lib/requestCache';
+import { instrumentation } from '../lib/instrumentation';
+import { applyChangesToCache, changesOfBatch } from './changeEvents';
+import { MutationQueue } from './mutationQueue';
+import { offlineCache, type OfflineCollection } from './offlineCache';
+import { sharedData } from './sharedData';
 
 const API_BASE_URL = '/backend/api';
 
+// Default page size for journal entries
+const JOURNAL_ENTRY_PAGE_SIZE = 500;
+
+const pad = (value: number) => String(value).padStart(2, '0');
+
+// Resolve a ledger period to an inclusive from/to date range (YYYY-MM-DD)
+const periodRange = (period: JournalEntryFilters['period']): { from?: string; to?: string } => {
+  if (period.type === 'custom') {
+    return { from: period.startDate, to: period.endDate };
+  }
+  if (!period.year) return {};
+  if (period.type === 'month' && period.month) {
+    const lastDay = new Date(period.year, period.month, 0).getDate();
+    return {
+      from: `${period.year}-${pad(period.month)}-01`,
+      to: `${period.year}-${pad(period.month)}-${pad(lastDay)}`,
+    };
+  }
+  return { from: `${period.year}-01-01`, to: `${period.year}-12-31` };
+};
+
+const journalEntryParams = (filters: JournalEntryFilters, cursor?: string | null, limit?: number) => {
+  const params = new URLSearchParams();
+  const { from, to } = periodRange(filters.period);
+  if (from) params.set('from', from);
+  if (to) params.set('to', to);
+  if (filters.projectId) params.set('projectId', filters.projectId);
+  if (filters.entryType) params.set('entryType', filters.entryType);
+  if (filters.accountId) params.set('accountId', filters.accountId);
+  if (filters.openOnly) params.set('openOnly', 'true');
+  if (filters.search) params.set('search', filters.search);
+  if (cursor) params.set('cursor', cursor);
+  if (limit) params.set('limit', String(limit));
+  return params;
+};
+
 class ApiService {
+  private readonly cache = new RequestCache({ maxEntries: 100, ttlMs: 30_000 });
+
+  // Queues that coalesce department/project edits into batch requests
+  readonly departmentMutations = new MutationQueue<Department>(operations => this.batchDepartments(operations));
+  readonly projectMutations = new MutationQueue<Project>(operations => this.batchProjects(operations));
+  // Crossings are collected for longer, so reconciling a run of bank lines
+  // goes out as a few requests
+  readonly crossingMutations = new MutationQueue<JournalEntryCrossing, string>(
+    operations => this.batchCrossings(operations),
+    { delayMs: 400, maxBatchSize: 500 }
+  );
+
+  constructor() {
+    // Another tab changed something: revalidate it before serving it again
+    sharedData.onInvalidate(prefix => this.cache.invalidate(prefix));
+    // Department and project changes made here are applied in the other tabs
+    this.departmentMutations.subscribe(batch => sharedData.publish(changesOfBatch('departments', batch)));
+    this.projectMutations.subscribe(batch => sharedData.publish(changesOfBatch('projects', batch)));
+  }
+
+  // fetch against the API. With instrumentation on, the time until the
+  // response headers arrive is recorded as api.fetch.
+  private async send(path: string, init?: RequestInit): Promise<Response> {
+    const startedAt = instrumentation.now();
+    const response = await fetch(`${API_BASE_URL}${path}`, init);
+    if (instrumentation.enabled) {
+      instrumentation.end('api.fetch', startedAt, {
+        method: init?.method ?? 'GET',
+        path: path.split('?')[0],
+        status: response.status,
+      });
+    }
+    return response;
+  }
+
+  private async fetchJson<T>(path: string, init?: RequestInit): Promise<T> {
+    return this.handleResponse<T>(await this.send(path, init));
+  }
+
+  // GET, or a 304 when `etag` still matches
+  private async revalidate<T>(path: string, etag: string | null): Promise<Revalidation<T>> {
+    const response = await this.send(path, {
+      headers: etag ? { 'If-None-Match': etag } : {},
+    });
+    if (response.status === 304) {
+      return { notModified: true };
+    }
+    const data = await this.handleResponse<T>(response);
+    return { data, etag: response.headers.get('ETag') };
+  }
+
+  // GET through the request cache: identical concurrent requests share one
+  // fetch, and cached data is revalidated with If-None-Match. A miss asks the
+  // shared data worker, which may have it from another tab.
+  private cachedGet<T>(path: string): Promise<T> {
+    return this.cache.get<T>(path, etag => sharedData.get<T>(path, etag, tag => this.revalidate<T>(path, tag)));
+  }
+
+  // Like cachedGet, but the collection is also kept in the offline cache.
+  // Once it has been synced, revalidating fetches only the records changed
+  // since the sync watermark, which stands in for the ETag.
+  private syncedGet<T extends Department | Project>(collection: OfflineCollection): Promise<T[]> {
+    const path = `/${collection}`;
+    return this.cache.get<T[]>(path, etag =>
+      sharedData.get<T[]>(path, etag, async (tag): Promise<Revalidation<T[]>> =>
+        (await offlineCache.revalidate<T>(collection, tag, <R>(changesPath: string) => this.fetchJson<R>(changesPath)))
+          ?? this.revalidate<T[]>(path, tag)
+      )
+    );
+  }
+
+  // Forget cached responses below `prefix` after a mutation: here, in the
+  // shared data worker and in the other tabs
+  private invalidate(prefix: string) {
+    this.cache.invalidate(prefix);
+    sharedData.invalidate(prefix);
+  }
+
+  // POST operations to `${path}/batch` and return per-item results. Backends
+  // without the batch endpoint get the operations one by one instead.
+  private async sendBatch<T, K extends number | string = number>(
+    path: string,
+    operations: BatchOperation<T, K>[],
+    runOne: (operation: BatchOperation<T, K>) => Promise<T | void>
+  ): Promise<BatchItemResult<T>[]> {
+    const response = await this.send(`${path}/batch`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ operations }),
+    });
+    this.invalidate(path);
+
+    if (response.status === 404 || response.status === 405) {
+      const results: BatchItemResult<T>[] = [];
+      for (const operation of operations) {
+        try {
+          const item = await runOne(operation);
+          results.push({ ok: true, item: item || undefined });
+        } catch (error) {
+          results.push({ ok: false, error: error as ApiError });
+        }
+      }
+      return results;
+    }
+
+    const { results } = await this.handleResponse<{ results: BatchItemResult<T>[] }>(response);
+    return results;
+  }
+
   private async handleResponse<T>(response: Response): Promise<T> {
     if (!response.ok) {
       const error: ApiError = await response.json().catch(() => ({
@@ -10,51 +181,84 @@ class ApiService {
       }));
       throw error;
     }
-    return response.json();
+    if (!instrumentation.enabled) {
+      return response.json();
+    }
+
+    // Body download and JSON parse, recorded as api.parse with the body size
+    const startedAt = performance.now();
+    const body = await response.text();
+    const parseStartedAt = performance.now();
+    const data = JSON.parse(body) as T;
+    instrumentation.record('api.parse', parseStartedAt, performance.now() - parseStartedAt, {
+      path: new URL(response.url, window.location.href).pathname,
+      bytes: Number(response.headers.get('Content-Length')) || body.length,
+      downloadMs: parseStartedAt - startedAt,
+    });
+    return data;
   }
 
   // Department API methods
   async getDepartments(): Promise<Department[]> {
     try {
-      const response = await fetch(`${API_BASE_URL}/departments`);
-      return this.handleResponse<Department[]>(response);
+      return await this.syncedGet<Department>('departments');
     } catch (error) {
-      // Network error or fetch failed
-      throw { message: 'Network error' };
+      // Network error or fetch failed; HTTP errors keep their ApiError
+      if (error instanceof TypeError) {
+        throw { message: 'Network error' };
+      }
+      throw error;
     }
   }
 
+  // Last known departments, possibly stale, without a request
+  getCachedDepartments(): Department[] | undefined {
+    return this.cache.peek<Department[]>('/departments');
+  }
+
+  // Departments stored offline by an earlier visit, without a request
+  getOfflineDepartments(): Promise<Department[] | undefined> {
+    return offlineCache.read<Department>('departments');
+  }
+
+  // Called when a background revalidation changes the department list
+  onDepartmentsChange(listener: (departments: Department[]) => void): () => void {
+    return this.cache.subscribe('/departments', listener);
+  }
+
   async getDepartment(id: number): Promise<Department> {
-    const response = await fetch(`${API_BASE_URL}/departments/${id}`);
-    return this.handleResponse<Department>(response);
+    return this.cachedGet<Department>(`/departments/${id}`);
   }
 
   async createDepartment(department: Omit<Department, 'id' | 'createdAt' | 'updatedAt'>): Promise<Department> {
-    const response = await fetch(`${API_BASE_URL}/departments`, {
+    const response = await this.send('/departments', {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
       body: JSON.stringify(department),
     });
+    this.invalidate('/departments');
     return this.handleResponse<Department>(response);
   }
 
   async updateDepartment(id: number, department: Omit<Department, 'id' | 'createdAt' | 'updatedAt'>): Promise<Department> {
-    const response = await fetch(`${API_BASE_URL}/departments/${id}`, {
+    const response = await this.send(`/departments/${id}`, {
       method: 'PUT',
       headers: {
         'Content-Type': 'application/json',
       },
       body: JSON.stringify(department),
     });
+    this.invalidate('/departments');
     return this.handleResponse<Department>(response);
   }
 
   async deleteDepartment(id: number): Promise<void> {
-    const response = await fetch(`${API_BASE_URL}/departments/${id}`, {
+    const response = await this.send(`/departments/${id}`, {
       method: 'DELETE',
     });
+    this.invalidate('/departments');
     if (!response.ok) {
       const error: ApiError = await response.json().catch(() => ({
         message: `HTTP error! status: ${response.status}`
@@ -63,43 +267,215 @@ class ApiService {
     }
   }
 
+  async batchDepartments(operations: BatchOperation<Department>[]): Promise<BatchItemResult<Department>[]> {
+    return this.sendBatch('/departments', operations, operation => {
+      switch (operation.op) {
+        case 'create':
+          return this.createDepartment(operation.data);
+        case 'update':
+          return this.updateDepartment(operation.id, operation.data);
+        case 'delete':
+          return this.deleteDepartment(operation.id);
+      }
+    });
+  }
+
   // Project API methods
   async getProjects(): Promise<Project[]> {
-    const response = await fetch(`${API_BASE_URL}/projects`);
-    return this.handleResponse<Project[]>(response);
+    return this.syncedGet<Project>('projects');
+  }
+
+  // Last known projects, possibly stale, without a request
+  getCachedProjects(): Project[] | undefined {
+    return this.cache.peek<Project[]>('/projects');
+  }
+
+  // Projects stored offline by an earlier visit, without a request
+  getOfflineProjects(): Promise<Project[] | undefined> {
+    return offlineCache.read<Project>('projects');
+  }
+
+  // Called when a background revalidation changes the project list
+  onProjectsChange(listener: (projects: Project[]) => void): () => void {
+    return this.cache.subscribe('/projects', listener);
+  }
+
+  // Bring the cached lists and summaries up to date with changes pushed by
+  // the backend or made in another tab (see services/liveUpdates.ts)
+  applyLiveChanges(batch: EventBatch<ChangeEvent>) {
+    applyChangesToCache(this.cache, batch);
   }
 
   async getProject(id: number): Promise<Project> {
-    const response = await fetch(`${API_BASE_URL}/projects/${id}`);
-    return this.handleResponse<Project>(response);
+    return this.cachedGet<Project>(`/projects/${id}`);
   }
 
   async createProject(project: Omit<Project, 'id' | 'createdAt' | 'updatedAt'>): Promise<Project> {
-    const response = await fetch(`${API_BASE_URL}/projects`, {
+    const response = await this.send('/projects', {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
       body: JSON.stringify(project),
     });
+    this.invalidate('/projects');
     return this.handleResponse<Project>(response);
   }
 
   async updateProject(id: number, project: Omit<Project, 'id' | 'createdAt' | 'updatedAt'>): Promise<Project> {
-    const response = await fetch(`${API_BASE_URL}/projects/${id}`, {
+    const response = await this.send(`/projects/${id}`, {
       method: 'PUT',
       headers: {
         'Content-Type': 'application/json',
       },
       body: JSON.stringify(project),
     });
+    this.invalidate('/projects');
     return this.handleResponse<Project>(response);
   }
 
   async deleteProject(id: number): Promise<void> {
-    const response = await fetch(`${API_BASE_URL}/projects/${id}`, {
+    const response = await this.send(`/projects/${id}`, {
       method: 'DELETE',
     });
+    this.invalidate('/projects');
+    if (!response.ok) {
+      const error: ApiError = await response.json().catch(() => ({
+        message: `HTTP error! status: ${response.status}`
+      }));
+      throw error;
+    }
+  }
+
+  async batchProjects(operations: BatchOperation<Project>[]): Promise<BatchItemResult<Project>[]> {
+    return this.sendBatch('/projects', operations, operation => {
+      switch (operation.op) {
+        case 'create':
+          return this.createProject(operation.data);
+        case 'update':
+          return this.updateProject(operation.id, operation.data);
+        case 'delete':
+          return this.deleteProject(operation.id);
+      }
+    });
+  }
+
+  // Journal entry API methods
+
+  // One page of journal entries, ordered by date and entry id. Pass the
+  // returned nextCursor to get the page after it.
+  async getJournalEntriesPage(
+    filters: JournalEntryFilters,
+    options: { cursor?: string | null; limit?: number; signal?: AbortSignal } = {}
+  ): Promise<Page<JournalEntry>> {
+    const params = journalEntryParams(filters, options.cursor, options.limit ?? JOURNAL_ENTRY_PAGE_SIZE);
+    const response = await this.send(`/journal-entries?${params}`, { signal: options.signal });
+    return this.handleResponse<Page<JournalEntry>>(response);
+  }
+
+  // Per-account totals of the entries matching `filters`, and the number of
+  // matching entries per account range in `ranges` (e.g. '1000-1999'):
+  // enough to draw the collapsed ledger without loading any entries
+  async getLedgerSummary(filters: JournalEntryFilters, ranges: string[] = []): Promise<LedgerSummary> {
+    const params = journalEntryParams(filters);
+    if (ranges.length > 0) params.set('ranges', ranges.join(','));
+    return this.cachedGet<LedgerSummary>(`/journal-entries/summary?${params}`);
+  }
+
+  // Journal entries matching `filters` that were created, changed or deleted
+  // after `since`, for bringing the offline cache up to date
+  async getJournalEntryChanges(
+    filters: JournalEntryFilters,
+    since: string,
+    options: { signal?: AbortSignal } = {}
+  ): Promise<Changes<JournalEntry, string>> {
+    const params = journalEntryParams(filters);
+    params.set('since', since);
+    return this.fetchJson<Changes<JournalEntry, string>>(`/journal-entries/changes?${params}`, { signal: options.signal });
+  }
+
+  // Stream journal entries as NDJSON, starting after `cursor` when given.
+  // Entries are yielded as they are parsed, so callers can render before
+  // the whole period has arrived.
+  async *streamJournalEntries(
+    filters: JournalEntryFilters,
+    options: { cursor?: string | null; signal?: AbortSignal } = {}
+  ): AsyncGenerator<JournalEntry> {
+    const params = journalEntryParams(filters, options.cursor);
+    const response = await this.send(`/journal-entries/stream?${params}`, {
+      headers: {
+        'Accept': 'application/x-ndjson',
+      },
+      signal: options.signal,
+    });
+    if (!response.ok || !response.body) {
+      const error: ApiError = await response.json().catch(() => ({
+        message: `HTTP error! status: ${response.status}`
+      }));
+      throw error;
+    }
+    yield* readNdjson<JournalEntry>(response.body);
+  }
+
+  async setEntryCrossed(entryId: string, crossing: JournalEntryCrossing): Promise<void> {
+    const response = await this.send(`/journal-entries/${encodeURIComponent(entryId)}/crossing`, {
+      method: 'PUT',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(crossing),
+    });
+    if (!response.ok) {
+      const error: ApiError = await response.json().catch(() => ({
+        message: `HTTP error! status: ${response.status}`
+      }));
+      throw error;
+    }
+  }
+
+  // Crossing batches only carry updates, keyed by entry id
+  async batchCrossings(
+    operations: BatchOperation<JournalEntryCrossing, string>[]
+  ): Promise<BatchItemResult<JournalEntryCrossing>[]> {
+    return this.sendBatch('/journal-entries/crossings', operations, operation => {
+      if (operation.op !== 'update') {
+        const error: ApiError = { message: `Unsupported crossing operation: ${operation.op}` };
+        return Promise.reject(error);
+      }
+      return this.setEntryCrossed(operation.id, operation.data);
+    });
+  }
+
+  // Document uploads (see services/documentUpload.ts)
+
+  // The stored document with this content hash, or null
+  async findDocument(sha256: string, options: { signal?: AbortSignal } = {}): Promise<StoredDocument | null> {
+    const response = await this.send(`/documents/by-hash/${sha256}`, { signal: options.signal });
+    if (response.status === 404) return null;
+    return this.handleResponse<StoredDocument>(response);
+  }
+
+  // Start an upload, or resume the one in progress for the same content
+  async startUpload(request: UploadRequest, options: { signal?: AbortSignal } = {}): Promise<UploadStart> {
+    return this.fetchJson<UploadStart>('/uploads', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(request),
+      signal: options.signal,
+    });
+  }
+
+  async uploadChunk(uploadId: string, index: number, chunk: Blob, options: { signal?: AbortSignal } = {}): Promise<void> {
+    const response = await this.send(`/uploads/${encodeURIComponent(uploadId)}/chunks/${index}`, {
+      method: 'PUT',
+      headers: {
+        'Content-Type': 'application/octet-stream',
+      },
+      body: chunk,
+      signal: options.signal,
+    });
     if (!response.ok) {
       const error: ApiError = await response.json().catch(() => ({
         message: `HTTP error! status: ${response.status}`
@@ -107,6 +483,14 @@ class ApiService {
       throw error;
     }
   }
+
+  // Assemble the chunks; the server checks the content against the announced hash
+  async completeUpload(uploadId: string, options: { signal?: AbortSignal } = {}): Promise<StoredDocument> {
+    return this.fetchJson<StoredDocument>(`/uploads/${encodeURIComponent(uploadId)}/complete`, {
+      method: 'POST',
+      signal: options.signal,
+    });
+  }
 }
 
 export const apiService = new ApiService();
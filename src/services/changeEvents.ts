@@ -0,0 +1,74 @@
+import type { EventBatch } from '../lib/eventStream';
+import type { RequestCache } from '../lib/requestCache';
+import type { ChangeEvent, Department, Project } from '../types';
+import type { AppliedBatch } from './mutationQueue';
+
+// Applying ChangeEvents to lists and cached responses. No DOM here: the
+// shared data worker (workers/sharedDataWorker.ts) uses this too.
+
+type Entity = ChangeEvent['entity'];
+export type EntityChange<E extends Entity> = Extract<ChangeEvent, { entity: E }>;
+
+export const ofEntity = <E extends Entity>(events: ChangeEvent[], entity: E) =>
+  events.filter((event): event is EntityChange<E> => event.entity === entity);
+
+// Apply department/project changes to a list in one pass: updated records
+// replace theirs in place, new ones are added at the end
+export function applyChanges<T extends { id?: number }>(
+  items: T[],
+  changes: ({ op: 'upsert'; item: T } | { op: 'delete'; id: number })[]
+): T[] {
+  if (changes.length === 0) return items;
+  const upserted = new Map<number, T>();
+  const deleted = new Set<number>();
+  changes.forEach(change => {
+    if (change.op === 'delete') {
+      upserted.delete(change.id);
+      deleted.add(change.id);
+    } else if (change.item.id !== undefined) {
+      deleted.delete(change.item.id);
+      upserted.set(change.item.id, change.item);
+    }
+  });
+
+  const next = items
+    .filter(item => item.id === undefined || !deleted.has(item.id))
+    .map(item => {
+      if (item.id === undefined) return item;
+      const updated = upserted.get(item.id);
+      if (!updated) return item;
+      upserted.delete(item.id);
+      return updated;
+    });
+  return next.concat(Array.from(upserted.values()));
+}
+
+// Bring cached responses up to date with a batch of changes: the department
+// and project lists are patched, journal-entry summaries (which cannot be)
+// are fetched again when next asked for. After a reset everything is.
+export function applyChangesToCache(cache: RequestCache, { events, reset }: EventBatch<ChangeEvent>) {
+  if (reset) {
+    cache.invalidate('/departments');
+    cache.invalidate('/projects');
+    cache.invalidate('/journal-entries');
+    return;
+  }
+  const departments = ofEntity(events, 'departments');
+  const projects = ofEntity(events, 'projects');
+  if (departments.length > 0) cache.update<Department[]>('/departments', items => applyChanges(items, departments));
+  if (projects.length > 0) cache.update<Project[]>('/projects', items => applyChanges(items, projects));
+  if (events.some(event => event.entity === 'journal-entries')) cache.invalidate('/journal-entries');
+}
+
+// The changes a batch of department or project mutations made, for the other tabs
+export function changesOfBatch(
+  entity: 'departments' | 'projects',
+  { operations, results }: AppliedBatch<Department | Project>
+): ChangeEvent[] {
+  return operations.flatMap((operation, index): ChangeEvent[] => {
+    const result = results[index];
+    if (!result?.ok) return [];
+    if (operation.op === 'delete') return [{ entity, op: 'delete', id: operation.id } as ChangeEvent];
+    return result.item ? [{ entity, op: 'upsert', item: result.item } as ChangeEvent] : [];
+  });
+}
@@ -0,0 +1,217 @@
+import type { StoredDocument, UploadSession } from '../types';
+import { compressImage } from '../lib/imageCompression';
+import { hashBlob, type HashRequest, type HashResponse } from '../lib/sha256';
+import { apiService } from './api';
+
+// Chunks in flight at once
+const PARALLEL_CHUNKS = 3;
+// Attempts per chunk before the upload fails; retrying the upload resumes it
+const MAX_ATTEMPTS = 5;
+// First retry delay, doubled per attempt
+const RETRY_DELAY_MS = 500;
+
+export type UploadPhase = 'hashing' | 'compressing' | 'uploading' | 'done';
+
+export interface UploadProgress {
+  phase: UploadPhase;
+  // Bytes hashed or confirmed by the server, of `total`
+  loaded: number;
+  total: number;
+}
+
+export interface UploadResult {
+  document: StoredDocument;
+  // The server already had the content; nothing was sent
+  deduplicated: boolean;
+  originalBytes: number;
+  // Bytes of the file as stored, after compression
+  storedBytes: number;
+  // Bytes sent by this call; less than storedBytes when an upload was resumed
+  sentBytes: number;
+}
+
+interface UploadOptions {
+  onProgress?: (progress: UploadProgress) => void;
+  signal?: AbortSignal;
+}
+
+const abortError = () => new DOMException('Upload aborted', 'AbortError');
+
+// Listeners are removed when the promise settles, so a long upload sharing
+// one signal does not pile them up
+const delay = (ms: number, signal?: AbortSignal) =>
+  new Promise<void>((resolve, reject) => {
+    const aborted = () => {
+      clearTimeout(timer);
+      reject(abortError());
+    };
+    const timer = setTimeout(() => {
+      signal?.removeEventListener('abort', aborted);
+      resolve();
+    }, ms);
+    signal?.addEventListener('abort', aborted, { once: true });
+  });
+
+// Resolves once the browser reports a connection again
+const whenOnline = (signal?: AbortSignal) =>
+  new Promise<void>((resolve, reject) => {
+    if (typeof navigator === 'undefined' || navigator.onLine) return resolve();
+    const online = () => {
+      signal?.removeEventListener('abort', aborted);
+      resolve();
+    };
+    const aborted = () => {
+      window.removeEventListener('online', online);
+      reject(abortError());
+    };
+    window.addEventListener('online', online, { once: true });
+    signal?.addEventListener('abort', aborted, { once: true });
+  });
+
+let nextHashId = 0;
+
+// SHA-256 of `blob` in a worker, or in-thread where workers are unavailable
+function hash(blob: Blob, onProgress: (loaded: number) => void, signal?: AbortSignal): Promise<string> {
+  let worker: Worker;
+  try {
+    worker = new Worker(new URL('../workers/hashWorker.ts', import.meta.url), { type: 'module' });
+  } catch {
+    return hashBlob(blob, onProgress);
+  }
+
+  return new Promise((resolve, reject) => {
+    const id = ++nextHashId;
+    const aborted = () => {
+      finish();
+      reject(abortError());
+    };
+    const finish = () => {
+      worker.terminate();
+      signal?.removeEventListener('abort', aborted);
+    };
+    worker.onmessage = ({ data }: MessageEvent<HashResponse>) => {
+      if (data.id !== id) return;
+      if (data.type === 'progress') {
+        onProgress(data.loaded);
+        return;
+      }
+      finish();
+      if (data.type === 'done') resolve(data.sha256);
+      else reject(new Error(data.message));
+    };
+    worker.onerror = () => {
+      finish();
+      hashBlob(blob, onProgress).then(resolve, reject);
+    };
+    signal?.addEventListener('abort', aborted, { once: true });
+    const request: HashRequest = { id, blob };
+    worker.postMessage(request);
+  });
+}
+
+// Send the chunks the server does not have yet, PARALLEL_CHUNKS at a time.
+// A failed chunk is retried with backoff, after the connection is back; when
+// it fails for good the other lanes stop too.
+async function sendChunks(
+  body: Blob,
+  session: UploadSession,
+  onSent: (bytes: number) => void,
+  outerSignal?: AbortSignal
+) {
+  if (outerSignal?.aborted) throw abortError();
+  const controller = new AbortController();
+  const { signal } = controller;
+  const abort = () => controller.abort();
+  outerSignal?.addEventListener('abort', abort, { once: true });
+
+  const received = new Set(session.received);
+  const count = Math.ceil(body.size / session.chunkSize);
+  const pending: number[] = [];
+  for (let index = 0; index < count; index++) {
+    if (!received.has(index)) pending.push(index);
+  }
+
+  const sendOne = async (index: number) => {
+    const chunk = body.slice(index * session.chunkSize, (index + 1) * session.chunkSize);
+    for (let attempt = 1; ; attempt++) {
+      try {
+        await apiService.uploadChunk(session.uploadId, index, chunk, { signal });
+        onSent(chunk.size);
+        return;
+      } catch (error) {
+        if (signal?.aborted || attempt >= MAX_ATTEMPTS) throw error;
+        await whenOnline(signal);
+        await delay(RETRY_DELAY_MS * 2 ** (attempt - 1), signal);
+      }
+    }
+  };
+
+  const lanes = Array.from({ length: Math.min(PARALLEL_CHUNKS, pending.length) }, async () => {
+    try {
+      for (let index = pending.shift(); index !== undefined; index = pending.shift()) {
+        await sendOne(index);
+      }
+    } catch (error) {
+      abort();
+      throw error;
+    }
+  });
+  try {
+    await Promise.all(lanes);
+  } finally {
+    outerSignal?.removeEventListener('abort', abort);
+  }
+}
+
+/**
+ * Upload a voucher document:
+ *
+ * 1. Hash the file in a worker. If the server already has it, stop there.
+ * 2. Downscale and re-encode photos (see compressImage).
+ * 3. Announce the upload with both hashes. The server answers with the
+ *    stored document when it has the content, or with a session listing the
+ *    chunks it already has from an earlier, interrupted attempt.
+ * 4. Send the missing chunks in parallel, then complete the upload; the
+ *    server checks the assembled content against the hash.
+ *
+ * Calling it again after a failure resumes the same upload.
+ */
+export async function uploadDocument(file: File, { onProgress, signal }: UploadOptions = {}): Promise<UploadResult> {
+  const report = (phase: UploadPhase, loaded: number, total: number) => onProgress?.({ phase, loaded, total });
+  const done = (document: StoredDocument, deduplicated: boolean, storedBytes: number, sentBytes: number) => {
+    report('done', storedBytes, storedBytes);
+    return { document, deduplicated, originalBytes: file.size, storedBytes, sentBytes };
+  };
+
+  report('hashing', 0, file.size);
+  const sourceSha256 = await hash(file, loaded => report('hashing', loaded, file.size), signal);
+  const existing = await apiService.findDocument(sourceSha256, { signal });
+  if (existing) return done(existing, true, existing.size, 0);
+
+  report('compressing', 0, file.size);
+  const body = await compressImage(file);
+  if (signal?.aborted) throw abortError();
+  const sha256 = body === file ? sourceSha256 : await hash(body, () => undefined, signal);
+
+  const start = await apiService.startUpload({
+    fileName: file.name,
+    contentType: body.type || file.type || 'application/octet-stream',
+    size: body.size,
+    sha256,
+    sourceSha256,
+  }, { signal });
+  if ('document' in start) return done(start.document, true, start.document.size, 0);
+
+  const { session } = start;
+  let loaded = Math.min(body.size, session.received.length * session.chunkSize);
+  let sentBytes = 0;
+  report('uploading', loaded, body.size);
+  await sendChunks(body, session, bytes => {
+    loaded += bytes;
+    sentBytes += bytes;
+    report('uploading', Math.min(loaded, body.size), body.size);
+  }, signal);
+
+  const document = await apiService.completeUpload(session.uploadId, { signal });
+  return done(document, false, body.size, sentBytes);
+}
@@ -0,0 +1,65 @@
+import type { JournalEntry } from '../types';
+import { apiService } from './api';
+import { offlineCache } from './offlineCache';
+
+// How often streamed entries are passed on to the target
+const STREAM_FLUSH_MS = 250;
+
+export interface JournalYearTarget {
+  // Replace the shown entries
+  load: (entries: JournalEntry[]) => void;
+  // Add entries after the shown ones
+  append: (entries: JournalEntry[]) => void;
+}
+
+async function fetchYear(year: number, target: JournalYearTarget, signal: AbortSignal) {
+  const filters = { period: { type: 'year' as const, year } };
+  const firstPage = await apiService.getJournalEntriesPage(filters, { signal });
+  target.load(firstPage.items);
+  const all = firstPage.items.slice();
+
+  if (firstPage.nextCursor) {
+    let batch: JournalEntry[] = [];
+    let lastFlush = performance.now();
+    const stream = apiService.streamJournalEntries(filters, { cursor: firstPage.nextCursor, signal });
+    for await (const entry of stream) {
+      batch.push(entry);
+      all.push(entry);
+      if (performance.now() - lastFlush >= STREAM_FLUSH_MS) {
+        target.append(batch);
+        batch = [];
+        lastFlush = performance.now();
+      }
+    }
+    if (batch.length > 0) target.append(batch);
+  }
+  await offlineCache.saveJournalYear(year, all);
+}
+
+/**
+ * Load the journal entries of a fiscal year into `target`. A year stored
+ * offline is shown at once, and only the changes since its last sync are
+ * fetched. Otherwise the first page is shown at once, the rest streams in
+ * batches, and the year is stored offline for the next visit.
+ *
+ * Rejects when the backend has no journal-entry API or `signal` aborts;
+ * `target` then keeps whatever it had.
+ */
+export async function loadJournalYear(year: number, target: JournalYearTarget, signal: AbortSignal) {
+  const cached = await offlineCache.readJournalYear(year);
+  if (signal.aborted) return;
+  if (!cached) return fetchYear(year, target, signal);
+
+  target.load(cached);
+  try {
+    const filters = { period: { type: 'year' as const, year } };
+    const synced = await offlineCache.syncJournalYear(year, cached, since =>
+      apiService.getJournalEntryChanges(filters, since, { signal })
+    );
+    if (synced !== cached && !signal.aborted) target.load(synced);
+  } catch (error) {
+    // Offline the stored year is kept; without the changes endpoint the whole year is fetched
+    if (error instanceof TypeError || signal.aborted) return;
+    await fetchYear(year, target, signal);
+  }
+}
@@ -0,0 +1,54 @@
+import type { EventBatch } from '../lib/eventStream';
+import type { ChangeEvent } from '../types';
+import { apiService } from './api';
+import { ofEntity, type EntityChange } from './changeEvents';
+import { sharedData } from './sharedData';
+
+type Entity = ChangeEvent['entity'];
+
+export interface LiveChanges<E extends Entity> {
+  changes: EntityChange<E>[];
+  // Changes were missed; reload instead of relying on `changes` alone
+  reset: boolean;
+}
+
+/**
+ * Changes to departments, projects and journal entries pushed by the backend
+ * (GET /backend/api/events), by this user or anyone else, and department and
+ * project changes made in another tab. They arrive through the shared data
+ * layer, so all tabs share one stream. Each batch is applied to the cached
+ * department and project lists before listeners hear about it, so a list
+ * mounted later starts from current data. The stream opens with the first
+ * subscriber and stays open.
+ */
+class LiveUpdates {
+  private readonly listeners = new Map<Entity, Set<(changes: LiveChanges<Entity>) => void>>();
+  private unsubscribe: (() => void) | null = null;
+
+  subscribe<E extends Entity>(entity: E, listener: (changes: LiveChanges<E>) => void): () => void {
+    this.unsubscribe ??= sharedData.subscribe(batch => this.apply(batch));
+    let listeners = this.listeners.get(entity);
+    if (!listeners) {
+      listeners = new Set();
+      this.listeners.set(entity, listeners);
+    }
+    const wrapped = listener as unknown as (changes: LiveChanges<Entity>) => void;
+    listeners.add(wrapped);
+    return () => {
+      listeners.delete(wrapped);
+    };
+  }
+
+  private apply(batch: EventBatch<ChangeEvent>) {
+    const { events, reset } = batch;
+    apiService.applyLiveChanges(batch);
+
+    this.listeners.forEach((listeners, entity) => {
+      const changes = ofEntity(events, entity);
+      if (changes.length === 0 && !reset) return;
+      listeners.forEach(listener => listener({ changes, reset }));
+    });
+  }
+}
+
+export const liveUpdates = new LiveUpdates();
@@ -0,0 +1,131 @@
+import type { ApiError, BatchItemResult, BatchOperation } from '../types';
+
+export interface AppliedBatch<T, K extends number | string = number> {
+  operations: BatchOperation<T, K>[];
+  results: BatchItemResult<T>[];
+}
+
+interface QueuedOperation<T, K extends number | string> {
+  operation: BatchOperation<T, K>;
+  waiters: ((result: BatchItemResult<T>) => void)[];
+}
+
+/**
+ * Collects create/update/delete operations for a short window and sends them
+ * as one batch. Repeated edits of the same row before the flush collapse into
+ * the latest one. Listeners get each batch with its results so lists can
+ * apply them in a single state update.
+ */
+export class MutationQueue<T, K extends number | string = number> {
+  private readonly send: (operations: BatchOperation<T, K>[]) => Promise<BatchItemResult<T>[]>;
+  private readonly delayMs: number;
+  private readonly maxBatchSize: number;
+  private queued: QueuedOperation<T, K>[] = [];
+  private readonly queuedById = new Map<K, QueuedOperation<T, K>>();
+  // Ids with an operation sent and not answered yet, with the number of such operations
+  private readonly sentById = new Map<K, number>();
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private readonly listeners = new Set<(batch: AppliedBatch<T, K>) => void>();
+
+  constructor(
+    send: (operations: BatchOperation<T, K>[]) => Promise<BatchItemResult<T>[]>,
+    { delayMs = 50, maxBatchSize = 200 }: { delayMs?: number; maxBatchSize?: number } = {}
+  ) {
+    this.send = send;
+    this.delayMs = delayMs;
+    this.maxBatchSize = maxBatchSize;
+  }
+
+  enqueue(operation: BatchOperation<T, K>): Promise<BatchItemResult<T>> {
+    return new Promise(resolve => {
+      const id = operation.op === 'create' ? undefined : operation.id;
+      const existing = id !== undefined ? this.queuedById.get(id) : undefined;
+      if (existing) {
+        existing.operation = operation;
+        existing.waiters.push(resolve);
+      } else {
+        const queued = { operation, waiters: [resolve] };
+        this.queued.push(queued);
+        if (id !== undefined) this.queuedById.set(id, queued);
+      }
+
+      if (this.queued.length >= this.maxBatchSize) {
+        this.flush();
+      } else if (!this.timer) {
+        this.timer = setTimeout(() => this.flush(), this.delayMs);
+      }
+    });
+  }
+
+  // Whether an operation on `id` is queued or waiting for its result
+  isPending(id: K): boolean {
+    return this.queuedById.has(id) || this.sentById.has(id);
+  }
+
+  subscribe(listener: (batch: AppliedBatch<T, K>) => void): () => void {
+    this.listeners.add(listener);
+    return () => {
+      this.listeners.delete(listener);
+    };
+  }
+
+  // Send everything queued so far (in batches of at most maxBatchSize)
+  async flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    const batch = this.queued.splice(0, this.maxBatchSize);
+    if (batch.length === 0) return;
+    batch.forEach(({ operation }) => {
+      if (operation.op !== 'create') this.queuedById.delete(operation.id);
+    });
+    if (this.queued.length > 0) {
+      this.timer = setTimeout(() => this.flush(), 0);
+    }
+
+    const operations = batch.map(({ operation }) => operation);
+    const sentIds = operations.flatMap(operation => (operation.op === 'create' ? [] : [operation.id]));
+    sentIds.forEach(id => this.sentById.set(id, (this.sentById.get(id) ?? 0) + 1));
+    let results: BatchItemResult<T>[];
+    try {
+      results = await this.send(operations);
+    } catch (error) {
+      results = operations.map(() => ({ ok: false, error: error as ApiError }));
+    }
+    sentIds.forEach(id => {
+      const count = this.sentById.get(id)! - 1;
+      if (count === 0) this.sentById.delete(id);
+      else this.sentById.set(id, count);
+    });
+
+    this.listeners.forEach(listener => listener({ operations, results }));
+    batch.forEach(({ waiters }, i) => {
+      const result = results[i] ?? { ok: false, error: { message: 'Missing batch result' } };
+      waiters.forEach(resolve => resolve(result));
+    });
+  }
+}
+
+// Apply the successful operations of a batch to a list in one pass
+export function applyBatchResults<T extends { id?: number }>(items: T[], { operations, results }: AppliedBatch<T>): T[] {
+  const created: T[] = [];
+  const updated = new Map<number, T>();
+  const deleted = new Set<number>();
+  operations.forEach((operation, i) => {
+    const result = results[i];
+    if (!result?.ok) return;
+    if (operation.op === 'delete') {
+      deleted.add(operation.id);
+    } else if (result.item) {
+      if (operation.op === 'create') created.push(result.item);
+      else updated.set(operation.id, result.item);
+    }
+  });
+  if (created.length === 0 && updated.size === 0 && deleted.size === 0) return items;
+
+  return items
+    .filter(item => item.id === undefined || !deleted.has(item.id))
+    .map(item => (item.id !== undefined && updated.get(item.id)) || item)
+    .concat(created);
+}
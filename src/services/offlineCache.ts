@@ -0,0 +1,269 @@
+import type { Changes, JournalEntry } from '../types';
+import type { Revalidation } from '../lib/requestCache';
+import {
+  OfflineStore,
+  deleteIndexRange,
+  isQuotaError,
+  storageUsage,
+  type Migration,
+} from '../lib/offlineStore';
+
+const DATABASE_NAME = 'accounting-offline';
+
+// Schema history, oldest first. Append a migration for every schema change;
+// never edit one that has shipped.
+const migrations: Migration[] = [
+  // 1: departments, projects, journal entries by date, and sync state
+  db => {
+    db.createObjectStore('departments', { keyPath: 'id' });
+    db.createObjectStore('projects', { keyPath: 'id' });
+    db.createObjectStore('journalEntries', { keyPath: 'entryId' }).createIndex('date', 'date');
+    db.createObjectStore('syncState', { keyPath: 'key' });
+  },
+];
+
+// Old fiscal years are evicted while the origin uses more than this share of its quota
+const MAX_STORAGE_USAGE = 0.8;
+
+// Journal entries are written in chunks so one transaction doesn't hold the main thread
+const WRITE_CHUNK = 5000;
+
+export type OfflineCollection = 'departments' | 'projects';
+
+interface SyncState {
+  // 'departments', 'projects' or 'journalEntries:<year>'
+  key: string;
+  // Latest updatedAt (or createdAt) seen; the next sync asks for changes after it
+  watermark: string;
+  syncedAt: string;
+}
+
+interface Timestamped {
+  createdAt?: string;
+  updatedAt?: string;
+}
+
+export interface SyncResult<T> {
+  data: T[];
+  watermark: string;
+  // False when the backend reported no changes since the last sync
+  changed: boolean;
+}
+
+const changedAt = (record: Timestamped) => record.updatedAt ?? record.createdAt ?? '';
+
+// Latest of the watermark and the timestamps; ISO timestamps compare as strings
+const latest = (watermark: string, timestamps: string[]) =>
+  timestamps.reduce((max, timestamp) => (timestamp > max ? timestamp : max), watermark);
+
+const changesWatermark = <T extends Timestamped, K extends number | string>(watermark: string, changes: Changes<T, K>) =>
+  latest(watermark, [...changes.items.map(changedAt), ...changes.deleted.map(deletion => deletion.deletedAt)]);
+
+const journalKey = (year: number) => `journalEntries:${year}`;
+const yearRange = (year: number) => IDBKeyRange.bound(`${year}-01-01`, `${year}-12-31\uffff`);
+
+const byDateAndId = (a: JournalEntry, b: JournalEntry) =>
+  a.date < b.date ? -1 : a.date > b.date ? 1 : a.entryId < b.entryId ? -1 : a.entryId > b.entryId ? 1 : 0;
+
+// A failed fetch (offline, DNS) rather than an HTTP error from the backend
+const isNetworkError = (error: unknown) => error instanceof TypeError;
+
+/**
+ * Departments, projects and journal entries (per fiscal year) kept in
+ * IndexedDB between visits. Views render from here first; after the first
+ * full load only the records changed since the sync watermark are fetched.
+ * The cache is best effort: failing writes are dropped, and without
+ * IndexedDB every call behaves as a cold load.
+ */
+class OfflineCache {
+  private opened: Promise<OfflineStore | null> | null = null;
+
+  private store(): Promise<OfflineStore | null> {
+    this.opened ??= OfflineStore.open(DATABASE_NAME, migrations).then(store => {
+      // Ask the browser not to clear the cache under storage pressure
+      if (store) navigator.storage?.persist?.().catch(() => undefined);
+      return store;
+    });
+    return this.opened;
+  }
+
+  // Cached records of a collection, or undefined before its first sync
+  async read<T>(collection: OfflineCollection): Promise<T[] | undefined> {
+    const store = await this.store();
+    if (!store || !(await store.get<SyncState>('syncState', collection))) return undefined;
+    return store.getAll<T>(collection);
+  }
+
+  // Bring a collection up to date: the changes since the watermark when it
+  // has been synced before, everything otherwise. Offline, the cached records
+  // are returned. Null without IndexedDB.
+  async sync<T extends Timestamped & { id?: number }>(
+    collection: OfflineCollection,
+    fetchAll: () => Promise<T[]>,
+    fetchChanges: (since: string) => Promise<Changes<T>>
+  ): Promise<SyncResult<T> | null> {
+    const store = await this.store();
+    if (!store) return null;
+
+    const state = await store.get<SyncState>('syncState', collection);
+    if (state) {
+      try {
+        const changes = await fetchChanges(state.watermark);
+        const watermark = changesWatermark(state.watermark, changes);
+        const changed = changes.items.length > 0 || changes.deleted.length > 0;
+        if (changed) {
+          await this.persist(store, [collection, 'syncState'], stores => {
+            changes.items.forEach(item => stores[collection].put(item));
+            changes.deleted.forEach(({ id }) => stores[collection].delete(id));
+            stores.syncState.put({ key: collection, watermark, syncedAt: new Date().toISOString() });
+          });
+        }
+        return { data: await store.getAll<T>(collection), watermark, changed };
+      } catch (error) {
+        if (isNetworkError(error)) {
+          return { data: await store.getAll<T>(collection), watermark: state.watermark, changed: false };
+        }
+        // No changes endpoint, or the delta failed: load everything below
+      }
+    }
+
+    const data = await fetchAll();
+    const watermark = latest('', data.map(changedAt));
+    await this.persist(store, [collection, 'syncState'], stores => {
+      stores[collection].clear();
+      data.forEach(item => stores[collection].put(item));
+      stores.syncState.put({ key: collection, watermark, syncedAt: new Date().toISOString() });
+    });
+    return { data, watermark, changed: true };
+  }
+
+  // sync() for a RequestCache entry whose ETag is the sync watermark: not
+  // modified when nothing changed since `etag`. Null without IndexedDB.
+  async revalidate<T extends Timestamped & { id?: number }>(
+    collection: OfflineCollection,
+    etag: string | null,
+    fetchJson: <R>(path: string) => Promise<R>
+  ): Promise<Revalidation<T[]> | null> {
+    const path = `/${collection}`;
+    const synced = await this.sync<T>(
+      collection,
+      () => fetchJson<T[]>(path),
+      since => fetchJson<Changes<T>>(`${path}/changes?since=${encodeURIComponent(since)}`)
+    );
+    if (!synced) return null;
+    if (!synced.changed && etag === synced.watermark) return { notModified: true };
+    return { data: synced.data, etag: synced.watermark };
+  }
+
+  // Cached journal entries of a fiscal year in date order, or undefined
+  // before the year's first sync
+  async readJournalYear(year: number): Promise<JournalEntry[] | undefined> {
+    const store = await this.store();
+    if (!store || !(await store.get<SyncState>('syncState', journalKey(year)))) return undefined;
+    const entries = await store.getAll<JournalEntry>('journalEntries', yearRange(year), 'date');
+    return entries.sort(byDateAndId);
+  }
+
+  // Apply the changes since the year's watermark to `entries` (from
+  // readJournalYear). Returns `entries` itself when nothing changed; fetch
+  // errors are left to the caller.
+  async syncJournalYear(
+    year: number,
+    entries: JournalEntry[],
+    fetchChanges: (since: string) => Promise<Changes<JournalEntry, string>>
+  ): Promise<JournalEntry[]> {
+    const store = await this.store();
+    const state = store && (await store.get<SyncState>('syncState', journalKey(year)));
+    if (!store || !state) return entries;
+
+    const changes = await fetchChanges(state.watermark);
+    if (changes.items.length === 0 && changes.deleted.length === 0) return entries;
+
+    const byId = new Map(entries.map(entry => [entry.entryId, entry]));
+    changes.items.forEach(entry => byId.set(entry.entryId, entry));
+    changes.deleted.forEach(({ id }) => byId.delete(id));
+    const watermark = changesWatermark(state.watermark, changes);
+    await this.persist(store, ['journalEntries', 'syncState'], stores => {
+      changes.items.forEach(entry => stores.journalEntries.put(entry));
+      changes.deleted.forEach(({ id }) => stores.journalEntries.delete(id));
+      stores.syncState.put({ key: journalKey(year), watermark, syncedAt: new Date().toISOString() });
+    }, year);
+    return Array.from(byId.values()).sort(byDateAndId);
+  }
+
+  // Store a fully loaded fiscal year, replacing what was cached for it. The
+  // sync state is written last, so an interrupted save reads as not cached.
+  async saveJournalYear(year: number, entries: JournalEntry[]) {
+    const store = await this.store();
+    if (!store) return;
+
+    const key = journalKey(year);
+    const saved = await this.persist(store, ['journalEntries', 'syncState'], stores => {
+      stores.syncState.delete(key);
+      deleteIndexRange(stores.journalEntries, 'date', yearRange(year));
+    }, year);
+    for (let start = 0; saved && start < entries.length; start += WRITE_CHUNK) {
+      const chunk = entries.slice(start, start + WRITE_CHUNK);
+      if (!(await this.persist(store, ['journalEntries'], stores => chunk.forEach(entry => stores.journalEntries.put(entry)), year))) {
+        return;
+      }
+    }
+    if (saved) {
+      const watermark = latest('', entries.map(changedAt));
+      await this.persist(store, ['syncState'], stores => {
+        stores.syncState.put({ key, watermark, syncedAt: new Date().toISOString() });
+      }, year);
+      await this.evictOldYears(store, year, false);
+    }
+  }
+
+  // Write, evicting old fiscal years and retrying once when the quota is
+  // exceeded. Resolves to false when the write was dropped.
+  private async persist(
+    store: OfflineStore,
+    storeNames: string[],
+    work: (stores: Record<string, IDBObjectStore>) => void,
+    keepYear = new Date().getFullYear()
+  ): Promise<boolean> {
+    try {
+      await store.write(storeNames, work);
+      return true;
+    } catch (error) {
+      if (!isQuotaError(error)) return false;
+    }
+    try {
+      await this.evictOldYears(store, keepYear, true);
+      await store.write(storeNames, work);
+      return true;
+    } catch {
+      return false;
+    }
+  }
+
+  // Drop cached fiscal years, oldest first, while storage usage is above
+  // MAX_STORAGE_USAGE. `force` drops at least one (after a quota error). The
+  // current year and `keepYear` are never dropped.
+  private async evictOldYears(store: OfflineStore, keepYear: number, force: boolean) {
+    const currentYear = new Date().getFullYear();
+    const years = (await store.getAllKeys('syncState'))
+      .map(String)
+      .filter(key => key.startsWith('journalEntries:'))
+      .map(key => Number(key.slice('journalEntries:'.length)))
+      .filter(year => year !== keepYear && year !== currentYear)
+      .sort((a, b) => a - b);
+
+    for (const year of years) {
+      if (!force) {
+        const usage = await storageUsage();
+        if (usage === null || usage < MAX_STORAGE_USAGE) return;
+      }
+      force = false;
+      await store.write(['journalEntries', 'syncState'], stores => {
+        stores.syncState.delete(journalKey(year));
+        deleteIndexRange(stores.journalEntries, 'date', yearRange(year));
+      });
+    }
+  }
+}
+
+export const offlineCache = new OfflineCache();
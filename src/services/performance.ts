@@ -0,0 +1,24 @@
+import {
+  instrumentation,
+  loadInstrumentationSettings,
+  saveInstrumentationSettings,
+  type InstrumentationSettings,
+} from '../lib/instrumentation';
+
+// Backend endpoint for batches of measurements when the beacon is on
+export const PERFORMANCE_BEACON_URL = '/backend/api/telemetry/performance';
+
+// Apply instrumentation settings to the shared instrumentation. Called at
+// startup with the settings from the URL or localStorage, and by the debug
+// panel, which also remembers them.
+export function applyInstrumentationSettings(settings: InstrumentationSettings = loadInstrumentationSettings()) {
+  instrumentation.configure({
+    enabled: settings.enabled,
+    beaconUrl: settings.enabled && settings.beacon ? PERFORMANCE_BEACON_URL : null,
+  });
+}
+
+export function changeInstrumentationSettings(settings: InstrumentationSettings) {
+  saveInstrumentationSettings(settings);
+  applyInstrumentationSettings(settings);
+}
@@ -0,0 +1,12 @@
+import { EventStream } from '../lib/eventStream';
+import { SharedDataClient } from '../lib/sharedData';
+import type { ChangeEvent } from '../types';
+
+// The data layer all tabs share (see lib/sharedData.ts): cached GET responses
+// and the event stream live in one SharedWorker, and invalidations and
+// changes made in one tab reach the others
+export const sharedData = new SharedDataClient<ChangeEvent>(
+  () => new SharedWorker(new URL('../workers/sharedDataWorker.ts', import.meta.url), { type: 'module', name: 'shared-data' }),
+  () => new EventStream<ChangeEvent>('/backend/api/events'),
+  'shared-data'
+);
@@ -35,6 +35,21 @@ export interface ApiError {
   errors?: Record<string, string[]>;
 }
 
+// One mutation in a batch request. `K` is the id type: numeric for
+// departments and projects, the entry id for journal entries.
+export type BatchOperation<T, K extends number | string = number> =
+  | { op: 'create'; data: Omit<T, 'id' | 'createdAt' | 'updatedAt'> }
+  | { op: 'update'; id: K; data: Omit<T, 'id' | 'createdAt' | 'updatedAt'> }
+  | { op: 'delete'; id: K };
+
+// Outcome of one batch operation, in request order. `item` is the created
+// or updated entity.
+export interface BatchItemResult<T> {
+  ok: boolean;
+  item?: T;
+  error?: ApiError;
+}
+
 // Ledger types following Norwegian accounting standards (NS 4102)
 export type EntryType =
   | 'sale'           // Salg
@@ -82,6 +97,8 @@ export interface JournalEntry {
   customerSupplierId?: string;
   documentUrl?: string;
   createdAt: string;
+  // Set by the backend on every change, e.g. crossing; missing on entries never changed
+  updatedAt?: string;
   createdBy: string;
   currency?: string;
   reference?: string;
@@ -133,6 +150,72 @@ export interface LedgerFilters {
   searchQuery?: string;
 }
 
+// Filters the journal-entry endpoints apply on the server
+export type JournalEntryFilters = Pick<LedgerFilters, 'period' | 'projectId' | 'entryType'> & {
+  // Entries with a line on this account
+  accountId?: string;
+  openOnly?: boolean;
+  // Every word must start a word of the entry, as in the ledger search
+  search?: string;
+};
+
+// Records created, changed or deleted after a sync watermark
+// (`?since=`, an updatedAt timestamp), for the offline cache
+export interface Changes<T, K extends number | string = number> {
+  items: T[];
+  deleted: { id: K; deletedAt: string }[];
+}
+
+// A change pushed by the backend's event stream (GET /events) when a record
+// is created, changed or deleted, by anyone. Journal entries are never deleted.
+export type ChangeEvent =
+  | { entity: 'departments'; op: 'upsert'; item: Department }
+  | { entity: 'departments'; op: 'delete'; id: number }
+  | { entity: 'projects'; op: 'upsert'; item: Project }
+  | { entity: 'projects'; op: 'delete'; id: number }
+  | { entity: 'journal-entries'; op: 'upsert'; item: JournalEntry };
+
+// One page of a keyset-paginated collection; pass nextCursor back to get the next page
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+// A stored voucher document (receipt, invoice), identified by its SHA-256
+export interface StoredDocument {
+  documentId: string;
+  sha256: string;
+  size: number;
+}
+
+// Announces a document upload. `sha256` is the hash of the bytes that will be
+// sent; `sourceSha256` that of the file as picked, which differs when an
+// image was compressed first. The server deduplicates on both.
+export interface UploadRequest {
+  fileName: string;
+  contentType: string;
+  size: number;
+  sha256: string;
+  sourceSha256: string;
+}
+
+// An upload in progress. `received` lists the chunk indexes the server has,
+// so an interrupted upload continues where it stopped.
+export interface UploadSession {
+  uploadId: string;
+  chunkSize: number;
+  received: number[];
+}
+
+// Answer to an UploadRequest: the stored document when the server already
+// has the content, otherwise the session to send chunks to
+export type UploadStart = { document: StoredDocument } | { session: UploadSession };
+
+// Crossed (reconciled) state of one journal entry, as sent in crossing batches
+export interface JournalEntryCrossing {
+  isCrossed: boolean;
+}
+
 export type SortField =
   | 'date'
   | 'entryId'
@@ -0,0 +1,3 @@
+import { serveHashing, type HashWorkerScope } from '../lib/sha256';
+
+serveHashing(self as unknown as HashWorkerScope);
@@ -0,0 +1,10 @@
+import { LedgerEngine, serveLedgerEngine, type LedgerWorkerScope } from '../lib/ledgerEngine';
+import { journalEntryAccessors } from '../ledger/accessors';
+import { categoryIdOf } from '../ledger/chart';
+import { createColumnarLedger } from '../ledger/columnar';
+import type { JournalEntry } from '../types';
+
+serveLedgerEngine(
+  self as unknown as LedgerWorkerScope<JournalEntry>,
+  new LedgerEngine(journalEntryAccessors, categoryIdOf, createColumnarLedger)
+);
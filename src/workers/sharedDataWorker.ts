@@ -0,0 +1,70 @@
+import { EventStream } from '../lib/eventStream';
+import { RequestCache, type Revalidation } from '../lib/requestCache';
+import { serveSharedData, type MeasurementRecorder, type SharedDataScope } from '../lib/sharedData';
+import { applyChangesToCache } from '../services/changeEvents';
+import { offlineCache } from '../services/offlineCache';
+import type { ApiError, ChangeEvent, Department, Project } from '../types';
+
+const API_BASE_URL = '/backend/api';
+
+// fetch against the API, measured as api.fetch like ApiService.send when the
+// asking tab records timings
+const send = async (path: string, init: RequestInit, record: MeasurementRecorder | null): Promise<Response> => {
+  const startedAt = performance.now();
+  const response = await fetch(`${API_BASE_URL}${path}`, init);
+  record?.('api.fetch', startedAt, performance.now() - startedAt, {
+    method: 'GET',
+    path: path.split('?')[0],
+    status: response.status,
+  });
+  return response;
+};
+
+// The response body, or the backend's error body thrown as ApiService throws
+// it. Download and parse are measured as api.parse, like ApiService.handleResponse.
+const readJson = async <T>(response: Response, record: MeasurementRecorder | null): Promise<T> => {
+  if (!response.ok) {
+    throw await response.json().catch((): ApiError => ({ message: `HTTP error! status: ${response.status}` }));
+  }
+  if (!record) return response.json();
+
+  const startedAt = performance.now();
+  const body = await response.text();
+  const parseStartedAt = performance.now();
+  const data = JSON.parse(body) as T;
+  record('api.parse', parseStartedAt, performance.now() - parseStartedAt, {
+    path: new URL(response.url).pathname,
+    bytes: Number(response.headers.get('Content-Length')) || body.length,
+    downloadMs: parseStartedAt - startedAt,
+  });
+  return data;
+};
+
+const revalidateJson = async (
+  path: string,
+  etag: string | null,
+  record: MeasurementRecorder | null
+): Promise<Revalidation<unknown>> => {
+  const response = await send(path, { headers: etag ? { 'If-None-Match': etag } : {} }, record);
+  if (response.status === 304) return { notModified: true };
+  const data = await readJson<unknown>(response, record);
+  return { data, etag: response.headers.get('ETag') };
+};
+
+serveSharedData<ChangeEvent>(self as unknown as SharedDataScope, {
+  // Tabs keep their own cache and serve stale data from it; this one
+  // revalidates first
+  cache: new RequestCache({ maxEntries: 100, ttlMs: 30_000, serveStale: false }),
+  stream: new EventStream<ChangeEvent>(`${API_BASE_URL}/events`),
+  // Departments and projects go through the offline cache, as in ApiService.syncedGet
+  fetcherFor: (path, record) => {
+    const collection = path.slice(1);
+    if (collection === 'departments' || collection === 'projects') {
+      const getJson = async <T>(jsonPath: string) => readJson<T>(await send(jsonPath, {}, record), record);
+      return async etag =>
+        (await offlineCache.revalidate<Department | Project>(collection, etag, getJson)) ?? revalidateJson(path, etag, record);
+    }
+    return etag => revalidateJson(path, etag, record);
+  },
+  applyToCache: applyChangesToCache,
+});
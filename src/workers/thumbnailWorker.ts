@@ -0,0 +1,3 @@
+import { serveThumbnails, ThumbnailSource, type ThumbnailWorkerScope } from '../lib/thumbnails';
+
+serveThumbnails(self as unknown as ThumbnailWorkerScope, new ThumbnailSource('/backend/api'));
@@ -0,0 +1,121 @@
+import { createElement } from 'react';
+import { renderToString } from 'react-dom/server';
+import { bench, describe } from 'vitest';
+import { JournalEntryTable } from '../../src/components/JournalEntryTable';
+import { journalEntryAccessors } from '../../src/ledger/accessors';
+import { categoryIdOf } from '../../src/ledger/chart';
+import { createColumnarLedger } from '../../src/ledger/columnar';
+import { formattersFor } from '../../src/lib/formatting';
+import { LedgerEngine } from '../../src/lib/ledgerEngine';
+import { PeriodAggregates, monthKey } from '../../src/lib/periodAggregates';
+import { ReportEngine } from '../../src/lib/reportEngine';
+import { SearchIndex } from '../../src/lib/searchIndex';
+import type { JournalEntry, JournalEntryLine } from '../../src/types';
+import { generateJournalEntries } from '../fixtures/syntheticLedger';
+
+// Ledger sizes in lines. 1k and 100k by default; set BENCH_LINES to e.g.
+// 1000,100000,1000000 for a production-sized run.
+const sizes = (process.env.BENCH_LINES ?? '1000,100000').split(',').map(Number);
+
+const YEAR = 2024;
+const fullYear = { fromMonth: monthKey(YEAR, 1), toMonth: monthKey(YEAR, 12) };
+const march = { fromMonth: monthKey(YEAR, 3), toMonth: monthKey(YEAR, 3) };
+
+for (const lines of sizes) {
+  const entries = generateJournalEntries({ lines, year: YEAR });
+  const engine = new LedgerEngine<JournalEntry, JournalEntryLine>(journalEntryAccessors, categoryIdOf);
+  engine.load(entries);
+  // What the worker runs: large ledgers kept in columns
+  const columnarEngine = new LedgerEngine<JournalEntry, JournalEntryLine>(
+    journalEntryAccessors,
+    categoryIdOf,
+    createColumnarLedger
+  );
+  columnarEngine.load(entries);
+  const aggregates = PeriodAggregates.build(entries, journalEntryAccessors, categoryIdOf);
+  const accountIds = engine.query(fullYear).ledgerAccountIds;
+  const columns = createColumnarLedger(entries);
+  const searchIndex = new SearchIndex();
+  entries.forEach(entry => searchIndex.add(journalEntryAccessors.searchText(entry)));
+  const format = formattersFor('nb-NO');
+  const label = `${lines.toLocaleString('en')} lines`;
+
+  describe(`filter · ${label}`, () => {
+    bench('full year', () => {
+      engine.query(fullYear);
+    });
+    bench('one month, purchases', () => {
+      engine.query({ ...march, entryType: 'purchase' });
+    });
+    bench('one account (1920)', () => {
+      engine.query({ ...fullYear, accountId: '1920' });
+    });
+    bench('open items', () => {
+      engine.query({ ...fullYear, openOnly: true });
+    });
+    bench('full year, columnar', () => {
+      columnarEngine.query(fullYear);
+    });
+    bench('one month, purchases, columnar', () => {
+      columnarEngine.query({ ...march, entryType: 'purchase' });
+    });
+  });
+
+  describe(`aggregate · ${label}`, () => {
+    bench('build period aggregates', () => {
+      PeriodAggregates.build(entries, journalEntryAccessors, categoryIdOf);
+    });
+    bench('totals for every account', () => {
+      accountIds.forEach(accountId => aggregates.totals(accountId, fullYear.fromMonth, fullYear.toMonth));
+    });
+  });
+
+  describe(`search · ${label}`, () => {
+    bench('build index', () => {
+      const index = new SearchIndex();
+      entries.forEach(entry => index.add(journalEntryAccessors.searchText(entry)));
+    });
+    bench('one letter', () => {
+      searchIndex.match('k');
+    });
+    bench('word prefix', () => {
+      searchIndex.match('kontor');
+    });
+    bench('two words', () => {
+      searchIndex.match('salg varer');
+    });
+    bench('engine query with search', () => {
+      engine.query({ ...fullYear, search: 'husleie' });
+    });
+  });
+
+  describe(`reports · ${label}`, () => {
+    bench('trial balance and VAT, full year', () => {
+      new ReportEngine(journalEntryAccessors).report(entries, fullYear);
+    });
+    bench('one month, purchases', () => {
+      new ReportEngine(journalEntryAccessors).report(entries, { ...march, entryType: 'purchase' });
+    });
+    bench('trial balance and VAT, full year, from columns', () => {
+      new ReportEngine(journalEntryAccessors).report(columns, fullYear);
+    });
+    bench('memoized, after replacing one entry', () => {
+      engine.replace(0, { ...entries[0] });
+      engine.report(fullYear);
+    });
+  });
+
+  describe(`render · ${label}`, () => {
+    const visible = entries.slice(0, 50);
+    bench('format amounts and dates for a window', () => {
+      format.dates(visible.map(entry => entry.date));
+      format.amounts(visible.flatMap(entry => entry.lines.map(line => line.amount)));
+    });
+    bench('JournalEntryTable, virtualized', () => {
+      renderToString(createElement(JournalEntryTable, { entries }));
+    });
+    bench('rebuild rows from columns for a window', () => {
+      columns.slice(0, 50);
+    });
+  });
+}
@@ -0,0 +1,230 @@
+import { chart } from '../../src/ledger/chart';
+import type { EntryType, JournalEntry, JournalEntryLine, VATCode } from '../../src/types';
+
+// Seeded synthetic ledger for benchmarks. Every voucher balances (debit ==
+// credit), uses NS 4102 accounts from the chart of accounts and the app's
+// VAT codes, and the account, customer and supplier choices are skewed the way
+// real ledgers are: a few accounts and counterparties carry most postings.
+//
+// The same seed always gives the same ledger, so benchmark runs on different
+// commits measure the same data.
+
+export interface SyntheticLedgerOptions {
+  // Stop once at least this many lines have been generated
+  lines: number;
+  seed?: number;
+  year?: number;
+}
+
+// mulberry32: small, fast and good enough for test data
+export function createRandom(seed: number) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+type Random = ReturnType<typeof createRandom>;
+
+// Zipf-like pick: item i is chosen with weight 1 / (i + 1)
+function skewedPicker<T>(items: readonly T[]) {
+  const cumulative: number[] = [];
+  let sum = 0;
+  items.forEach((_, i) => {
+    sum += 1 / (i + 1);
+    cumulative.push(sum);
+  });
+  return (random: Random) => {
+    const target = random() * sum;
+    let low = 0;
+    let high = cumulative.length - 1;
+    while (low < high) {
+      const middle = (low + high) >>> 1;
+      if (cumulative[middle] < target) low = middle + 1;
+      else high = middle;
+    }
+    return items[low];
+  };
+}
+
+const accountsBetween = (from: number, to: number) =>
+  chart.accounts.map(account => account.accountId).filter(id => Number(id) >= from && Number(id) <= to);
+
+const accountName = (accountId: string) => chart.placementOf(accountId)?.account.name ?? accountId;
+
+// Output (sales) and input (purchase) VAT codes by rate, see VATCode
+const VAT_RATES: { rate: number; outputCode: VATCode; inputCode: VATCode; weight: number }[] = [
+  { rate: 0.25, outputCode: '1', inputCode: '3', weight: 0.8 },
+  { rate: 0.15, outputCode: '11', inputCode: '31', weight: 0.12 },
+  { rate: 0.12, outputCode: '13', inputCode: '33', weight: 0.08 },
+];
+
+const ENTRY_TYPES: { type: EntryType; weight: number }[] = [
+  { type: 'purchase', weight: 0.38 },
+  { type: 'sale', weight: 0.3 },
+  { type: 'bank', weight: 0.2 },
+  { type: 'salary', weight: 0.05 },
+  { type: 'journal', weight: 0.04 },
+  { type: 'depreciation', weight: 0.02 },
+  { type: 'adjustment', weight: 0.01 },
+];
+
+// Busier months in spring and autumn, quiet July
+const MONTH_WEIGHTS = [8, 8, 9, 9, 9, 8, 4, 7, 9, 10, 10, 9];
+
+const pickWeighted = <T>(random: Random, items: readonly T[], weightOf: (item: T) => number) => {
+  const total = items.reduce((sum, item) => sum + weightOf(item), 0);
+  let target = random() * total;
+  for (const item of items) {
+    target -= weightOf(item);
+    if (target < 0) return item;
+  }
+  return items[items.length - 1];
+};
+
+const round = (amount: number) => Math.round(amount * 100) / 100;
+
+const PROJECTS = Array.from({ length: 20 }, (_, i) => `P-${String(i + 1).padStart(3, '0')}`);
+const CUSTOMERS = Array.from({ length: 500 }, (_, i) => `K-${String(i + 1).padStart(4, '0')}`);
+const SUPPLIERS = Array.from({ length: 300 }, (_, i) => `L-${String(i + 1).padStart(4, '0')}`);
+
+const REVENUE_ACCOUNTS = accountsBetween(3000, 3999);
+const EXPENSE_ACCOUNTS = [...accountsBetween(4000, 4999), ...accountsBetween(6000, 7999)];
+const FIXED_ASSET_ACCOUNTS = accountsBetween(1000, 1299);
+
+const DESCRIPTIONS: Record<EntryType, string[]> = {
+  sale: ['Salg av konsulenttjenester', 'Salg av varer', 'Abonnement', 'Kurs og opplæring'],
+  purchase: ['Kontormateriell', 'Programvarelisens', 'Reisekostnader', 'Varekjøp', 'Husleie', 'Strøm'],
+  bank: ['Innbetaling fra kunde', 'Betaling til leverandør'],
+  salary: ['Lønn', 'Forskuddstrekk', 'Arbeidsgiveravgift'],
+  journal: ['Periodisering', 'Ompostering'],
+  depreciation: ['Avskrivning driftsmidler'],
+  adjustment: ['Korrigering', 'Avrunding'],
+};
+
+/**
+ * Balanced journal entries with at least `options.lines` lines in total,
+ * dated within `options.year` and sorted by date.
+ */
+export function generateJournalEntries({ lines, seed = 4102, year = 2024 }: SyntheticLedgerOptions): JournalEntry[] {
+  const random = createRandom(seed);
+  const pickRevenue = skewedPicker(REVENUE_ACCOUNTS);
+  const pickExpense = skewedPicker(EXPENSE_ACCOUNTS);
+  const pickFixedAsset = skewedPicker(FIXED_ASSET_ACCOUNTS);
+  const pickCustomer = skewedPicker(CUSTOMERS);
+  const pickSupplier = skewedPicker(SUPPLIERS);
+  const months = MONTH_WEIGHTS.map((weight, month) => ({ month, weight }));
+
+  const entries: JournalEntry[] = [];
+  let lineCount = 0;
+  let invoiceNumber = 0;
+
+  while (lineCount < lines) {
+    const entryType = pickWeighted(random, ENTRY_TYPES, item => item.weight).type;
+    const { month } = pickWeighted(random, months, item => item.weight);
+    const day = 1 + Math.floor(random() * 28);
+    const date = `${year}-${String(month + 1).padStart(2, '0')}-${String(day).padStart(2, '0')}`;
+    const descriptions = DESCRIPTIONS[entryType];
+    const description = descriptions[Math.floor(random() * descriptions.length)];
+    // Log-normal-ish amounts: mostly hundreds to tens of thousands
+    const net = round(Math.exp(5 + random() * 5));
+    const vat = pickWeighted(random, VAT_RATES, item => item.weight);
+
+    const entryLines: JournalEntryLine[] = [];
+    const addLine = (accountId: string, debit: number | null, credit: number | null, vatCode: VATCode = '0', vatAmount = 0) => {
+      const amount = debit ?? credit ?? 0;
+      entryLines.push({
+        lineId: String(entryLines.length + 1),
+        accountId,
+        accountName: accountName(accountId),
+        debit,
+        credit,
+        amount,
+        vatCode,
+        vatAmount,
+        description,
+      });
+    };
+
+    let counterparty: string | undefined;
+    switch (entryType) {
+      case 'sale': {
+        const vatAmount = round(net * vat.rate);
+        counterparty = pickCustomer(random);
+        addLine('1500', round(net + vatAmount), null);
+        addLine(pickRevenue(random), null, net, vat.outputCode, vatAmount);
+        addLine('2700', null, vatAmount, vat.outputCode, vatAmount);
+        break;
+      }
+      case 'purchase': {
+        const vatAmount = round(net * vat.rate);
+        counterparty = pickSupplier(random);
+        addLine(pickExpense(random), net, null, vat.inputCode, vatAmount);
+        addLine('2710', vatAmount, null, vat.inputCode, vatAmount);
+        addLine('2400', null, round(net + vatAmount));
+        break;
+      }
+      case 'bank':
+        if (random() < 0.5) {
+          counterparty = pickCustomer(random);
+          addLine('1920', net, null);
+          addLine('1500', null, net);
+        } else {
+          counterparty = pickSupplier(random);
+          addLine('2400', net, null);
+          addLine('1920', null, net);
+        }
+        break;
+      case 'salary': {
+        const gross = round(net * 4);
+        const tax = round(gross * 0.3);
+        const employerTax = round(gross * 0.141);
+        addLine('5000', gross, null);
+        addLine('5400', employerTax, null);
+        addLine('2600', null, tax);
+        addLine('2770', null, employerTax);
+        addLine('1920', null, round(gross - tax));
+        break;
+      }
+      case 'depreciation': {
+        const asset = pickFixedAsset(random);
+        addLine('6000', net, null);
+        addLine(asset, null, net);
+        break;
+      }
+      case 'journal':
+      case 'adjustment':
+        addLine(pickExpense(random), net, null);
+        addLine(pickExpense(random), null, net);
+        break;
+    }
+
+    entries.push({
+      entryId: '',
+      entryType,
+      date,
+      lines: entryLines,
+      customerSupplierId: counterparty,
+      createdAt: `${date}T09:00:00Z`,
+      createdBy: 'Syntetisk',
+      reference: entryType === 'sale' || entryType === 'purchase'
+        ? `F-${year}-${String(++invoiceNumber).padStart(6, '0')}`
+        : undefined,
+      projectId: random() < 0.3 ? PROJECTS[Math.floor(random() * PROJECTS.length)] : undefined,
+      isCrossed: random() < 0.4,
+      isOpen: random() < 0.25,
+    });
+    lineCount += entryLines.length;
+  }
+
+  // Number the vouchers in date order, like a real journal
+  entries.sort((a, b) => (a.date < b.date ? -1 : a.date > b.date ? 1 : 0));
+  entries.forEach((entry, i) => {
+    entry.entryId = `B-${year}-${String(i + 1).padStart(7, '0')}`;
+  });
+  return entries;
+}
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Shared Selenium harness: wait for pages to become usable and measure them
+
+Pages signal that they are usable with a `page-ready` User Timing mark that
+carries the page name (see src/hooks/usePageReady.ts). The harness waits for
+that mark instead of sleeping, and collects per page:
+  - Navigation Timing (TTFB, DOMContentLoaded, load)
+  - time until the page-ready mark
+  - Largest Contentful Paint and Cumulative Layout Shift
+  - long tasks (count, total and longest)
+  - used JS heap (Chrome only)
+
+Budgets per page live in perf_budgets.json; test_page_performance.py checks
+them and writes a JSON report.
+"""
+import json
+import os
+import time
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.chrome.options import Options
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_URL = os.environ.get('APP_URL', 'http://localhost:4200/frontend')
+BUDGETS_PATH = os.path.join(TESTS_DIR, 'perf_budgets.json')
+REPORT_PATH = os.environ.get(
+    'PERF_REPORT', os.path.join(TESTS_DIR, '..', 'test-results', 'page-performance.json')
+)
+
+# Installed before any page script runs, so buffered entries are not missed
+OBSERVERS_JS = """
+(() => {
+  const perf = window.__perf = { lcp: 0, cls: 0, longTasks: [] };
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver(list => list.getEntries().forEach(onEntry)).observe({ type, buffered: true });
+    } catch (error) {
+      // Entry type not supported by this browser
+    }
+  };
+  observe('largest-contentful-paint', entry => { perf.lcp = entry.renderTime || entry.loadTime || entry.startTime; });
+  observe('layout-shift', entry => { if (!entry.hadRecentInput) perf.cls += entry.value; });
+  observe('longtask', entry => { perf.longTasks.push(entry.duration); });
+})();
+"""
+
+READY_NAMES_JS = """
+return performance.getEntriesByName('page-ready').map(mark => mark.detail && mark.detail.name);
+"""
+
+COLLECT_JS = """
+const [name, since] = arguments;
+const ready = performance.getEntriesByName('page-ready').find(mark => mark.detail && mark.detail.name === name);
+const navigation = performance.getEntriesByType('navigation')[0];
+const perf = window.__perf || { lcp: 0, cls: 0, longTasks: [] };
+const memory = performance.memory;
+return {
+  ttfbMs: navigation ? navigation.responseStart - navigation.startTime : null,
+  domContentLoadedMs: navigation ? navigation.domContentLoadedEventEnd - navigation.startTime : null,
+  loadMs: navigation ? navigation.loadEventEnd - navigation.startTime : null,
+  readyMs: ready ? ready.startTime - since : null,
+  lcpMs: perf.lcp || null,
+  cls: perf.cls,
+  longTaskCount: perf.longTasks.length,
+  longTaskTotalMs: perf.longTasks.reduce((sum, duration) => sum + duration, 0),
+  longTaskMaxMs: Math.max(0, ...perf.longTasks),
+  heapMb: memory ? memory.usedJSHeapSize / 1048576 : null,
+};
+"""
+
+
+def app_url(route='/'):
+    """Absolute URL of an app route, e.g. app_url('/settings')"""
+    return APP_URL.rstrip('/') + route
+
+
+def create_driver(window_size='1920,1080'):
+    """Headless Chrome with browser logging and the performance observers"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument(f'--window-size={window_size}')
+    # Precise performance.memory values instead of bucketed ones
+    chrome_options.add_argument('--enable-precise-memory-info')
+    chrome_options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': OBSERVERS_JS})
+    return driver
+
+
+def wait_for_page_ready(driver, name=None, timeout=30):
+    """Wait until the page called `name` (or any page) has signalled it is usable"""
+    def ready(d):
+        names = d.execute_script(READY_NAMES_JS) or []
+        return names if (name in names if name else names) else False
+
+    WebDriverWait(driver, timeout, poll_frequency=0.05).until(ready)
+
+
+def measure_page(driver, page, timeout=30):
+    """
+    Load `page` (an entry of perf_budgets.json) and return its metrics.
+
+    Pages with `click` are measured from the click: the route is loaded, the
+    harness waits for `clickAfter` to be ready, clicks the selector and then
+    waits for `ready`.
+    """
+    driver.get(app_url(page['route']))
+    since = 0
+    if page.get('click'):
+        wait_for_page_ready(driver, page['clickAfter'], timeout)
+        since = driver.execute_script('return performance.now()')
+        driver.find_element(By.CSS_SELECTOR, page['click']).click()
+
+    started = time.monotonic()
+    try:
+        wait_for_page_ready(driver, page['ready'], timeout)
+    except Exception:
+        print(f"❌ {page['name']}: no page-ready mark '{page['ready']}' within {timeout} s")
+    metrics = driver.execute_script(COLLECT_JS, page['ready'], since)
+    metrics['waitedMs'] = (time.monotonic() - started) * 1000
+    return metrics
+
+
+def check_budgets(metrics, budgets):
+    """Budget violations as readable strings; a page that never got ready is one"""
+    violations = []
+    if metrics.get('readyMs') is None:
+        violations.append('page never signalled ready')
+    for metric, limit in budgets.items():
+        value = metrics.get(metric)
+        if value is not None and value > limit:
+            violations.append(f'{metric} {value:.2f} > {limit}')
+    return violations
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_report(results, path=REPORT_PATH):
+    """Write per-page metrics, budgets and violations as JSON"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    report = {
+        'appUrl': APP_URL,
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'pages': results,
+        'passed': all(not result['violations'] for result in results),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
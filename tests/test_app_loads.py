@@ -2,12 +2,12 @@
 """
 Test that the accounting system shell app loads correctly
 """
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from perf_harness import app_url, wait_for_page_ready
 
 def test_app_loads():
     # Setup Chrome in headless mode
@@ -19,11 +19,11 @@ def test_app_loads():
     driver = webdriver.Chrome(options=chrome_options)
 
     try:
-        print("🔍 Testing app at http://localhost:4200...")
-        driver.get('http://localhost:4200')
+        print(f"🔍 Testing app at {app_url()}...")
+        driver.get(app_url())
 
-        # Wait for page to load (give it 10 seconds)
-        time.sleep(10)
+        # Wait until the dashboard signals it is ready
+        wait_for_page_ready(driver, 'dashboard')
 
         # Take screenshot
         driver.save_screenshot('/tmp/accounting-app-test.png')
@@ -8,6 +8,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from perf_harness import app_url, wait_for_page_ready
 
 def test_no_flicker():
     chrome_options = Options()
@@ -20,12 +21,11 @@ def test_no_flicker():
     driver = webdriver.Chrome(options=chrome_options)
 
     try:
-        print("🔍 Testing app at http://localhost:4200...")
-        driver.get('http://localhost:4200')
+        print(f"🔍 Testing app at {app_url()}...")
+        driver.get(app_url())
 
-        # Wait much longer for React to load
-        print("⏳ Waiting 20 seconds for app to fully load...")
-        time.sleep(20)
+        print("⏳ Waiting for the dashboard to signal it is ready...")
+        wait_for_page_ready(driver, 'dashboard')
 
         # Take screenshot
         driver.save_screenshot('/tmp/accounting-flicker-test.png')
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Check every page in perf_budgets.json against its performance budget
+
+Start the app against the mock backend first (see perf_budgets.json for the
+dataset the budgets assume). The metrics are written to
+test-results/page-performance.json, or to PERF_REPORT if set.
+"""
+from perf_harness import (
+    check_budgets, create_driver, load_budgets, measure_page, write_report, REPORT_PATH,
+)
+
+def test_page_performance():
+    pages = load_budgets()['pages']
+    driver = create_driver()
+    results = []
+
+    try:
+        for page in pages:
+            print(f"🔍 Measuring {page['name']} ({page['route']})...")
+            # Fresh document per page, so heap and long tasks are not carried over
+            driver.get('about:blank')
+            metrics = measure_page(driver, page)
+            violations = check_budgets(metrics, page['budgets'])
+            results.append({
+                'name': page['name'],
+                'route': page['route'],
+                'metrics': metrics,
+                'budgets': page['budgets'],
+                'violations': violations,
+            })
+
+            ready = metrics['readyMs']
+            print(f"  ready: {f'{ready:.0f} ms' if ready is not None else '—'}, "
+                  f"LCP: {metrics['lcpMs'] or 0:.0f} ms, CLS: {metrics['cls']:.3f}, "
+                  f"long tasks: {metrics['longTaskCount']} ({metrics['longTaskTotalMs']:.0f} ms)")
+            for violation in violations:
+                print(f"  ❌ {violation}")
+    finally:
+        driver.quit()
+
+    print(f"\n📄 Report written to {write_report(results, REPORT_PATH)}")
+    failed = [result['name'] for result in results if result['violations']]
+    if failed:
+        print(f"\n❌ Over budget: {', '.join(failed)}")
+    else:
+        print("\n✅ ALL PAGES WITHIN BUDGET!")
+    assert not failed, f"Pages over budget: {failed}"
+
+if __name__ == '__main__':
+    try:
+        test_page_performance()
+    except AssertionError:
+        exit(1)
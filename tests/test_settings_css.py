@@ -2,13 +2,13 @@
 """
 Test Settings page CSS and styling
 """
-import time
 import sys
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from perf_harness import app_url, wait_for_page_ready
 
 def test_settings_css():
     chrome_options = Options()
@@ -21,12 +21,12 @@ def test_settings_css():
     driver = webdriver.Chrome(options=chrome_options)
 
     try:
-        print("🔍 Testing Settings page CSS at http://localhost:4200/settings...")
-        driver.get('http://localhost:4200/settings')
+        print(f"🔍 Testing Settings page CSS at {app_url('/settings')}...")
+        driver.get(app_url('/settings'))
 
-        # Wait for page to load
+        # Wait for the departments tab to signal it is ready
         print("⏳ Waiting for page to load...")
-        time.sleep(5)
+        wait_for_page_ready(driver, 'departments')
 
         # Take screenshot
         driver.save_screenshot('/tmp/settings-css-test.png')
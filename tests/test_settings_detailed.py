@@ -8,6 +8,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from perf_harness import app_url, wait_for_page_ready
 
 def test_settings_detailed():
     chrome_options = Options()
@@ -22,12 +23,12 @@ def test_settings_detailed():
     driver = webdriver.Chrome(options=chrome_options)
 
     try:
-        print("🔍 Testing Settings page at http://localhost:4200/settings...")
-        driver.get('http://localhost:4200/settings')
+        print(f"🔍 Testing Settings page at {app_url('/settings')}...")
+        driver.get(app_url('/settings'))
 
-        # Wait for page to load
-        print("⏳ Waiting 15 seconds for page to fully load...")
-        time.sleep(15)
+        # Wait for the departments tab to signal it is ready
+        print("⏳ Waiting for page to fully load...")
+        wait_for_page_ready(driver, 'departments')
 
         # Take screenshot
         driver.save_screenshot('/tmp/settings-detailed-test.png')
@@ -101,9 +102,6 @@ def test_settings_detailed():
         traceback.print_exc()
         return False
     finally:
-        # Keep browser open for inspection
-        print("\n⏸️  Browser will stay open for 30 seconds for inspection...")
-        time.sleep(30)
         driver.quit()
 
 if __name__ == '__main__':
@@ -2,12 +2,12 @@
 """
 Test the Settings page specifically for CSS and functionality
 """
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from perf_harness import app_url, wait_for_page_ready
 
 def test_settings_page():
     chrome_options = Options()
@@ -21,12 +21,12 @@ def test_settings_page():
     driver = webdriver.Chrome(options=chrome_options)
 
     try:
-        print("🔍 Testing Settings page at http://localhost:4200/settings...")
-        driver.get('http://localhost:4200/settings')
+        print(f"🔍 Testing Settings page at {app_url('/settings')}...")
+        driver.get(app_url('/settings'))
 
-        # Wait for page to load
-        print("⏳ Waiting 10 seconds for page to fully load...")
-        time.sleep(10)
+        # Wait for the departments tab to signal it is ready
+        print("⏳ Waiting for page to fully load...")
+        wait_for_page_ready(driver, 'departments')
 
         # Take screenshot
         driver.save_screenshot('/tmp/settings-page-test.png')
@@ -2,12 +2,12 @@
 """
 Visual test for the accounting system - checks styling and translations
 """
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from perf_harness import app_url, wait_for_page_ready
 
 def test_visual():
     chrome_options = Options()
@@ -21,12 +21,12 @@ def test_visual():
     driver = webdriver.Chrome(options=chrome_options)
 
     try:
-        print("🔍 Testing app at http://localhost:4200...")
-        driver.get('http://localhost:4200')
+        print(f"🔍 Testing app at {app_url()}...")
+        driver.get(app_url())
 
-        # Wait longer for i18n to fully load
-        print("⏳ Waiting 10 seconds for app and i18n to fully load...")
-        time.sleep(10)
+        # The ready signal comes after i18n has loaded the page namespace
+        print("⏳ Waiting for app and i18n to fully load...")
+        wait_for_page_ready(driver, 'dashboard')
 
         # Take initial screenshot
         driver.save_screenshot('/tmp/accounting-visual-test.png')
@@ -1,13 +1,24 @@
 import { defineConfig } from 'vite';
 import react from '@vitejs/plugin-react';
 import tailwindcss from '@tailwindcss/vite';
+import { fileURLToPath } from 'node:url';
+import { routeChunkReport } from './plugins/routeChunkReport';
+import { mockBackend, mockBackendOptionsFromEnv } from './plugins/mockBackend';
 
 export default defineConfig({
   base: '/frontend/',
   plugins: [
     react(),
     tailwindcss(),
+    routeChunkReport({ pagesDir: fileURLToPath(new URL('./src/pages', import.meta.url)) }),
+    // MOCK_BACKEND=1 answers /backend/api locally instead of proxying to :8080
+    process.env.MOCK_BACKEND && mockBackend(mockBackendOptionsFromEnv(process.env)),
   ],
+  resolve: {
+    // PROFILE=1 bundles React's profiling build, so <Profiler> timings are
+    // recorded in production builds too
+    alias: process.env.PROFILE ? { 'react-dom/client': 'react-dom/profiling' } : {},
+  },
   server: {
     port: 4200,
     strictPort: true,